@@ -1,7 +1,3 @@
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
-
 from arkouda.client import *
 from arkouda.dtypes import *
 from arkouda.pdarrayclass import *
@@ -15,7 +11,44 @@ from arkouda.strings import *
 from arkouda.join import *
 from arkouda.categorical import *
 from arkouda.logger import *
-from arkouda.timeclass import *
 from arkouda.infoclass import *
 from arkouda.pdarrayfunctions import *
 
+from arkouda.flush import *
+from arkouda.lazy import *
+from arkouda.transfer import *
+from arkouda.instrumentation import *
+
+import importlib
+
+# submodules imported on first use of one of their names, since they import
+# dependencies which dominate the import time of arkouda (pandas)
+_LAZY_SUBMODULES = {
+    'timeclass': ("Datetime", "Timedelta", "date_range", "timedelta_range"),
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_SUBMODULES.items() for name in names}
+
+# the names "from arkouda import *" imports, including the lazy ones, which it
+# imports the submodules of
+__all__ = sorted(name for name in globals() if not name.startswith('_') and name != 'importlib')
+__all__ += [*_LAZY_SUBMODULES, *_LAZY_NAMES]
+
+
+def __getattr__(name):
+    # the version is computed on first use, since in a git checkout it runs git
+    if name == '__version__':
+        from ._version import get_versions
+        value = get_versions()['version']
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module('arkouda.' + name)
+    elif name in _LAZY_NAMES:
+        module = importlib.import_module('arkouda.' + _LAZY_NAMES[name])
+        value = getattr(module, name)
+    else:
+        raise AttributeError("module 'arkouda' has no attribute '{}'".format(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_NAMES) | {'__version__'})
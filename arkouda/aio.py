@@ -0,0 +1,336 @@
+import asyncio, itertools, sys
+from typing import cast, AbstractSet, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np  # type: ignore
+import zmq  # type: ignore
+import zmq.asyncio  # type: ignore
+from arkouda import client, instrumentation
+from arkouda.compression import decompress
+from arkouda.pdarrayclass import pdarray
+
+__all__ = ["AsyncClient", "connect"]
+
+
+class AsyncClient:
+    """
+    asyncio client of the arkouda_server the blocking client is connected
+    to. Requests are sent over a DEALER socket, each tagged with a request
+    id the server sends back with the reply, so any number of them can be
+    in flight at once, e.g. downloading one pdarray while another is
+    computed. The client shares the command buffer of the blocking client:
+    compute() executes the independent branches of the buffered commands
+    concurrently.
+
+    The server executes the requests of the client in the order they are
+    sent. Requests of the blocking client are not ordered with those in
+    flight, so await them before blocking calls that depend on them.
+
+    Attributes
+    ----------
+    socket : zmq.asyncio.Socket
+        The DEALER socket, None until opened
+    pending : Dict[bytes, asyncio.Future]
+        Request id to the future of the reply, for requests in flight
+    in_flight : Dict[client.BufferItem, asyncio.Future]
+        The buffered commands a task took to execute, to the future done
+        once they are executed or failed, so that other tasks wait for the
+        pdarrays they compute
+    """
+
+    def __init__(self) -> None:
+        self.context = zmq.asyncio.Context.instance()
+        self.socket: Optional[zmq.asyncio.Socket] = None
+        self.pending: Dict[bytes, asyncio.Future] = dict()
+        self.in_flight: Dict[client.BufferItem, asyncio.Future] = dict()
+        self.ids = itertools.count()
+        self.receiver: Optional[asyncio.Task] = None
+
+    def open(self) -> None:
+        """
+        Connect the DEALER socket to the server of the blocking client
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the blocking client is not connected to a server
+        """
+        if not client.connected:
+            raise RuntimeError("client is not connected to a server")
+        if self.socket is not None:
+            return
+        self.socket = self.context.socket(zmq.DEALER)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(client.pspStr)
+
+    async def close(self) -> None:
+        """
+        Close the socket, failing the requests still in flight
+        """
+        if self.receiver is not None:
+            self.receiver.cancel()
+            self.receiver = None
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("the asyncio client was closed"))
+        self.pending.clear()
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _receive(self) -> None:
+        """
+        Resolve the future of each reply, by request id, while requests are
+        in flight
+        """
+        socket = cast(zmq.asyncio.Socket, self.socket)
+        while self.pending:
+            # the server sends back the request id and the empty delimiter
+            frames = await socket.recv_multipart(copy=False)
+            future = self.pending.pop(frames[0].bytes, None)
+            if future is not None and not future.done():
+                future.set_result(frames[-1].bytes)
+        self.receiver = None
+
+    async def send(self, cmd: str, args: Optional[str] = None,
+                   payload: Optional[Union[bytes, Tuple[bytes, memoryview]]] = None,
+                   recv_bytes: bool = False) -> Union[str, bytes]:
+        """
+        Send a request to the server, without going through the command
+        buffer, and return its reply once it arrives
+
+        Parameters
+        ----------
+        cmd : str
+            The server-side command to be executed
+        args : str
+            A space-delimited list of command arguments, with server names
+        payload : Union[bytes, Tuple[bytes, memoryview]]
+            The binary payload of the request, if any (see
+            client._send_binary_message)
+        recv_bytes : bool
+            Indicates if the return message will be binary, default to False
+
+        Returns
+        -------
+        Union[str, bytes]
+            The string or binary return message
+
+        Raises
+        ------
+        RuntimeError
+            Raised if there is a server-side error thrown
+        """
+        self.open()
+        request_id = str(next(self.ids)).encode()
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        timer = instrumentation.timer(cmd)
+        frames = [request_id, b''] + client._request_frames(cmd, args, payload)
+        timer.lap('serialize')
+        await cast(zmq.asyncio.Socket, self.socket).send_multipart(frames, copy=False)
+        timer.count_sent(frames)
+        if self.receiver is None:
+            self.receiver = asyncio.ensure_future(self._receive())
+        # the wait includes the time the event loop spends on other tasks
+        raw_message = await future
+        timer.lap('wait')
+        timer.count_received(raw_message)
+        reply = cast(Union[str, bytes], client._parse_reply(raw_message, recv_bytes))
+        timer.lap('parse')
+        return reply
+
+    def track(self, items: Iterable[client.BufferItem]) -> None:
+        """
+        Record the BufferItems, taken out of the command buffer, as in flight
+        until execute_batch executed them
+        """
+        loop = asyncio.get_running_loop()
+        for item in items:
+            if item not in self.in_flight:
+                self.in_flight[item] = loop.create_future()
+
+    async def wait_for_in_flight(self, reads: AbstractSet[str], writes: AbstractSet[str] = frozenset(),
+                                 own: AbstractSet[client.BufferItem] = frozenset()) -> None:
+        """
+        Wait until the items other tasks have in flight are executed, which
+        write the pdarrays named in reads or use those named in writes, like
+        client.wait_for_in_flight does for other threads. Only the items
+        taken out of the command buffer before the own items are waited for,
+        since those taken later follow them.
+        """
+        while True:
+            blocking = []
+            for other, done in self.in_flight.items():
+                if other in own:
+                    break
+                if not writes.isdisjoint(other.operands) or not reads.isdisjoint(other.writes):
+                    blocking.append(done)
+            if not blocking:
+                return
+            await asyncio.wait(blocking)
+
+    async def execute_batch(self, items: list, trigger: str = "explicit") -> List:
+        """
+        Execute BufferItems in order, like client.execute_batch, awaiting the
+        reply to each request rather than blocking, once the items other
+        tasks have in flight that they must follow are executed
+        """
+        self.track(items)
+        try:
+            await self.wait_for_in_flight({name for item in items for name in item.reads},
+                                          {name for item in items for name in item.writes},
+                                          set(items))
+            steps = client.batch_requests(items, trigger)
+            try:
+                with client.state_lock:
+                    request = next(steps)
+                while True:
+                    try:
+                        reply = await self.send(*request)
+                    except RuntimeError as e:
+                        # raised by the generator once it failed the items not executed
+                        with client.state_lock:
+                            steps.throw(e)
+                        raise
+                    except BaseException:
+                        with client.state_lock:
+                            steps.close()
+                        raise
+                    with client.state_lock:
+                        request = steps.send(reply)
+            except StopIteration as done:
+                return done.value
+        finally:
+            for item in items:
+                future = self.in_flight.pop(item, None)
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+    async def compute(self, *arrays: pdarray) -> None:
+        """
+        Execute the buffered commands the given pdarrays depend on, like
+        ak.compute, sending the branches that do not depend on each other
+        as concurrent batches, and wait for those other tasks are executing
+
+        Parameters
+        ----------
+        arrays : pdarray
+            The pdarrays to materialize
+
+        Returns
+        -------
+        None
+        """
+        items: List[client.BufferItem] = []
+        with client.state_lock:
+            for arr in arrays:
+                item = client.q.producers.get(arr.name)
+                if item is not None:
+                    client.collect_with_dependencies(item, items)
+            # before any other task runs, which would no longer find them buffered
+            self.track(items)
+        await asyncio.gather(*(self.execute_batch(branch)
+                               for branch in client.independent_branches(items)))
+        await self.wait_for_in_flight({arr.name for arr in arrays})
+
+    async def generic_msg(self, cmd: str, args: str = '', recv_bytes: bool = False,
+                          my_pdarray: Optional[List[pdarray]] = None) -> Union[str, bytes]:
+        """
+        Send a command which returns a value, e.g. a reduction, once the
+        pdarrays it reads are computed
+
+        Parameters
+        ----------
+        cmd : str
+            The server-side command to be executed
+        args : str
+            A space-delimited list of command arguments, with pdarray names
+        recv_bytes : bool
+            Indicates if the return message will be binary, default to False
+        my_pdarray : List[pdarray]
+            The pdarrays the command reads
+
+        Returns
+        -------
+        Union[str, bytes]
+            The string or binary return message
+
+        Raises
+        ------
+        RuntimeError
+            Raised if there is a server-side error thrown
+        """
+        if my_pdarray:
+            await self.compute(*my_pdarray)
+        return await self.send(cmd, client.transform_args(args), recv_bytes=recv_bytes)
+
+    async def to_ndarray(self, pda: pdarray) -> np.ndarray:
+        """
+        Convert the pdarray to a np.ndarray, like pdarray.to_ndarray
+
+        Parameters
+        ----------
+        pda : pdarray
+            The pdarray to transfer
+
+        Returns
+        -------
+        np.ndarray
+            A numpy ndarray with the same values as the pdarray
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the pdarray exceeds ak.maxTransferBytes, or if there is
+            a server-side error thrown
+        """
+        nbytes = int(pda.size) * pda.dtype.itemsize
+        if nbytes > client.maxTransferBytes:
+            raise RuntimeError(('Array exceeds allowed size for transfer. Increase ' +
+                                'client.maxTransferBytes to allow, or use ak.download'))
+        npdtype = np.dtype(pda.dtype.name)
+        codec = client._transfer_codec(nbytes)
+        if codec is not None:
+            rep_msg = cast(bytes, await self.generic_msg(
+                'tondarray', '{} 0 {} {} {}'.format(pda.name, pda.size, sys.byteorder, codec),
+                recv_bytes=True, my_pdarray=[pda]))
+            return np.frombuffer(decompress(codec, rep_msg, nbytes), dtype=npdtype).copy()
+        rep_msg = cast(bytes, await self.generic_msg('tondarray', pda.name, recv_bytes=True,
+                                                     my_pdarray=[pda]))
+        if len(rep_msg) != nbytes:
+            raise RuntimeError("Expected {} bytes but received {}".format(nbytes, len(rep_msg)))
+        return np.frombuffer(rep_msg, dtype=npdtype.newbyteorder('>')).astype(npdtype)
+
+
+def connect() -> AsyncClient:
+    """
+    Return an AsyncClient of the server the blocking client is connected to,
+    to be used as an async context manager
+
+    Returns
+    -------
+    AsyncClient
+        The client, with its socket open
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the blocking client is not connected to a server
+
+    Examples
+    --------
+    >>> ak.connect()
+    >>> from arkouda import aio
+    >>> async with aio.connect() as aclient:
+    ...     a, b = ak.arange(0, 10, 1) * 2, ak.arange(0, 10, 1) + 1
+    ...     x, _ = await asyncio.gather(aclient.to_ndarray(a), aclient.compute(b))
+    """
+    aclient = AsyncClient()
+    aclient.open()
+    return aclient
@@ -1,24 +1,149 @@
-import json, os
-from typing import cast, Mapping, Optional, Tuple, Union
-import warnings, pkg_resources
+import contextlib, functools, json, os, threading, time, uuid
+from typing import cast, AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, TextIO, Tuple, Union
+import warnings
 import zmq # type: ignore
-import pyfiglet # type: ignore
-from arkouda import security, io_util, __version__
+import arkouda
+from arkouda import security, io_util
 from arkouda.logger import getArkoudaLogger
 from arkouda.message import RequestMessage, MessageFormat, ReplyMessage, \
-    MessageType
-from queue import Queue
+    MessageType, TypedReply, COMPACT_MAGIC, sequence_header
 import weakref
-from collections import defaultdict
-from arkouda.dtypes import int64 as akint64, float64 as akfloat64
+from collections import defaultdict, deque, Counter, OrderedDict
+from arkouda.dtypes import int64 as akint64, float64 as akfloat64, bool as akbool
+from arkouda.flush import FlushPolicy, CountFlushPolicy
+from arkouda import compression as codecs
+from arkouda import instrumentation
 import sys
 
-__all__ = ["connect", "disconnect", "shutdown", "get_config", "get_mem_used", "ruok", "generic_msg", "client_to_server_names", "weakref"]
+__all__ = ["connect", "disconnect", "shutdown", "get_config", "get_mem_used", "ruok", "generic_msg", "client_to_server_names", "weakref",
+           "set_flush_policy", "get_flush_counts", "get_plan_cache_info", "clear_plan_cache",
+           "set_compression", "set_temp_cache_budget", "get_temp_cache_info", "clear_temp_cache",
+           "get_temp_cache_lookups", "dump_peak_bytes", "enable_memory_timeline",
+           "disable_memory_timeline", "get_memory_timeline", "dump_memory_timeline"]
 
 # stuff for zmq connection
 pspStr = ''
 context = zmq.Context()
-socket = context.socket(zmq.REQ)
+
+
+class SocketPool:
+    """
+    The REQ sockets connected to the arkouda_server, one per thread using
+    the client. A REQ socket must alternate between sending a request and
+    receiving its reply, so threads sharing one would mix up their replies.
+    The socket of a thread is returned to the pool when the thread ends, for
+    the next thread to reuse. Each thread numbers its requests within a
+    session of its own, for the server to recognize the requests it retries
+    (see sequence).
+
+    Attributes
+    ----------
+    address : str
+        The address of the server, empty until connected
+    timeout : int
+        The send and receive timeout of the sockets in seconds, 0 for none
+    idle : List[zmq.Socket]
+        The sockets returned by the threads that ended
+    """
+
+    def __init__(self) -> None:
+        self.address = ''
+        self.timeout = 0
+        self.idle: List[zmq.Socket] = []
+        self.sockets: List[zmq.Socket] = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def connect(self, address: str, timeout: int = 0) -> None:
+        """
+        Close the sockets and open new ones to the address from now on, in
+        new sessions
+        """
+        self.close()
+        self.address = address
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _open(self) -> zmq.Socket:
+        socket = context.socket(zmq.REQ)  # request end of the zmq connection
+        # if timeout is specified, set send and receive timeout params
+        if self.timeout > 0:
+            socket.setsockopt(zmq.SNDTIMEO, self.timeout * 1000)
+            socket.setsockopt(zmq.RCVTIMEO, self.timeout * 1000)
+        socket.connect(self.address)
+        self.sockets.append(socket)
+        return socket
+
+    def socket(self) -> zmq.Socket:
+        """
+        Return the socket of the calling thread
+        """
+        lease = getattr(self.local, 'lease', None)
+        if lease is None or lease.socket.closed:
+            with self.lock:
+                socket = self.idle.pop() if self.idle else self._open()
+            lease = self.local.lease = _SocketLease(self, socket)
+        return lease.socket
+
+    def sequence(self) -> bytes:
+        """
+        Return the prefix of the next sequenced request of the calling thread
+        """
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = uuid.uuid4().hex
+            self.local.seq = 0
+        self.local.seq += 1
+        return sequence_header(session, self.local.seq)
+
+    def reset(self) -> None:
+        """
+        Close the socket of the calling thread, e.g. after an interrupted
+        request left it waiting for a reply, so that it gets a new one
+        """
+        lease = getattr(self.local, 'lease', None)
+        if lease is None:
+            return
+        self.local.lease = None
+        with self.lock:
+            if lease.socket in self.sockets:
+                self.sockets.remove(lease.socket)
+        lease.socket.close(linger=0)
+
+    def release(self, socket: zmq.Socket) -> None:
+        """
+        Return the socket of a thread that ended
+        """
+        with self.lock:
+            if not socket.closed:
+                self.idle.append(socket)
+
+    def close(self) -> None:
+        """
+        Close all the sockets
+        """
+        with self.lock:
+            for socket in self.sockets:
+                socket.close(linger=0)
+            self.sockets = []
+            self.idle = []
+
+
+class _SocketLease:
+    """
+    Holds the socket of a thread, in a thread-local attribute, and returns
+    it to the pool once the thread ends
+    """
+
+    def __init__(self, pool: SocketPool, socket: zmq.Socket) -> None:
+        self.pool = pool
+        self.socket = socket
+
+    def __del__(self):
+        self.pool.release(self.socket)
+
+
+pool = SocketPool()
 connected = False
 # username and token for when basic authentication is enabled
 username = ''
@@ -31,17 +156,138 @@ pdarrayIterThreshDefVal = 100
 pdarrayIterThresh = pdarrayIterThreshDefVal
 maxTransferBytesDefVal = 2 ** 30
 maxTransferBytes = maxTransferBytesDefVal
+# whether the server accepts binary payloads as a separate frame, in the
+# client's byte order, as reported by its config on connect
+multipartPayloads = False
+# whether the server accepts chunked uploads and downloads, as reported by
+# its config on connect
+chunkedTransfers = False
+# whether requests and replies use the compact binary envelope rather than
+# JSON, as negotiated on connect; set to False to fall back to JSON
+compactEnvelope = False
+# the codec compressing array transfers of at least compressionThreshold
+# bytes, None for no compression (see set_compression), and the codecs the
+# server supports, as reported by its config on connect
+compression: Optional[str] = None
+compressionThreshold = 2 ** 16
+serverCodecs: List[str] = []
+# bytes per chunk, and chunks sent before waiting for a reply, of streaming
+# transfers (see ak.upload and ak.download)
+chunkTransferBytes = 2 ** 26
+maxChunksInFlight = 4
+# whether requests are sequenced, as negotiated on connect, so that a request
+# whose reply does not arrive, e.g. within the timeout, is resent over a new
+# socket up to maxRetries times without being executed twice, waiting
+# retryDelay seconds before the first retry and twice as long before each next
+sequencedRequests = False
+maxRetries = 3
+retryDelay = 0.5
 
 logger = getArkoudaLogger(name='Arkouda Client')
 clientLogger = getArkoudaLogger(name='Arkouda User Logger', logFormat='%(message)s')
 
-# Print splash message
-print('{}'.format(pyfiglet.figlet_format('Arkouda')))
-print('Client Version: {}'.format(__version__)) # type: ignore
+# whether the splash message is printed on the first connect, which can be
+# turned off by setting ARKOUDA_CLIENT_BANNER=False
+banner = os.getenv('ARKOUDA_CLIENT_BANNER', 'True') != 'False'
 
 queue_size: int = 2
 
-q = Queue(queue_size)
+# decides when the buffer is flushed, None while flushing is suspended by ak.lazy()
+flush_policy: Optional[FlushPolicy] = CountFlushPolicy()
+
+# number of flushes caused by each trigger: the flush policy's triggers,
+# "dependency" for values needed and "explicit" for emptying the whole buffer
+flush_counts: Counter = Counter()
+
+# prefix of the client-side id of a pdarray created earlier in the same batch,
+# in the args of a batch line: the server only resolves tokens so marked,
+# since server-side names may equal client-side ids
+BATCH_ALIAS_PREFIX = "%"
+
+# commands which update one of their operands in place, mapped to the
+# position of that operand in the space-delimited args
+IN_PLACE_COMMANDS = {"opeqvv": 1, "opeqvs": 1, "set": 0, "cumsum": 0,
+                     "[int]=val": 0, "[pdarray]=val": 0, "[pdarray]=pdarray": 0,
+                     "[slice]=val": 0, "[slice]=pdarray": 0}
+
+# commands which only read their operands, apart from the pdarrays they create
+PURE_COMMANDS = frozenset(["binopvv", "binopvs", "binopsv", "binopvvStore",
+                           "binopvsStore", "binopsvStore", "efunc", "cast",
+                           "efunc3vv", "efunc3vs", "efunc3sv", "efunc3ss",
+                           "efuncStore", "castStore", "efunc3vvStore",
+                           "efunc3vsStore", "efunc3svStore", "efunc3ssStore",
+                           "[pdarray]Store", "randomNormal", "randomNormalStore",
+                           "reduction", "[int]", "[slice]", "[sliceStore]",
+                           "[pdarray]", "arange", "arangeStore", "create",
+                           "zerosStore", "randint", "randintStore", "str",
+                           "repr", "tondarray", "argsort", "coargsort",
+                           "fused", "fusedStore", "unique", "in1d", "segmentedHash"])
+
+# whether chains of buffered elementwise commands are sent as one fused command
+fusion_enabled: bool = True
+
+# whether buffered commands whose results are never observed are dropped
+dead_code_elimination_enabled: bool = True
+
+# limits on the expression of a fused command, which the server evaluates
+# in a single pass with a fixed number of operand slots and a fixed-size stack
+max_fused_operands: int = 4
+max_fused_depth: int = 16
+
+# whether the output buffers of a batch are assigned over the whole batch
+# (see plan_buffers), or only to dead inputs and cached arrays as each
+# command is prepared
+buffer_planning_enabled: bool = True
+
+# (greedy, planned) estimates of the bytes allocated on the server by each
+# of the most recent flushes, see dump_peak_bytes
+peak_bytes_history: deque = deque(maxlen=4096)
+
+# whether the optimizer's decisions for a flushed command sequence are reused
+# by later flushes of the same shape
+plan_cache_enabled: bool = True
+
+# maximum number of distinct plans kept, the oldest are evicted first
+max_cached_plans: int = 256
+
+# shape of a flushed command sequence, as built by plan_signature, to the
+# positions of its dead items and the fusion of its remaining items
+plan_cache: Dict[tuple, tuple] = dict()
+
+# number of flushes whose plan was found in the plan cache ("hits") or not ("misses")
+plan_cache_counts: Counter = Counter()
+
+# commands whose result only depends on their args, so a pdarray sharing the
+# array of a live pdarray created by the same command and args is returned
+# instead of computing it again (see share)
+CSE_COMMANDS = frozenset(["efunc", "cast", "[pdarray]", "[slice]", "argsort", "coargsort",
+                          "unique", "in1d", "segmentedHash"])
+
+# commands creating permutations which, once dropped, are cached for the same
+# sort of the same keys until one of those is updated in place or deleted
+PERMUTATION_COMMANDS = frozenset(["argsort", "coargsort"])
+
+# commands which can store their result to a dead temporary via their Store variant
+REUSING_COMMANDS = frozenset(["binopvv", "binopvs", "binopsv", "arange", "randint", "fused"])
+
+# binops the binop*Store commands implement
+STORE_BINOPS = frozenset(["+", "-", "*", "//"])
+
+# commands which overwrite every element of the pdarray they create, so the
+# server can recycle a dead temporary or cached array of the same dtype and
+# size for it: sent as <cmd>Store with the name of the array as first arg,
+# they still create a pdarray (with a new name), and the array is deleted
+# if it cannot be recycled
+OUTPUT_BUFFER_COMMANDS = frozenset(["efunc", "cast", "efunc3vv", "efunc3vs", "efunc3sv",
+                                    "efunc3ss", "[pdarray]", "randomNormal"])
+
+# commands reading their operands out of order, which must not be given one
+# of them as output buffer
+GATHER_COMMANDS = frozenset(["[pdarray]"])
+
+# binops which can be fused, and the efuncs which can be fused into float64 results
+FUSED_BINOPS = frozenset(["+", "-", "*", "/"])
+FUSED_EFUNCS = frozenset(["abs", "log", "exp", "sin", "cos"])
 client_to_server_names = {}
 
 # name of pdarray to arguments that create it
@@ -56,11 +302,124 @@ names_to_number_of_live_references = {}
 # name of pdarray to a weak reference of it
 names_to_weakref = {}
 
+# name of pdarray to the number of times it was updated in place, absent if never
+versions: Dict[str, int] = {}
+
+# name of pdarray to the arguments it is an operand of
+operand_to_args: Dict[str, Set[str]] = defaultdict(set)
+
+# common subexpressions found since the buffer was last emptied, as
+# ("op:operand:operand", id of the pdarray returned for it)
+cse_hits: List[Tuple[str, str]] = []
+
+# name of pdarray to the error of the flush which was to compute or update it,
+# for pdarrays whose command failed or was not executed since an earlier
+# command of the flush failed (see fail_items)
+failed_arrays: Dict[str, str] = {}
+
+# server-side name to the ids of the pdarrays sharing the array: a common
+# subexpression and the pdarrays find_common_subexpression returned for it.
+# The array is copied for a pdarray before it is updated in place, and only
+# parked once the last of them is deleted (see share and unshare)
+shared_arrays: Dict[str, Set[str]] = {}
+
+# guards the buffers, the maps above and the cache below, so that the client
+# can be used from several threads; reentrant since pdarrays are deleted by
+# whichever thread drops them, including one holding it. Flushes release it
+# for their round trips to the server (see drive_batch)
+state_lock = threading.RLock()
+
+
+def synchronized(function: Callable) -> Callable:
+    """
+    Decorate a function of the client state to run holding state_lock
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with state_lock:
+            return function(*args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def unlocked():
+    """
+    Release state_lock, however many times the calling thread holds it, for
+    the duration of the block, e.g. a round trip to the server, and acquire
+    it again as many times after
+    """
+    depth = 0
+    while True:
+        try:
+            state_lock.release()
+        except RuntimeError:
+            break
+        depth += 1
+    try:
+        yield
+    finally:
+        for _ in range(depth):
+            state_lock.acquire()
+
+
+# the buffer items sent to the server and not yet completed, to the thread
+# sending them: their round trips run without holding state_lock, so the
+# commands of other threads wait for those they must follow (see
+# wait_for_in_flight)
+in_flight: Dict["BufferItem", int] = dict()
+
+# notified whenever items in flight are completed
+in_flight_done = threading.Condition(state_lock)
+
+
 # Default dictionary so you can access cached pdarrays as
 # cache[type of stored value][size of pdarray]
 cache = dict()
 cache[akint64] = defaultdict(set)
 cache[akfloat64] = defaultdict(set)
+cache[akbool] = defaultdict(set)
+
+# the server-side names of the cached arrays, least recently parked first,
+# mapped to their dtype and size, and the bytes they take on the server
+cache_lru: OrderedDict = OrderedDict()
+cached_bytes = 0
+# the bytes the cached arrays may take, beyond which the least recently parked
+# are deleted (see set_temp_cache_budget)
+cacheBudget = int(os.getenv('ARKOUDA_CLIENT_CACHE_BUDGET', str(2 ** 30)))
+# the server memory in use, as reported by get_mem_used, beyond which cached
+# arrays are deleted too, None not to check it; checked before a command at
+# most every memCheckInterval seconds
+serverMemoryBudget: Optional[int] = None
+memCheckInterval = 10.0
+next_mem_check = 0.0
+# names of the evicted arrays, deleted in a batch before the next command
+pending_deletes: List[str] = []
+# numbers of arrays parked, taken from the cache ("hits") or not found in it
+# ("misses"), evicted, of delete requests, of dead temporaries reused without
+# being parked ("reused") and of commands rewritten to their Store variant
+# ("rewrites"), and the bytes parked, evicted and not allocated thanks to reuse
+cache_counts: Counter = Counter()
+# (dtype name, size) to the hits and misses of the lookups of that key
+cache_lookups: Dict[Tuple[str, int], Counter] = defaultdict(Counter)
+
+# whether dropped permutations are cached, see PERMUTATION_COMMANDS
+permutation_cache_enabled: bool = True
+# versioned expression key of a sort to the server-side name of its cached
+# permutation, and back. Cached permutations are in cache_lru and count
+# towards cacheBudget, but are not reused as temporaries unless released.
+permutations: Dict[str, str] = dict()
+permutation_keys: Dict[str, str] = dict()
+# pdarray id of a sort key to the versioned expression keys of its cached sorts
+permutation_operands: Dict[str, set] = defaultdict(set)
+# pdarray id of a live permutation to the versioned expression key of its sort
+sorted_by: Dict[str, str] = dict()
+
+# whether the server memory in use is sampled at each flush, see
+# enable_memory_timeline
+memory_timeline_enabled = os.getenv('ARKOUDA_CLIENT_MEMORY_TIMELINE', 'False') == 'True'
+# (time, server memory in use, bytes of the cached arrays) of the most
+# recent samples
+memory_timeline: deque = deque(maxlen=65536)
 
 # reset settings to default values
 def set_defaults() -> None:
@@ -93,7 +452,9 @@ def connect(server: str = "localhost", port: int = 5555, timeout: int = 0,
         The port of the server. Defaults to 5555.
     timeout : int, optional
         The timeout in seconds for client send and receive operations.
-        Defaults to 0 seconds, whicn is interpreted as no timeout.
+        Defaults to 0 seconds, whicn is interpreted as no timeout. Requests
+        timing out are retried up to maxRetries times if the server accepts
+        sequenced requests.
     access_token : str, optional
         The token used to connect to an existing socket to enable access to
         an Arkouda server where authentication is enabled. Defaults to None.
@@ -117,10 +478,13 @@ def connect(server: str = "localhost", port: int = 5555, timeout: int = 0,
     Notes
     -----
     On success, prints the connected address, as seen by the server. If called
-    with an existing connection, the socket will be re-initialized.
+    with an existing connection, the socket will be re-initialized, and the
+    commands buffered for the previous connection are dropped.
     """
-    global context, socket, pspStr, connected, verbose, username, token
+    global context, pspStr, connected, verbose, username, token, multipartPayloads, \
+        chunkedTransfers, compactEnvelope, serverCodecs, sequencedRequests
 
+    _print_banner()
     logger.debug("ZMQ version: {}".format(zmq.zmq_version()))
 
     if connect_url:
@@ -140,13 +504,14 @@ def connect(server: str = "localhost", port: int = 5555, timeout: int = 0,
 
     logger.debug("psp = {}".format(pspStr))
 
-    # create and configure socket for connections to arkouda server
-    socket = context.socket(zmq.REQ)  # request end of the zmq connection
-
-    # if timeout is specified, set send and receive timeout params
-    if timeout > 0:
-        socket.setsockopt(zmq.SNDTIMEO, timeout * 1000)
-        socket.setsockopt(zmq.RCVTIMEO, timeout * 1000)
+    # sockets for connections to arkouda server are opened per thread
+    pool.connect(pspStr, timeout)
+    # the cached arrays are those of the server connected to before
+    forget_temp_cache()
+    # the envelope is negotiated with each server, starting from JSON, and
+    # requests are sequenced once the server is known to accept it
+    compactEnvelope = False
+    sequencedRequests = False
 
     # set token and username global variables
     username = security.get_username()
@@ -155,7 +520,7 @@ def connect(server: str = "localhost", port: int = 5555, timeout: int = 0,
 
     # connect to arkouda server
     try:
-        socket.connect(pspStr)
+        pool.socket()
     except Exception as e:
         raise ConnectionError(e)
 
@@ -170,14 +535,31 @@ def connect(server: str = "localhost", port: int = 5555, timeout: int = 0,
     connected = True
 
     conf = get_config()
-    if conf['arkoudaVersion'] != __version__:
+    multipartPayloads = cast(bool, conf.get('multipartPayloads', False))
+    chunkedTransfers = cast(bool, conf.get('chunkedTransfers', False))
+    compactEnvelope = cast(bool, conf.get('compactEnvelope', False))
+    sequencedRequests = cast(bool, conf.get('sequencedRequests', False))
+    serverCodecs = [c for c in cast(str, conf.get('compressionCodecs', '')).split(',') if c]
+    if conf['arkoudaVersion'] != arkouda.__version__:
         warnings.warn(('Version mismatch between client ({}) and server ({}); ' +
                        'this may cause some commands to fail or behave ' +
                        'incorrectly! Updating arkouda is strongly recommended.'). \
-                      format(__version__, conf['arkoudaVersion']), RuntimeWarning)
+                      format(arkouda.__version__, conf['arkoudaVersion']), RuntimeWarning)
     clientLogger.info(return_message)
 
 
+def _print_banner() -> None:
+    """
+    Prints the splash message, unless it was printed already or turned off
+    """
+    global banner
+    if banner:
+        banner = False
+        import pyfiglet # type: ignore
+        print('{}'.format(pyfiglet.figlet_format('Arkouda')))
+        print('Client Version: {}'.format(arkouda.__version__))
+
+
 def _parse_url(url: str) -> Tuple[str, int, Optional[str]]:
     """
     Parses the url in the following format if authentication enabled:
@@ -328,7 +710,7 @@ def _start_tunnel(addr: str, tunnel_server: str) -> Tuple[str, object]:
 
 
 def _send_string_message(cmd: str, recv_bytes: bool = False,
-                         args: str = None) -> Union[str, bytes]:
+                         args: Optional[str] = None, sequence: Optional[bytes] = None) -> Union[str, bytes]:
     """
     Generates a RequestMessage encapsulating command and requesting
     user information, sends it to the Arkouda server, and returns
@@ -343,6 +725,9 @@ def _send_string_message(cmd: str, recv_bytes: bool = False,
         as opposed to a string
     args : str
         A delimited string containing 1..n command arguments
+    sequence : bytes
+        The sequence prefix of the request if it is resent, by default that
+        of a new request if sequencedRequests
 
     Returns
     -------
@@ -357,43 +742,16 @@ def _send_string_message(cmd: str, recv_bytes: bool = False,
     ValueError
         Raised if the return message is malformed JSON or is missing 1..n
         expected fields
+    ConnectionError
+        Raised if the reply does not arrive, after maxRetries retries if
+        sequencedRequests
     """
-    message = RequestMessage(user=username, token=token, cmd=cmd,
-                             format=MessageFormat.STRING, args=cast(str, args))
-
-    logger.debug('sending message {}'.format(message))
-
-    socket.send_string(json.dumps(message.asdict()))
-
-    if recv_bytes:
-        return_message = socket.recv()
-
-        # raise errors or warnings sent back from the server
-        if return_message.startswith(b"Error:"):
-            raise RuntimeError(return_message.decode())
-        elif return_message.startswith(b"Warning:"):
-            warnings.warn(return_message.decode())
-        return return_message
-    else:
-        raw_message = socket.recv_string()
-        try:
-            return_message = ReplyMessage.fromdict(json.loads(raw_message))
+    return _round_trip(cmd, args, None, recv_bytes, sequence)
 
-            # raise errors or warnings sent back from the server
-            if return_message.msgType == MessageType.ERROR:
-                raise RuntimeError(return_message.msg)
-            elif return_message.msgType == MessageType.WARNING:
-                warnings.warn(return_message.msg)
-            return return_message.msg
-        except KeyError as ke:
-            raise ValueError('Return message is missing the {} field'.format(ke))
-        except json.decoder.JSONDecodeError:
-            raise ValueError('Return message is not valid JSON: {}'. \
-                             format(raw_message))
 
-
-def _send_binary_message(cmd: str, payload: bytes, recv_bytes: bool = False,
-                         args: str = None) -> Union[str, bytes]:
+def _send_binary_message(cmd: str, payload: Union[bytes, Tuple[bytes, memoryview]],
+                         recv_bytes: bool = False, args: Optional[str] = None,
+                         sequence: Optional[bytes] = None) -> Union[str, bytes]:
     """
     Generates a RequestMessage encapsulating command and requesting user information,
     information prepends the binary payload, sends the binary request to the Arkouda
@@ -403,14 +761,18 @@ def _send_binary_message(cmd: str, payload: bytes, recv_bytes: bool = False,
     ----------
     cmd : str
         The name of the command to be executed by the Arkouda server
-    payload : bytes
+    payload : Union[bytes, Tuple[bytes, memoryview]]
         The bytes to be converted to a pdarray, Strings, or Categorical object
-        on the Arkouda server
+        on the Arkouda server, or a header and the buffer of a native-endian
+        array, which is sent as a separate frame without being copied
     recv_bytes : bool, defaults to False
         A boolean indicating whether the return message will be in bytes
         as opposed to a string
     args : str
         A delimited string containing 1..n command arguments
+    sequence : bytes
+        The sequence prefix of the request if it is resent, by default that
+        of a new request if sequencedRequests
 
     Returns
     -------
@@ -425,39 +787,394 @@ def _send_binary_message(cmd: str, payload: bytes, recv_bytes: bool = False,
     ValueError
         Raised if the return message is malformed JSON or is missing 1..n
         expected fields
+    ConnectionError
+        Raised if the reply does not arrive, after maxRetries retries if
+        sequencedRequests
     """
-    message = RequestMessage(user=username, token=token, cmd=cmd,
-                             format=MessageFormat.BINARY, args=cast(str, args))
+    return _round_trip(cmd, args, payload, recv_bytes, sequence)
+
+
+def _round_trip(cmd: str, args: Optional[str],
+                payload: Optional[Union[bytes, Tuple[bytes, memoryview]]],
+                recv_bytes: bool, sequence: Optional[bytes] = None) -> Union[str, bytes]:
+    """
+    Sends a request over the socket of the calling thread and returns the
+    parsed reply, timing its phases if instrumentation is enabled. A flush
+    the thread left interrupted is completed first (see replay_interrupted).
+    """
+    if getattr(pool.local, 'interrupted', None) is not None:
+        replay_interrupted()
+    timer = instrumentation.timer(cmd)
+    if sequence is None and sequencedRequests:
+        sequence = pool.sequence()
+    frames = _request_frames(cmd, args, payload, sequence)
+    timer.lap('serialize')
+    raw_message = _exchange(frames, sequence is not None)
+    timer.lap('wait')
+    reply = _parse_reply(raw_message, recv_bytes)
+    timer.lap('parse')
+    timer.count_sent(frames)
+    timer.count_received(raw_message)
+    # a compact batch reply is decoded to a list, read by _batch_replies only
+    return cast(Union[str, bytes], reply)
+
+
+def _exchange(frames: List, retry: bool) -> bytes:
+    """
+    Sends the frames of a request over the socket of the calling thread and
+    returns the reply. If the socket fails, e.g. the reply does not arrive
+    within the timeout, the socket is replaced, and the request is resent if
+    retry, i.e. it is sequenced, so that the server does not execute it twice.
+
+    Raises
+    ------
+    ConnectionError
+        Raised if the reply does not arrive, after maxRetries retries if retry
+    """
+    attempt = 0
+    while True:
+        socket = pool.socket()
+        try:
+            socket.send_multipart(frames, copy=False)
+            return socket.recv()
+        except zmq.ZMQError as e:
+            # the REQ socket is left waiting for the reply
+            pool.reset()
+            if not retry or attempt >= maxRetries:
+                raise ConnectionError('no reply from the arkouda server at {}: {}'.format(
+                    pool.address, e))
+            logger.warning('no reply from the arkouda server ({}), retrying'.format(e))
+            time.sleep(retryDelay * 2 ** attempt)
+            attempt += 1
+
+
+def _request_frames(cmd: str, args: Optional[str] = None,
+                    payload: Optional[Union[bytes, Tuple[bytes, memoryview]]] = None,
+                    sequence: Optional[bytes] = None) -> List:
+    """
+    Encodes a request as the frames sent to the Arkouda server: the
+    RequestMessage, JSON-formatted or in the compact form if compactEnvelope,
+    followed by the binary payload if there is one (see _send_binary_message).
+
+    Parameters
+    ----------
+    cmd : str
+        The name of the command to be executed by the Arkouda server
+    args : str
+        A delimited string containing 1..n command arguments
+    payload : Union[bytes, Tuple[bytes, memoryview]]
+        The binary payload of the request, if any
+    sequence : bytes
+        The prefix of a sequenced request (see SocketPool.sequence), if any
 
+    Returns
+    -------
+    List
+        The frames of the request
+    """
+    frames: List[Union[bytes, memoryview]]
+    if payload is None:
+        message = RequestMessage(user=username, token=token, cmd=cmd,
+                                 format=MessageFormat.STRING, args=cast(str, args))
+        if compactEnvelope:
+            header = message.ascompact()
+        else:
+            header = json.dumps(message.asdict()).encode()
+        frames = [sequence + header if sequence else header]
+    else:
+        if isinstance(payload, tuple):
+            data: Union[bytes, memoryview] = payload[1]
+            codec = _transfer_codec(len(data))
+            if codec is None:
+                args = 'multipart {}'.format(sys.byteorder)
+            else:
+                args = 'multipart {} {} {}'.format(sys.byteorder, codec, len(data))
+                data = codecs.compress(codec, cast(memoryview, data))
+        message = RequestMessage(user=username, token=token, cmd=cmd,
+                                 format=MessageFormat.BINARY, args=cast(str, args))
+        if compactEnvelope:
+            header = message.ascompact()
+        else:
+            header = '{}BINARY_PAYLOAD'.format(json.dumps(message.asdict())).encode()
+        if sequence:
+            header = sequence + header
+        if isinstance(payload, tuple):
+            frames = [header + payload[0], data]
+        else:
+            frames = [header + payload]
     logger.debug('sending message {}'.format(message))
+    return frames
+
+
+def _parse_reply(raw_message: bytes,
+                 recv_bytes: bool = False) -> Union[str, bytes, List[str]]:
+    """
+    Decodes a reply of the Arkouda server, raising the errors and warnings
+    it carries.
+
+    Parameters
+    ----------
+    raw_message : bytes
+        The reply
+    recv_bytes : bool, defaults to False
+        Whether the reply is binary rather than a JSON-formatted or compact
+        ReplyMessage
 
-    socket.send('{}BINARY_PAYLOAD'. \
-                format(json.dumps(message.asdict())).encode() + payload)
+    Returns
+    -------
+    Union[str, bytes, List[str]]
+        The reply message, the binary reply, or the reply message of each
+        command of a batch if the reply is compact (see _batch_replies)
 
+    Raises
+    ------
+    RuntimeError
+        Raised if the reply is a server-side error
+    ValueError
+        Raised if the return message is malformed JSON or is missing 1..n
+        expected fields
+    """
     if recv_bytes:
-        binary_return_message = cast(bytes, socket.recv())
+        # raise errors or warnings sent back from the server, which are
+        # compact replies if the request was compact
+        if raw_message.startswith(COMPACT_MAGIC):
+            _reply_messages([cast(ReplyMessage, ReplyMessage.fromcompact(raw_message))])
+        if raw_message.startswith(b"Error:"):
+            raise RuntimeError(raw_message.decode())
+        elif raw_message.startswith(b"Warning:"):
+            warnings.warn(raw_message.decode())
+        return raw_message
+    if raw_message.startswith(COMPACT_MAGIC):
+        replies = ReplyMessage.fromcompact(raw_message)
+        if isinstance(replies, list):
+            return _reply_messages(replies, batch=True)
+        return _reply_messages([replies])[0]
+    try:
+        return_message = ReplyMessage.fromdict(json.loads(raw_message.decode()))
+
         # raise errors or warnings sent back from the server
-        if binary_return_message.startswith(b"Error:"): \
-                raise RuntimeError(binary_return_message.decode())
-        elif binary_return_message.startswith(b"Warning:"): \
-                warnings.warn(binary_return_message.decode())
-        return binary_return_message
-    else:
-        raw_message = socket.recv_string()
-        try:
-            return_message = ReplyMessage.fromdict(json.loads(raw_message))
+        if return_message.msgType == MessageType.ERROR:
+            raise RuntimeError(return_message.msg)
+        elif return_message.msgType == MessageType.WARNING:
+            warnings.warn(return_message.msg)
+        return return_message.msg
+    except KeyError as ke:
+        raise ValueError('Return message is missing the {} field'.format(ke))
+    except json.decoder.JSONDecodeError:
+        raise ValueError('Return message is not valid JSON: {}'. \
+                         format(raw_message.decode(errors='replace')))
+
+
+def _send_chunked_messages(requests: Iterable[Tuple[str, str, Optional[Tuple[bytes, memoryview]]]],
+                           on_reply: Callable[[int, Union[str, zmq.Frame]], None],
+                           recv_bytes: bool = False) -> None:
+    """
+    Sends the requests of a streaming transfer over a separate DEALER
+    socket, keeping up to maxChunksInFlight of them unanswered, so that
+    sending the next chunks overlaps with the server handling the previous
+    ones. The server answers in order.
+
+    Parameters
+    ----------
+    requests : Iterable[Tuple[str, str, Optional[Tuple[bytes, memoryview]]]]
+        The command, args and payload of each request; requests with a
+        payload are sent as multipart binary requests, where the args are
+        replaced by the byte order of the client
+    on_reply : Callable[[int, Union[str, zmq.Frame]], None]
+        Called with the index of each request and its reply, which is the
+        reply message, or the uncopied frame if recv_bytes
+    recv_bytes : bool, defaults to False
+        Whether the replies are binary
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    RuntimeError
+        Raised if a string reply is an error message
+    """
+    dealer = context.socket(zmq.DEALER)
+    dealer.setsockopt(zmq.LINGER, 0)
+    if pool.timeout > 0:
+        dealer.setsockopt(zmq.SNDTIMEO, pool.timeout * 1000)
+        dealer.setsockopt(zmq.RCVTIMEO, pool.timeout * 1000)
+    dealer.connect(pspStr)
+
+    # the timer of each request in flight; the requests overlap, so the
+    # wait of each is the time the client blocks receiving its reply
+    timers: List = []
+
+    def receive(index: int) -> None:
+        timer = timers[index]
+        timer.restart()
+        # the first frame is the empty delimiter added for the REP socket
+        reply = dealer.recv_multipart(copy=False)[-1]
+        timer.lap('wait')
+        timer.count_received(reply)
+        if recv_bytes:
+            on_reply(index, reply)
+            return
+        on_reply(index, cast(str, _parse_reply(reply.bytes)))
+        timer.lap('parse')
+
+    try:
+        sent = received = 0
+        for cmd, args, payload in requests:
+            if sent - received == maxChunksInFlight:
+                receive(received)
+                received += 1
+            timer = instrumentation.timer(cmd)
+            frames = [b''] + _request_frames(cmd, args, payload)
+            timer.lap('serialize')
+            dealer.send_multipart(frames, copy=False)
+            timer.count_sent(frames)
+            timers.append(timer)
+            sent += 1
+        while received < sent:
+            receive(received)
+            received += 1
+    finally:
+        dealer.close()
+
+
+def _send_request(cmd: str, args: Optional[str] = None,
+                  payload: Optional[Union[bytes, Tuple[bytes, memoryview]]] = None,
+                  recv_bytes: bool = False, sequence: Optional[bytes] = None) -> Union[str, bytes]:
+    """
+    Sends a request given as (cmd, args, payload, recv_bytes), a string
+    request if payload is None and a binary one otherwise, and returns the
+    reply. A request is resent with the same sequence prefix.
+    """
+    try:
+        if payload is None:
+            return _send_string_message(cmd=cmd, args=args, recv_bytes=recv_bytes,
+                                        sequence=sequence)
+        return _send_binary_message(cmd=cmd, payload=payload, recv_bytes=recv_bytes,
+                                    sequence=sequence)
+    except KeyboardInterrupt as e:
+        # if the user interrupts during command execution, the socket gets out
+        # of sync reset the socket before raising the interrupt exception
+        pool.reset()
+        raise e
+
+
+def _send_batch_message(items) -> List[str]:
+    """
+    Sends a sequence of BufferItems to the Arkouda server as a single
+    batch request and returns the reply message of each item, in order.
+
+    Each item is encoded as one line consisting of the comma-delimited
+    client-side ids of the pdarrays it creates (or "-" if none) followed by
+    the JSON-formatted RequestMessage or, if compactEnvelope, by the command
+    and its args. Item args are resolved through
+    client_to_server_names before sending; ids of pdarrays created earlier
+    in the same batch are sent prefixed with BATCH_ALIAS_PREFIX, and
+    resolved by the server as it executes the batch.
+
+    Parameters
+    ----------
+    items : List[BufferItem]
+        The string-formatted BufferItems to be executed, in execution order
+
+    Returns
+    -------
+    List[str]
+        The reply message of each item
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the batch or any one of its items results in a
+        server-side error
+    ValueError
+        Raised if the return message is malformed JSON or is missing 1..n
+        expected fields
+    """
+    return _batch_replies(cast(Union[str, List[str]],
+                               _send_string_message(cmd='batch', args=_batch_args(items))))
+
+
+def _batch_args(items) -> str:
+    """
+    Returns the args of the batch request executing the BufferItems, one
+    line per item (see _send_batch_message)
+    """
+    lines = []
+    created: Set[str] = set()
+    for item in items:
+        ids = '-'
+        if (item.create_pdarray or item.alias) and item.pdarray_id:
+            ids = ','.join(item.pdarray_id) if isinstance(item.pdarray_id, list) \
+                                            else item.pdarray_id
+        lines.append(_batch_line(ids, item.cmd, item.server_args(created)))
+        if ids != '-':
+            created.update(ids.split(','))
+    return '\n'.join(lines)
+
+
+def _batch_line(ids: str, cmd: str, args: str) -> str:
+    """
+    Returns the line of a batch request executing the command, which
+    creates the pdarrays of the comma-delimited client-side ids, or "-"
+    """
+    if compactEnvelope and '\n' not in args:
+        # the batch request carries the user and token of its commands
+        return '{} {} {}'.format(ids, cmd, args)
+    message = RequestMessage(user=username, token=token, cmd=cmd,
+                             format=MessageFormat.STRING, args=args)
+    return '{} {}'.format(ids, json.dumps(message.asdict()))
+
+
+def _batch_replies(raw_message: Union[str, List[str]]) -> List[str]:
+    """
+    Returns the reply message of each item of a batch from the reply to the
+    batch request, raising the first error among them. Compact replies are
+    decoded by _parse_reply already.
+    """
+    if isinstance(raw_message, list):
+        return raw_message
+    try:
+        replies = [ReplyMessage.fromdict(r) for r in json.loads(raw_message)]
+    except json.decoder.JSONDecodeError:
+        raise ValueError('Batch return message is not valid JSON: {}'. \
+                         format(raw_message))
+    return _reply_messages(replies, batch=True)
+
+
+class BatchError(RuntimeError):
+    """
+    Raised for a server-side error in a batch request, which the server
+    stops at the failing command
+
+    Attributes
+    ----------
+    replies : List[str]
+        The reply message of each command executed before the failing one
+    """
+
+    def __init__(self, msg: str, replies: List[str]) -> None:
+        super().__init__(msg)
+        self.replies = replies
 
-            # raise errors or warnings sent back from the server
-            if return_message.msgType == MessageType.ERROR:
-                raise RuntimeError(return_message.msg)
-            elif return_message.msgType == MessageType.WARNING:
-                warnings.warn(return_message.msg)
-            return return_message.msg
-        except KeyError as ke:
-            raise ValueError('Return message is missing the {} field'.format(ke))
-        except json.decoder.JSONDecodeError:
-            raise ValueError('{} is not valid JSON, may be server-side error'. \
-                             format(raw_message))
+
+def _reply_messages(replies: List[ReplyMessage], batch: bool = False) -> List[str]:
+    """
+    Returns the msg of each ReplyMessage, raising the first error among them,
+    as a BatchError if the replies are those of a batch, and warning of the
+    warnings before it
+    """
+    messages: List[str] = []
+    for reply in replies:
+        if reply.msgType == MessageType.ERROR:
+            if batch:
+                raise BatchError(reply.msg, messages)
+            raise RuntimeError(reply.msg)
+        elif reply.msgType == MessageType.WARNING:
+            warnings.warn(reply.msg)
+        messages.append(reply.msg)
+    return messages
 
 
 # message arkouda server the client is disconnecting from the server
@@ -474,16 +1191,17 @@ def disconnect() -> None:
     ConnectionError
         Raised if there's an error disconnecting from the Arkouda server
     """
-    global socket, pspStr, connected, verbose, token
+    global pspStr, connected, verbose, token
 
     if connected:
+        clear_temp_cache()
         # send disconnect message to server
         message = "disconnect"
         logger.debug("[Python] Sending request: {}".format(message))
         return_message = cast(str, _send_string_message(message))
         logger.debug("[Python] Received response: {}".format(return_message))
         try:
-            socket.disconnect(pspStr)
+            pool.close()
         except Exception as e:
             raise ConnectionError(e)
         connected = False
@@ -511,7 +1229,7 @@ def shutdown() -> None:
         Raised if the client is not connected to the Arkouda server or
         there is an error in disconnecting from the server
     """
-    global socket, pspStr, id_to_args, connected, verbose
+    global pspStr, id_to_args, connected, verbose
 
     if not connected:
         raise RuntimeError('not connected, cannot shutdown server')
@@ -521,16 +1239,130 @@ def shutdown() -> None:
     logger.debug("[Python] Sending request: {}".format(message))
     return_message = cast(str, _send_string_message(message))
     logger.debug("[Python] Received response: {}".format(return_message))
+    forget_temp_cache()
 
     try:
-        socket.disconnect(pspStr)
+        pool.close()
     except Exception as e:
         raise RuntimeError(e)
     connected = False
 
+def set_flush_policy(policy: FlushPolicy) -> None:
+    """
+    Sets the policy deciding when buffered commands are flushed to the server
+
+    Parameters
+    ----------
+    policy : FlushPolicy
+        e.g. CountFlushPolicy(), BytesFlushPolicy(2**30) or AdaptiveFlushPolicy()
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    TypeError
+        Raised if policy is not a FlushPolicy
+    """
+    global flush_policy
+    if not isinstance(policy, FlushPolicy):
+        raise TypeError('policy must be a FlushPolicy, not {}'.format(type(policy)))
+    flush_policy = policy
+
+
+def set_compression(codec: Optional[str], threshold: Optional[int] = None) -> None:
+    """
+    Sets the codec compressing the values of array transfers on the wire:
+    ak.array, pdarray.to_ndarray, ak.upload and ak.download, and the
+    Strings built on them. Each transfer, or chunk of a streaming transfer,
+    of at least threshold bytes is compressed on its own; transfers are
+    not compressed if the server does not support the codec.
+
+    Parameters
+    ----------
+    codec : Optional[str]
+        One of ak.compression.available_codecs(): 'zlib', and 'lz4' or
+        'zstd' if their packages are installed; None disables compression
+    threshold : int, optional
+        The size in bytes below which transfers are not compressed,
+        defaults to the current ak.client.compressionThreshold
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        Raised if the codec is not available, or threshold is negative
+    """
+    global compression, compressionThreshold
+    if codec is not None and codec not in codecs.codecs:
+        raise ValueError('codec must be one of {}, not {}'.format(
+            codecs.available_codecs(), codec))
+    if threshold is not None:
+        if threshold < 0:
+            raise ValueError('threshold must be non-negative, not {}'.format(threshold))
+        compressionThreshold = threshold
+    compression = codec
+
+
+def _transfer_codec(nbytes: int) -> Optional[str]:
+    """
+    Returns the codec compressing a transfer of nbytes bytes, or None if it
+    is not compressed
+    """
+    if compression is None or nbytes < compressionThreshold or \
+            compression not in serverCodecs:
+        return None
+    return compression
+
+
+def get_flush_counts() -> Dict[str, int]:
+    """
+    Get the number of flushes of the buffer each trigger caused: the flush
+    policy's triggers ("count", "bytes", "time" or "adaptive"), "dependency"
+    for values needed and "explicit" for emptying the buffer.
+
+    Returns
+    -------
+    Dict[str, int]
+        Trigger name to number of flushes
+    """
+    return dict(flush_counts)
+
+
+def get_plan_cache_info() -> Dict[str, int]:
+    """
+    Get how often the optimizer's plan for a flushed command sequence was
+    reused from the plan cache ("hits") or had to be made ("misses"), and
+    the number of distinct plans cached ("plans")
+
+    Returns
+    -------
+    Dict[str, int]
+        The numbers of hits, misses and plans
+    """
+    return {"hits": plan_cache_counts["hits"], "misses": plan_cache_counts["misses"],
+            "plans": len(plan_cache)}
+
+
+def clear_plan_cache() -> None:
+    """
+    Forget the cached plans and reset the counts of get_plan_cache_info
+
+    Returns
+    -------
+    None
+    """
+    plan_cache.clear()
+    plan_cache_counts.clear()
+
+
 maxNumServerVariables = 0
 
-def generic_msg(cmd: str, args: Union[str, bytes] = None, send_bytes: bool = False,
+def generic_msg(cmd: str, args: Union[str, bytes, Tuple[bytes, memoryview]] = None, send_bytes: bool = False,
                 recv_bytes: bool = False, return_value_needed: bool = False,
                 create_pdarray: bool = False, buff_emptying: bool = False, arr_id: str = None, my_pdarray = None) -> Union[str, bytes]:
     """
@@ -541,9 +1373,10 @@ def generic_msg(cmd: str, args: Union[str, bytes] = None, send_bytes: bool = Fal
     ----------
     cmd : str
         The server-side command to be executed
-    args : Union[str,bytes]
+    args : Union[str, bytes, Tuple[bytes, memoryview]]
         A space-delimited list of command arguments or a byte array, the latter
-        of which is for creating an Arkouda array
+        of which is for creating an Arkouda array, or a header and an array
+        buffer sent as separate frames (see _send_binary_message)
     send_bytes : bool
         Indicates if the message to be sent is binary, defaults to False
     recv_bytes : bool
@@ -568,14 +1401,22 @@ def generic_msg(cmd: str, args: Union[str, bytes] = None, send_bytes: bool = Fal
     confirmation, warn message, or error message. A response of type bytes 
     corresponds to an Arkouda array output as a numpy array.
     """
-    global socket, pspStr, connected, verbose
-
     if not connected:
         raise RuntimeError("client is not connected to a server")
-
+    # the args may name pdarrays created by a flush left interrupted
+    if getattr(pool.local, 'interrupted', None) is not None:
+        replay_interrupted()
+    if pending_deletes or (serverMemoryBudget is not None and time.monotonic() >= next_mem_check):
+        trim_temp_cache()
+    if failed_arrays and isinstance(args, str):
+        check_failed(args.split(" "))
+    if shared_arrays and cmd in IN_PLACE_COMMANDS and isinstance(args, str):
+        unshare(args.split(" ")[IN_PLACE_COMMANDS[cmd]])
+
+    timer = instrumentation.timer(cmd)
     if send_bytes:
         buff_item = BufferItem(cmd=cmd,
-                               args=cast(bytes, args),
+                               args=cast(Union[bytes, Tuple[bytes, memoryview]], args),
                                send_bytes=send_bytes,
                                recv_bytes=recv_bytes,
                                create_pdarray=create_pdarray,
@@ -589,61 +1430,78 @@ def generic_msg(cmd: str, args: Union[str, bytes] = None, send_bytes: bool = Fal
                                 create_pdarray=create_pdarray,
                                 pdarray_id=arr_id,
                                 my_pd_array=my_pdarray)
+    timer.lap('format')
 
     if return_value_needed and not buff_emptying and not send_bytes:
-        ret = buff_push(buff_item)
-        if (q.empty()):
-            return ret
-        return execute_with_dependencies(buff_item)
+        with state_lock:
+            ret = buff_push(buff_item)
+            if (q.empty()):
+                return ret
+            if not recv_bytes:
+                return execute_with_dependencies(buff_item)
+            # binary replies only read the pdarrays passed in, which the caller
+            # keeps alive, so once these are computed the transfer runs without
+            # holding the lock
+            items: List[BufferItem] = []
+            collect_with_dependencies(buff_item, items)
+            items.remove(buff_item)
+            if items:
+                execute_batch(items, "dependency")
+            wait_for_in_flight([buff_item])
+            buff_item.executed = True
+            timer.restart()
+            args = transform_args(cast(str, args))
+            timer.lap('transform_args')
+        return _send_request(cmd, cast(str, args), recv_bytes=recv_bytes)
 
     if buff_emptying or return_value_needed:
-        try:
-            # Transform the args with client to server names
-            if not send_bytes:
-                args = transform_args(args)
-            #print("cmd=",cmd)
-            #print("args=",args)
-            # Send the message
-            if send_bytes:
-                repMsg = _send_binary_message(cmd=cmd,
-                                              payload=cast(bytes, args),
-                                              recv_bytes=recv_bytes)
-                #return repMsg
-            else:
-                repMsg = _send_string_message(cmd=cmd,
-                                              args=cast(str, args),
-                                              recv_bytes=recv_bytes)
-
-            if create_pdarray:
-                # transpose returns more then one created pdarray
-                if (cmd!="transpose"):
-                    fields = repMsg.split()
-                    name = fields[1]
-                    mydtype = fields[2]
-                    size = int(fields[3])
-                    ndim = int(fields[4])
-                    shape = [int(el) for el in fields[5][1:-1].split(',')]
-                    itemsize = int(fields[6])
-                    logger.debug(("created Chapel array with name: {} dtype: {} size: {} ndim: {} shape: {} " +
-                                "itemsize: {}").format(name, mydtype, size, ndim, shape, itemsize))
-                    client_to_server_names[arr_id] = name
-                else:
-                    fields = repMsg.split()
-                    for i in range(1, len(arr_id)+1):
-                        client_to_server_names[arr_id[i-1]]=fields[i]
-            return repMsg
-
-        except KeyboardInterrupt as e:
-            # if the user interrupts during command execution, the socket gets out
-            # of sync reset the socket before raising the interrupt exception
-            socket = context.socket(zmq.REQ)
-            socket.connect(pspStr)
-            raise e
+        # Transform the args with client to server names
+        if send_bytes:
+            repMsg = _send_request(cmd, payload=cast(Union[bytes, Tuple[bytes, memoryview]], args),
+                                   recv_bytes=recv_bytes)
+        else:
+            args = transform_args(cast(str, args))
+            timer.lap('transform_args')
+            repMsg = _send_request(cmd, cast(str, args), recv_bytes=recv_bytes)
+        if create_pdarray:
+            register_created(cmd, arr_id, cast(str, repMsg))
+        return repMsg
     else:
         buff_push(buff_item)
     return
 
 
+@synchronized
+def register_created(cmd: str, arr_id, repMsg: str) -> None:
+    """
+        Map the client-side id(s) of a created pdarray to the server-side
+        name(s) found in the "created ..." reply message
+    """
+    if isinstance(repMsg, TypedReply):
+        # compact replies carry the names, no need to parse them
+        if isinstance(arr_id, list):
+            for i, created in zip(arr_id, repMsg.created):
+                client_to_server_names[i] = created.name
+        else:
+            client_to_server_names[arr_id] = repMsg.created[0].name
+        return
+    fields = repMsg.split()
+    # transpose returns more then one created pdarray
+    if (cmd!="transpose"):
+        name = fields[1]
+        mydtype = fields[2]
+        size = int(fields[3])
+        ndim = int(fields[4])
+        shape = [int(el) for el in fields[5][1:-1].split(',')]
+        itemsize = int(fields[6])
+        logger.debug(("created Chapel array with name: {} dtype: {} size: {} ndim: {} shape: {} " +
+                    "itemsize: {}").format(name, mydtype, size, ndim, shape, itemsize))
+        client_to_server_names[arr_id] = name
+    else:
+        for i in range(1, len(arr_id)+1):
+            client_to_server_names[arr_id[i-1]]=fields[i]
+
+
 def get_config() -> Mapping[str, Union[str, int, float]]:
     """
     Get runtime information about the server.
@@ -690,7 +1548,7 @@ def get_mem_used() -> int:
     ValueError
         Raised if the returned value is not an int-formatted string
     """
-    mem_used_message = cast(str, generic_msg(cmd="getmemused"))
+    mem_used_message = cast(str, generic_msg(cmd="getmemused", return_value_needed=True))
     return int(mem_used_message)
 
 
@@ -708,7 +1566,7 @@ def _no_op() -> str:
     RuntimeError
         Raised if there is a server-side error in executing noop request
     """
-    return cast(str,generic_msg(cmd="noop"))
+    return cast(str,generic_msg(cmd="noop", return_value_needed=True))
   
 def ruok() -> str:
     """
@@ -727,7 +1585,7 @@ def ruok() -> str:
         both of the latter cases
     """
     try:
-        res = cast(str,generic_msg(cmd='ruok'))
+        res = cast(str,generic_msg(cmd='ruok', return_value_needed=True))
         if res == 'imok':
             return 'imok'
         else:
@@ -737,7 +1595,7 @@ def ruok() -> str:
 
 
 class BufferItem:
-    def __init__(self, cmd: str, args: Union[str, bytes] = None, send_bytes: bool = False,
+    def __init__(self, cmd: str, args: Union[str, bytes, Tuple[bytes, memoryview]] = None, send_bytes: bool = False,
                  recv_bytes: bool = False, create_pdarray: bool = False, pdarray_id: str = None, executed: bool = False, my_pd_array = None, 
                  size = None, type= None):
         self.cmd = cmd
@@ -747,68 +1605,461 @@ class BufferItem:
         self.create_pdarray = create_pdarray
         self.pdarray_id = pdarray_id
         self.dependencies = []
+        self.args_list: List[str] = []
+        self.operands: List[str] = []
+        self.outputs: List[str] = []
+        self.reads: List[str] = []
+        self.writes: List[str] = []
         self.executed = executed
+        self.used = None
+        self.used_cached = False
+        # server-side name of the output buffer of the prepared item
+        self.buffer = None
+        # whether the server names the result of the prepared item, stored
+        # to a pdarray created earlier in the same batch
+        self.alias = False
         self.my_pd_array = []
+        # number of the pdarrays in my_pd_array released when prepared; those
+        # dropped while the item is in flight are released when completed
+        self.released = 0
+        # time.monotonic() when the item was put in a BufferGraph
+        self.queued_at = 0.0
         self.size = size
         self.type = type
+        # dtype and size of the pdarrays passed in, by name
+        self.dtypes = dict()
+        if my_pd_array:
+            for arr in my_pd_array:
+                if hasattr(arr, 'name') and hasattr(arr, 'dtype'):
+                    self.dtypes[arr.name] = (arr.dtype, arr.size)
+        if isinstance(pdarray_id, str) and pdarray_id in self.dtypes:
+            self.type, self.size = self.dtypes[pdarray_id]
 
 
+    def nbytes(self) -> int:
+        """
+            Return the estimated bytes of the pdarray the item creates
+        """
+        if not self.create_pdarray or self.size is None or self.type is None:
+            return 0
+        return int(self.size) * self.type.itemsize
+
     def __str__(self):
         return "Buffer Item, Cmd={0}, Args={1}, Pdarray_id={2}".format(self.cmd, self.args, self.pdarray_id)
 
-    def execute(self):
+    def output_key(self, cmd: Optional[str] = None):
         """
-            Execute a a buffer item
+            Return the (dtype, size) of the pdarray the item creates if the
+            command can store it to a dead temporary or cached array, else None
+
+            Parameters
+            ----------
+            cmd : str
+                The command to check instead of the item's own
         """
-        used = None
+        cmd = cmd or self.cmd
+        if cmd not in REUSING_COMMANDS and cmd not in OUTPUT_BUFFER_COMMANDS:
+            return None
+        if cmd.startswith("binop") and self.args_list and self.args_list[0] not in STORE_BINOPS:
+            return None
+        if not isinstance(self.pdarray_id, str):
+            return None
+        dtype, size = self.type, self.size
+        if dtype is None or size is None:
+            ref = names_to_weakref.get(self.pdarray_id)
+            out = ref() if ref is not None else None
+            if out is None:
+                return None
+            dtype, size = out.dtype, out.size
+        if dtype not in cache or size is None:
+            return None
+        # the Store variants of the reusing commands are only typed for these
+        if cmd in REUSING_COMMANDS and dtype not in (akint64, akfloat64):
+            return None
+        return dtype, int(size)
+
+    def find_reuse(self, live_references, is_cached, cmd: Optional[str] = None, inputs: Optional[list] = None,
+                   named = None):
+        """
+            Find the dead temporary or cached array the item can store its
+            result to
+
+            Parameters
+            ----------
+            live_references : dict
+                pdarray id to its number of live references
+            is_cached : callable
+                Tells whether a server-side array of the dtype and size is cached
+            cmd : str
+                The command to check instead of the item's own
+            inputs : list
+                The (id, dtype, size) of the dead inputs to check instead of the
+                item's own
+            named : container
+                The ids of the dead inputs which can be reused, by default
+                those with a server-side name
+
+            Returns
+            -------
+            tuple or None
+                The (id, dtype, size) of the dead input and False, or
+                (None, dtype, size) and True if a cached server-side array of
+                the dtype and size of the result is to be taken, or None
+        """
+        key = self.output_key(cmd)
+        if key is None:
+            return None
+        named = client_to_server_names if named is None else named
+        if (cmd or self.cmd) not in GATHER_COMMANDS:
+            for info in (self.my_pd_array if inputs is None else inputs):
+                # temporaries created earlier in the same batch have no server name yet
+                if (live_references.get(info[0])==0 and (info[1], int(info[2]))==key
+                        and info[0] in named and not is_shared(info[0])):
+                    return info, False
+        if is_cached(*key):
+            return (None,) + key, True
+        return None
+
+    def prepare(self, plan: Optional[dict] = None):
+        """
+            Rewrite the buffer item to reuse a dead temporary before it is sent:
+            the one plan_buffers assigned it if a plan is given, else one of
+            its dead inputs or a cached array
+        """
+        self.used = None
+        self.used_cached = False
+        self.buffer = None
+        self.alias = False
         self.executed = True
-        ret = False
-        ret = []
-        for info in self.my_pd_array:
-            ret.append(delete_from_args_map(info[0]))
-        for info in self.my_pd_array:
-            if (names_to_number_of_live_references[info[0]]==0):
-                # See if we can reuse some temporaries right now
-                if (self.cmd=="binopvv" or self.cmd=="binopvs" or self.cmd=="binopsv" or self.cmd=="arange" or self.cmd == "randint"):
-                    #print("aaa")
-                    if (info[1]==names_to_weakref[self.pdarray_id]().dtype and int(info[2])==names_to_weakref[self.pdarray_id]().size
-                    and (info[0].split(' ')[0]!="/" or names_to_weakref[self.pdarray_id]().dtype==akint64)):
-                        self.cmd+='Store'
-                        #print("new=",self.cmd)
-                        self.args+=" "+info[0]
-                        self.create_pdarray=False
-                        names_to_weakref[self.pdarray_id]().cmd = self.cmd
-                        names_to_weakref[self.pdarray_id]().cmd_args=self.args
-                        client_to_server_names[self.pdarray_id]=client_to_server_names[info[0]]
-                        used = info[0]
-                        break
-                    elif (check_arr(info[1], info[2])):
-                        name = uncache_array(info[1], info[2])
-                        self.cmd+='Store'
-                        self.args+=" "+info[0]
-                        self.create_pdarray=False
-                        names_to_weakref[self.pdarray_id]().cmd = self.cmd
-                        names_to_weakref[self.pdarray_id]().cmd_args=self.args
-                        client_to_server_names[self.pdarray_id]=client_to_server_names[name]
-                        used = name
-
-        retMsg = generic_msg(self.cmd, self.args, self.send_bytes, self.recv_bytes,
-                    return_value_needed=True, create_pdarray=self.create_pdarray,
-                    buff_emptying=True, arr_id=self.pdarray_id)
         for info in self.my_pd_array:
-            if (names_to_number_of_live_references[info[0]]==0 and info[0]!=used):
+            delete_from_args_map(info[0])
+        self.released = len(self.my_pd_array)
+        # See if we can reuse some temporaries right now
+        if plan is not None:
+            reuse = plan.get(self)
+        else:
+            reuse = self.find_reuse(names_to_number_of_live_references, check_arr)
+        if reuse is None:
+            key = self.output_key()
+            if key is not None:
+                record_cache_lookup(key[0], key[1], False)
+            return
+        info, cached = reuse
+        if cached:
+            name = uncache_array(info[1], info[2])
+            if name is None:
+                return
+        else:
+            # None for a pdarray created earlier in the same batch, whose id
+            # the server resolves
+            name = client_to_server_names.get(info[0])
+            cache_counts["reused"] += 1
+            cache_counts["bytes_saved"] += int(info[2]) * info[1].itemsize
+        cache_counts["rewrites"] += 1
+        if self.cmd in OUTPUT_BUFFER_COMMANDS:
+            # the server recycles the array for the one it creates, or deletes it
+            self.used = info[0] if not cached else name
+            self.buffer = name if name is not None else BATCH_ALIAS_PREFIX+info[0]
+            self.used_cached = cached
+            self.cmd+='Store'
+            return
+        if not cached:
+            record_update(info[0])
+            self.used = info[0]
+            self.args+=" "+info[0]
+            # the server replies with the name of the dead temporary
+            self.alias = name is None
+        else:
+            self.used = name
+            self.used_cached = True
+            # by the id of the result, mapped to the name below, since server
+            # names may equal client ids
+            self.args = cast(str, self.args)+" "+self.pdarray_id
+        self.cmd+='Store'
+        self.create_pdarray=False
+        ref = names_to_weakref.get(self.pdarray_id)
+        out = ref() if ref is not None else None
+        if out is not None:
+            out.cmd = self.cmd
+            out.cmd_args=self.args
+        if name is not None:
+            client_to_server_names[self.pdarray_id]=name
+
+    def complete(self, retMsg, reused=frozenset()):
+        """
+            Register the results of an executed buffer item and park its dead inputs.
+            Temporaries in reused were taken over by items prepared in the same batch.
+        """
+        if self.create_pdarray:
+            if self.used is not None and not self.used_cached:
+                # the dead temporary was recycled or deleted as output buffer
+                client_to_server_names.pop(self.used, None)
+            register_created(self.cmd, self.pdarray_id, retMsg)
+        elif self.alias:
+            # "updated <name> ...", the name of the temporary stored to
+            client_to_server_names.pop(self.used, None)
+            client_to_server_names[self.pdarray_id] = retMsg.split()[1]
+        in_flight.pop(self, None)
+        for info in self.my_pd_array[self.released:]:
+            delete_from_args_map(info[0])
+        for info in self.my_pd_array:
+            if (names_to_number_of_live_references[info[0]]==0 and info[0]!=self.used
+                    and info[0] not in reused):
                 cache_array(info[0], info[1], info[2])
         return retMsg
 
+    def request(self):
+        """
+            Return the (cmd, args, payload, recv_bytes) of the request
+            executing the prepared buffer item
+        """
+        if self.send_bytes:
+            return self.cmd, None, self.args, self.recv_bytes
+        return self.cmd, self.server_args(), None, self.recv_bytes
+
+    def server_args(self, created: AbstractSet[str] = frozenset()) -> str:
+        """
+            Return the args of the prepared buffer item with the client-side
+            names of pdarrays replaced by their server-side names, and the
+            ids of those created earlier in the same batch marked as aliases
+        """
+        timer = instrumentation.timer(self.cmd)
+        args = transform_args(cast(str, self.args), created)
+        if self.buffer is not None:
+            # already a server-side name, which may equal a client-side one
+            args = self.buffer+" "+args
+        timer.lap('transform_args')
+        return args
+
+    def execute(self):
+        """
+            Execute a a buffer item
+        """
+        self.prepare()
+        return self.complete(_send_request(*self.request()))
+
+class BufferGraph:
+    """
+    Indexed dependency DAG of the BufferItems that are waiting to be executed.
+
+    Every node keeps the operand list parsed from its args once, when it is
+    pushed. The graph keeps an index from pdarray id to the queued node that
+    last wrote it (producers), to the queued nodes that read it since that
+    write (readers) and to all queued nodes that reference it (uses), so
+    dependency lookup and removal don't rescan the buffer.
+    Insertion order is a valid topological order, since a node can only
+    depend on nodes pushed before it.
+
+    Attributes
+    ----------
+    maxsize : int
+        The number of nodes at which the buffer is flushed by the default
+        CountFlushPolicy
+    pending_bytes : int
+        The bytes of the pdarrays created by the queued nodes
+    nodes : dict
+        The queued nodes, in insertion order
+    producers : dict
+        pdarray id to the queued node that last wrote it
+    readers : dict
+        pdarray id to the queued nodes that read it since its last write
+    uses : dict
+        pdarray id to the queued nodes that reference it
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self.maxsize = maxsize
+        self.pending_bytes = 0
+        self.nodes: Dict[BufferItem, None] = dict()
+        self.producers: Dict[str, BufferItem] = dict()
+        self.readers: Dict[str, Dict[BufferItem, None]] = defaultdict(dict)
+        self.uses: Dict[str, Dict[BufferItem, None]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(list(self.nodes))
+
+    def qsize(self) -> int:
+        return len(self.nodes)
+
+    def empty(self) -> bool:
+        return not self.nodes
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self.nodes)
+
+    def put(self, item: BufferItem) -> None:
+        """
+            Add a node to the graph, making it depend on the queued writers of
+            the pdarrays it reads and on the queued readers and writers of the
+            pdarrays it writes
+        """
+        parse_operands(item)
+        deps: Dict[BufferItem, None] = dict()
+        for name in item.reads:
+            if name in self.producers:
+                deps[self.producers[name]] = None
+        for name in item.writes:
+            if name in self.producers:
+                deps[self.producers[name]] = None
+            for reader in self.readers.pop(name, {}):
+                deps[reader] = None
+        deps.pop(item, None)
+        item.dependencies = [weakref.ref(dep) for dep in deps]
+
+        for name in item.reads:
+            self.readers[name][item] = None
+        for name in item.writes:
+            self.producers[name] = item
+        for name in item.operands:
+            self.uses[name][item] = None
+        item.queued_at = time.monotonic()
+        self.pending_bytes += item.nbytes()
+        self.nodes[item] = None
+
+    def remove(self, item: BufferItem) -> None:
+        """
+            Remove a node from the graph in O(number of operands)
+        """
+        if item not in self.nodes:
+            return
+        del self.nodes[item]
+        self.pending_bytes -= item.nbytes()
+        for name in item.operands:
+            for index in (self.uses, self.readers):
+                users = index.get(name)
+                if users is not None:
+                    users.pop(item, None)
+                    if not users:
+                        del index[name]
+            if self.producers.get(name) is item:
+                del self.producers[name]
+
+    def age(self) -> float:
+        """
+            Return the seconds since the oldest queued node was added
+        """
+        if not self.nodes:
+            return 0.0
+        return time.monotonic() - next(iter(self.nodes)).queued_at
+
+    def get(self) -> BufferItem:
+        """
+            Remove and return the oldest node
+        """
+        item = next(iter(self.nodes))
+        self.remove(item)
+        return item
+
+    def users(self, name: str) -> List[BufferItem]:
+        """
+            Return the queued nodes that reference the pdarray id
+        """
+        return list(self.uses.get(name, ()))
+
+    def consumers(self, name: str) -> int:
+        """
+            Return the number of queued nodes that reference the pdarray id
+        """
+        return len(self.uses.get(name, ()))
+
+
+class ThreadLocalBufferGraph:
+    """
+    Stands for the BufferGraph of the calling thread: each thread using the
+    client buffers, optimizes and flushes its own commands. Attributes and
+    methods are those of the thread's BufferGraph.
+
+    Attributes
+    ----------
+    graphs : Dict[BufferGraph, weakref.ref]
+        The buffer of each thread, to the thread, so that commands buffered
+        by one thread are seen by the others
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self.__dict__['default_maxsize'] = maxsize
+        self.__dict__['local'] = threading.local()
+        self.__dict__['graphs'] = dict()
+
+    def graph(self) -> BufferGraph:
+        """
+        Return the buffer of the calling thread
+        """
+        graph = getattr(self.local, 'graph', None)
+        if graph is None:
+            graph = self.local.graph = BufferGraph(self.default_maxsize)
+            with state_lock:
+                # forget the emptied buffers of the threads that ended
+                for other, thread in list(self.graphs.items()):
+                    if thread() is None and other.empty():
+                        del self.graphs[other]
+                self.graphs[graph] = weakref.ref(threading.current_thread())
+        return graph
+
+    def __getattr__(self, name):
+        return getattr(self.graph(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.graph(), name, value)
+
+    def __len__(self) -> int:
+        return len(self.graph())
+
+    def __iter__(self):
+        return iter(self.graph())
+
+
+q = ThreadLocalBufferGraph(queue_size)
+
+
+def buffers() -> List[BufferGraph]:
+    """
+        Return the buffers of all threads
+    """
+    if isinstance(q, ThreadLocalBufferGraph):
+        q.graph()
+        return list(q.graphs)
+    return [q]
+
+
+def flush_other_threads(item: BufferItem):
+    """
+        Execute the commands buffered by other threads that the item must
+        follow: those writing a pdarray the item uses, and those using a
+        pdarray the item writes
+    """
+    own = q.graph() if isinstance(q, ThreadLocalBufferGraph) else q
+    items: List[BufferItem] = []
+    for graph in buffers():
+        if graph is own or graph.empty():
+            continue
+        users = [graph.producers[name] for name in item.reads if name in graph.producers]
+        for name in item.writes:
+            users.extend(graph.users(name))
+        for user in users:
+            collect_with_dependencies(user, items, graph)
+    if items:
+        execute_batch(items, "dependency")
+
+
+@synchronized
 def buff_push(item: BufferItem):
     """
         Add BufferItem to the buffer and execute if the buffer is full
     """
+    parse_operands(item)
+    flush_other_threads(item)
     q.put(item)
-    make_dependencies(item)
-    if q.full():
-        return buff_empty_partial(q.maxsize - 1)
-    return None
+    if flush_policy is None:
+        return None
+    decision = flush_policy.check(q)
+    if decision is None:
+        return None
+    trigger, keep = decision
+    return buff_empty_partial(keep, trigger)
 
 def is_temporary(arg: str):
     if (arg[:2]=="id"):
@@ -816,47 +2067,45 @@ def is_temporary(arg: str):
     else:
         return False
 
-def make_dependencies(item: BufferItem):
+def parse_operands(item: BufferItem):
     """
-        Make all dependecies of a given BufferItem
+        Parse the pdarray ids a BufferItem reads and writes out of its args
+    """
+    outputs = []
+    if item.pdarray_id:
+        outputs = list(item.pdarray_id) if isinstance(item.pdarray_id, list) else [item.pdarray_id]
+    args_list = item.args.split(" ") if isinstance(item.args, str) else []
+    operands = list(dict.fromkeys(filter(is_temporary, args_list + outputs)))
+    written = set(outputs)
+    if item.cmd in IN_PLACE_COMMANDS:
+        position = IN_PLACE_COMMANDS[item.cmd]
+        if position < len(args_list):
+            written.add(args_list[position])
+    elif item.cmd not in PURE_COMMANDS:
+        # commands with unknown side effects are ordered after every other use
+        written.update(operands)
+    item.args_list = args_list
+    item.operands = operands
+    item.outputs = outputs
+    item.writes = [name for name in operands if name in written]
+    item.reads = [name for name in operands if name not in written]
+
+def transform_args(args: str, created: AbstractSet[str] = frozenset()):
+    """
+        Replace the client-side ids of pdarrays in args by their server-side
+        names, and those of the created ids, of pdarrays created earlier in
+        the same batch, by their aliases (see BATCH_ALIAS_PREFIX)
     """
-    # print('starting length of dependencies:',len(item.dependencies))
-    if item.args is None:
-        return
-    args_list = item.args.split(" ")
-    args_list = list(filter(is_temporary, args_list))
-    for q_elem in reversed(list(q.queue)):
-        if (q_elem is item):
-            continue
-        args_list_q_elem=list()
-        for arg in q_elem.args.split(" "):
-            args_list_q_elem.append(arg)
-        if (q_elem.pdarray_id!=None):
-            if (isinstance(q_elem.pdarray_id,list)):
-                args_list_q_elem.extend(q_elem.pdarray_id)
-            else:
-                args_list_q_elem.append(q_elem.pdarray_id)
-        for arg_q_elem in args_list_q_elem:
-            if arg_q_elem in args_list and not(q_elem in item.dependencies):
-                item.dependencies.append(weakref.ref(q_elem))
-
-def remove_from_queue(item: BufferItem):
-    top = None
-    helper_queue = Queue(queue_size)
-    while (not q.empty() and top!=item):
-        top=q.get()
-        if (top!=item):
-            helper_queue.put(top)
-    while (not helper_queue.empty()):
-        q.put(helper_queue.get())
-
-def transform_args(args: str):
     if (args==None):
         return None
     args_list = list()
     args_list = args.split(" ")
+    if failed_arrays:
+        check_failed(args_list)
     for i in range(len(args_list)):
-        if (args_list[i] in client_to_server_names.keys()):
+        if (args_list[i] in created):
+            args_list[i]=BATCH_ALIAS_PREFIX+args_list[i]
+        elif (args_list[i] in client_to_server_names.keys()):
             args_list[i]=client_to_server_names[args_list[i]]
     s=""
     for i in range(len(args_list)):
@@ -866,33 +2115,758 @@ def transform_args(args: str):
             s+=args_list[i]
     return s
 
+def collect_with_dependencies(item: BufferItem, items: list, queue: Optional[Union[BufferGraph, ThreadLocalBufferGraph]] = None):
+    """
+        Remove a BufferItem and everything it depends on from the buffer (by
+        default that of the calling thread), appending them to items in
+        execution order
+    """
+    if queue is None:
+        queue = q
+    seen = set()
+    stack = [(item, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            queue.remove(node)
+            items.append(node)
+            continue
+        if node.executed or node in seen or node not in queue.nodes:
+            continue
+        seen.add(node)
+        stack.append((node, True))
+        for dependency in reversed(node.dependencies):
+            dep = dependency()
+            if dep is not None and dep not in seen:
+                stack.append((dep, False))
+
+
+@synchronized
 def execute_with_dependencies(item: BufferItem):
-    if (item.executed):
+    items: List[BufferItem] = []
+    collect_with_dependencies(item, items)
+    if not items:
+        return
+    replies = execute_batch(items, "dependency")
+    return replies[-1] if replies else None
+
+
+def fail_items(items: list, error: BaseException) -> None:
+    """
+        Mark the pdarrays which the BufferItems, not executed because of the
+        error, were to create or update as failed with it, as well as those
+        of the buffered items using them, which are dropped. Commands naming
+        a failed pdarray raise the error rather than being sent.
+    """
+    pending = [name for item in items for name in item.outputs + item.writes]
+    while pending:
+        name = pending.pop()
+        if name in failed_arrays:
+            continue
+        failed_arrays[name] = str(error)
+        for graph in buffers():
+            for user in graph.users(name):
+                graph.remove(user)
+                pending.extend(user.outputs + user.writes)
+
+
+def check_failed(names: Iterable[str]) -> None:
+    """
+        Raise the error of the flush which was to compute any of the pdarrays
+        named, see fail_items
+    """
+    for name in names:
+        if name in failed_arrays:
+            raise RuntimeError("{} was not computed: {}".format(name, failed_arrays[name]))
+
+
+def elementwise_expression(item: BufferItem):
+    """
+        Return the postfix expression of an elementwise BufferItem which can
+        be fused, or None
+    """
+    if (not item.create_pdarray or not isinstance(item.pdarray_id, str)
+            or item.type not in (akint64, akfloat64)):
+        return None
+    args = item.args_list
+    if item.cmd == "efunc":
+        if len(args) == 2 and args[0] in FUSED_EFUNCS and item.type == akfloat64 \
+                and args[1] in item.dtypes:
+            return [args[1], args[0]]
+        return None
+    if item.cmd not in ("binopvv", "binopvs", "binopsv") or args[0] not in FUSED_BINOPS:
+        return None
+    if args[0] == "/" and item.type != akfloat64:
+        return None
+    if item.cmd == "binopvv":
+        if len(args) == 3 and args[1] in item.dtypes and args[2] in item.dtypes:
+            return [args[1], args[2], args[0]]
+        return None
+    # division by a scalar isn't guarded against zero divisors
+    op = "/s" if args[0] == "/" else args[0]
+    if len(args) != 4:
+        return None
+    if item.cmd == "binopvs":
+        array, dt, value = args[1], args[2], args[3]
+    else:
+        dt, value, array = args[1], args[2], args[3]
+    if array not in item.dtypes or dt not in (akint64.name, akfloat64.name) \
+            or (dt == akfloat64.name and item.type != akfloat64):
+        return None
+    scalar = "{}:{}".format(dt, value)
+    return [array, scalar, op] if item.cmd == "binopvs" else [scalar, array, op]
+
+
+def expression_depth(expression: list) -> int:
+    """
+        Return the maximum stack depth needed to evaluate a postfix expression
+    """
+    depth = 0
+    max_depth = 0
+    for token in expression:
+        if token in FUSED_EFUNCS:
+            continue
+        depth += -1 if token in FUSED_BINOPS or token == "/s" else 1
+        max_depth = max(max_depth, depth)
+    return max_depth
+
+
+def plan_fusion(items: list, queue: Optional[Union[BufferGraph, ThreadLocalBufferGraph]] = None):
+    """
+        Find the chains of elementwise BufferItems which can be fused
+
+        A producer is absorbed into its consumer when its result has no
+        references left, is read by no other buffered command, has the same
+        dtype as the consumer's and none of its operands is updated in place
+        in between. The consumer's expression then reads the producer's
+        operands directly, so the server evaluates the chain in one pass
+        without creating the producer's temporary.
+        Commands still queued in queue (by default the buffer) may read the
+        results of the items.
+        Returns the postfix expression of each position whose item absorbs
+        producers, and the position of each absorbed producer mapped to the
+        position of its consumer.
+    """
+    if queue is None:
+        queue = q
+    readers = defaultdict(list)
+    for position, item in enumerate(items):
+        for name in item.reads:
+            readers[name].append(position)
+
+    expressions: Dict[int, List[str]] = dict()
+    operand_dtypes: Dict[int, dict] = dict()
+    producers: Dict[str, int] = dict()
+    rewritten = dict()
+    absorbed = dict()
+    for position, item in enumerate(items):
+        original = elementwise_expression(item)
+        if original is None:
+            continue
+        expression = original
+        item_dtypes = item.dtypes
+        for name in list(dict.fromkeys(original)):
+            if name not in producers:
+                continue
+            source = producers[name]
+            producer = items[source]
+            if (producer.type != item.type or not is_dead(name)
+                    or readers[name] != [position] or queue.consumers(name) != 0):
+                continue
+            if any(leaf in other.writes for other in items[source+1:position]
+                   for leaf in expressions[source] if leaf in operand_dtypes[source]):
+                continue
+            candidate: List[str] = []
+            for token in expression:
+                candidate.extend(expressions[source] if token == name else [token])
+            dtypes = dict(item_dtypes)
+            dtypes.update(operand_dtypes[source])
+            operands = set(token for token in candidate if token in dtypes)
+            operand_types = set(dtypes[operand][0] for operand in operands)
+            if (len(operands) > max_fused_operands or len(operand_types) != 1
+                    or not operand_types <= {akint64, akfloat64}
+                    or expression_depth(candidate) > max_fused_depth):
+                continue
+            expression = candidate
+            item_dtypes = dtypes
+            absorbed[source] = position
+        expressions[position] = expression
+        operand_dtypes[position] = item_dtypes
+        producers[item.pdarray_id] = position
+        if expression is not original:
+            rewritten[position] = expression
+    return rewritten, absorbed
+
+
+def replay_fusion(items: list, absorbed: dict) -> dict:
+    """
+        Rebuild the postfix expressions of the items absorbing producers
+        from a fusion planned by plan_fusion for a sequence of the same
+        shape, without checking again whether the producers can be absorbed.
+        Returns the postfix expression of each position whose item absorbs
+        producers.
+    """
+    consumers = defaultdict(list)
+    for source, position in absorbed.items():
+        consumers[position].append(source)
+    rewritten: Dict[int, List[str]] = dict()
+    for position in sorted(consumers):
+        item = items[position]
+        original = elementwise_expression(item)
+        sources = dict((items[source].pdarray_id, source) for source in consumers[position])
+        expression = original
+        for name in list(dict.fromkeys(original)):
+            if name not in sources:
+                continue
+            source = sources[name]
+            substituted = rewritten.get(source) or elementwise_expression(items[source])
+            candidate: List[str] = []
+            for token in expression:
+                candidate.extend(substituted if token == name else [token])
+            expression = candidate
+        rewritten[position] = expression
+    return rewritten
+
+
+def fuse_elementwise(items: list, plan: Optional[tuple] = None) -> list:
+    """
+        Fuse chains of elementwise BufferItems into single "fused" commands,
+        as found by plan_fusion unless the (rewritten, absorbed) plan is given.
+        Returns the remaining items, in order.
+    """
+    rewritten, absorbed = plan_fusion(items) if plan is None else plan
+    for source in sorted(absorbed):
+        producer = items[source]
+        item = items[absorbed[source]]
+        name = producer.pdarray_id
+        producer.executed = True
+        # the producer's result is never created, so it is not parked either
+        for info in [info for info in item.my_pd_array if info[0] == name]:
+            item.my_pd_array.remove(info)
+            delete_from_args_map(name)
+        item.my_pd_array.extend(producer.my_pd_array)
+        item.dtypes.update(producer.dtypes)
+    for position, expression in rewritten.items():
+        item = items[position]
+        item.cmd = "fused"
+        item.args = "{} {}".format(item.type.name, " ".join(expression))
+        parse_operands(item)
+    return [item for position, item in enumerate(items) if position not in absorbed]
+
+
+def is_dead(name: str) -> bool:
+    """
+        Return whether the pdarray with the client-side id has no references left
+    """
+    ref = names_to_weakref.get(name)
+    return ref is not None and ref() is None
+
+
+def find_dead_operations(items: list, queue: Optional[Union[BufferGraph, ThreadLocalBufferGraph]] = None) -> list:
+    """
+        Find the BufferItems whose results are never observed
+
+        An item is dead when it only creates new pdarrays, has no other
+        side effects (no Store, opeq or setitem) and none of its results
+        has references left or is read by a remaining buffered command.
+        Items are visited last to first, so whole chains of throwaway
+        intermediates are found at once. Commands still queued in queue (by
+        default the buffer) may read the results of the items.
+        Returns the dead items, last to first.
+    """
+    if queue is None:
+        queue = q
+    needed: Set[str] = set()
+    dead = []
+    for item in reversed(items):
+        if (item.create_pdarray and item.outputs and item.cmd in PURE_COMMANDS
+                and not item.cmd.endswith("Store") and not item.send_bytes
+                and not item.recv_bytes
+                and all(is_dead(name) and name not in needed and queue.consumers(name) == 0
+                        for name in item.outputs)):
+            dead.append(item)
+            continue
+        # the outputs of commands writing to existing pdarrays (setitems,
+        # which pass their target as arr_id) are read, so their producers stay
+        needed.update(name for name in item.operands
+                      if not (item.create_pdarray and name in item.outputs))
+    return dead
+
+
+def eliminate_dead_operations(items: list, dropped: Optional[list] = None):
+    """
+        Drop the BufferItems found by find_dead_operations, unless the
+        dropped items are given, last to first.
+        Returns the remaining items, in order, and the dead pdarrays read
+        only by dropped items, which are to be parked in the cache once the
+        remaining items have been executed.
+    """
+    if dropped is None:
+        dropped = find_dead_operations(items)
+    if not dropped:
+        return items, []
+    for item in dropped:
+        item.executed = True
+
+    kept = [item for item in items if not item.executed]
+    handled = set(info[0] for item in kept for info in item.my_pd_array)
+    parked = dict()
+    for item in reversed(dropped):
+        for info in item.my_pd_array:
+            delete_from_args_map(info[0])
+            if info[0] not in handled:
+                parked[info[0]] = info
+    return kept, [info for name, info in parked.items()
+                  if names_to_number_of_live_references.get(name) == 0]
+
+
+def is_number(token: str) -> bool:
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def plan_signature(items: list, queue: Optional[Union[BufferGraph, ThreadLocalBufferGraph]] = None) -> tuple:
+    """
+        Return the shape of a sequence of BufferItems, which determines what
+        find_dead_operations and plan_fusion decide for it: the commands,
+        the dtypes and sizes of what they read and create, their operands
+        numbered by first appearance, whether each operand still has
+        references or buffered readers in queue (by default the buffer)
+        and the optimizer settings. Scalar values are left out, so loop
+        bodies that only differ by their scalars have the same shape.
+    """
+    if queue is None:
+        queue = q
+    ids: Dict[str, int] = dict()
+
+    def canonical(token):
+        if is_temporary(token):
+            if token not in ids:
+                ids[token] = len(ids)
+            return "%{}".format(ids[token])
+        return "#" if is_number(token) else token
+
+    shape = []
+    for item in items:
+        args = tuple(canonical(token) for token in item.args_list) if not item.send_bytes else ()
+        outputs = tuple(canonical(name) for name in item.outputs)
+        dtypes = tuple(sorted((canonical(name), str(dtype), size)
+                              for name, (dtype, size) in item.dtypes.items()))
+        shape.append((item.cmd, args, outputs, dtypes, str(item.type), item.size,
+                      item.create_pdarray, item.send_bytes, item.recv_bytes))
+    liveness = tuple((is_dead(name), queue.consumers(name) != 0) for name in ids)
+    settings = (dead_code_elimination_enabled, fusion_enabled, max_fused_operands, max_fused_depth)
+    return tuple(shape), liveness, settings
+
+
+def optimize_batch(items: list, stats: dict):
+    """
+        Drop the dead BufferItems of a flushed sequence and fuse its
+        elementwise chains, reusing the decisions made for the last flushed
+        sequence of the same shape when the plan cache is enabled.
+        Counts what was eliminated and fused in stats.
+        Returns the remaining items, in order, and the dead pdarrays to park
+        once they have been executed.
+    """
+    if not (dead_code_elimination_enabled or fusion_enabled):
+        return items, []
+    signature = plan_signature(items) if plan_cache_enabled else None
+    plan = plan_cache.get(signature) if signature is not None else None
+    if signature is not None:
+        plan_cache_counts["hits" if plan is not None else "misses"] += 1
+    if plan is None:
+        dropped = find_dead_operations(items) if dead_code_elimination_enabled else []
+        positions = dict((item, position) for position, item in enumerate(items))
+        dead_positions = tuple(positions[item] for item in dropped)
+    else:
+        dead_positions, absorbed = plan
+        dropped = [items[position] for position in dead_positions]
+    parked = []
+    if dropped:
+        items, parked = eliminate_dead_operations(items, dropped)
+        stats["eliminated"] = len(dropped)
+    if plan is None:
+        fusion = plan_fusion(items) if fusion_enabled else (dict(), dict())
+        absorbed = fusion[1]
+        if signature is not None:
+            if len(plan_cache) >= max_cached_plans:
+                del plan_cache[next(iter(plan_cache))]
+            plan_cache[signature] = (dead_positions, dict(absorbed))
+    else:
+        fusion = (replay_fusion(items, absorbed), absorbed)
+    if absorbed:
+        items = fuse_elementwise(items, fusion)
+        stats["fused"] = len(absorbed)
+    return items, parked
+
+
+def plan_buffers(items: list, references: Optional[dict] = None, cached: Optional[Counter] = None,
+                 within_batch: bool = True) -> Tuple[dict, int]:
+    """
+        Assign output buffers to a sequence of BufferItems like a register
+        allocator. Liveness over the sequence finds the item reading each
+        dead pdarray for the last time; each item which can store its result
+        is then given, in order of preference, one of the inputs it reads
+        for the last time, a dead pdarray whose last read came earlier in
+        the sequence, or a cached array of the dtype and size of its result.
+        The pdarrays created by earlier items of a batch are reused as well,
+        since the server resolves their ids. With within_batch False only
+        dead inputs with a server-side name and cached arrays are assigned,
+        which is what preparing each item on its own finds.
+
+        Parameters
+        ----------
+        items : list
+            The BufferItems, in execution order, not prepared yet
+        references : dict
+            pdarray id to its number of live references, by default
+            names_to_number_of_live_references
+        cached : Counter
+            (dtype, size) to the number of cached arrays, by default those
+            in the temp cache
+        within_batch : bool
+            Whether the items are sent as a single batch
+
+        Returns
+        -------
+        Tuple[dict, int]
+            The item to (info, cached) map of the buffers assigned, as
+            find_reuse returns them, and the bytes of the pdarrays the items
+            still allocate: the peak of the server memory they add, since
+            dead pdarrays are parked rather than freed
+    """
+    remaining = dict(names_to_number_of_live_references if references is None else references)
+    if cached is None:
+        cached = Counter({(dtype, size): len(names) for dtype, sizes in cache.items()
+                          for size, names in sizes.items()})
+    else:
+        cached = Counter(cached)
+    created = set()
+    free: Dict[tuple, list] = defaultdict(list)
+    plan = dict()
+    allocated = 0
+    for item in items:
+        dying = []
+        for info in item.my_pd_array:
+            if info[0] in remaining:
+                remaining[info[0]] -= 1
+                if remaining[info[0]] == 0 and (info[0] in client_to_server_names
+                                                and not is_shared(info[0])
+                                                or within_batch and info[0] in created):
+                    dying.append(info)
+        key = item.output_key()
+        reuse = None
+        if key is not None:
+            if item.cmd not in GATHER_COMMANDS:
+                reuse = next(((info, False) for info in dying if (info[1], int(info[2])) == key),
+                             None)
+            if reuse is None and free[key]:
+                reuse = (free[key].pop(), False)
+            if reuse is None and cached[key] > 0:
+                cached[key] -= 1
+                reuse = ((None,) + key, True)
+        if reuse is not None:
+            plan[item] = reuse
+        else:
+            allocated += item.nbytes()
+        if within_batch:
+            for info in dying:
+                if reuse is None or info is not reuse[0]:
+                    free[(info[1], int(info[2]))].append(info)
+            created.update(item.outputs)
+    return plan, allocated
+
+
+def assign_buffers(run: list, stats: dict) -> dict:
+    """
+        Plan the output buffers of a run of BufferItems sent together (see
+        plan_buffers), adding the bytes they allocate to stats["peak_bytes"]
+        and the bytes they would allocate if each was given a buffer on its
+        own to stats["peak_bytes_greedy"]
+    """
+    plan, allocated = plan_buffers(run, within_batch=buffer_planning_enabled)
+    stats["peak_bytes"] += allocated
+    stats["peak_bytes_greedy"] += (plan_buffers(run, within_batch=False)[1]
+                                   if buffer_planning_enabled else allocated)
+    return plan
+
+
+def dump_peak_bytes(file: Union[str, TextIO]) -> None:
+    """
+    Write the estimated peak bytes allocated on the server by each of the
+    most recent flushes, one "<greedy> <planned>" line per flush: without
+    and with the output buffers assigned over the whole batch
+
+    Parameters
+    ----------
+    file : Union[str, TextIO]
+        The path of the file to append to, like max_live.dat, or a file object
+
+    Returns
+    -------
+    None
+    """
+    lines = ''.join('{} {}\n'.format(greedy, planned) for greedy, planned in peak_bytes_history)
+    if isinstance(file, str):
+        with open(file, 'a') as f:
+            f.write(lines)
+    else:
+        file.write(lines)
+
+
+def batch_requests(items: list, trigger: str = "explicit"):
+    """
+        Execute BufferItems in order, like execute_batch, without doing the
+        I/O: a generator yielding the (cmd, args, payload, recv_bytes) of
+        each request, with each run of consecutive string commands as a
+        single batch request, which must be sent the reply to each request.
+        Returns the reply of each item. Shared by the blocking client and
+        the asyncio client (arkouda.aio).
+    """
+    flush_counts[trigger] += 1
+    stats: Dict[str, Any] = {"trigger": trigger, "items": len(items), "eliminated": 0, "fused": 0,
+                             "reused": 0, "peak_bytes": 0, "peak_bytes_greedy": 0}
+    items, parked = optimize_batch(items, stats)
+    # completed items leave in_flight as they complete, the others once the
+    # generator ends, also if it is closed without being run to the end
+    in_flight.update(dict.fromkeys(items, threading.get_ident()))
+    replies = []
+    run = []
+    try:
+        for item in items + [None]:
+            if item is not None and not item.send_bytes and not item.recv_bytes:
+                run.append(item)
+                continue
+            if run:
+                plan = assign_buffers(run, stats)
+                for r in run:
+                    r.prepare(plan)
+            sample = memory_timeline_enabled
+            if len(run) == 1 and not sample:
+                replies.append(run[0].complete((yield run[0].request())))
+            elif run:
+                reused = frozenset(r.used for r in run if r.used is not None and not r.used_cached)
+                args = _batch_args(run)
+                if sample:
+                    # sampled by the server once the run executed, in the same request
+                    args += '\n' + _batch_line('-', 'getmemused', '')
+                try:
+                    run_replies = _batch_replies((yield 'batch', args, None, False))
+                except BatchError as e:
+                    # the commands before the failing one were executed
+                    for r, retMsg in zip(run, e.replies):
+                        replies.append(r.complete(retMsg, reused))
+                    raise
+                if sample:
+                    record_memory_sample(int(run_replies[-1]))
+                for r, retMsg in zip(run, run_replies):
+                    replies.append(r.complete(retMsg, reused))
+            run = []
+            if item is not None:
+                item.prepare(assign_buffers([item], stats))
+                replies.append(item.complete((yield item.request())))
+    except RuntimeError as e:
+        # replies holds those of the items executed, in order
+        fail_items(items[len(replies):], e)
+        for info in parked:
+            cache_array(info[0], info[1], info[2])
+        raise
+    finally:
+        with state_lock:
+            for item in items:
+                in_flight.pop(item, None)
+            in_flight_done.notify_all()
+    for info in parked:
+        cache_array(info[0], info[1], info[2])
+    if q.empty():
+        del cse_hits[:]
+    # items storing to a dead temporary, whether chosen when buffered or when sent
+    stats["reused"] = sum(1 for item in items if item.cmd.endswith("Store"))
+    peak_bytes_history.append((stats["peak_bytes_greedy"], stats["peak_bytes"]))
+    if flush_policy is not None:
+        flush_policy.observe(stats)
+    instrumentation.record_flush(stats)
+    return replies
+
+
+@synchronized
+def execute_batch(items: list, trigger: str = "explicit"):
+    """
+        Execute BufferItems in order, sending each run of consecutive string
+        commands to the server as a single batch request. The trigger names
+        what caused the flush, for flush_counts and the flush policy.
+    """
+    wait_for_in_flight(items)
+    steps = batch_requests(items, trigger)
+    try:
+        return drive_batch(steps, next(steps))
+    except StopIteration as done:
+        return done.value
+
+
+def drive_batch(steps, request: Tuple[str, Optional[str], Optional[bytes], bool],
+                sequence: Optional[bytes] = None):
+    """
+        Send the requests of a batch_requests generator, starting from
+        request, and return its replies. The requests are sent without
+        holding state_lock, which the generator holds while it runs. If a
+        request gets no reply, because the user interrupted it or the server
+        could not be reached within maxRetries, and requests are sequenced,
+        the generator is kept on the thread with the request, for
+        replay_interrupted to resend it with the same sequence number and
+        complete the flush.
+    """
+    try:
+        while True:
+            if sequence is None and sequencedRequests:
+                sequence = pool.sequence()
+            try:
+                with unlocked():
+                    reply = _send_request(*request, sequence=sequence)
+            except (KeyboardInterrupt, ConnectionError):
+                if sequence is None:
+                    steps.close()
+                else:
+                    pool.local.interrupted = (steps, request, sequence)
+                raise
+            except RuntimeError as e:
+                # a server-side error, which the generator raises once it
+                # completed the items executed and failed the others
+                steps.throw(e)
+                raise
+            except BaseException:
+                # the items of the flush are no longer in flight
+                steps.close()
+                raise
+            request = steps.send(reply)
+            sequence = None
+    except StopIteration as done:
+        return done.value
+
+
+@synchronized
+def replay_interrupted():
+    """
+        Complete the flush the calling thread left interrupted, if any: its
+        unanswered request is resent with the same sequence number, so that
+        the server resends the reply if it executed the request already, and
+        the remaining requests of the flush are sent. Called before the next
+        request of the thread, so the buffered commands of the flush are not
+        lost and the pdarrays they create get their server-side names.
+    """
+    interrupted = getattr(pool.local, 'interrupted', None)
+    if interrupted is None:
         return
-    for dependency in item.dependencies:
-        if (dependency() is not None):
-            execute_with_dependencies(dependency())
-    remove_from_queue(item)
-    return item.execute()
+    pool.local.interrupted = None
+    steps, request, sequence = interrupted
+    logger.info('replaying the interrupted {} request'.format(request[0]))
+    drive_batch(steps, request, sequence)
 
 
+def independent_branches(items: list) -> List[list]:
+    """
+        Split BufferItems, in execution order, into the groups that neither
+        depend on each other nor have to run in a given order, each in
+        execution order
+    """
+    parent = {item: item for item in items}
+
+    def find(item):
+        while parent[item] is not item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for item in items:
+        for dependency in item.dependencies:
+            dep = dependency()
+            if dep is not None and dep in parent:
+                parent[find(dep)] = find(item)
+    branches: Dict[BufferItem, list] = dict()
+    for item in items:
+        branches.setdefault(find(item), []).append(item)
+    return list(branches.values())
+
+
+@synchronized
 def buff_empty():
-    q.get().execute()
-    if not q.empty():
-        buff_empty()
+    items = []
+    while not q.empty():
+        items.append(q.get())
+    if items:
+        execute_batch(items, "explicit")
+
+
+@synchronized
+def buff_empty_all():
+    """
+        Execute the commands buffered by all threads
+    """
+    items = []
+    for graph in buffers():
+        while not graph.empty():
+            items.append(graph.get())
+    if items:
+        execute_batch(items, "explicit")
+
+
+@synchronized
+def buff_drop_all():
+    """
+        Drop the commands buffered by all threads without executing them,
+        since they were buffered for a server the client is no longer
+        connected to
+    """
+    for graph in buffers():
+        while not graph.empty():
+            graph.get()
 
 
-def buff_empty_partial(size):
+@synchronized
+def buff_empty_partial(size, trigger: str = "explicit"):
+    items = []
     while q.qsize() > size:
-        return q.get().execute()
+        items.append(q.get())
+    if items:
+        replies = execute_batch(items, trigger)
+        return replies[-1] if replies else None
+
+def wait_for_in_flight(items: list) -> None:
+    """
+        Wait, without holding state_lock, until the items other threads have
+        in flight that the items must follow are completed: those writing a
+        pdarray the items use, and those using a pdarray the items write
+    """
+    reads = {name for item in items for name in item.reads}
+    writes = {name for item in items for name in item.writes}
 
+    def blocked() -> bool:
+        thread = threading.get_ident()
+        return any(owner != thread and (writes.intersection(other.operands)
+                                        or reads.intersection(other.writes))
+                   for other, owner in in_flight.items())
+
+    with state_lock:
+        while blocked():
+            in_flight_done.wait()
+
+
+@synchronized
 def find_last(arr):
     """
-        Find all usages of an array in the current buffer
+        Find all usages of an array in the buffers of all threads, and in
+        the items in flight
     """
     ret = False
-    for q_elem in reversed(list(q.queue)):
-        if (arr.name in q_elem.args.split(" ")):
+    users = [user for graph in buffers() for user in graph.users(arr.name)]
+    # including the item in flight creating the array, which parks it once
+    # its server-side name is known
+    users.extend(item for item in in_flight if arr.name in item.operands)
+    for q_elem in reversed(users):
+        if (arr.name in q_elem.args_list or q_elem in in_flight):
             q_elem.my_pd_array.append((arr.name, arr.dtype, arr.size))
             if (arr.name not in names_to_number_of_live_references.keys()):
                 names_to_number_of_live_references[arr.name] = 1
@@ -901,68 +2875,607 @@ def find_last(arr):
             ret = True
     return ret
 
+@synchronized
 def delete_from_args_map(arrName: str):
     """
         Delete an array from all the dicionaries (call with the destrcutor)
     """
-    # try:
     logger.debug('deleting pdarray with name {}'.format(arrName))
-    # delete all things that are in same arguments
     if (arrName in names_to_number_of_live_references.keys()):
         names_to_number_of_live_references[arrName] = names_to_number_of_live_references[arrName] - 1
     if (arrName in names_to_number_of_live_references.keys() and names_to_number_of_live_references[arrName]!=0):
         return False
-    all_deletions = []
-    keys = []
-    for key in args_to_id.keys():
-        bris = key.split(":")
-        if (arrName in bris):
-            if (args_to_id[key]() is not None):
-                all_deletions.append(args_to_id[key]())
-                keys.append(key)
-
-    # keys = []
-
-    if (arrName in id_to_args.keys()):
-        for nes in id_to_args[arrName]:
-            if nes in args_to_id.keys():
-                del args_to_id[nes]
-        del id_to_args[arrName]
-
-    for dels in all_deletions:
-        for key in args_to_id.keys():
-            bris = key.split(":")
-            if (dels.name in bris):
-                all_deletions.append(args_to_id[key]())
-                keys.append(key)
+    forget_common_subexpressions(arrName)
+    versions.pop(arrName, None)
+    failed_arrays.pop(arrName, None)
+    return True
+
+
+def forget_common_subexpressions(arrName: str) -> None:
+    """
+        Delete the arguments the array is the result or an operand of, in
+        O(number of such arguments). The results of deleted arguments keep
+        the arguments they are operands of, since they still hold. The
+        cached permutations sorting the array are released.
+    """
+    for key in id_to_args.pop(arrName, []) + list(operand_to_args.pop(arrName, ())):
+        if args_to_id.pop(key, None) is None:
+            continue
+        for token in key.split(":"):
+            if is_temporary(token):
+                keys = operand_to_args.get(token.rpartition("@")[0])
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del operand_to_args[token.rpartition("@")[0]]
+    release_permutations(arrName)
+
+
+@synchronized
+def record_update(arrName: str) -> None:
+    """
+        Record an in-place update of the array: bump its version, so the
+        arguments recorded for its previous value no longer match, and
+        delete them
+    """
+    versions[arrName] = versions.get(arrName, 0) + 1
+    # a permutation updated in place no longer sorts its keys
+    sorted_by.pop(arrName, None)
+    forget_common_subexpressions(arrName)
 
+
+def versioned_key(key: str) -> str:
+    """
+        Return the key with the version of each pdarray operand appended to
+        its name, e.g. "+:id_1@0:id_2@3"
+    """
+    return ":".join("{}@{}".format(token, versions.get(token, 0)) if is_temporary(token) else token
+                    for token in key.split(":"))
+
+
+def expression_key(cmd: str, args: str) -> str:
+    """
+        Return the structural key of the result of a command in CSE_COMMANDS:
+        the command and its space-delimited args joined by ":", the way
+        binop results are keyed by "op:operand:operand"
+    """
+    return ":".join([cmd] + args.split())
+
+
+@synchronized
+def record_common_subexpression(arr, *keys: str) -> None:
+    """
+        Record the pdarray as the result of the expression keys, until it or
+        one of the operands named in the keys is deleted or updated in place.
+        The keys are recorded with the current versions of the operands.
+    """
+    ref = weakref.ref(arr)
+    if arr.name not in id_to_args:
+        id_to_args[arr.name] = []
     for key in keys:
-        if (key in args_to_id.keys()):
-            #pass
-            del args_to_id[key]
-    return True
-    
+        versioned = versioned_key(key)
+        args_to_id[versioned] = ref
+        id_to_args[arr.name].append(versioned)
+        if key.split(":", 1)[0] in PERMUTATION_COMMANDS:
+            sorted_by[arr.name] = versioned
+        for token in key.split(":"):
+            if is_temporary(token):
+                operand_to_args[token].add(versioned)
+
+
+@synchronized
+def find_common_subexpression(key: str, outputs: int = 0):
+    """
+        Return a new pdarray sharing the array of the live pdarray already
+        computed by the "op:operand:operand" or expression_key key (see
+        share), or None. The results of commands creating several pdarrays
+        are recorded as "key:index" and are returned as a tuple of the given
+        number of outputs, if they all live.
+    """
+    if outputs:
+        refs = [args_to_id.get(versioned_key("{}:{}".format(key, index))) for index in range(outputs)]
+        arrs = tuple(ref() if ref is not None else None for ref in refs)
+        hit = all(arr is not None for arr in arrs)
+        if hit:
+            arrs = tuple(share(arr) for arr in arrs)
+            hit = all(arr is not None for arr in arrs)
+        instrumentation.record_lookup("cse", hit)
+        if not hit:
+            return None
+        cse_hits.append((key, "+".join(arr.name for arr in arrs if arr is not None)))
+        return arrs
+    ref = args_to_id.get(versioned_key(key))
+    arr = ref() if ref is not None else None
+    if arr is not None:
+        arr = share(arr)
+    instrumentation.record_lookup("cse", arr is not None)
+    if arr is not None:
+        cse_hits.append((key, arr.name))
+    return arr
+
+
+def materialize(arrName: str) -> Optional[str]:
+    """
+        Return the server-side name of the pdarray, executing the commands
+        any thread buffered to compute it and waiting for those other threads
+        have in flight, or None if the calling thread has it in flight, like
+        the tasks of the asyncio client
+    """
+    for graph in buffers():
+        producer = graph.producers.get(arrName)
+        if producer is not None:
+            items: List[BufferItem] = []
+            collect_with_dependencies(producer, items, graph)
+            execute_batch(items, "dependency")
+    thread = threading.get_ident()
+    while any(owner != thread and arrName in item.writes for item, owner in in_flight.items()):
+        in_flight_done.wait()
+    if any(arrName in item.writes for item in in_flight):
+        return None
+    return client_to_server_names.get(arrName)
+
+
+@synchronized
+def share(arr):
+    """
+        Return a new pdarray sharing the server-side array of the pdarray,
+        computed first if it is still buffered, so that updating either in
+        place leaves the other as is (see unshare), or None if it cannot be
+        computed yet
+    """
+    from arkouda.pdarrayclass import create_pdarray_with_name
+    name = materialize(arr.name)
+    if name is None:
+        return None
+    alias = create_pdarray_with_name(name, cmd="", cmd_args="", mydtype=arr.dtype, size=arr.size,
+                                     ndim=arr.ndim, shape=arr.shape, itemsize=arr.itemsize)
+    alias.properties = dict(arr.properties)
+    shared_arrays.setdefault(name, {arr.name}).add(alias.name)
+    return alias
+
+
+def is_shared(arrName: str) -> bool:
+    """
+        Tell whether other live pdarrays share the server-side array of the
+        pdarray
+    """
+    return client_to_server_names.get(arrName) in shared_arrays
+
+
+def release_shared(arrName: str) -> None:
+    """
+        Stop sharing the server-side array of the pdarray, which is left to
+        the others, and forget its name
+    """
+    name = client_to_server_names.pop(arrName)
+    sharing = shared_arrays[name]
+    sharing.discard(arrName)
+    if len(sharing) < 2:
+        del shared_arrays[name]
+
+
+@synchronized
+def unshare(arrName: str) -> None:
+    """
+        Give the pdarray a copy of the server-side array it shares with other
+        pdarrays, before it is updated in place
+    """
+    if not is_shared(arrName):
+        return
+    ref = names_to_weakref.get(arrName)
+    arr = ref() if ref is not None else None
+    if arr is None:
+        return
+    cmd = "[slice]"
+    repMsg = _send_request(cmd, "{} 0 {} 1".format(client_to_server_names[arrName], arr.size))
+    release_shared(arrName)
+    register_created(cmd, arrName, cast(str, repMsg))
+
 
 def check_arr(dtype, arr_size):
     # Make sure cache[dtype][arr_size] is not empty
     #print("checking", dtype, arr_size)
     return dtype in cache and arr_size in cache[dtype] and cache[dtype][arr_size]
 
+@synchronized
 def cache_array(arrName: str, arrType, arrSize):
     """
-        Cache the array to be reused (called with the destructor)
+        Cache the array to be reused (called with the destructor), evicting
+        the least recently cached arrays beyond cacheBudget. A permutation
+        whose keys are live is cached for the same sort of them instead.
     """
-    #print("cache", client_to_server_names[arrName], arrType)
+    global cached_bytes
+    key = sorted_by.pop(arrName, None)
     if (sys.meta_path is None):
         return
-    if arrName not in client_to_server_names.keys():
+    if is_shared(arrName):
+        # the array lives on in the pdarrays sharing it
+        release_shared(arrName)
         return
-    cache[arrType][arrSize].add(client_to_server_names[arrName])
-    client_to_server_names.pop(arrName)
-
+    if arrName not in client_to_server_names.keys() or arrType not in cache:
+        return
+    name = client_to_server_names.pop(arrName)
+    if (key is not None and permutation_cache_enabled and key not in permutations
+            and sort_keys_live(key)):
+        permutations[key] = name
+        permutation_keys[name] = key
+        for token in key.split(":"):
+            if is_temporary(token):
+                permutation_operands[token.rpartition("@")[0]].add(key)
+    else:
+        cache[arrType][arrSize].add(name)
+    cache_lru[name] = (arrType, arrSize)
+    cached_bytes += int(arrSize) * arrType.itemsize
+    cache_counts["parked"] += 1
+    cache_counts["bytes_parked"] += int(arrSize) * arrType.itemsize
+    if cached_bytes > cacheBudget:
+        evict_cached(cached_bytes - cacheBudget)
+
+@synchronized
 def uncache_array(dtype, arr_size):
-    if check_arr(dtype, arr_size):
+    """
+        Take a cached array of the dtype and size to be reused, or return
+        None if there is none
+    """
+    global cached_bytes
+    hit = bool(check_arr(dtype, arr_size))
+    instrumentation.record_lookup("temp_cache", hit)
+    if hit:
+        record_cache_lookup(dtype, arr_size, True)
         arr = cache[dtype][arr_size].pop()
-        # print("Uncaching ", arr, arr_size)
-        # print("New cache length ", len(cache[dtype][arr_size]))
-        return arr
\ No newline at end of file
+        del cache_lru[arr]
+        cached_bytes -= int(arr_size) * dtype.itemsize
+        cache_counts["bytes_saved"] += int(arr_size) * dtype.itemsize
+        return arr
+
+
+def sort_keys_live(key: str) -> bool:
+    """
+        Tell whether the pdarrays named in the versioned expression key of a
+        sort are live, and not updated in place since
+    """
+    for token in key.split(":"):
+        if is_temporary(token):
+            name, _, version = token.rpartition("@")
+            ref = names_to_weakref.get(name)
+            if ref is None or ref() is None or versions.get(name, 0) != int(version):
+                return False
+    return True
+
+
+@synchronized
+def find_permutation(key: str) -> Optional[str]:
+    """
+        Take the cached permutation computed by the sort of the expression
+        key (see expression_key) of the current versions of its keys,
+        returning its server-side name, or None if there is none
+    """
+    global cached_bytes
+    name = permutations.pop(versioned_key(key), None)
+    cache_counts["permutation_hits" if name is not None else "permutation_misses"] += 1
+    if name is None:
+        return None
+    del permutation_keys[name]
+    dtype, size = cache_lru.pop(name)
+    cached_bytes -= int(size) * dtype.itemsize
+    cache_counts["bytes_saved"] += int(size) * dtype.itemsize
+    return name
+
+
+@synchronized
+def has_permutation(key: str) -> bool:
+    """
+        Tell whether the sort of the expression key was computed already,
+        by a live pdarray or a cached permutation
+    """
+    versioned = versioned_key(key)
+    ref = args_to_id.get(versioned)
+    return (ref is not None and ref() is not None) or versioned in permutations
+
+
+def release_permutations(arrName: str) -> None:
+    """
+        Move the cached permutations sorting the pdarray, which was deleted
+        or updated in place, to the temporaries reused by later commands
+    """
+    for key in permutation_operands.pop(arrName, ()):
+        name = permutations.pop(key, None)
+        if name is not None:
+            del permutation_keys[name]
+            dtype, size = cache_lru[name]
+            cache[dtype][size].add(name)
+
+
+def record_cache_lookup(dtype, arr_size, hit: bool) -> None:
+    """
+        Count an array of the dtype and size taken from the cache, or one
+        allocated by a command which could have stored to a cached array
+    """
+    cache_counts["hits" if hit else "misses"] += 1
+    cache_lookups[(dtype.name, int(arr_size))]["hits" if hit else "misses"] += 1
+
+
+@synchronized
+def evict_cached(nbytes: Optional[int] = None) -> None:
+    """
+        Evict the least recently cached arrays until they free nbytes, or
+        all of them if None. They are deleted on the server by delete_evicted,
+        since arrays are cached by destructors, which must not send requests.
+    """
+    global cached_bytes
+    while cache_lru and (nbytes is None or nbytes > 0):
+        name, (dtype, size) = cache_lru.popitem(last=False)
+        cache[dtype][size].discard(name)
+        freed = int(size) * dtype.itemsize
+        cached_bytes -= freed
+        if nbytes is not None:
+            nbytes -= freed
+        pending_deletes.append(name)
+        cache_counts["evicted"] += 1
+        key = permutation_keys.pop(name, None)
+        if key is not None:
+            del permutations[key]
+        cache_counts["bytes_evicted"] += freed
+
+
+@synchronized
+def delete_evicted() -> None:
+    """
+        Delete the evicted arrays on the server, in a single batch request.
+        Arrays still named by buffered commands, which may take a cached
+        array when created, are deleted once those are sent.
+    """
+    if not pending_deletes or not connected:
+        return
+    graphs = buffers()
+    names = [name for name in pending_deletes if not any(name in graph.uses for graph in graphs)]
+    if not names:
+        return
+    deleted = set(names)
+    pending_deletes[:] = [name for name in pending_deletes if name not in deleted]
+    cache_counts["deletes"] += 1
+    logger.debug('deleting {} evicted arrays'.format(len(names)))
+    try:
+        if len(names) == 1:
+            _send_request('delete', names[0])
+        else:
+            _batch_replies(cast(Union[str, List[str]], _send_request(
+                'batch', '\n'.join(_batch_line('-', 'delete', name) for name in names))))
+    except RuntimeError as e:
+        # the batch stops at an array the server no longer has
+        logger.warning('could not delete the evicted arrays: {}'.format(e))
+
+
+@synchronized
+def trim_temp_cache() -> None:
+    """
+        Called before a command: if serverMemoryBudget is set and
+        memCheckInterval has passed, evict cached arrays until get_mem_used()
+        would be within it, then delete the evicted arrays
+    """
+    global next_mem_check
+    if serverMemoryBudget is not None and cache_lru and time.monotonic() >= next_mem_check:
+        next_mem_check = time.monotonic() + memCheckInterval
+        used = get_mem_used()
+        if used > serverMemoryBudget:
+            evict_cached(used - serverMemoryBudget)
+    delete_evicted()
+
+
+def forget_temp_cache() -> None:
+    """
+        Forget the cached arrays without deleting them, e.g. since they
+        belong to a server the client is no longer connected to, with the
+        commands all threads buffered for that server
+    """
+    global cached_bytes
+    with state_lock:
+        buff_drop_all()
+        failed_arrays.clear()
+        shared_arrays.clear()
+        for sizes in cache.values():
+            sizes.clear()
+        cache_lru.clear()
+        cached_bytes = 0
+        del pending_deletes[:]
+        permutations.clear()
+        permutation_keys.clear()
+        permutation_operands.clear()
+
+
+def set_temp_cache_budget(budget: int, server_budget: Optional[int] = None,
+                          interval: float = 10.0) -> None:
+    """
+    Sets how much server memory the dead arrays the client caches for reuse
+    by later commands of the same dtype and size may take. The least
+    recently cached arrays beyond the budget are deleted on the server, in
+    a single batch request before the next command.
+
+    Parameters
+    ----------
+    budget : int
+        The bytes the cached arrays may take, 0 not to cache any. The
+        budget is ARKOUDA_CLIENT_CACHE_BUDGET, or 1 GiB, until set.
+    server_budget : int, optional
+        The server memory in use, as reported by get_mem_used(), beyond
+        which cached arrays are deleted too, defaults to None not to check it
+    interval : float, optional
+        The minimum seconds between checks of the server memory in use,
+        defaults to 10
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        Raised if a budget or the interval is negative
+    """
+    global cacheBudget, serverMemoryBudget, memCheckInterval, next_mem_check
+    if budget < 0:
+        raise ValueError('budget must be non-negative, not {}'.format(budget))
+    if server_budget is not None and server_budget < 0:
+        raise ValueError('server_budget must be non-negative, not {}'.format(server_budget))
+    if interval < 0:
+        raise ValueError('interval must be non-negative, not {}'.format(interval))
+    with state_lock:
+        cacheBudget = budget
+        serverMemoryBudget = server_budget
+        memCheckInterval = interval
+        next_mem_check = 0.0
+        if cached_bytes > cacheBudget:
+            evict_cached(cached_bytes - cacheBudget)
+
+
+def get_temp_cache_info() -> Dict[str, int]:
+    """
+    Get the state of the cache of dead arrays kept for reuse
+
+    Returns
+    -------
+    Dict[str, int]
+        The number of cached "arrays" and the "bytes" they take, the
+        "budget", and since the counts were reset: the number of arrays
+        cached ("parked"), of lookups which took a cached array ("hits") or
+        of commands which allocated a result they could have stored to a
+        cached array ("misses"), of dead temporaries
+        reused without being cached ("reused"), of buffered commands
+        rewritten to store their result to a reused array ("rewrites"), of
+        arrays "evicted" and of the "deletes" requests sending them, and the
+        "bytes_parked", "bytes_evicted" and the "bytes_saved", not allocated
+        on the server thanks to reuse. Of the cached arrays, the number of
+        "permutations" kept for the same sort of the same keys, and the
+        "permutation_hits" and "permutation_misses" of the sorts looking
+        them up.
+    """
+    with state_lock:
+        info = {"arrays": len(cache_lru), "bytes": cached_bytes, "budget": cacheBudget,
+                "permutations": len(permutations)}
+        for key in ("parked", "hits", "misses", "reused", "rewrites", "evicted", "deletes",
+                    "bytes_parked", "bytes_evicted", "bytes_saved", "permutation_hits",
+                    "permutation_misses"):
+            info[key] = cache_counts[key]
+        return info
+
+
+def get_temp_cache_lookups() -> Dict[Tuple[str, int], Dict[str, int]]:
+    """
+    Get the lookups of cached arrays by the dtype and size looked up, to
+    see which shapes of temporaries are reused and which are allocated
+
+    Returns
+    -------
+    Dict[Tuple[str, int], Dict[str, int]]
+        (dtype name, size) to the "hits" and "misses" of the lookups (see
+        get_temp_cache_info), since the counts were reset
+    """
+    with state_lock:
+        return {key: {"hits": counts["hits"], "misses": counts["misses"]}
+                for key, counts in sorted(cache_lookups.items())}
+
+
+def clear_temp_cache() -> None:
+    """
+    Delete all the cached arrays on the server, and reset the counts of
+    get_temp_cache_info and get_temp_cache_lookups. The commands buffered
+    by all threads are executed first, since they may recycle cached arrays.
+
+    Returns
+    -------
+    None
+    """
+    with state_lock:
+        buff_empty_all()
+        evict_cached()
+        delete_evicted()
+        cache_counts.clear()
+        cache_lookups.clear()
+
+
+def record_memory_sample(used: int) -> None:
+    """
+        Record the server memory in use sampled at a flush, with the bytes
+        cached at that time
+    """
+    memory_timeline.append((time.time(), used, cached_bytes))
+
+
+def enable_memory_timeline(reset: bool = False) -> None:
+    """
+    Start sampling the server memory in use at each flush of the buffer, see
+    get_memory_timeline. The sample is taken by one more command at the end
+    of the batch request sending the buffered commands, so it costs no
+    round trip unless a single command is flushed. Sampling is disabled
+    unless the ARKOUDA_CLIENT_MEMORY_TIMELINE environment variable is True.
+
+    Parameters
+    ----------
+    reset : bool, defaults to False
+        Whether to forget the samples taken before
+
+    Returns
+    -------
+    None
+    """
+    global memory_timeline_enabled
+    if reset:
+        memory_timeline.clear()
+    memory_timeline_enabled = True
+
+
+def disable_memory_timeline() -> None:
+    """
+    Stop sampling the server memory in use; the samples taken can still be
+    queried
+
+    Returns
+    -------
+    None
+    """
+    global memory_timeline_enabled
+    memory_timeline_enabled = False
+
+
+def get_memory_timeline() -> List[Tuple[float, int, int]]:
+    """
+    Get the samples of the server memory in use taken at the most recent
+    flushes, oldest first
+
+    Returns
+    -------
+    List[Tuple[float, int, int]]
+        The time of each sample, in seconds since the epoch, the bytes of
+        memory in use on the server, as get_mem_used() reports it, and the
+        bytes of those taken by the arrays cached for reuse
+    """
+    with state_lock:
+        return list(memory_timeline)
+
+
+def dump_memory_timeline(file: Union[str, TextIO], timestamps: bool = False) -> None:
+    """
+    Write the samples of get_memory_timeline, the bytes of server memory in
+    use, one per line like max_live.dat
+
+    Parameters
+    ----------
+    file : Union[str, TextIO]
+        The path of the file to append to, or a file object
+    timestamps : bool, defaults to False
+        Whether each line starts with the time of the sample, and ends with
+        the bytes taken by cached arrays
+
+    Returns
+    -------
+    None
+    """
+    if timestamps:
+        lines = ''.join('{:.6f} {} {}\n'.format(*sample) for sample in get_memory_timeline())
+    else:
+        lines = ''.join('{}\n'.format(sample[1]) for sample in get_memory_timeline())
+    if isinstance(file, str):
+        with open(file, 'a') as f:
+            f.write(lines)
+    else:
+        file.write(lines)
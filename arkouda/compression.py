@@ -0,0 +1,76 @@
+import zlib
+from typing import Callable, Dict, List, NamedTuple, Union
+
+__all__ = ["codecs", "available_codecs", "compress", "decompress"]
+
+"""
+The codecs compressing the binary payloads of array transfers on the wire
+(see ak.client.set_compression). zlib is always available; lz4 and zstd
+require the lz4 and zstandard packages, and a server built with them.
+"""
+class Codec(NamedTuple):
+    compress: Callable[[memoryview], bytes]
+    decompress: Callable[[Union[bytes, memoryview], int], bytes]
+
+
+# transfers are bandwidth-bound, so the fastest levels gain the most
+codecs: Dict[str, Codec] = {
+    'zlib': Codec(compress=lambda data: zlib.compress(data, 1),
+                  decompress=lambda data, nbytes: zlib.decompress(data, bufsize=nbytes))
+}
+
+try:
+    import lz4.block  # type: ignore
+    # raw blocks, since the size of the values is known on both ends
+    codecs['lz4'] = Codec(
+        compress=lambda data: lz4.block.compress(data, store_size=False),
+        decompress=lambda data, nbytes: lz4.block.decompress(data, uncompressed_size=nbytes))
+except ImportError:
+    pass
+
+try:
+    import zstandard  # type: ignore
+    codecs['zstd'] = Codec(
+        compress=lambda data: zstandard.ZstdCompressor(level=1).compress(data),
+        decompress=lambda data, nbytes: zstandard.ZstdDecompressor().decompress(
+            data, max_output_size=nbytes))
+except ImportError:
+    pass
+
+
+def available_codecs() -> List[str]:
+    """
+    Return the codecs the client can compress transfers with
+
+    Returns
+    -------
+    List[str]
+        The names of the codecs, e.g. ['zlib', 'lz4']
+    """
+    return list(codecs)
+
+
+def compress(codec: str, data: memoryview) -> bytes:
+    """
+    Compress the bytes of data with codec
+    """
+    return codecs[codec].compress(data)
+
+
+def decompress(codec: str, data: Union[bytes, memoryview], nbytes: int) -> bytes:
+    """
+    Decompress data compressed with codec into the nbytes bytes of the values
+
+    Raises
+    ------
+    RuntimeError
+        Raised if data does not decompress into nbytes bytes
+    """
+    try:
+        values = codecs[codec].decompress(data, nbytes)
+    except Exception as e:
+        raise RuntimeError('Unable to decompress {} bytes with {}: {}'.format(
+            len(data), codec, e))
+    if len(values) != nbytes:
+        raise RuntimeError('Expected {} bytes but received {}'.format(nbytes, len(values)))
+    return values
@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+__all__ = ["FlushPolicy", "CountFlushPolicy", "BytesFlushPolicy", "TimeFlushPolicy",
+           "AdaptiveFlushPolicy", "AnyFlushPolicy"]
+
+
+class FlushPolicy(ABC):
+    """
+    Decides when the buffer of lazily evaluated commands is flushed to the
+    server. The policy is consulted every time a command is buffered; commands
+    whose value is needed flush what they depend on regardless of the policy.
+
+    Set the policy with ak.client.set_flush_policy.
+    """
+
+    @abstractmethod
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        """
+        Decide whether the buffer is to be flushed
+
+        Parameters
+        ----------
+        buffer : BufferGraph
+            The buffer a command was just added to
+
+        Returns
+        -------
+        Optional[Tuple[str, int]]
+            The name of the trigger and the number of most recent commands to
+            leave buffered, or None if the buffer is not to be flushed
+        """
+        pass
+
+    def observe(self, stats: Dict[str, int]) -> None:
+        """
+        Called after every flush with what the optimizer found in the batch:
+        the numbers of items, eliminated, fused and reused (items which
+        store their result to a dead temporary via a Store command), the
+        estimated bytes allocated on the server with and without the output
+        buffers planned over the batch (peak_bytes and peak_bytes_greedy), and
+        the trigger which caused the flush
+        """
+        pass
+
+
+class CountFlushPolicy(FlushPolicy):
+    """
+    Flushes the oldest commands once max_ops commands are buffered, leaving
+    the max_ops - 1 most recent ones buffered. By default max_ops is the
+    maxsize of the buffer.
+    """
+
+    def __init__(self, max_ops: Optional[int] = None) -> None:
+        self.max_ops = max_ops
+
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        max_ops = buffer.maxsize if self.max_ops is None else self.max_ops
+        if 0 < max_ops <= len(buffer):
+            return 'count', max_ops - 1
+        return None
+
+
+class BytesFlushPolicy(FlushPolicy):
+    """
+    Flushes the whole buffer once the pdarrays created by the buffered
+    commands (size times itemsize) add up to max_bytes
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        if buffer.pending_bytes >= self.max_bytes:
+            return 'bytes', 0
+        return None
+
+
+class TimeFlushPolicy(FlushPolicy):
+    """
+    Flushes the whole buffer once its oldest command has been buffered for
+    max_seconds. The age is checked when commands are buffered, so an idle
+    buffer is flushed by the next command or value needed.
+    """
+
+    def __init__(self, max_seconds: float) -> None:
+        self.max_seconds = max_seconds
+
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        if not buffer.empty() and buffer.age() >= self.max_seconds:
+            return 'time', 0
+        return None
+
+
+class AdaptiveFlushPolicy(FlushPolicy):
+    """
+    Flushes the whole buffer once window commands are buffered. The window
+    starts at min_ops and is multiplied by growth, up to max_ops, after every
+    flush in which the optimizer eliminated, fused or reused something; it is
+    divided by growth, down to min_ops, after a full window was flushed with
+    nothing to optimize.
+    """
+
+    def __init__(self, min_ops: int = 2, max_ops: int = 256, growth: int = 2) -> None:
+        if not 0 < min_ops <= max_ops or growth < 2:
+            raise ValueError('require 0 < min_ops <= max_ops and growth >= 2')
+        self.min_ops = min_ops
+        self.max_ops = max_ops
+        self.growth = growth
+        self.window = min_ops
+
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        if len(buffer) >= self.window:
+            return 'adaptive', 0
+        return None
+
+    def observe(self, stats: Dict[str, int]) -> None:
+        if stats['eliminated'] + stats['fused'] + stats['reused'] > 0:
+            self.window = min(self.max_ops, self.window * self.growth)
+        elif stats['trigger'] == 'adaptive':
+            self.window = max(self.min_ops, self.window // self.growth)
+
+
+class AnyFlushPolicy(FlushPolicy):
+    """
+    Flushes as soon as one of its policies would, e.g. by op count or by
+    bytes, whichever comes first
+    """
+
+    def __init__(self, *policies: FlushPolicy) -> None:
+        self.policies = policies
+
+    def check(self, buffer) -> Optional[Tuple[str, int]]:
+        for policy in self.policies:
+            decision = policy.check(buffer)
+            if decision is not None:
+                return decision
+        return None
+
+    def observe(self, stats: Dict[str, int]) -> None:
+        for policy in self.policies:
+            policy.observe(stats)
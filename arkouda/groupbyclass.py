@@ -180,7 +180,9 @@ class GroupBy:
                                            effectiveKeys,
                                            ' '.join(keynames),
                                            ' '.join(keytypes))
-        repMsg = generic_msg(cmd=cmd, args=args)
+        # the segments and unique key indices are read from the reply
+        repMsg = generic_msg(cmd=cmd, args=args, return_value_needed=True,
+                             my_pdarray=[self.permutation] + [k for k in keyobjs if isinstance(k, pdarray)])
         segAttr, uniqAttr = cast(str, repMsg).split("+")
         self.logger.debug('{},{}'.format(segAttr, uniqAttr))
         self.segments = cast(pdarray, create_pdarray(repMsg=cast(str,segAttr)))
@@ -225,7 +227,7 @@ class GroupBy:
         '''
         cmd = "countReduction"
         args = "{} {}".format(cast(pdarray, self.segments).name, self.size)
-        repMsg = generic_msg(cmd=cmd, args=args)
+        repMsg = generic_msg(cmd=cmd, args=args, return_value_needed=True, my_pdarray=[self.segments])
         self.logger.debug(repMsg)
         return self.unique_keys, create_pdarray(repMsg)
     
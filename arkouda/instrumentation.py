@@ -0,0 +1,354 @@
+import json, math, os, threading, time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO, Union
+
+__all__ = ["enable_instrumentation", "disable_instrumentation", "reset_instrumentation",
+           "instrumented", "get_instrumentation", "instrumentation_dataframe",
+           "dump_instrumentation"]
+
+# the phases of a command timed on the client: building the buffered command
+# from its args, translating client-side names to server names, encoding the
+# request, waiting for the reply (network and server) and decoding the reply
+PHASES = ("format", "transform_args", "serialize", "wait", "parse")
+
+# whether commands are instrumented, see enable_instrumentation
+enabled = os.getenv('ARKOUDA_CLIENT_INSTRUMENTATION', 'False') == 'True'
+
+lock = threading.Lock()
+
+
+class Histogram:
+    """
+    Histogram of durations with power-of-two buckets from one microsecond,
+    so that recording is O(1) and the quantiles are accurate to a factor of 2
+
+    Attributes
+    ----------
+    count : int
+        The number of durations recorded
+    total : float
+        Their sum in seconds
+    min : float
+        The shortest duration, in seconds
+    max : float
+        The longest duration, in seconds
+    buckets : Counter
+        Number of durations by bucket: durations in bucket b are at most
+        2**b microseconds, and longer than 2**(b-1) if b > 0
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: Counter = Counter()
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        micros = seconds * 1e6
+        self.buckets[math.ceil(math.log2(micros)) if micros > 1 else 0] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns the upper bound of the bucket of the q-quantile, in seconds,
+        capped by the longest duration
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                break
+        return min(2.0 ** bucket / 1e6, self.max)
+
+    def asdict(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        return {"count": self.count, "total": self.total,
+                "mean": self.total / self.count if self.count else 0.0,
+                "min": self.min if self.count else 0.0, "max": self.max,
+                "p50": self.quantile(0.5), "p90": self.quantile(0.9),
+                "p99": self.quantile(0.99),
+                "buckets": {"{:g}".format(2.0 ** bucket / 1e6): n
+                            for bucket, n in sorted(self.buckets.items())}}
+
+
+class CommandStats:
+    """
+    What was recorded for one command: a Histogram per phase, the number
+    of requests sent for it on their own and the bytes of those requests
+    and their replies
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, Histogram] = defaultdict(Histogram)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def asdict(self) -> Dict:
+        return {"requests": self.requests, "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "phases": {phase: self.phases[phase].asdict()
+                           for phase in PHASES if phase in self.phases}}
+
+
+commands: Dict[str, CommandStats] = defaultdict(CommandStats)
+# per trigger, the number of flushes and the sums of what the optimizer found
+flushes: Dict[str, Counter] = defaultdict(Counter)
+# hits and misses of the common subexpression lookups and of the temp cache
+lookups: Dict[str, Counter] = defaultdict(Counter)
+started = time.time()
+
+
+class RequestTimer:
+    """
+    Times the phases of one request, each lap recording the time since the
+    previous one under the command
+    """
+
+    def __init__(self, cmd: str) -> None:
+        self.cmd = cmd
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        record(self.cmd, phase, now - self.last)
+        self.last = now
+
+    def restart(self) -> None:
+        self.last = time.perf_counter()
+
+    def count_sent(self, frames: List) -> None:
+        sent = sum(memoryview(frame).nbytes for frame in frames)
+        with lock:
+            stats = commands[self.cmd]
+            stats.requests += 1
+            stats.bytes_sent += sent
+
+    def count_received(self, reply) -> None:
+        received = memoryview(reply).nbytes
+        with lock:
+            commands[self.cmd].bytes_received += received
+
+
+class NullTimer:
+    """
+    The timer of requests made while instrumentation is disabled
+    """
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def restart(self) -> None:
+        pass
+
+    def count_sent(self, frames: List) -> None:
+        pass
+
+    def count_received(self, reply) -> None:
+        pass
+
+
+null_timer = NullTimer()
+
+
+def timer(cmd: str) -> Union[RequestTimer, NullTimer]:
+    """
+    Returns the timer of a request for cmd, started now, which does nothing
+    unless instrumentation is enabled
+    """
+    return RequestTimer(cmd) if enabled else null_timer
+
+
+def record(cmd: str, phase: str, seconds: float) -> None:
+    """
+    Record that a phase of the command took seconds
+    """
+    with lock:
+        commands[cmd].phases[phase].add(seconds)
+
+
+def record_flush(stats: Dict[str, Union[str, int]]) -> None:
+    """
+    Record a flush of the buffer, given the stats of client.batch_requests
+    """
+    if not enabled:
+        return
+    with lock:
+        counts = flushes[str(stats["trigger"])]
+        counts["flushes"] += 1
+        for key in ("items", "eliminated", "fused", "reused", "peak_bytes", "peak_bytes_greedy"):
+            if key in stats:
+                counts[key] += int(stats[key])
+
+
+def record_lookup(kind: str, hit: bool) -> None:
+    """
+    Record a hit or miss of a lookup: "cse" for common subexpressions,
+    "temp_cache" for server-side arrays cached for reuse
+    """
+    if not enabled:
+        return
+    with lock:
+        lookups[kind]["hits" if hit else "misses"] += 1
+
+
+def enable_instrumentation(reset: bool = False) -> None:
+    """
+    Start recording, for each command, how long the client spends in each
+    phase of it (see get_instrumentation), the bytes it sends and receives,
+    what caused the flushes of the buffer, and how often the common
+    subexpression and temp cache lookups hit. Instrumentation is disabled
+    unless the ARKOUDA_CLIENT_INSTRUMENTATION environment variable is True,
+    and the hooks do nothing while it is disabled.
+
+    Parameters
+    ----------
+    reset : bool, defaults to False
+        Whether to forget what was recorded before
+
+    Returns
+    -------
+    None
+    """
+    global enabled
+    if reset:
+        reset_instrumentation()
+    enabled = True
+
+
+def disable_instrumentation() -> None:
+    """
+    Stop recording; what was recorded can still be queried
+
+    Returns
+    -------
+    None
+    """
+    global enabled
+    enabled = False
+
+
+def reset_instrumentation() -> None:
+    """
+    Forget what was recorded
+
+    Returns
+    -------
+    None
+    """
+    global started
+    with lock:
+        commands.clear()
+        flushes.clear()
+        lookups.clear()
+        started = time.time()
+
+
+@contextmanager
+def instrumented(reset: bool = True) -> Iterator[None]:
+    """
+    Context manager within which instrumentation is enabled, by default
+    recording afresh
+
+    Examples
+    --------
+    >>> with ak.instrumented():
+    ...     a = ak.arange(0, 10**6, 1)
+    ...     (a * a).sum()
+    >>> ak.get_instrumentation()['commands']['batch']['requests']
+    1
+    """
+    saved = enabled
+    enable_instrumentation(reset)
+    try:
+        yield
+    finally:
+        if not saved:
+            disable_instrumentation()
+
+
+def get_instrumentation() -> Dict:
+    """
+    Get what was recorded since instrumentation was last reset
+
+    Returns
+    -------
+    Dict
+        "commands": per command, the number of "requests" sent for it on
+        their own, "bytes_sent" and "bytes_received" by those requests, and
+        per phase the statistics of a histogram of its durations in seconds
+        (count, total, mean, min, max, p50, p90, p99 and the bucket counts).
+        The phases are "format" (building the buffered command),
+        "transform_args", "serialize", "wait" and "parse"; buffered commands
+        are sent within "batch" requests.
+        "flushes": per trigger, the number of flushes and the numbers of
+        items, eliminated, fused and reused items, and the sums of the
+        estimated bytes the flushes allocated on the server, with and without
+        their output buffers planned over the batch ("peak_bytes" and
+        "peak_bytes_greedy").
+        "cse" and "temp_cache": the hits, misses and hit_rate of the lookups.
+        "enabled" and "elapsed", the seconds since the last reset.
+    """
+    with lock:
+        result = {"enabled": enabled, "elapsed": time.time() - started,
+                  "commands": {cmd: stats.asdict() for cmd, stats in sorted(commands.items())},
+                  "flushes": {trigger: dict(counts) for trigger, counts in sorted(flushes.items())}}
+        for kind in ("cse", "temp_cache"):
+            hits, misses = lookups[kind]["hits"], lookups[kind]["misses"]
+            result[kind] = {"hits": hits, "misses": misses,
+                            "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+    return result
+
+
+def instrumentation_dataframe():
+    """
+    Get the recorded phase durations as a pandas DataFrame
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per command and phase, with the histogram statistics of
+        get_instrumentation (without the buckets) and the requests and bytes
+        of the command
+    """
+    import pandas as pd  # type: ignore
+    rows = []
+    for cmd, stats in get_instrumentation()["commands"].items():
+        for phase, histogram in stats["phases"].items():
+            row = {"cmd": cmd, "phase": phase}
+            row.update((key, value) for key, value in histogram.items() if key != "buckets")
+            row.update(requests=stats["requests"], bytes_sent=stats["bytes_sent"],
+                       bytes_received=stats["bytes_received"])
+            rows.append(row)
+    columns = ["cmd", "phase", "count", "total", "mean", "min", "max", "p50", "p90", "p99",
+               "requests", "bytes_sent", "bytes_received"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def dump_instrumentation(file: Union[str, TextIO], indent: Optional[int] = 2) -> None:
+    """
+    Write get_instrumentation() as JSON
+
+    Parameters
+    ----------
+    file : Union[str, TextIO]
+        The path of the file to write, or a file object
+    indent : int, optional
+        The indentation of the JSON, defaults to 2
+
+    Returns
+    -------
+    None
+    """
+    if isinstance(file, str):
+        with open(file, 'w') as f:
+            json.dump(get_instrumentation(), f, indent=indent)
+    else:
+        json.dump(get_instrumentation(), file, indent=indent)
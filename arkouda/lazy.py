@@ -0,0 +1,261 @@
+import copy
+import json
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from typeguard import typechecked
+from arkouda import client
+from arkouda.pdarrayclass import pdarray
+
+__all__ = ["lazy", "compute", "explain", "export_plan"]
+
+# number of lazy() scopes currently entered
+lazy_depth = 0
+
+
+@contextmanager
+def lazy() -> Iterator[None]:
+    """
+    Context manager within which commands are only buffered, whatever the
+    flush policy, so that the optimizer sees the whole scope at once.
+    Commands still run when their value is needed, e.g. by a reduction or a
+    transfer to the client, and the remaining buffer is executed when the
+    outermost scope exits.
+
+    Examples
+    --------
+    >>> with ak.lazy():
+    ...     a = ak.arange(0, 10, 1)
+    ...     b = (a * a) + 1
+    ...     ak.explain()
+    >>> b.sum()
+    295
+    """
+    global lazy_depth
+    saved = client.flush_policy
+    client.flush_policy = None
+    lazy_depth += 1
+    try:
+        yield
+    finally:
+        lazy_depth -= 1
+        client.flush_policy = saved
+        if lazy_depth == 0:
+            client.buff_empty()
+
+
+@typechecked
+def compute(*arrays : pdarray) -> None:
+    """
+    Execute the buffered commands the given pdarrays depend on, so that
+    they are materialized on the server. The commands are optimized and
+    sent as one batch.
+
+    Parameters
+    ----------
+    arrays : pdarray
+        The pdarrays to materialize
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    TypeError
+        Raised if an argument is not a pdarray
+    """
+    with client.state_lock:
+        items : List[client.BufferItem] = []
+        for arr in arrays:
+            item = client.q.producers.get(arr.name)
+            if item is not None:
+                client.collect_with_dependencies(item, items)
+        if items:
+            client.execute_batch(items)
+
+
+def _plan() -> Dict:
+    """
+    Dry-run the optimizer over the buffer, without executing or changing
+    anything, and describe what the next flush of the whole buffer does.
+    The output buffers are assigned by plan_buffers over the whole
+    sequence, as the flush does, from the current temporary cache.
+    """
+    items = list(client.q.nodes)
+    index = {item: position for position, item in enumerate(items)}
+    empty = client.BufferGraph()
+    dead = set(client.find_dead_operations(items, empty))
+    live = [item for item in items if item not in dead]
+    rewritten, absorbed = client.plan_fusion(live, empty)
+
+    # inputs of each item once the producers it absorbs are folded in
+    inputs = {item: list(item.my_pd_array) for item in live}
+    fused_into = dict()
+    for source in sorted(absorbed):
+        producer, consumer = live[source], live[absorbed[source]]
+        fused_into[producer] = consumer
+        inputs[consumer] = [info for info in inputs[consumer]
+                            if info[0] != producer.pdarray_id] + inputs[producer]
+
+    references = dict(client.names_to_number_of_live_references)
+    for item in dead:
+        for info in item.my_pd_array:
+            references[info[0]] = references.get(info[0], 1) - 1
+    cached: Counter = Counter()
+    for dtype, sizes in client.cache.items():
+        for size, names in sizes.items():
+            cached[(dtype, size)] += len(names)
+
+    # the items as the flush sends them, copied so the buffer is left as is
+    sent = dict()
+    for position, item in enumerate(live):
+        if item in fused_into:
+            continue
+        copied = copy.copy(item)
+        copied.my_pd_array = inputs[item]
+        if position in rewritten:
+            copied.cmd = 'fused'
+            copied.args = '{} {}'.format(item.type.name, ' '.join(rewritten[position]))
+        sent[item] = copied
+    buffers, _ = client.plan_buffers(list(sent.values()), references, cached,
+                                     within_batch=client.buffer_planning_enabled)
+
+    nodes = []
+    for position, item in enumerate(items):
+        args = item.args if isinstance(item.args, str) else '<{} byte payload>'.format(len(item.args))
+        node = {'index': position,
+                'outputs': list(item.outputs),
+                'cmd': item.cmd,
+                'args': args,
+                'status': 'pending',
+                'fused_into': None,
+                'optimized_cmd': item.cmd,
+                'optimized_args': args,
+                'reuses': None,
+                'dependencies': sorted(index[dep()] for dep in item.dependencies
+                                       if dep() is not None and dep() in index)}
+        nodes.append(node)
+        if item in dead:
+            node['status'] = 'eliminated'
+            continue
+        if item in fused_into:
+            node['status'] = 'fused'
+            node['fused_into'] = index[fused_into[item]]
+            continue
+        cmd, args = sent[item].cmd, node['args']
+        if cmd == 'fused':
+            args = sent[item].args
+        reuse = buffers.get(sent[item])
+        if reuse is not None:
+            info, from_cache = reuse
+            if from_cache:
+                node['reuses'] = 'cached {} array of size {}'.format(info[1], info[2])
+            else:
+                node['reuses'] = info[0]
+            cmd += 'Store'
+        node['optimized_cmd'] = cmd
+        node['optimized_args'] = args
+
+    return {'nodes': nodes,
+            'cse_hits': [{'key': key, 'id': name} for key, name in client.cse_hits]}
+
+
+def _plan_to_text(plan: Dict) -> str:
+    nodes = plan['nodes']
+    statuses = Counter(node['status'] for node in nodes)
+    lines = ['buffered plan: {} commands, {} fused, {} eliminated, {} reusing temporaries, '
+             '{} CSE hits'.format(len(nodes), statuses['fused'], statuses['eliminated'],
+                                  sum(1 for node in nodes if node['reuses'] is not None),
+                                  len(plan['cse_hits']))]
+    for node in nodes:
+        line = '  [{}] {} = {} {}'.format(node['index'], ','.join(node['outputs']) or '-',
+                                          node['cmd'], node['args'])
+        if node['status'] == 'eliminated':
+            line += '  (eliminated: result never observed)'
+        elif node['status'] == 'fused':
+            line += '  (fused into [{}])'.format(node['fused_into'])
+        else:
+            if (node['optimized_cmd'], node['optimized_args']) != (node['cmd'], node['args']):
+                line += '\n      -> {} {}'.format(node['optimized_cmd'], node['optimized_args'])
+            if node['reuses'] is not None:
+                line += '\n      -> stores into {}'.format(node['reuses'])
+        if node['dependencies']:
+            line += '  after {}'.format(node['dependencies'])
+        lines.append(line)
+    for hit in plan['cse_hits']:
+        lines.append('  CSE hit: {} -> {}'.format(hit['key'].replace(':', ' '), hit['id']))
+    return '\n'.join(lines)
+
+
+def _plan_to_dot(plan: Dict) -> str:
+    styles = {'pending': 'solid', 'fused': 'dotted', 'eliminated': 'dashed'}
+    lines = ['digraph plan {', '  node [shape=box];']
+    for node in plan['nodes']:
+        label = '{} = {} {}'.format(','.join(node['outputs']) or '-',
+                                    node['optimized_cmd'], node['optimized_args'])
+        if node['reuses'] is not None:
+            label += '\\nstores into {}'.format(node['reuses'])
+        lines.append('  n{} [label={}, style={}];'.format(node['index'], json.dumps(label),
+                                                          styles[node['status']]))
+        for dependency in node['dependencies']:
+            lines.append('  n{} -> n{};'.format(dependency, node['index']))
+        if node['fused_into'] is not None:
+            lines.append('  n{} -> n{} [style=dotted, label="fused"];'.format(node['index'],
+                                                                             node['fused_into']))
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def explain() -> None:
+    """
+    Print the buffered commands as the optimizer will execute them: which
+    commands are eliminated, which are fused into a single kernel, which
+    store their result to a reused temporary and which expressions were
+    answered from the common subexpression cache.
+    Nothing is executed.
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    export_plan
+    """
+    print(_plan_to_text(_plan()))
+
+
+@typechecked
+def export_plan(format : str = 'json', filename : Optional[str] = None) -> str:
+    """
+    Export the optimized DAG of buffered commands, as printed by explain().
+    Nothing is executed.
+
+    Parameters
+    ----------
+    format : str
+        'json' or 'dot' (Graphviz), defaults to 'json'
+    filename : str, optional
+        Path of a file to also write the export to
+
+    Returns
+    -------
+    str
+        The exported plan
+
+    Raises
+    ------
+    ValueError
+        Raised if the format is not 'json' or 'dot'
+    """
+    if format == 'json':
+        exported = json.dumps(_plan(), indent=2)
+    elif format == 'dot':
+        exported = _plan_to_dot(_plan())
+    else:
+        raise ValueError("format must be 'json' or 'dot', not {}".format(format))
+    if filename is not None:
+        with open(filename, 'w') as f:
+            f.write(exported)
+    return exported
@@ -1,7 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict
+from typing import Dict, List, NamedTuple, Tuple, Union
+import functools
+import struct
 
 """
 The MessageFormat enum provides controlled vocabulary for the message
@@ -115,6 +117,21 @@ class RequestMessage():
                 'format': str(self.format),
                 'args' : args}
 
+    def ascompact(self) -> bytes:
+        """
+        Encodes the RequestMessage in the compact binary form, to which
+        the binary payload of the request, if any, is appended.
+
+        Returns
+        -------
+        bytes
+            The compact request
+        """
+        fields = [self.user.encode(), (self.token or '').encode(), self.cmd.encode(),
+                  (self.args or '').encode()]
+        code = 1 if self.format == MessageFormat.BINARY else 0
+        return b''.join([_COMPACT_REQUEST.pack(COMPACT_MAGIC, code, *map(len, fields))] + fields)
+
 '''
 The ReplyMessage class encapsulates the data and metadata corresponding to
 a message returned by the Arkouda server
@@ -155,3 +172,143 @@ class ReplyMessage():
                         msgType=MessageType(values['msgType']), user=values['user'])
         except KeyError as ke:
             raise ValueError('values dict missing {} field'.format(ke))
+
+    @staticmethod
+    def fromcompact(raw : bytes) -> Union[ReplyMessage, List[ReplyMessage]]:
+        """
+        Decodes a compact reply returned by the Arkouda server. Compact
+        replies do not echo the user back, so user is empty. The msg of a
+        reply reporting created arrays is a TypedReply carrying their
+        ArrayMetadata.
+
+        Parameters
+        ----------
+        raw : bytes
+            The compact reply
+
+        Returns
+        -------
+        Union[ReplyMessage, List[ReplyMessage]]
+            The ReplyMessage, or the ReplyMessage of each command in order
+            if the reply is to a batch request
+
+        Raises
+        ------
+        ValueError
+            Raised if raw is not a well-formed compact reply
+        """
+        try:
+            magic, batch, count = _COMPACT_REPLIES.unpack_from(raw)
+            if magic != COMPACT_MAGIC:
+                raise ValueError('missing magic {!r}'.format(COMPACT_MAGIC))
+            offset = _COMPACT_REPLIES.size
+            replies = []
+            for _ in range(count):
+                msg_type, ncreated, msg_size = _COMPACT_REPLY.unpack_from(raw, offset)
+                offset += _COMPACT_REPLY.size
+                msg = raw[offset:offset + msg_size].decode()
+                offset += msg_size
+                if ncreated:
+                    created = []
+                    for _ in range(ncreated):
+                        name_size, = _COMPACT_NAME.unpack_from(raw, offset)
+                        offset += _COMPACT_NAME.size
+                        name = raw[offset:offset + name_size].decode()
+                        offset += name_size
+                        code, size, ndim = _COMPACT_ARRAY.unpack_from(raw, offset)
+                        offset += _COMPACT_ARRAY.size
+                        # the shape, followed by the itemsize
+                        values = _compact_ints(ndim + 1).unpack_from(raw, offset)
+                        offset += 8 * (ndim + 1)
+                        created.append(ArrayMetadata(name, COMPACT_DTYPES[code], size, ndim,
+                                                     values[:-1], values[-1]))
+                    msg = TypedReply(msg, created)
+                replies.append(ReplyMessage(msg=msg, msgType=_COMPACT_TYPES[msg_type],
+                                            user=''))
+            if offset > len(raw):
+                raise ValueError('{} bytes missing'.format(offset - len(raw)))
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError('Malformed compact reply: {}'.format(e))
+        return replies if batch else replies[0]
+
+'''
+The ArrayMetadata class holds the typed attributes of an array created by
+the Arkouda server, as sent in compact replies
+'''
+class ArrayMetadata(NamedTuple):
+
+    name: str
+    dtype: str
+    size: int
+    ndim: int
+    shape: Tuple[int, ...]
+    itemsize: int
+
+'''
+The TypedReply class is the msg of a compact reply reporting created
+arrays: the msg string, which also carries the ArrayMetadata of the arrays
+so that they need not be parsed from it
+'''
+class TypedReply(str):
+
+    created: Tuple[ArrayMetadata, ...]
+
+    def __new__(cls, msg : str, created : List[ArrayMetadata]) -> TypedReply:
+        reply = super().__new__(cls, msg)
+        reply.created = tuple(created)
+        return reply
+
+"""
+Compact requests and replies start with COMPACT_MAGIC, which JSON-formatted
+messages never do, followed by fixed-size little-endian fields:
+
+request: the format (0 STRING, 1 BINARY) as a uint8, the sizes of user,
+         token, cmd and args as uint32s, then the UTF-8 fields themselves
+         and, for a binary request, the payload
+reply:   whether it is the reply to a batch as a uint8 and the number of
+         replies as a uint32 (one per command of a batch), then for each
+         reply its MessageType (0 NORMAL, 1 WARNING, 2 ERROR) as a uint8,
+         the number of arrays it reports as created as a uint16 and the size
+         of msg as a uint32, followed by msg and by the metadata of each
+         created array: the size of its name as a uint16, the name, its
+         dtype (an index into COMPACT_DTYPES) as a uint8, its size and ndim
+         as int64s, its shape as ndim int64s and its itemsize as an int64
+"""
+COMPACT_MAGIC = b'AKC1'
+COMPACT_DTYPES = ('int64', 'float64', 'bool', 'uint8')
+_COMPACT_TYPES = (MessageType.NORMAL, MessageType.WARNING, MessageType.ERROR)
+_COMPACT_REQUEST = struct.Struct('<4sBIIII')
+_COMPACT_REPLIES = struct.Struct('<4sBI')
+_COMPACT_REPLY = struct.Struct('<BHI')
+_COMPACT_NAME = struct.Struct('<H')
+_COMPACT_ARRAY = struct.Struct('<Bqq')
+
+@functools.lru_cache()
+def _compact_ints(count : int) -> struct.Struct:
+    return struct.Struct('<{}q'.format(count))
+
+"""
+Sequenced requests, JSON-formatted or compact, are prefixed with
+SEQUENCE_MAGIC, the session of the client as 32 hex digits and the sequence
+number of the request within the session as a uint64. The server answers a
+request the client retries with the same sequence number by resending its
+reply, rather than by executing it again.
+"""
+SEQUENCE_MAGIC = b'AKS1'
+_SEQUENCE = struct.Struct('<4s32sQ')
+
+def sequence_header(session : str, seq : int) -> bytes:
+    """
+    Returns the prefix of request seq of the session, a uuid4 hex string
+    """
+    return _SEQUENCE.pack(SEQUENCE_MAGIC, session.encode(), seq)
+
+def split_sequenced(request : bytes) -> Tuple[str, int, bytes]:
+    """
+    Splits a sequenced request into its session, its sequence number and the
+    request itself
+    """
+    magic, session, seq = _SEQUENCE.unpack_from(request)
+    if magic != SEQUENCE_MAGIC:
+        raise ValueError('missing magic {!r}'.format(SEQUENCE_MAGIC))
+    return session.decode(), seq, request[_SEQUENCE.size:]
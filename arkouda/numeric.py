@@ -2,10 +2,10 @@ import numpy as np # type: ignore
 from typeguard import typechecked
 from typing import cast as type_cast
 from typing import Optional, Tuple, Union, ForwardRef
-from arkouda.client import generic_msg
+from arkouda.client import generic_msg, find_common_subexpression, expression_key
 from arkouda.dtypes import resolve_scalar_dtype, DTypes, isSupportedNumber, \
      int_scalars, numeric_scalars
-from arkouda.dtypes import _as_dtype
+from arkouda.dtypes import _as_dtype, float64, int64
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.pdarraysetops import unique
 from arkouda.strings import Strings
@@ -65,12 +65,42 @@ def cast(pda : Union[pdarray, Strings], dt: Union[np.dtype,str]) -> Union[pdarra
     opt = ""
     cmd = "cast"
     args= "{} {} {} {}".format(name, objtype, dt.name, opt)
+    if isinstance(pda, pdarray) and not dt.name.startswith("str"):
+        hit = find_common_subexpression(expression_key(cmd, args))
+        if hit is not None:
+            return hit
+        arr = pdarray(cmd=cmd, cmd_args=args, mydtype=dt, size=pda.size,
+                      ndim=1, shape=pda.shape, itemsize=dt.itemsize)
+        generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name,
+                    my_pdarray=[pda, arr])
+        if pda.dtype.name == 'int64' and dt.name == 'float64':
+            # int64 to float64 is monotone and maps only zero to zero
+            arr.properties.update((name, np.float64(value) if name in ('min', 'max') else value)
+                                  for name, value in pda.properties.items()
+                                  if name in ('min', 'max', 'any', 'all') or (name == 'is_sorted' and value))
+        return arr
     repMsg = generic_msg(cmd=cmd,args=args)
     if dt.name.startswith("str"):
         return Strings(*(type_cast(str,repMsg).split("+")))
     else:
         return create_pdarray(type_cast(str,repMsg))
 
+def _elementwise_efunc(efunc : str, pda : pdarray, dt : np.dtype = float64) -> pdarray:
+    """
+    Buffer an efunc whose result has the size of the array and dtype dt,
+    which for the elementwise efuncs is float64 for int64 and float64
+    arrays alike.
+    """
+    args = "{} {}".format(efunc, pda.name)
+    hit = find_common_subexpression(expression_key("efunc", args))
+    if hit is not None:
+        return hit
+    arr = pdarray(cmd="efunc", cmd_args=args, mydtype=dt, size=pda.size,
+                  ndim=1, shape=pda.shape, itemsize=dt.itemsize)
+    generic_msg(cmd="efunc", args=args, create_pdarray=True, arr_id=arr.name,
+                my_pdarray=[pda, arr])
+    return arr
+
 @typechecked
 def abs(pda : pdarray) -> pdarray:
     """
@@ -98,8 +128,7 @@ def abs(pda : pdarray) -> pdarray:
     >>> ak.abs(ak.linspace(-5,-1,5))
     array([5, 4, 3, 2, 1])    
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("abs", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("abs", pda)
 
 @typechecked
 def log(pda : pdarray) -> pdarray:
@@ -138,8 +167,7 @@ def log(pda : pdarray) -> pdarray:
     >>> ak.log(A) / np.log(2)
     array([0, 3.3219280948873626, 6.6438561897747253])
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("log", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("log", pda)
 
 @typechecked
 def exp(pda : pdarray) -> pdarray:
@@ -170,8 +198,7 @@ def exp(pda : pdarray) -> pdarray:
     array([11.84010843172504, 46.454368507659211, 5.5571769623557188, 
            33.494295836924771, 13.478894913238722])
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("exp", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("exp", pda)
 
 @typechecked
 def cumsum(pda : pdarray) -> pdarray:
@@ -208,8 +235,7 @@ def cumsum(pda : pdarray) -> pdarray:
     >>> ak.cumsum(ak.randint(0, 1, 5, dtype=ak.bool))
     array([0, 1, 1, 2, 3])
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("cumsum", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("cumsum", pda, float64 if pda.dtype == float64 else int64)
 
 @typechecked
 def cumprod(pda : pdarray) -> pdarray:
@@ -243,8 +269,7 @@ def cumprod(pda : pdarray) -> pdarray:
     array([1.5728783400481925, 7.0472855509390593, 33.78523998586553, 
            134.05309592737584, 450.21589865655358])
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("cumprod", pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("cumprod", pda, float64 if pda.dtype == float64 else int64)
 
 @typechecked
 def sin(pda : pdarray) -> pdarray:
@@ -266,8 +291,7 @@ def sin(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
-    repMsg = generic_msg(cmd="efunc", args="{} {}".format("sin",pda.name))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("sin", pda)
 
 @typechecked
 def cos(pda : pdarray) -> pdarray:
@@ -289,8 +313,7 @@ def cos(pda : pdarray) -> pdarray:
     TypeError
         Raised if the parameter is not a pdarray
     """
-    repMsg = type_cast(str, generic_msg(cmd="efunc", args="{} {}".format("cos",pda.name)))
-    return create_pdarray(type_cast(str,repMsg))
+    return _elementwise_efunc("cos", pda)
 
 @typechecked
 def where(condition : pdarray, A : Union[numeric_scalars, pdarray], 
@@ -357,26 +380,29 @@ def where(condition : pdarray, A : Union[numeric_scalars, pdarray],
                                       (not isSupportedNumber(B) and not isinstance(B,pdarray)):
         raise TypeError('both A and B must be an int, np.int64, float, np.float64, or pdarray')
     if isinstance(A, pdarray) and isinstance(B, pdarray):
-        repMsg = generic_msg(cmd="efunc3vv", args="{} {} {} {}".\
-                             format("where",
+        cmd = "efunc3vv"
+        args = "{} {} {} {}".format("where",
                                     condition.name,
                                     A.name,
-                                    B.name))
+                                    B.name)
+        dt = A.dtype
     # For scalars, try to convert it to the array's dtype
     elif isinstance(A, pdarray) and np.isscalar(B):
-        repMsg = generic_msg(cmd="efunc3vs", args="{} {} {} {} {}".\
-                             format("where",
-                                    condition.name,
-                                    A.name,
-                                    A.dtype.name,
-                                    A.format_other(B)))
+        cmd = "efunc3vs"
+        args = "{} {} {} {} {}".format("where",
+                                       condition.name,
+                                       A.name,
+                                       A.dtype.name,
+                                       A.format_other(B))
+        dt = A.dtype
     elif isinstance(B, pdarray) and np.isscalar(A):
-        repMsg = generic_msg(cmd="efunc3sv", args="{} {} {} {} {}".\
-                             format("where",
-                                    condition.name,
-                                    B.dtype.name,
-                                    B.format_other(A),
-                                    B.name))
+        cmd = "efunc3sv"
+        args = "{} {} {} {} {}".format("where",
+                                       condition.name,
+                                       B.dtype.name,
+                                       B.format_other(A),
+                                       B.name)
+        dt = B.dtype
     elif np.isscalar(A) and np.isscalar(B):
         # Scalars must share a common dtype (or be cast)
         dtA = resolve_scalar_dtype(A)
@@ -387,26 +413,33 @@ def where(condition : pdarray, A : Union[numeric_scalars, pdarray],
                             "and {}").format(dtA, dtB))
         # If the dtypes are the same, do not cast
         if dtA == dtB: # type: ignore
-            dt = dtA
+            scalar_dt = dtA
         # If the dtypes are different, try casting one direction then the other
         elif dtB in DTypes and np.can_cast(A, dtB):
             A = np.dtype(dtB).type(A)
-            dt = dtB
+            scalar_dt = dtB
         elif dtA in DTypes and np.can_cast(B, dtA):
             B = np.dtype(dtA).type(B)
-            dt = dtA
+            scalar_dt = dtA
         # Cannot safely cast
         else:
             raise TypeError(("Cannot cast between scalars {} and {} to " +
                             "supported dtype").format(A, B))
-        repMsg = generic_msg(cmd="efunc3ss", args="{} {} {} {} {} {}".\
-                             format("where",
-                                    condition.name,
-                                    dt,
-                                    A,
-                                    dt,
-                                    B))
-    return create_pdarray(type_cast(str,repMsg))
+        cmd = "efunc3ss"
+        args = "{} {} {} {} {} {}".format("where",
+                                          condition.name,
+                                          scalar_dt,
+                                          A,
+                                          scalar_dt,
+                                          B)
+        dt = _as_dtype(scalar_dt)
+    # the result is buffered like the pdarrays it is computed from
+    arr = pdarray(cmd=cmd, cmd_args=args, mydtype=dt, size=condition.size,
+                  ndim=1, shape=condition.shape, itemsize=dt.itemsize)
+    operands = [operand for operand in (condition, A, B) if isinstance(operand, pdarray)]
+    generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name,
+                my_pdarray=operands + [arr])
+    return arr
 
 @typechecked
 def histogram(pda : pdarray, bins : int_scalars=10) -> pdarray:
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import sys
 from time import process_time
-from typing import cast, List, Sequence
+from typing import cast, Any, Callable, Dict, List, Sequence
 from typeguard import typechecked
 import json, struct
 import numpy as np  # type: ignore
-from arkouda.client import generic_msg, client_to_server_names, id_to_args, args_to_id, find_last, delete_from_args_map, cache_array, cache, names_to_weakref, check_arr, uncache_array
+from arkouda.client import generic_msg, client_to_server_names, id_to_args, args_to_id, find_last, delete_from_args_map, cache_array, cache, names_to_weakref, check_arr, uncache_array, \
+    find_common_subexpression, record_common_subexpression, expression_key, CSE_COMMANDS, record_update, versions, \
+    versioned_key, state_lock, _transfer_codec
 from arkouda.dtypes import dtype, DTypes, resolve_scalar_dtype, \
     structDtypeCodes, translate_np_dtype, NUMBER_FORMAT_STRINGS, \
     int_scalars, numeric_scalars, numpy_scalars, int64
@@ -14,9 +16,12 @@ from arkouda.dtypes import int64 as akint64, float64 as akfloat64
 from arkouda.dtypes import str_ as akstr_
 from arkouda.dtypes import bool as npbool
 from arkouda.logger import getArkoudaLogger
+from arkouda.message import TypedReply
+from arkouda.compression import decompress
 from collections import defaultdict
 from arkouda.infoclass import list_registry, information, pretty_print_information
 import builtins
+import itertools
 import weakref
 import time
 
@@ -29,7 +34,8 @@ startAllDell = time.perf_counter()
 
 logger = getArkoudaLogger(name='pdarrayclass')
 
-array_count = 1
+# source of the client-side pdarray ids, atomic for threads
+array_ids = itertools.count(1)
 
 @typechecked
 def parse_single_value(msg: str) -> object:
@@ -80,6 +86,33 @@ def parse_single_value(msg: str) -> object:
                           format(mydtype.name, value)))
 
 
+def _binop_dtype(left: np.dtype, other, op: str) -> np.dtype:
+    """
+    Return the dtype of the result of a binop between a pdarray of dtype
+    left and other, a pdarray or a scalar
+    """
+    if op in ("<", ">", "<=", ">=", "==", "!="):
+        return npbool
+    if isinstance(other, pdarray):
+        floating = other.dtype == akfloat64
+    else:
+        floating = resolve_scalar_dtype(other) == 'float64'
+    if left == akfloat64 or floating or op == '/':
+        return akfloat64
+    return left
+
+
+def _uncache_store(dtype: np.dtype, size: int_scalars):
+    """
+    Take a cached array to store the result of a binop of the dtype to,
+    or return None if there is none or the binop*Store commands do not
+    support the dtype
+    """
+    if dtype not in (akint64, akfloat64):
+        return None
+    return uncache_array(dtype, size)
+
+
 # class for the pdarray
 class pdarray:
     """
@@ -123,9 +156,7 @@ class pdarray:
     def __init__(self, cmd: str, cmd_args: str, mydtype: np.dtype = None, size: int_scalars = None,
                  ndim: int_scalars = None, shape: Sequence[int] = None,
                  itemsize: int_scalars = None) -> None:
-        global array_count
-        self.name = "id_" + str(array_count)
-        array_count += 1
+        self.name = "id_" + str(next(array_ids))
         self.cmd = cmd
         self.cmd_args = cmd_args
         self.dtype = dtype(mydtype)
@@ -136,37 +167,31 @@ class pdarray:
         self.properties = {}
         names_to_weakref[self.name] = weakref.ref(self)
         if (cmd_args != ''):
-            if (cmd=="binopvv"):
-                argss = cmd_args.split(' ')
-                op = argss[0]
-                thing1 = argss[1]
-                thing2 = argss[2]
-                args_to_id[op+":"+thing1+":"+thing2] = weakref.ref(self)
-                if (self.name not in id_to_args):
-                    id_to_args[self.name] = []
-                id_to_args[self.name].append(op+":"+thing1+":"+thing2)
-                if (op=="+" or op=="*"):
-                    args_to_id[op+":"+thing2+":"+thing1] = weakref.ref(self)
-                    id_to_args[self.name].append(op + ":" + thing2 + ":" + thing1)
-            elif (cmd=="binopvs"):
+            if (cmd=="binopvv" or cmd=="binopvs"):
                 argss = cmd_args.split(' ')
                 op = argss[0]
                 thing1 = argss[1]
-                thing2 = argss[3]
-                # print('things:'+op + ":" + thing1 + ":" + thing2)
-                args_to_id[op+":"+thing1+":"+thing2] = weakref.ref(self)
-                if (self.name not in id_to_args):
-                    id_to_args[self.name] = []
-                id_to_args[self.name].append(op+":"+thing1+":"+thing2)
+                thing2 = argss[2] if cmd=="binopvv" else argss[3]
+                keys = [op+":"+thing1+":"+thing2]
                 if (op=="+" or op=="*"):
-                    args_to_id[op+":"+thing2+":"+thing1] = weakref.ref(self)
-                    id_to_args[self.name].append(op + ":" + thing2 + ":" + thing1)
+                    keys.append(op+":"+thing2+":"+thing1)
+                record_common_subexpression(self, *keys)
+            elif (cmd in CSE_COMMANDS):
+                record_common_subexpression(self, expression_key(cmd, cmd_args))
+
+    @property
+    def version(self) -> int:
+        """
+        The number of times the pdarray was updated in place
+        """
+        return versions.get(self.name, 0)
 
     def __del__(self):
-        ret = find_last(self)
-        if (not ret):
-            delete_from_args_map(self.name)
-            cache_array(self.name, self.dtype, self.size)
+        with state_lock:
+            ret = find_last(self)
+            if (not ret):
+                delete_from_args_map(self.name)
+                cache_array(self.name, self.dtype, self.size)
 
     # except:
     #     pass
@@ -258,18 +283,14 @@ class pdarray:
                 raise ValueError("size mismatch {} {}".format(self.size, other.size))
             cmd = "binopvv"
             args = "{} {} {}".format(op, self.name, other.name)
-            myType = self.dtype
-            if (self.dtype==akfloat64 or other.dtype==akfloat64 or op=='/'):
-                myType=akfloat64
+            myType = _binop_dtype(self.dtype, other, op)
             arr = pdarray(cmd=cmd, cmd_args=args, mydtype=myType, size=self.size,
                           ndim=1, shape=self.shape, itemsize=self.itemsize)
             generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name, my_pdarray=[self, other, arr])
             return arr
         # pdarray binop scalar
         dt = resolve_scalar_dtype(other)
-        myType = self.dtype
-        if (self.dtype==akfloat64 or type(other)==np.float64 or op=='/'):
-            myType=akfloat64
+        myType = _binop_dtype(self.dtype, other, op)
         if dt not in DTypes:
             raise TypeError("Unhandled scalar type: {} ({})".format(other,
                                                                     type(other)))
@@ -279,6 +300,7 @@ class pdarray:
         arr = pdarray(cmd=cmd, cmd_args=args, mydtype=myType, size=self.size,
                     ndim=1, shape=self.shape, itemsize=self.itemsize)
         generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name, my_pdarray=[self, arr])
+        _derive_properties(arr, self, op, other)
         return arr
 
     # reverse binary operators
@@ -311,8 +333,10 @@ class pdarray:
         if op not in self.BinOps:
             raise ValueError("bad operator {}".format(op))
         # pdarray binop scalar
-        if (check_arr(self.dtype, self.size)):
-            return binOpWithStore(other, self, uncache_array(self.dtype, self.size), op)
+        myType = _binop_dtype(self.dtype, other, op)
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(other, self, name, op)
 
         dt = resolve_scalar_dtype(other)
         if dt not in DTypes:
@@ -324,9 +348,10 @@ class pdarray:
             format(op, dt, NUMBER_FORMAT_STRINGS[dt].format(other),
                    self.name)
 
-        arr = pdarray(cmd=cmd, cmd_args=args, mydtype=self.dtype, size=self.size,
+        arr = pdarray(cmd=cmd, cmd_args=args, mydtype=myType, size=self.size,
                       ndim=1, shape=self.shape, itemsize=self.itemsize)
         generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name, my_pdarray=[self, arr])
+        _derive_properties(arr, self, op, other, reverse=True)
         return arr
 
     # overload + for pdarray, other can be {pdarray, int, float}
@@ -338,15 +363,16 @@ class pdarray:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
         # print("+:"+self.name+":"+name)
-        if (("+:"+self.name+":"+name) in args_to_id.keys()):
-            return args_to_id[("+:"+self.name+":"+name)]()
-        if (("+:" + name + ":" + self.name) in args_to_id.keys()):
-            return args_to_id[("+:" + name + ":" + self.name)]()
-        myType = self.dtype
-        if (self.dtype==akfloat64 or type(other)==np.float64 or (isinstance(other,pdarray) and other.dtype==akfloat64)):
-            myType=akfloat64
-        if check_arr(myType, self.size):
-            return binOpWithStore(self, other, uncache_array(myType, self.size), "+")
+        hit = find_common_subexpression("+:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        hit = find_common_subexpression("+:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
+        myType = _binop_dtype(self.dtype, other, "+")
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "+")
         return self._binop(other, "+")
 
     def __radd__(self, other):
@@ -355,10 +381,12 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("+:"+self.name+":"+name) in args_to_id.keys()):
-            return args_to_id[("+:"+self.name+":"+name)]()
-        if (("+:" + other.name + ":" + self.name) in args_to_id.keys()):
-            return args_to_id[("+:" + name + ":" + self.name)]()
+        hit = find_common_subexpression("+:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        hit = find_common_subexpression("+:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
         return self._r_binop(other, "+")
 
     # overload - for pdarray, other can be {pdarray, int, float}
@@ -368,14 +396,14 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("-:"+self.name+":"+name) in args_to_id.keys()):
-            return args_to_id[("-:"+self.name+":"+name)]()
+        hit = find_common_subexpression("-:"+self.name+":"+name)
+        if hit is not None:
+            return hit
         # print('tip=', type(other))
-        myType = self.dtype
-        if (self.dtype==akfloat64 or type(other)==np.float64 or (isinstance(other,pdarray) and other.dtype==akfloat64)):
-            myType=akfloat64
-        if check_arr(myType, self.size):
-            return binOpWithStore(self, other, uncache_array(myType, self.size), "-")
+        myType = _binop_dtype(self.dtype, other, "-")
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "-")
         return self._binop(other, "-")
 
     def __rsub__(self, other):
@@ -384,8 +412,9 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("-:" + name + ":" + self.name) in args_to_id.keys()):
-            return args_to_id[("-:" + name + ":" + self.name)]()
+        hit = find_common_subexpression("-:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
         return self._r_binop(other, "-")
 
     # overload * for pdarray, other can be {pdarray, int, float}
@@ -396,16 +425,17 @@ class pdarray:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
         # print("*:"+self.name+":"+name)
-        if (("*:"+self.name+":"+name) in args_to_id.keys() and args_to_id[("*:"+self.name+":"+name)]() is not None):
-            return args_to_id[("*:"+self.name+":"+name)]()
-        if (("*:" + name + ":" + self.name) in args_to_id.keys() and args_to_id[("*:" + name + ":" + self.name)]() is not None):
-            return args_to_id[("*:" + name + ":" + self.name)]()
-        myType = self.dtype
-        if (self.dtype==akfloat64 or type(other)==np.float64 or (isinstance(other,pdarray) and other.dtype==akfloat64)):
-            myType=akfloat64
+        hit = find_common_subexpression("*:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        hit = find_common_subexpression("*:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
+        myType = _binop_dtype(self.dtype, other, "*")
         # print('mul type ',myType,' size ', self.size)
-        if check_arr(myType, self.size):
-            return binOpWithStore(self, other, uncache_array(myType, self.size), "*")
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "*")
         return self._binop(other, "*")
 
     def __rmul__(self, other):
@@ -414,10 +444,12 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("*:"+self.name+":"+name) in args_to_id.keys()):
-            return args_to_id[("*:"+self.name+":"+name)]()
-        if (("*:" + name + ":" + self.name) in args_to_id.keys()):
-            return args_to_id[("*:" + name + ":" + self.name)]()
+        hit = find_common_subexpression("*:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        hit = find_common_subexpression("*:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
         return self._r_binop(other, "*")
 
     # overload / for pdarray, other can be {pdarray, int, float}
@@ -427,10 +459,12 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("/:"+self.name+":"+name) in args_to_id.keys() and args_to_id[("/:"+self.name+":"+name)]() is not None):
-            return args_to_id[("/:"+self.name+":"+name)]()
-        if check_arr(akfloat64, self.size):
-            return binOpWithStore(self, other, uncache_array(akfloat64, self.size), "/")
+        hit = find_common_subexpression("/:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        name = uncache_array(akfloat64, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "/")
         return self._binop(other, "/")
 
     def __rtruediv__(self, other):
@@ -438,8 +472,10 @@ class pdarray:
 
     # overload // for pdarray, other can be {pdarray, int, float}
     def __floordiv__(self, other):
-        if check_arr(self.dtype, self.size):
-            return binOpWithStore(self, other, uncache_array(self.dtype, self.size), "//")
+        myType = _binop_dtype(self.dtype, other, "//")
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "//")
         return self._binop(other, "//")
 
     def __rfloordiv__(self, other):
@@ -492,15 +528,16 @@ class pdarray:
         else:
             dt = resolve_scalar_dtype(other)
             name = NUMBER_FORMAT_STRINGS[dt].format(other)
-        if (("**:"+self.name+":"+name) in args_to_id.keys()):
-            return args_to_id[("**:"+self.name+":"+name)]()
-        if (("**:" + name + ":" + self.name) in args_to_id.keys()):
-            return args_to_id[("**:" + name + ":" + self.name)]()
-        myType = self.dtype
-        if (self.dtype==akfloat64 or type(other)==np.float64):
-            myType=akfloat64
-        if check_arr(myType, self.size):
-            return binOpWithStore(self, other, uncache_array(myType, self.size), "**")
+        hit = find_common_subexpression("**:"+self.name+":"+name)
+        if hit is not None:
+            return hit
+        hit = find_common_subexpression("**:" + name + ":" + self.name)
+        if hit is not None:
+            return hit
+        myType = _binop_dtype(self.dtype, other, "**")
+        name = _uncache_store(myType, self.size)
+        if name is not None:
+            return binOpWithStore(self, other, name, "**")
         return self._binop(other, "**")
 
     def __rpow__(self, other):
@@ -547,6 +584,8 @@ class pdarray:
     def opeq(self, other, op):
         if op not in self.OpEqOps:
             raise ValueError("bad operator {}".format(op))
+        self.properties.clear()
+        record_update(self.name)
         # pdarray op= pdarray
         if isinstance(other, pdarray):
             if self.size != other.size:
@@ -629,19 +668,25 @@ class pdarray:
         if isinstance(key, slice):
             (start, stop, stride) = key.indices(self.size)
             logger.debug('start: {} stop: {} stride: {}'.format(start, stop, stride))
-            size = (stop - start)//stride
-            if (check_arr(self.dtype, size)):
-                name = uncache_array(self.dtype, size)
+            size = len(range(start, stop, stride))
+            hit = find_common_subexpression(expression_key("[slice]", "{} {} {} {}".format(self.name, start, stop, stride)))
+            if hit is not None:
+                return hit
+            name = uncache_array(self.dtype, size)
+            if name is not None:
                 arr = create_pdarray_with_name(name, cmd="[sliceStore]", cmd_args="", mydtype=self.dtype,
                                                size=size, ndim=1, shape=[size], itemsize=self.dtype.itemsize)
                 args = "{} {} {} {} {}".format(self.name, start, stop, stride, arr.name)
                 arr.cmd_args = args
+                record_common_subexpression(arr, expression_key("[slice]", "{} {} {} {}".format(self.name, start, stop, stride)))
                 generic_msg(cmd="[sliceStore]", args=args, arr_id=arr.name, my_pdarray=[self, arr])
                 # print("name=", args)
             else:
-                arr = pdarray(cmd="[slice]", cmd_args="{} {} {} {}".format(self.name, start, stop, stride), mydtype=self.dtype, size=(stop-start)//stride,
-                          ndim=1, shape=self.shape, itemsize=self.itemsize)
+                arr = pdarray(cmd="[slice]", cmd_args="{} {} {} {}".format(self.name, start, stop, stride), mydtype=self.dtype, size=size,
+                          ndim=1, shape=[size], itemsize=self.itemsize)
                 generic_msg(cmd="[slice]", args="{} {} {} {}".format(self.name, start, stop, stride), create_pdarray=True, arr_id=arr.name, my_pdarray=[self, arr])
+            if stride > 0 and self.properties.get('is_sorted'):
+                arr.properties['is_sorted'] = np.bool_(True)
             return arr
         if isinstance(key, pdarray):
             kind, _ = translate_np_dtype(key.dtype)
@@ -649,17 +694,30 @@ class pdarray:
                 raise TypeError("unsupported pdarray index type {}".format(key.dtype))
             if kind == "bool" and self.size != key.size:
                 raise ValueError("size mismatch {} {}".format(self.size, key.size))
-            repMsg = generic_msg(cmd="[pdarray]", args="{} {}".format(self.name, key.name))
-            return create_pdarray(repMsg)
+            args = "{} {}".format(self.name, key.name)
+            hit = find_common_subexpression(expression_key("[pdarray]", args))
+            if hit is not None:
+                return hit
+            if kind == "bool":
+                # the size of the result depends on the values of the key
+                repMsg = generic_msg(cmd="[pdarray]", args=args, return_value_needed=True, my_pdarray=[self, key])
+                return create_pdarray(repMsg, "[pdarray]", args)
+            arr = pdarray(cmd="[pdarray]", cmd_args=args, mydtype=self.dtype, size=key.size,
+                          ndim=1, shape=[key.size], itemsize=self.itemsize)
+            generic_msg(cmd="[pdarray]", args=args, create_pdarray=True, arr_id=arr.name, my_pdarray=[self, key, arr])
+            permutation = args_to_id.get(versioned_key(expression_key("argsort", "pdarray " + self.name)))
+            if self.dtype == akint64 and permutation is not None and permutation() is key:
+                # gathered by its own sorting permutation
+                arr.properties.update((name, value) for name, value in self.properties.items()
+                                      if name in ('min', 'max', 'sum', 'any', 'all'))
+                arr.properties['is_sorted'] = np.bool_(True)
+            return arr
         else:
             raise TypeError("Unhandled key type: {} ({})".format(key, type(key)))
 
     def __setitem__(self, key, value):
         self.properties.clear()
-        if (self.name in id_to_args.keys()):
-            for args in id_to_args[self.name]:
-                del args_to_id[args]
-        id_to_args[self.name] = []
+        record_update(self.name)
         if np.isscalar(key) and resolve_scalar_dtype(key) == 'int64':
             orig_key = key
             if key < 0:
@@ -708,6 +766,8 @@ class pdarray:
         TypeError
             Raised if value is not an int, int64, float, or float64
         """
+        self.properties.clear()
+        record_update(self.name)
         generic_msg(cmd="set", args="{} {} {}".format(self.name,
                                                       self.dtype.name, self.format_other(value)))
 
@@ -1028,21 +1088,29 @@ class pdarray:
         """
         from arkouda.client import maxTransferBytes
         # Total number of bytes in the array data
-        arraybytes = self.size * self.dtype.itemsize
+        arraybytes = int(self.size) * self.dtype.itemsize
         # Guard against overflowing client memory
         if arraybytes > maxTransferBytes:
             raise RuntimeError(('Array exceeds allowed size for transfer. Increase ' +
-                                'client.maxTransferBytes to allow'))
+                                'client.maxTransferBytes to allow, or use ak.download'))
+        npdtype = np.dtype(self.dtype.name)
+        codec = _transfer_codec(arraybytes)
+        if codec is not None:
+            # The server compresses the values, in the byte order of the client
+            rep_msg = generic_msg(cmd="tondarray", args="{} 0 {} {} {}".format(
+                                  self.name, self.size, sys.byteorder, codec), recv_bytes=True,
+                                  return_value_needed=True, my_pdarray=[self])
+            values = decompress(codec, cast(bytes, rep_msg), arraybytes)
+            return np.frombuffer(values, dtype=npdtype).copy()
         # The reply from the server will be a bytes object
-        rep_msg = generic_msg(cmd="tondarray", args="{}".format(self.name), recv_bytes=True)
+        rep_msg = generic_msg(cmd="tondarray", args="{}".format(self.name), recv_bytes=True,
+                              return_value_needed=True, my_pdarray=[self])
         # Make sure the received data has the expected length
         if len(rep_msg) != self.size * self.dtype.itemsize:
             raise RuntimeError("Expected {} bytes but received {}". \
                                format(self.size * self.dtype.itemsize, len(rep_msg)))
-        # Use struct to interpret bytes as a big-endian numeric array
-        fmt = '>{:n}{}'.format(self.size, structDtypeCodes[self.dtype.name])
-        # Return a numpy ndarray
-        return np.array(struct.unpack(fmt, rep_msg))  # type: ignore
+        # Interpret the bytes as a big-endian numeric array
+        return np.frombuffer(cast(bytes, rep_msg), dtype=npdtype.newbyteorder('>')).astype(npdtype)
 
     def to_cuda(self):
         """
@@ -1346,7 +1414,7 @@ class pdarray:
 #       server has created pdarray already before this is called
 #       server has created pdarray already befroe this is called
 @typechecked
-def create_pdarray(repMsg: str) -> pdarray:
+def create_pdarray(repMsg: str, cmd: str = '', cmd_args: str = '') -> pdarray:
     """
     Return a pdarray instance pointing to an array created by the arkouda server.
     The user should not call this function directly.
@@ -1355,7 +1423,11 @@ def create_pdarray(repMsg: str) -> pdarray:
     ----------
     repMsg : str
         space-delimited string containing the pdarray name, datatype, size
-        dimension, shape,and itemsize
+        dimension, shape,and itemsize, or a TypedReply carrying them
+    cmd : str
+        Command which created the pdarray
+    cmd_args : str
+        Arguments of the command which created the pdarray
 
     Returns
     -------
@@ -1371,6 +1443,12 @@ def create_pdarray(repMsg: str) -> pdarray:
         Raised if a server-side error is thrown in the process of creating
         the pdarray instance
     """
+    if isinstance(repMsg, TypedReply):
+        # compact replies carry the attributes, no need to parse them
+        created = repMsg.created[0]
+        return create_pdarray_with_name(created.name, cmd, cmd_args, dtype(created.dtype),
+                                        created.size, created.ndim, list(created.shape),
+                                        created.itemsize)
     try:
         fields = repMsg.split()
         name = fields[1]
@@ -1383,7 +1461,7 @@ def create_pdarray(repMsg: str) -> pdarray:
         raise ValueError(e)
     logger.debug(("created Chapel array with name: {} dtype: {} size: {} ndim: {} shape: {} " +
                   "itemsize: {}").format(name, mydtype, size, ndim, shape, itemsize))
-    return pdarray(name, mydtype, size, ndim, shape, itemsize)
+    return create_pdarray_with_name(name, cmd, cmd_args, dtype(mydtype), size, ndim, shape, itemsize)
 
 def clear() -> None:
     """
@@ -1401,6 +1479,151 @@ def clear() -> None:
     generic_msg(cmd="clear")
 
 
+def _reduction(pda: pdarray, op: str) -> numpy_scalars:
+    """
+    Return the op reduction of the pdarray. The value is kept with the
+    properties of the pdarray, so it is only computed once while the
+    pdarray isn't updated. Reductions which follow from the size of the
+    pdarray or from its other known properties are not sent to the server.
+    """
+    if (op not in pda.properties.keys()):
+        implied = _implied_reduction(pda, op)
+        if implied is not None:
+            pda.properties[op] = implied
+        else:
+            repMsg = generic_msg(cmd="reduction", args="{} {}".format(op, pda.name), return_value_needed=True, my_pdarray=[pda])
+            pda.properties[op] = parse_single_value(cast(str, repMsg))
+    return pda.properties[op]
+
+
+def _implied_reduction(pda: pdarray, op: str):
+    """
+    Return the op reduction of the pdarray if it follows from the size of
+    the pdarray or from its known properties, else None
+    """
+    known = pda.properties
+    lo, hi = known.get('min'), known.get('max')
+    if lo is not None and hi is not None and (np.isnan(lo) or np.isnan(hi)):
+        lo = hi = None
+    constant = lo is not None and hi is not None and lo == hi
+    if op == 'is_sorted' and (pda.size <= 1 or constant):
+        return np.bool_(True)
+    if op in ('argmin', 'argmax') and (pda.size == 1 or constant):
+        return np.int64(0)
+    if op == 'argmin' and known.get('is_sorted') and pda.dtype == akint64:
+        return np.int64(0)
+    if op in ('any', 'all'):
+        if pda.size == 0:
+            return np.bool_(op == 'all')
+        if lo is not None and hi is not None:
+            if lo > 0 or hi < 0:
+                return np.bool_(True)
+            if lo == hi == 0:
+                return np.bool_(False)
+    if op == 'sum' and pda.dtype == akint64 and constant and lo is not None:
+        return _wrap_int64(int(lo) * int(pda.size))
+    return None
+
+
+def _wrap_int64(value: int) -> np.int64:
+    """
+    Return the int as the server computes it, modulo 2**64
+    """
+    return np.int64((value + 2**63) % 2**64 - 2**63)
+
+
+def _in_int64(value: int) -> bool:
+    return -2**63 <= value < 2**63
+
+
+def _derive_properties(result: pdarray, source: pdarray, op: str, scalar, reverse: bool = False) -> None:
+    """
+    Derive the known properties of result = source op scalar (or scalar op
+    source if reverse) from those of source, where they follow exactly:
+    min and max through maps which are monotone in floating point too,
+    sortedness through non-decreasing maps, and sum, argmin, argmax, any
+    and all through int64 maps which don't overflow.
+    """
+    known = source.properties
+    if (not known or result.size != source.size or result.size == 0
+            or isinstance(scalar, (bool, np.bool_))
+            or not isinstance(scalar, (int, float, np.integer, np.floating))):
+        return
+    integral = (source.dtype == akint64 and result.dtype == akint64
+                and isinstance(scalar, (int, np.integer)))
+    if not integral and (result.dtype != akfloat64 or not np.isfinite(scalar)):
+        return
+    # int for int64 maps, np.float64 for float64 ones
+    s: Any
+    f: Callable[[Any], Any]
+    if integral:
+        s = int(scalar)
+        if op == '+':
+            f = lambda x: int(x) + s
+        elif op == '-':
+            f = (lambda x: s - int(x)) if reverse else (lambda x: int(x) - s)
+        elif op == '*':
+            f = lambda x: int(x) * s
+        elif op == '//' and not reverse and s > 0:
+            f = lambda x: int(x) // s
+        else:
+            return
+        direction = -1 if (op == '-' and reverse) or (op == '*' and s < 0) else int(op != '*' or s != 0)
+    else:
+        s = np.float64(scalar)
+        if op == '+':
+            f = lambda x: np.float64(x) + s
+        elif op == '-':
+            f = (lambda x: s - np.float64(x)) if reverse else (lambda x: np.float64(x) - s)
+        elif op == '*' and s != 0:
+            f = lambda x: np.float64(x) * s
+        elif op == '/' and not reverse and s != 0:
+            f = lambda x: np.float64(x) / s
+        else:
+            return
+        direction = -1 if (op == '-' and reverse) or (op in ('*', '/') and s < 0) else 1
+
+    derived: Dict[str, Any] = dict()
+    exact = False
+    lo, hi = known.get('min'), known.get('max')
+    if lo is not None and hi is not None and not (np.isnan(lo) or np.isnan(hi)):
+        lo, hi = f(lo), f(hi)
+        if direction < 0:
+            lo, hi = hi, lo
+        if integral:
+            exact = _in_int64(lo) and _in_int64(hi)
+            if exact:
+                derived['min'], derived['max'] = np.int64(lo), np.int64(hi)
+        elif not (np.isnan(lo) or np.isnan(hi)):
+            derived['min'], derived['max'] = lo, hi
+    if integral and op != '//' and 'sum' in known:
+        # exact modulo 2**64, as the server sums, whether or not it overflows
+        if op == '*':
+            derived['sum'] = _wrap_int64(int(known['sum']) * s)
+        else:
+            derived['sum'] = _wrap_int64(direction * int(known['sum']) + (s if op == '+' or reverse else -s) * int(source.size))
+    if direction == 0:
+        derived.update(min=np.int64(0), max=np.int64(0), sum=np.int64(0))
+    if 'is_sorted' in known and (exact or not integral):
+        if direction > 0 and known['is_sorted']:
+            derived['is_sorted'] = np.bool_(True)
+        elif direction > 0 and integral and op != '//':
+            derived['is_sorted'] = known['is_sorted']
+    if exact and op != '//' and direction != 0:
+        # a strictly monotone map keeps the positions of the extrema, so
+        # also their first occurrences
+        flipped = {'argmin': 'argmax', 'argmax': 'argmin'}
+        for name in ('argmin', 'argmax'):
+            other = name if direction > 0 else flipped[name]
+            if other in known:
+                derived[name] = known[other]
+        if op == '*':
+            for name in ('any', 'all'):
+                if name in known:
+                    derived[name] = known[name]
+    result.properties.update(derived)
+
+
 @typechecked
 def any(pda: pdarray) -> np.bool_:
     """
@@ -1423,8 +1646,7 @@ def any(pda: pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("any", pda.name))
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.bool_, _reduction(pda, "any"))
 
 
 @typechecked
@@ -1449,8 +1671,7 @@ def all(pda: pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("all", pda.name))
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.bool_, _reduction(pda, "all"))
 
 
 @typechecked
@@ -1475,8 +1696,7 @@ def is_sorted(pda: pdarray) -> np.bool_:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("is_sorted", pda.name))
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.bool_, _reduction(pda, "is_sorted"))
 
 
 @typechecked
@@ -1501,10 +1721,7 @@ def sum(pda: pdarray) -> np.float64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    if ('sum' not in pda.properties.keys()):
-        repMsg = generic_msg(cmd="reduction", args="{} {}".format("sum", pda.name), return_value_needed=True, my_pdarray=[pda])
-        pda.properties['sum'] = parse_single_value(cast(str, repMsg))
-    return pda.properties['sum']
+    return cast(np.float64, _reduction(pda, "sum"))
 
 
 @typechecked
@@ -1530,9 +1747,7 @@ def prod(pda: pdarray) -> np.float64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("prod", pda.name))
-
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.float64, _reduction(pda, "prod"))
 
 
 def min(pda: pdarray) -> numpy_scalars:
@@ -1556,10 +1771,7 @@ def min(pda: pdarray) -> numpy_scalars:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    if ('min' not in pda.properties.keys()):
-        repMsg = generic_msg(cmd="reduction", args="{} {}".format("min", pda.name), return_value_needed = True, arr_id=pda.name, my_pdarray=[pda])
-        pda.properties['min'] = parse_single_value(cast(str, repMsg))
-    return pda.properties['min']
+    return _reduction(pda, "min")
 
 
 @typechecked
@@ -1584,10 +1796,7 @@ def max(pda: pdarray) -> numpy_scalars:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    if ('max' not in pda.properties.keys()):
-        repMsg = generic_msg(cmd="reduction", args="{} {}".format("max", pda.name), return_value_needed = True, arr_id=pda.name, my_pdarray=[pda])
-        pda.properties['max'] = parse_single_value(cast(str, repMsg))
-    return pda.properties['max']
+    return _reduction(pda, "max")
 
 
 @typechecked
@@ -1612,8 +1821,7 @@ def argmin(pda: pdarray) -> np.int64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("argmin", pda.name))
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.int64, _reduction(pda, "argmin"))
 
 
 @typechecked
@@ -1638,8 +1846,7 @@ def argmax(pda: pdarray) -> np.int64:
     RuntimeError
         Raised if there's a server-side error thrown
     """
-    repMsg = generic_msg(cmd="reduction", args="{} {}".format("argmax", pda.name))
-    return parse_single_value(cast(str, repMsg))
+    return cast(np.int64, _reduction(pda, "argmax"))
 
 
 @typechecked
@@ -1711,12 +1918,11 @@ def var(pda: pdarray, ddof: int_scalars = 0) -> np.float64:
     """
     if ddof >= pda.size:
         raise ValueError("var: ddof must be less than number of values")
-    m = mean(pda)
-    # print('m=',m)    
-    ret = ((pda - m) ** 2).sum() / (pda.size - ddof)
-    # print('ret=',ret)
-    return ret
-    return ((pda - m) ** 2).sum() / (pda.size - ddof)
+    # kept with the properties of the pdarray, so other ddofs and std reuse it
+    if 'squared_deviations' not in pda.properties:
+        m = mean(pda)
+        pda.properties['squared_deviations'] = ((pda - m) ** 2).sum()
+    return pda.properties['squared_deviations'] / (pda.size - ddof)
 
 
 @typechecked
@@ -2089,13 +2295,10 @@ def binOpWithStore(pda_left: pdarray, pda_right: pdarray, pda_store_name: str, b
         op = argss[0]
         thing1 = argss[1]
         thing2 = argss[2]
-        args_to_id[op + ":" + thing1 + ":" + thing2] = weakref.ref(arr)
-        if (arr.name not in id_to_args):
-            id_to_args[arr.name] = []
-        id_to_args[arr.name].append(op + ":" + thing1 + ":" + thing2)
+        keys = [op + ":" + thing1 + ":" + thing2]
         if (op == "+" or op == "*"):
-            args_to_id[op + ":" + thing2 + ":" + thing1] = weakref.ref(arr)
-            id_to_args[arr.name].append(op + ":" + thing2 + ":" + thing1)
+            keys.append(op + ":" + thing2 + ":" + thing1)
+        record_common_subexpression(arr, *keys)
         generic_msg(cmd=cmd, args=args, arr_id=arr.name, my_pdarray=[pda_left, pda_right, arr])
         return arr
     elif isinstance(pda_left, pdarray):
@@ -2105,7 +2308,7 @@ def binOpWithStore(pda_left: pdarray, pda_right: pdarray, pda_store_name: str, b
         if dt not in DTypes:
             raise TypeError("Unhandled scalar type: {} ({})".format(pda_right, type(pda_right)))
         cmd = "binopvsStore"
-        arr = create_pdarray_with_name(pda_store_name, cmd, "", (akfloat64 if (dt=="float64") else pda_left.dtype), pda_left.size, pda_left.ndim,
+        arr = create_pdarray_with_name(pda_store_name, cmd, "", (akfloat64 if (dt=="float64" or binop=="/") else pda_left.dtype), pda_left.size, pda_left.ndim,
                                        pda_left.shape, pda_left.itemsize)
         args = "{} {} {} {} {}".format(binop, pda_left.name, dt, NUMBER_FORMAT_STRINGS[dt].format(pda_right), arr.name)
         arr.cmd_args = args
@@ -2113,14 +2316,12 @@ def binOpWithStore(pda_left: pdarray, pda_right: pdarray, pda_store_name: str, b
         op = argss[0]
         thing1 = argss[1]
         thing2 = argss[3]
-        args_to_id[op + ":" + thing1 + ":" + thing2] = weakref.ref(arr)
-        if (arr.name not in id_to_args):
-            id_to_args[arr.name] = []
-        id_to_args[arr.name].append(op + ":" + thing1 + ":" + thing2)
+        keys = [op + ":" + thing1 + ":" + thing2]
         if (op == "+" or op == "*"):
-            args_to_id[op + ":" + thing2 + ":" + thing1] = weakref.ref(arr)
-            id_to_args[arr.name].append(op + ":" + thing2 + ":" + thing1)
+            keys.append(op + ":" + thing2 + ":" + thing1)
+        record_common_subexpression(arr, *keys)
         generic_msg(cmd=cmd, args=args, create_pdarray=False, arr_id=arr.name, my_pdarray=[pda_left, arr])
+        _derive_properties(arr, pda_left, binop, pda_right)
         return arr
     else:
         dt = resolve_scalar_dtype(pda_left)
@@ -2129,7 +2330,7 @@ def binOpWithStore(pda_left: pdarray, pda_right: pdarray, pda_store_name: str, b
         if dt not in DTypes:
             raise TypeError("Unhandled scalar type: {} ({})".format(pda_right, type(pda_right)))
         cmd = "binopsvStore"
-        arr = create_pdarray_with_name(pda_store_name, cmd, "", pda_right.dtype, pda_right.size, pda_right.ndim,
+        arr = create_pdarray_with_name(pda_store_name, cmd, "", (akfloat64 if (dt=="float64" or binop=="/") else pda_right.dtype), pda_right.size, pda_right.ndim,
                                        pda_right.shape, pda_right.itemsize)
         args = "{} {} {} {} {}". \
             format(binop, dt, NUMBER_FORMAT_STRINGS[dt].format(pda_left),
@@ -2139,14 +2340,12 @@ def binOpWithStore(pda_left: pdarray, pda_right: pdarray, pda_store_name: str, b
         op = argss[0]
         thing1 = argss[2]
         thing2 = argss[3]
-        args_to_id[op + ":" + thing1 + ":" + thing2] = weakref.ref(arr)
-        if (arr.name not in id_to_args):
-            id_to_args[arr.name] = []
-        id_to_args[arr.name].append(op + ":" + thing1 + ":" + thing2)
+        keys = [op + ":" + thing1 + ":" + thing2]
         if (op == "+" or op == "*"):
-            args_to_id[op + ":" + thing2 + ":" + thing1] = weakref.ref(arr)
-            id_to_args[arr.name].append(op + ":" + thing2 + ":" + thing1)
+            keys.append(op + ":" + thing2 + ":" + thing1)
+        record_common_subexpression(arr, *keys)
         generic_msg(cmd=cmd, args=args, create_pdarray=False, arr_id=arr.name, my_pdarray=[pda_right, arr])
+        _derive_properties(arr, pda_right, binop, pda_left, reverse=True)
         return arr
 
 
@@ -1,17 +1,19 @@
 import numpy as np  # type: ignore
-import pandas as pd  # type: ignore
-import struct
-from typing import cast, Iterable, Optional, Union
-from typeguard import typechecked
+from typing import cast, Iterable, Optional, Tuple, Union, TYPE_CHECKING
+from typeguard import typechecked, check_argument_types
 from arkouda.client import generic_msg, client_to_server_names, id_to_args, args_to_id, find_last, delete_from_args_map, cache_array, cache, names_to_weakref
 from arkouda.dtypes import structDtypeCodes, NUMBER_FORMAT_STRINGS, float64, int64, \
     DTypes, isSupportedInt, isSupportedNumber, NumericDTypes, SeriesDTypes, \
     int_scalars, numeric_scalars
 from arkouda.dtypes import dtype as akdtype
-from arkouda.pdarrayclass import pdarray, create_pdarray, check_arr, uncache_array, create_pdarray_with_name
+from arkouda.pdarrayclass import pdarray, create_pdarray, check_arr, uncache_array, create_pdarray_with_name, \
+    _wrap_int64
 from arkouda.strings import Strings
 import weakref
 
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
 __all__ = ["array", "zeros", "ones", "zeros_like", "ones_like",
            "arange", "linspace", "randint", "uniform", "standard_normal",
            "random_strings_uniform", "random_strings_lognormal",
@@ -19,8 +21,7 @@ __all__ = ["array", "zeros", "ones", "zeros_like", "ones_like",
            ]
 
 
-@typechecked
-def from_series(series: pd.Series,
+def from_series(series: 'pd.Series',
                 dtype: Optional[Union[type, str]] = None) -> Union[pdarray, Strings]:
     """
     Converts a Pandas Series to an Arkouda pdarray or Strings object. If
@@ -87,6 +88,11 @@ def from_series(series: pd.Series,
     A Pandas Series containing strings has a dtype of object. Arkouda assumes the Series
     contains strings and sets the dtype to str
     """
+    # pandas is imported on first use, since importing it dominates the
+    # import time of arkouda, so the args are checked once the annotation
+    # 'pd.Series' resolves to it
+    import pandas as pd  # type: ignore
+    check_argument_types()
     if not dtype:
         dt = series.dtype.name
     else:
@@ -205,18 +211,17 @@ def array(a: Union[pdarray, np.ndarray, Iterable]) -> Union[pdarray, Strings]:
     size = a.size
     if (size * a.itemsize) > maxTransferBytes:
         raise RuntimeError(("Array exceeds allowed transfer size. Increase " +
-                            "ak.maxTransferBytes to allow"))
-    # Pack binary array data into a bytes object with a command header
-    # including the dtype and size
-    if (check_arr(a.dtype, a.size)):
-        fmt = ">{:n}{}".format(size, structDtypeCodes[a.dtype.name])
+                            "ak.maxTransferBytes to allow, or use ak.upload"))
+    # Send the binary array data after a command header including the dtype
+    # and size
+    name = uncache_array(a.dtype, a.size)
+    if name is not None:
         cmd = 'arrayStore'
-        name = uncache_array(a.dtype, a.size)
-        req_msg = "{} {} {:n} ". \
-                        format(a.dtype.name, name, size).encode() + struct.pack(fmt, *a)
-        arr = pdarray(cmd,req_msg)
+        req_msg = _payload(a, "{} {} {:n} ".format(a.dtype.name, name, size))
+        # the payload is only kept by the command until it is sent
+        arr = pdarray(cmd, '')
         repMsg = generic_msg(cmd = cmd, args=req_msg, send_bytes=True, return_value_needed=True, arr_id=arr.name, my_pdarray=[arr])
-        fields = repMsg.split()
+        fields = cast(str, repMsg).split()
         mydtype = akdtype(fields[2])
         size = int(fields[3])
         ndim = int(fields[4])
@@ -230,12 +235,10 @@ def array(a: Union[pdarray, np.ndarray, Iterable]) -> Union[pdarray, Strings]:
         client_to_server_names[arr.name]=name
         return arr
     else:
-        fmt = ">{:n}{}".format(size, structDtypeCodes[a.dtype.name])
-        req_msg = "{} {:n} ". \
-                    format(a.dtype.name, size).encode() + struct.pack(fmt, *a)
-        arr = pdarray('array', req_msg)
+        req_msg = _payload(a, "{} {:n} ".format(a.dtype.name, size))
+        arr = pdarray('array', '')
         repMsg = generic_msg(cmd='array', args=req_msg, send_bytes=True, create_pdarray=True, return_value_needed=True, arr_id=arr.name, my_pdarray=[arr])
-        fields = repMsg.split()
+        fields = cast(str, repMsg).split()
         mydtype = akdtype(fields[2])
         size = int(fields[3])
         ndim = int(fields[4])
@@ -289,15 +292,21 @@ def zeros(size: int_scalars, dtype: type = np.float64) -> pdarray:
     if not np.isscalar(size):
         raise TypeError("size must be a scalar, not {}". \
                         format(size.__class__.__name__))
+    try:
+        # the size of the pdarray is an int, also when given as a str
+        size = int(size)
+    except ValueError:
+        raise TypeError("size must be an int or a str parseable to an int, not {}". \
+                        format(size))
 
     dtype = akdtype(dtype)  # normalize dtype
     # check dtype for error
     if cast(np.dtype, dtype).name not in NumericDTypes:
         raise TypeError("unsupported dtype {}".format(dtype))
 
-    if check_arr(dtype, size):
+    name = uncache_array(dtype, size)
+    if name is not None:
         cmd = "zerosStore"
-        name = uncache_array(dtype, size)
 
         arr = create_pdarray_with_name(name, cmd, "", dtype, size, 1,
                                        [size], dtype.itemsize)
@@ -309,6 +318,7 @@ def zeros(size: int_scalars, dtype: type = np.float64) -> pdarray:
 
         generic_msg(cmd=cmd, args=args, arr_id=arr.name, my_pdarray=[arr])
 
+        _fill_properties(arr, 0)
         return arr
 
     # repMsg = generic_msg(cmd="create", args="{} {}".format(cast(np.dtype, dtype).name, size))
@@ -319,6 +329,7 @@ def zeros(size: int_scalars, dtype: type = np.float64) -> pdarray:
                 format(cast(np.dtype, dtype).name, size),
                 create_pdarray=True, buff_emptying=False, arr_id=arr.name, my_pdarray=[arr])
 
+    _fill_properties(arr, 0)
     return arr
 
 
@@ -362,13 +373,19 @@ def ones(size: int_scalars, dtype: type = float64) -> pdarray:
     if not np.isscalar(size):
         raise TypeError("size must be a scalar, not {}". \
                         format(size.__class__.__name__))
+    try:
+        # the size of the pdarray is an int, also when given as a str
+        size = int(size)
+    except ValueError:
+        raise TypeError("size must be an int or a str parseable to an int, not {}". \
+                        format(size))
     dtype = akdtype(dtype)  # normalize dtype
     # check dtype for error
     if cast(np.dtype, dtype).name not in NumericDTypes:
         raise TypeError("unsupported dtype {}".format(dtype))
-    if check_arr(dtype, size):
+    name = uncache_array(dtype, size)
+    if name is not None:
         cmd = "zerosStore"
-        name = uncache_array(dtype, size)
         arr = create_pdarray_with_name(name, cmd, "", dtype, size, 1,
                                        [size], dtype.itemsize)
 
@@ -388,6 +405,7 @@ def ones(size: int_scalars, dtype: type = float64) -> pdarray:
                 create_pdarray=True, return_value_needed=True, buff_emptying=False, arr_id=arr.name, my_pdarray=[arr])
 
     arr.fill(1)
+    _fill_properties(arr, 1)
     return arr
 
 
@@ -563,11 +581,11 @@ def arange(*args) -> pdarray:
     if isSupportedInt(start) and isSupportedInt(stop) and isSupportedInt(stride):
         if stride < 0:
             stop = stop + 2
-        if check_arr(int64, size):
+        name = uncache_array(int64, size)
+        if name is not None:
             cmd = 'arangeStore'
-            name = uncache_array(int64, size)
             arr = create_pdarray_with_name(name, cmd, "", int64, size, 1, [size], int64.itemsize)
-            args = '{} {} {} {}'.format(start, stop, stride, name)
+            args = '{} {} {} {}'.format(start, stop, stride, arr.name)
             arr.cmd_args = args
             generic_msg(cmd = cmd, args = args, arr_id = arr.name, my_pdarray=[arr])
         else:
@@ -579,6 +597,16 @@ def arange(*args) -> pdarray:
                     format(start, stop, stride),
                     create_pdarray=True, buff_emptying=False, arr_id=arr.name, my_pdarray=[arr])
 
+        if stride > 0 and size > 0 and (stop - start) % stride == 0:
+            # the values are known, so are their reductions
+            first, step, n = int(start), int(stride), int(size)
+            last = first + (n - 1) * step
+            arr.properties.update(min=int64.type(first), max=int64.type(last),
+                                  argmin=int64.type(0), argmax=int64.type(n - 1),
+                                  is_sorted=np.bool_(True),
+                                  sum=_wrap_int64(n * first + step * n * (n - 1) // 2),
+                                  any=np.bool_(first != 0 or n > 1),
+                                  all=np.bool_(first > 0 or last < 0 or first % step != 0))
         return arr
         # return create_pdarray(repMsg)
     else:
@@ -586,6 +614,31 @@ def arange(*args) -> pdarray:
                         format(start, stop, stride))
 
 
+def _payload(a: np.ndarray, header: str) -> Union[bytes, Tuple[bytes, memoryview]]:
+    """
+    Return the payload sending the values of a after the header: if the
+    server accepts multipart payloads, the header and the native-endian
+    buffer of a, which is sent as its own frame without being copied,
+    else the header and the big-endian values as bytes
+    """
+    from arkouda.client import multipartPayloads
+    if multipartPayloads:
+        values = np.ascontiguousarray(a, dtype=a.dtype.newbyteorder('='))
+        return header.encode(), values.data.cast('B')
+    return header.encode() + a.astype(a.dtype.newbyteorder('>'), copy=False).tobytes()
+
+
+def _fill_properties(arr: pdarray, value: int) -> None:
+    """
+    Set the reductions of a new numeric pdarray filled with 0 or 1
+    """
+    if arr.size == 0 or arr.dtype not in (int64, float64):
+        return
+    arr.properties.update(min=arr.dtype.type(value), max=arr.dtype.type(value),
+                          sum=_wrap_int64(value * int(arr.size)) if arr.dtype == int64 else float64.type(value * arr.size),
+                          any=np.bool_(value), all=np.bool_(value))
+
+
 @typechecked
 def linspace(start: numeric_scalars,
              stop: numeric_scalars, length: int_scalars) -> pdarray:
@@ -711,9 +764,9 @@ def randint(low: numeric_scalars, high: numeric_scalars,
     highstr = NUMBER_FORMAT_STRINGS[dtype.name].format(high)
     sizestr = NUMBER_FORMAT_STRINGS['int64'].format(size)
 
-    if check_arr(dtype, size):
+    name = uncache_array(dtype, size)
+    if name is not None:
         cmd = "randintStore"
-        name = uncache_array(dtype, size)
 
         arr = create_pdarray_with_name(name, cmd, "", dtype, size, 1,
                                        [size], dtype.itemsize)
@@ -823,8 +876,12 @@ def standard_normal(size: int_scalars, seed: Union[None, int_scalars] = None) ->
     """
     if size < 0:
         raise ValueError("The size parameter must be > 0")
-    return create_pdarray(generic_msg(cmd='randomNormal', args='{} {}'. \
-                                      format(NUMBER_FORMAT_STRINGS['int64'].format(size), seed)))
+    args = '{} {}'.format(NUMBER_FORMAT_STRINGS['int64'].format(size), seed)
+    arr = pdarray(cmd='randomNormal', cmd_args=args, mydtype=float64, size=size,
+                  ndim=1, shape=[size], itemsize=float64.itemsize)
+    generic_msg(cmd='randomNormal', args=args, create_pdarray=True, arr_id=arr.name,
+                my_pdarray=[arr])
+    return arr
 
 
 @typechecked
@@ -1,9 +1,8 @@
 import numpy as np  # type: ignore
-import pandas as pd  # type: ignore
 import struct
 from typing import cast, Iterable, Optional, Union
 from typeguard import check_type, typechecked
-from arkouda.client import generic_msg, id_to_args, args_to_id
+from arkouda.client import generic_msg, id_to_args, args_to_id, record_update
 from arkouda.dtypes import structDtypeCodes, NUMBER_FORMAT_STRINGS, float64 as akfloat64, int64 as akint64, bool as akbool, \
     DTypes, isSupportedInt, isSupportedNumber, NumericDTypes, SeriesDTypes, \
     int_scalars, numeric_scalars
@@ -27,6 +26,7 @@ def move_records(a: pdarray, b: pdarray, c: pdarray, n: int, l: list) -> int:
 
 def cumsum(a: pdarray):
     a.properties.clear()
+    record_update(a.name)
     cmd = "cumsum"
     cmd_args = "{}".format(a.name)
     generic_msg(cmd, cmd_args, return_value_needed=False, my_pdarray=[a])
@@ -1,13 +1,14 @@
 from __future__ import annotations
 from typing import cast, Optional, Sequence, Tuple, Union, ForwardRef
 from typeguard import typechecked
-from arkouda.client import generic_msg, get_config
+from arkouda.client import generic_msg, get_config, find_common_subexpression, \
+    record_common_subexpression, expression_key, has_permutation
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.pdarraycreation import zeros, zeros_like, array
 from arkouda.sorting import argsort
 from arkouda.strings import Strings
 from arkouda.logger import getArkoudaLogger
-from arkouda.dtypes import dtype
+from arkouda.dtypes import dtype, int64
 
 Categorical = ForwardRef('Categorical')
 
@@ -54,7 +55,8 @@ def unique(pda : Union[pdarray,Strings,'Categorical'], # type: ignore
     -----
     For integer arrays, this function checks to see whether `pda` is sorted
     and, if so, whether it is already unique. This step can save considerable 
-    computation. Otherwise, this function will sort `pda`.
+    computation. Otherwise, this function will sort `pda`, unless the
+    permutation sorting `pda` was computed already, e.g. by a GroupBy.
 
     Examples
     --------
@@ -66,14 +68,34 @@ def unique(pda : Union[pdarray,Strings,'Categorical'], # type: ignore
     if hasattr(pda, 'unique'):
         return cast(Categorical_,pda).unique()
     elif isinstance(pda, pdarray):
-        repMsg = generic_msg(cmd="unique", args="{} {} {}".\
-                             format(pda.objtype, pda.name, return_counts))
+        args = "{} {} {}".format(pda.objtype, pda.name, return_counts)
+        key = expression_key("unique", args)
+        hit = find_common_subexpression(key, 2 if return_counts else 0)
+        if hit is not None:
+            return hit
+        if pda.dtype == int64 and has_permutation(expression_key("argsort", "{} {}".format(
+                                                                 pda.objtype, pda.name))):
+            # group by the permutation sorting pda rather than sorting it again
+            from arkouda.groupbyclass import GroupBy
+            g = GroupBy(pda)
+            if return_counts:
+                values, counts = g.count()
+                record_common_subexpression(values, key + ":0")
+                record_common_subexpression(counts, key + ":1")
+                return values, counts
+            record_common_subexpression(g.unique_keys, key)
+            return g.unique_keys
+        # the size of the result depends on the values of pda
+        repMsg = generic_msg(cmd="unique", args=args, return_value_needed=True, my_pdarray=[pda])
         if return_counts:
             vc = cast(str,repMsg).split("+")
             logger.debug(vc)
-            return create_pdarray(cast(str,vc[0])), create_pdarray(cast(str,vc[1]))
+            values, counts = create_pdarray(cast(str,vc[0])), create_pdarray(cast(str,vc[1]))
+            record_common_subexpression(values, key + ":0")
+            record_common_subexpression(counts, key + ":1")
+            return values, counts
         else:
-            return create_pdarray(cast(str,repMsg))
+            return create_pdarray(cast(str,repMsg), "unique", args)
     elif isinstance(pda, Strings):
         name = '{}+{}'.format(pda.offsets.name, pda.bytes.name)
         repMsg = cast(str,generic_msg(cmd="unique", args="{} {} {}".\
@@ -153,9 +175,15 @@ def in1d(pda1 : Union[pdarray,Strings,'Categorical'], pda2 : Union[pdarray,Strin
     if hasattr(pda1, 'categories'):
         return cast(Categorical_,pda1).in1d(pda2)
     elif isinstance(pda1, pdarray) and isinstance(pda2, pdarray):
-        repMsg = generic_msg(cmd="in1d", args="{} {} {}".\
-                             format(pda1.name, pda2.name, invert))
-        return create_pdarray(repMsg)
+        args = "{} {} {}".format(pda1.name, pda2.name, invert)
+        hit = find_common_subexpression(expression_key("in1d", args))
+        if hit is not None:
+            return hit
+        arr = pdarray(cmd="in1d", cmd_args=args, mydtype=dtype(bool), size=pda1.size,
+                      ndim=1, shape=[int(pda1.size)], itemsize=dtype(bool).itemsize)
+        generic_msg(cmd="in1d", args=args, create_pdarray=True, arr_id=arr.name,
+                    my_pdarray=[pda1, pda2, arr])
+        return arr
     elif isinstance(pda1, Strings) and isinstance(pda2, Strings):
         repMsg = generic_msg(cmd="segmentedIn1d", args="{} {} {} {} {} {} {}".\
                                     format(pda1.objtype,
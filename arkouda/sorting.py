@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import cast, Sequence, Union
 from typeguard import typechecked, check_type
-from arkouda.client import generic_msg
+from arkouda.client import generic_msg, find_common_subexpression, expression_key, \
+    find_permutation, client_to_server_names
 from arkouda.pdarrayclass import pdarray, create_pdarray
 from arkouda.pdarraycreation import zeros
 from arkouda.strings import Strings
@@ -57,7 +58,10 @@ def argsort(pda : Union[pdarray,Strings,'Categorical']) -> pdarray: # type: igno
         name = '{}+{}'.format(pda.offsets.name, pda.bytes.name)
     else:
         name = pda.name
-    repMsg = generic_msg(cmd="argsort", args="{} {}".format(pda.objtype, name))
+    args = "{} {}".format(pda.objtype, name)
+    if isinstance(pda, pdarray):
+        return _permutation("argsort", args, int(pda.size), [pda])
+    repMsg = generic_msg(cmd="argsort", args=args)
     return create_pdarray(cast(str,repMsg))
 
 
@@ -129,10 +133,32 @@ def coargsort(arrays: Sequence[Union[Strings, pdarray, 'Categorical']]) -> pdarr
             raise ValueError("All pdarrays, Strings, or Categoricals must be of the same size")
     if size == 0:
         return zeros(0, dtype=int64)
-    repMsg = generic_msg(cmd="coargsort", args="{:n} {} {}".format(len(arrays), 
-                                                                   ' '.join(anames), ' '.join(atypes)))
+    args = "{:n} {} {}".format(len(arrays), ' '.join(anames), ' '.join(atypes))
+    if all(isinstance(a, pdarray) for a in arrays):
+        return _permutation("coargsort", args, size, list(arrays))
+    repMsg = generic_msg(cmd="coargsort", args=args)
     return create_pdarray(cast(str, repMsg))
 
+
+def _permutation(cmd: str, args: str, size: int, arrays: list) -> pdarray:
+    """
+    Buffer a command creating an int64 permutation of the given size from
+    pdarrays, unless the same command already computed a live permutation
+    from the same pdarrays, or one which is cached since it was dropped
+    """
+    key = expression_key(cmd, args)
+    hit = find_common_subexpression(key)
+    if hit is not None:
+        return hit
+    arr = pdarray(cmd=cmd, cmd_args=args, mydtype=int64, size=size,
+                  ndim=1, shape=[size], itemsize=int64.itemsize)
+    name = find_permutation(key)
+    if name is not None:
+        client_to_server_names[arr.name] = name
+        return arr
+    generic_msg(cmd=cmd, args=args, create_pdarray=True, arr_id=arr.name, my_pdarray=arrays + [arr])
+    return arr
+
 @typechecked
 def sort(pda : pdarray) -> pdarray:
     """
@@ -3,7 +3,8 @@ from __future__ import annotations
 import itertools
 from typing import cast, Tuple, List, Optional, Union
 from typeguard import typechecked
-from arkouda.client import generic_msg
+from arkouda.client import generic_msg, find_common_subexpression, \
+    record_common_subexpression, expression_key
 from arkouda.pdarrayclass import pdarray, create_pdarray, parse_single_value, \
      unregister_pdarray_by_name, RegistrationError
 from arkouda.logger import getArkoudaLogger
@@ -702,9 +703,17 @@ class Strings:
         cmd = "segmentedHash"
         args = "{} {} {}".format(self.objtype, self.offsets.name, 
                                               self.bytes.name)
-        repMsg = generic_msg(cmd=cmd,args=args)
+        key = expression_key(cmd, args)
+        hit = find_common_subexpression(key, 2)
+        if hit is not None:
+            return hit
+        repMsg = generic_msg(cmd=cmd,args=args, return_value_needed=True,
+                             my_pdarray=[self.offsets, self.bytes])
         h1, h2 = cast(str,repMsg).split('+')
-        return create_pdarray(h1), create_pdarray(h2)
+        hashes = create_pdarray(h1), create_pdarray(h2)
+        record_common_subexpression(hashes[0], key + ":0")
+        record_common_subexpression(hashes[1], key + ":1")
+        return hashes
 
     def group(self) -> pdarray:
         """
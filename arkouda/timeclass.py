@@ -7,6 +7,8 @@ import numpy as np # type: ignore
 import datetime
 from typing import Union
 
+__all__ = ["Datetime", "Timedelta", "date_range", "timedelta_range"]
+
 _BASE_UNIT = 'ns'
 
 _unit2normunit = {'weeks': 'w',
@@ -0,0 +1,224 @@
+import sys
+from typing import cast, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np  # type: ignore
+from arkouda import client
+from arkouda.compression import decompress
+from arkouda.dtypes import NumericDTypes
+from arkouda.lazy import compute
+from arkouda.pdarrayclass import pdarray
+from arkouda.pdarraycreation import zeros
+
+__all__ = ["upload", "download"]
+
+
+def _check_server() -> None:
+    if not client.chunkedTransfers:
+        raise RuntimeError('the server does not support chunked transfers')
+
+
+def _chunk_length(itemsize: int, chunk_bytes: Optional[int]) -> int:
+    """
+    Return the number of values in a chunk of at most chunk_bytes
+    """
+    if chunk_bytes is None:
+        chunk_bytes = client.chunkTransferBytes
+    return max(1, chunk_bytes // itemsize)
+
+
+def _is_buffer(source) -> bool:
+    try:
+        memoryview(source)
+    except TypeError:
+        return False
+    return True
+
+
+def download(pda: pdarray, out: Optional[np.ndarray] = None,
+             chunk_bytes: Optional[int] = None) -> np.ndarray:
+    """
+    Transfer the values of the pdarray to the client in chunks of
+    chunk_bytes, keeping up to ak.client.maxChunksInFlight chunks requested
+    at a time. Unlike pdarray.to_ndarray, the transfer is not limited by
+    ak.maxTransferBytes: neither the server nor the client hold more than
+    the values and a few chunks. Chunks are compressed one by one if
+    compression is enabled (see ak.client.set_compression).
+
+    Parameters
+    ----------
+    pda : pdarray
+        The pdarray to transfer
+    out : np.ndarray, optional
+        The array the values are written into, e.g. a np.empty or np.memmap
+        of the size and native dtype of the pdarray. A new array is
+        allocated if None.
+    chunk_bytes : int, optional
+        The size of a chunk, defaults to ak.client.chunkTransferBytes
+
+    Returns
+    -------
+    np.ndarray
+        out, or the new array holding the values
+
+    Raises
+    ------
+    ValueError
+        Raised if out does not have the size and dtype of the pdarray
+    RuntimeError
+        Raised if the server does not support chunked transfers, or if
+        there is a server-side error thrown
+
+    See Also
+    --------
+    upload, pdarray.to_ndarray
+
+    Examples
+    --------
+    >>> a = ak.arange(0, 10, 1)
+    >>> out = np.memmap('a.dat', dtype=np.int64, mode='w+', shape=(10,))
+    >>> ak.download(a, out=out, chunk_bytes=32)
+    memmap([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+    """
+    _check_server()
+    dtype = np.dtype(pda.dtype.name)
+    if out is None:
+        out = np.empty(pda.size, dtype=dtype)
+    elif out.shape != (pda.size,) or out.dtype != dtype:
+        raise ValueError('out must be a rank-1 array of {} {} values, not {} {}'.format(
+            pda.size, dtype, out.size, out.dtype))
+    compute(pda)
+    name = client.client_to_server_names.get(pda.name, pda.name)
+    length = _chunk_length(dtype.itemsize, chunk_bytes)
+    starts = range(0, pda.size, length)
+
+    def requests() -> Iterator[Tuple[str, str, None]]:
+        for start in starts:
+            count = min(length, pda.size - start)
+            args = '{} {} {} {}'.format(name, start, count, sys.byteorder)
+            codec = client._transfer_codec(int(count) * dtype.itemsize)
+            if codec is not None:
+                args += ' ' + codec
+            yield 'tondarray', args, None
+
+    def on_reply(index: int, frame) -> None:
+        start = starts[index]
+        stop = min(start + length, pda.size)
+        expected = int(stop - start) * dtype.itemsize
+        codec = client._transfer_codec(expected)
+        if codec is None and len(frame) == expected:
+            out[start:stop] = np.frombuffer(frame.buffer, dtype=dtype)
+            return
+        if bytes(frame.buffer[:6]) == b'Error:':
+            raise RuntimeError(frame.bytes.decode())
+        if codec is None:
+            raise RuntimeError('Expected {} bytes but received {}'.format(expected, len(frame)))
+        out[start:stop] = np.frombuffer(decompress(codec, frame.buffer, expected), dtype=dtype)
+
+    client._send_chunked_messages(requests(), on_reply, recv_bytes=True)
+    return out
+
+
+def upload(source: Union[np.ndarray, bytes, memoryview, Iterable], dtype: Optional[type] = None,
+           size: Optional[int] = None, chunk_bytes: Optional[int] = None) -> pdarray:
+    """
+    Create a pdarray from values transferred to the server in chunks of
+    chunk_bytes, keeping up to ak.client.maxChunksInFlight chunks sent at a
+    time. Unlike ak.array, the transfer is not limited by
+    ak.maxTransferBytes, and the values are read as they are sent. Chunks
+    are compressed one by one if compression is enabled (see
+    ak.client.set_compression).
+
+    Parameters
+    ----------
+    source : Union[np.ndarray, bytes, memoryview, Iterable]
+        A rank-1 np.ndarray or np.memmap, an object supporting the buffer
+        protocol, or an iterable of such arrays or buffers, sent in order
+    dtype : type, optional
+        The dtype of the values, defaults to that of source or of its first
+        array. Required for buffers.
+    size : int, optional
+        The total number of values, required for iterables
+    chunk_bytes : int, optional
+        The size of a chunk, defaults to ak.client.chunkTransferBytes
+
+    Returns
+    -------
+    pdarray
+        The pdarray holding the values
+
+    Raises
+    ------
+    TypeError
+        Raised if the dtype is missing or not supported
+    ValueError
+        Raised if the size is missing, or if an iterable yields more or
+        fewer values than size
+    RuntimeError
+        Raised if the server does not support chunked transfers, or if
+        there is a server-side error thrown
+
+    See Also
+    --------
+    download, array
+
+    Examples
+    --------
+    >>> chunks = (np.arange(i, i + 5) for i in range(0, 20, 5))
+    >>> ak.upload(chunks, size=20)
+    array([0 1 2 ... 17 18 19])
+    """
+    _check_server()
+    if not isinstance(source, np.ndarray) and _is_buffer(source):
+        if dtype is None:
+            raise TypeError('dtype is required to upload a buffer')
+        source = np.frombuffer(cast(bytes, source), dtype=dtype)
+    if isinstance(source, np.ndarray):
+        if source.ndim != 1:
+            raise ValueError('Only rank-1 arrays supported')
+        parts: Iterator = iter([source])
+        size = source.size
+        if dtype is None:
+            dtype = source.dtype
+    else:
+        if size is None:
+            raise ValueError('size is required to upload an iterable')
+        parts = iter(source)
+        if dtype is None:
+            first = next(parts, None)
+            if not isinstance(first, np.ndarray):
+                raise TypeError('dtype is required unless the first chunk is a np.ndarray')
+            dtype = first.dtype
+            parts = _chain(first, parts)
+    native = np.dtype(dtype).newbyteorder('=')
+    if native.name not in NumericDTypes:
+        raise TypeError('Unhandled dtype {}'.format(native))
+
+    arr = zeros(size, dtype=native.type)
+    compute(arr)
+    name = client.client_to_server_names.get(arr.name, arr.name)
+    length = _chunk_length(native.itemsize, chunk_bytes)
+    offset = 0
+
+    def requests() -> Iterator[Tuple[str, str, Tuple[bytes, memoryview]]]:
+        nonlocal offset
+        for part in parts:
+            if not isinstance(part, np.ndarray):
+                part = np.frombuffer(part, dtype=native)
+            for start in range(0, part.size, length):
+                values = np.ascontiguousarray(part[start:start + length], dtype=native)
+                if offset + values.size > size:
+                    raise ValueError('source has more than {} values'.format(size))
+                header = '{} {} {} '.format(name, offset, values.size).encode()
+                offset += values.size
+                yield 'arrayChunk', '', (header, values.data.cast('B'))
+
+    client._send_chunked_messages(requests(), lambda index, reply: None)
+    if offset != size:
+        raise ValueError('source has {} values, not {}'.format(offset, size))
+    # the values were written in place of the zeros
+    arr.properties.clear()
+    return arr
+
+
+def _chain(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import time, argparse
+import numpy as np
+import arkouda as ak
+
+KINDS = ('ids', 'mask', 'random')
+
+def make_values(kind, N, seed):
+    if kind == 'ids':
+        # sorted integer ID columns, as produced by joins and groupbys
+        return np.arange(N, dtype=np.int64) // 4
+    if kind == 'mask':
+        return np.random.RandomState(seed).random_sample(N) < 0.1
+    return np.random.RandomState(seed).randint(0, 2**62, N, dtype=np.int64)
+
+def wire_seconds(npa, codec, bandwidth):
+    """
+    Time to send the values over a link of bandwidth bytes/sec, compressed
+    with codec if not None
+    """
+    if bandwidth is None:
+        return 0.0
+    data = memoryview(np.ascontiguousarray(npa)).cast('B')
+    if codec is not None:
+        data = ak.compression.compress(codec, data)
+    return len(data) / bandwidth
+
+def time_transfers(npa, trials, codec=None, bandwidth=None):
+    to_ndarray_times = []
+    to_pdarray_times = []
+    wire = wire_seconds(npa, codec, bandwidth)
+    for i in range(trials):
+        start = time.time()
+        aka = ak.array(npa)
+        end = time.time()
+        to_pdarray_times.append(end - start + wire)
+        start = time.time()
+        aka.to_ndarray()
+        end = time.time()
+        to_ndarray_times.append(end - start + wire)
+    return sum(to_pdarray_times) / trials, sum(to_ndarray_times) / trials
+
+def time_ak_compressed_transfer(kind, codecs, sizes, trials, seed, bandwidth):
+    print(">>> arkouda {} array transfer compression".format(kind))
+    if bandwidth is not None:
+        print("modeling a link of {:,.0f} MB/s".format(bandwidth / 2**20))
+    cfg = ak.get_config()
+    print("numLocales = {}, server codecs = {}".format(cfg["numLocales"],
+                                                      cfg.get("compressionCodecs", "")))
+    print("{:>12} {:>8} {:>12} {:>12} {:>10}".format('bytes', 'codec', 'ak.array s',
+                                                    'to_ndarray s', 'speedup'))
+    # compression breaks even at the smallest size from which it is faster
+    break_even = {codec: None for codec in codecs}
+    largest = 0
+    for N in sizes:
+        npa = make_values(kind, N, seed)
+        nb = npa.size * npa.itemsize
+        largest = nb
+        ak.client.maxTransferBytes = max(ak.client.maxTransferBytes, nb)
+        ak.client.set_compression(None)
+        up, down = time_transfers(npa, trials, None, bandwidth)
+        base = up + down
+        print("{:>12,} {:>8} {:>12.4f} {:>12.4f} {:>10}".format(nb, 'none', up, down, ''))
+        for codec in codecs:
+            ak.client.set_compression(codec, threshold=0)
+            up, down = time_transfers(npa, trials, codec, bandwidth)
+            print("{:>12,} {:>8} {:>12.4f} {:>12.4f} {:>9.2f}x".format(nb, codec, up, down,
+                                                                      base / (up + down)))
+            if up + down >= base:
+                break_even[codec] = None
+            elif break_even[codec] is None:
+                break_even[codec] = nb
+    ak.client.set_compression(None)
+    for codec, nb in break_even.items():
+        if nb is None:
+            print("{}: compression did not pay off up to {:,} bytes".format(codec, largest))
+        else:
+            print("{}: break-even at about {:,} bytes".format(codec, nb))
+
+def check_correctness(kind, codecs, seed):
+    npa = make_values(kind, 10**4, seed)
+    for codec in codecs:
+        ak.client.set_compression(codec, threshold=0)
+        assert (ak.array(npa).to_ndarray() == npa).all()
+    ak.client.set_compression(None)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the break-even point of compressing array transfers, e.g. over ARKOUDA_TUNNEL_SERVER tunnels.")
+    parser.add_argument('hostname', help='Hostname of arkouda server')
+    parser.add_argument('port', type=int, help='Port of arkouda server')
+    parser.add_argument('-n', '--size', type=int, default=10**7, help='Largest problem size: length of array')
+    parser.add_argument('-t', '--trials', type=int, default=3, help='Number of times to run the benchmark')
+    parser.add_argument('-k', '--kind', default='ids', help='Values to transfer ({})'.format(', '.join(KINDS)))
+    parser.add_argument('-b', '--bandwidth', type=float, default=None, help='Model a link of this many MB/s, e.g. an ssh tunnel, by adding the time to send the bytes on the wire')
+    parser.add_argument('-c', '--codecs', default=None, help='Comma-separated codecs to compare, defaults to those both ends support')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check correctness, not performance.')
+    parser.add_argument('-s', '--seed', default=None, type=int, help='Value to initialize random number generator')
+    return parser
+
+if __name__ == "__main__":
+    import sys
+    parser = create_parser()
+    args = parser.parse_args()
+    if args.kind not in KINDS:
+        raise ValueError("Kind must be {}, not {}".format('/'.join(KINDS), args.kind))
+    ak.verbose = False
+    ak.connect(args.hostname, args.port)
+    if args.codecs is None:
+        codecs = [c for c in ak.compression.available_codecs() if c in ak.client.serverCodecs]
+    else:
+        codecs = args.codecs.split(',')
+
+    if args.correctness_only:
+        for kind in KINDS:
+            check_correctness(kind, codecs, args.seed)
+        sys.exit(0)
+
+    sizes = []
+    N = 2**10
+    while N < args.size:
+        sizes.append(N)
+        N *= 4
+    sizes.append(args.size)
+    print("number of trials = ", args.trials)
+    bandwidth = None if args.bandwidth is None else args.bandwidth * 2**20
+    time_ak_compressed_transfer(args.kind, codecs, sizes, args.trials, args.seed, bandwidth)
+    sys.exit(0)
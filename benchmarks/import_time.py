@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import argparse, os, re, statistics, subprocess, sys
+from collections import defaultdict
+
+# modules which are imported on first use, and must not be imported by
+# "import arkouda" itself
+DEFERRED = ('pandas', 'pyfiglet', 'pkg_resources')
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def import_times(module):
+    """
+    Import the module in a fresh interpreter with -X importtime, returning
+    the microseconds spent importing each module, as (self, cumulative)
+    """
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+                         stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                         env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'),
+                         universal_newlines=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+def time_import(module, trials, top):
+    print(">>> import {}".format(module))
+    # compile the bytecode once, so that the trials only measure importing
+    subprocess.run([sys.executable, '-c', 'import compileall, os, {0}; compileall.compile_dir('
+                    'os.path.dirname({0}.__file__), quiet=1)'.format(module)],
+                   stdout=subprocess.DEVNULL, check=True)
+    runs = [import_times(module) for _ in range(trials)]
+    totals = [run[module][1] / 1e6 for run in runs]
+    tavg = statistics.median(totals)
+    print("Average time = {:.4f} sec".format(tavg))
+    # self time of each top-level package, e.g. numpy including numpy.core
+    packages = defaultdict(list)
+    for run in runs:
+        selfs = defaultdict(int)
+        for name, (self_us, _) in run.items():
+            selfs[name.split('.')[0]] += self_us
+        for name, self_us in selfs.items():
+            packages[name].append(self_us)
+    slowest = sorted(packages.items(), key=lambda kv: -statistics.median(kv[1]))[:top]
+    for name, self_us in slowest:
+        print("  {:<20} {:.4f} sec".format(name, statistics.median(self_us) / 1e6))
+    return tavg, runs[-1]
+
+def check_correctness(module):
+    imported = import_times(module)
+    for name in DEFERRED:
+        assert name not in imported, "import {} imports {}".format(module, name)
+
+def create_parser():
+    parser = argparse.ArgumentParser(description="Measure the time to import arkouda with python -X importtime.")
+    parser.add_argument('hostname', nargs='?', help='Hostname of arkouda server (unused)')
+    parser.add_argument('port', nargs='?', type=int, help='Port of arkouda server (unused)')
+    parser.add_argument('-n', '--size', type=int, default=1, help='Problem size (unused)')
+    parser.add_argument('-t', '--trials', type=int, default=5, help='Number of times to run the benchmark')
+    parser.add_argument('-m', '--module', default='arkouda', help='Module to import')
+    parser.add_argument('-b', '--budget', type=float, default=0.5, help='Fail if the median import time exceeds this many seconds')
+    parser.add_argument('--top', type=int, default=8, help='Number of slowest packages to report')
+    parser.add_argument('--correctness-only', default=False, action='store_true', help='Only check that the deferred modules ({}) are not imported.'.format(', '.join(DEFERRED)))
+    return parser
+
+if __name__ == "__main__":
+    parser = create_parser()
+    args = parser.parse_args()
+
+    if args.correctness_only:
+        check_correctness(args.module)
+        sys.exit(0)
+
+    print("number of trials = ", args.trials)
+    tavg, imported = time_import(args.module, args.trials, args.top)
+    deferred = [name for name in DEFERRED if name in imported]
+    if deferred:
+        print("import {} imports {}, which should be deferred".format(args.module, ', '.join(deferred)))
+        sys.exit(1)
+    if args.budget is not None and tavg > args.budget:
+        print("Import time {:.4f} sec exceeds the budget of {:.4f} sec".format(tavg, args.budget))
+        sys.exit(1)
+    sys.exit(0)
@@ -22,7 +22,7 @@ logging.basicConfig(level=logging.INFO)
 BENCHMARKS = ['stream', 'argsort', 'coargsort', 'groupby', 'aggregate', 'gather', 'scatter',
               'reduce', 'scan', 'noop', 'setops', 'array_create',
               'array_transfer', 'IO', 'str-argsort', 'str-coargsort',
-              'str-groupby', 'str-gather']
+              'str-groupby', 'str-gather', 'import_time']
 
 def get_chpl_util_dir():
     """ Get the Chapel directory that contains graph generation utilities. """
@@ -0,0 +1,169 @@
+/*
+ * Compression of the binary payloads of array transfers. zlib is always
+ * available, since HDF5 links it; lz4 and zstd are compiled in with
+ * -slz4Compression=true and -szstdCompression=true.
+ */
+module Compression {
+    use SysCTypes;
+    use CPtr;
+    use Errors;
+    use Reflection;
+    use List;
+
+    config param lz4Compression = false;
+    config param zstdCompression = false;
+
+    /*
+     * The compression level of replies: transfers are bandwidth-bound, so the
+     * fastest level gains the most
+     */
+    config const compressionLevel = 1;
+
+    require "zlib.h", "-lz";
+    extern proc compressBound(sourceLen: c_ulong): c_ulong;
+    extern proc compress2(dest: c_ptr(uint(8)), ref destLen: c_ulong, source: c_ptr(uint(8)),
+                          sourceLen: c_ulong, level: c_int): c_int;
+    extern proc uncompress(dest: c_ptr(uint(8)), ref destLen: c_ulong, source: c_ptr(uint(8)),
+                           sourceLen: c_ulong): c_int;
+    extern const Z_OK: c_int;
+
+    if lz4Compression {
+        require "lz4.h", "-llz4";
+    }
+    extern proc LZ4_compressBound(inputSize: c_int): c_int;
+    extern proc LZ4_compress_fast(src: c_ptr(uint(8)), dst: c_ptr(uint(8)), srcSize: c_int,
+                                  dstCapacity: c_int, acceleration: c_int): c_int;
+    extern proc LZ4_decompress_safe(src: c_ptr(uint(8)), dst: c_ptr(uint(8)),
+                                    compressedSize: c_int, dstCapacity: c_int): c_int;
+
+    if zstdCompression {
+        require "zstd.h", "-lzstd";
+    }
+    extern proc ZSTD_compressBound(srcSize: c_size_t): c_size_t;
+    extern proc ZSTD_compress(dst: c_ptr(uint(8)), dstCapacity: c_size_t, src: c_ptr(uint(8)),
+                              srcSize: c_size_t, compressionLevel: c_int): c_size_t;
+    extern proc ZSTD_decompress(dst: c_ptr(uint(8)), dstCapacity: c_size_t, src: c_ptr(uint(8)),
+                                compressedSize: c_size_t): c_size_t;
+    extern proc ZSTD_isError(code: c_size_t): c_uint;
+
+    /*
+     * The codecs the server supports, reported as compressionCodecs in its
+     * config
+     */
+    proc supportedCodecs(): list(string) {
+        var codecs = new list(string);
+        codecs.append("zlib");
+        if lz4Compression then codecs.append("lz4");
+        if zstdCompression then codecs.append("zstd");
+        return codecs;
+    }
+
+    private proc ptrTo(data: bytes): c_ptr(uint(8)) {
+        return data.c_str():c_void_ptr:c_ptr(uint(8));
+    }
+
+    private proc codecError(codec: string, action: string) throws {
+        throw getErrorWithContext(
+                   msg="Unable to %s with %s".format(action, codec),
+                   lineNumber=getLineNumber(),
+                   routineName=getRoutineName(),
+                   moduleName=getModuleName(),
+                   errorClass="ErrorWithContext");
+    }
+
+    /*
+     * Compresses data with codec, one of supportedCodecs()
+     *
+     * :arg codec: the codec
+     * :arg data: the bytes to compress
+     *
+     * :returns: the compressed bytes
+     */
+    proc compressBytes(codec: string, data: bytes): bytes throws {
+        var capacity, size: int;
+        var buff: c_ptr(uint(8));
+        select codec {
+            when "zlib" {
+                var destLen = compressBound(data.size:c_ulong);
+                capacity = destLen:int;
+                buff = c_malloc(uint(8), capacity + 1);
+                if compress2(buff, destLen, ptrTo(data), data.size:c_ulong,
+                             compressionLevel:c_int) != Z_OK {
+                    c_free(buff);
+                    codecError(codec, "compress");
+                }
+                size = destLen:int;
+            }
+            when "lz4" {
+                if !lz4Compression then codecError(codec, "compress");
+                if lz4Compression {
+                    capacity = LZ4_compressBound(data.size:c_int):int;
+                    buff = c_malloc(uint(8), capacity + 1);
+                    size = LZ4_compress_fast(ptrTo(data), buff, data.size:c_int,
+                                             capacity:c_int, 1:c_int):int;
+                    if size <= 0 && data.size > 0 {
+                        c_free(buff);
+                        codecError(codec, "compress");
+                    }
+                }
+            }
+            when "zstd" {
+                if !zstdCompression then codecError(codec, "compress");
+                if zstdCompression {
+                    capacity = ZSTD_compressBound(data.size:c_size_t):int;
+                    buff = c_malloc(uint(8), capacity + 1);
+                    const ret = ZSTD_compress(buff, capacity:c_size_t, ptrTo(data),
+                                              data.size:c_size_t, compressionLevel:c_int);
+                    if ZSTD_isError(ret) != 0 {
+                        c_free(buff);
+                        codecError(codec, "compress");
+                    }
+                    size = ret:int;
+                }
+            }
+            otherwise {
+                codecError(codec, "compress");
+            }
+        }
+        return createBytesWithOwnedBuffer(buff, length=size, size=capacity + 1);
+    }
+
+    /*
+     * Decompresses data compressed with codec, one of supportedCodecs()
+     *
+     * :arg codec: the codec
+     * :arg data: the compressed bytes
+     * :arg nbytes: the size of the decompressed bytes
+     *
+     * :returns: the decompressed bytes
+     */
+    proc decompressBytes(codec: string, data: bytes, nbytes: int): bytes throws {
+        var buff = c_malloc(uint(8), nbytes + 1);
+        var ok = false;
+        select codec {
+            when "zlib" {
+                var destLen = nbytes:c_ulong;
+                ok = uncompress(buff, destLen, ptrTo(data), data.size:c_ulong) == Z_OK &&
+                     destLen:int == nbytes;
+            }
+            when "lz4" {
+                if lz4Compression {
+                    ok = LZ4_decompress_safe(ptrTo(data), buff, data.size:c_int,
+                                             nbytes:c_int):int == nbytes;
+                }
+            }
+            when "zstd" {
+                if zstdCompression {
+                    const ret = ZSTD_decompress(buff, nbytes:c_size_t, ptrTo(data),
+                                                data.size:c_size_t);
+                    ok = ZSTD_isError(ret) == 0 && ret:int == nbytes;
+                }
+            }
+        }
+        if !ok {
+            c_free(buff);
+            codecError(codec, "decompress");
+        }
+        return createBytesWithOwnedBuffer(buff, length=nbytes, size=nbytes + 1);
+    }
+}
@@ -197,8 +197,8 @@ module EfuncMsg
                 var e3 = toSymEntry(g3, int);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, e2.a, e3.a, 0);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                        where_helper(e1.a, e2.a, e3.a, 0, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -214,8 +214,8 @@ module EfuncMsg
                 var e3 = toSymEntry(g3, real);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, e2.a, e3.a, 0);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                        where_helper(e1.a, e2.a, e3.a, 0, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -231,8 +231,8 @@ module EfuncMsg
                 var e3 = toSymEntry(g3, bool);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, e2.a, e3.a, 0);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                        where_helper(e1.a, e2.a, e3.a, 0, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -292,8 +292,8 @@ module EfuncMsg
                var val = try! value:int;
                select efunc {
                   when "where" {
-                      var a = where_helper(e1.a, e2.a, val, 1);
-                      st.addEntry(rname, new shared SymEntry(a));
+                      var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                      where_helper(e1.a, e2.a, val, 1, a.a);
                   }
                   otherwise {
                       var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -309,8 +309,8 @@ module EfuncMsg
                 var val = try! value:real;
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, e2.a, val, 1);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                        where_helper(e1.a, e2.a, val, 1, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -326,8 +326,8 @@ module EfuncMsg
                 var val = try! value.toLower():bool;
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, e2.a, val, 1);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, e2.a.eltType);
+                        where_helper(e1.a, e2.a, val, 1, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -388,8 +388,8 @@ module EfuncMsg
                 var e2 = toSymEntry(g2, int);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val, e2.a, 2);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val.type);
+                        where_helper(e1.a, val, e2.a, 2, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -405,8 +405,8 @@ module EfuncMsg
                 var e2 = toSymEntry(g2, real);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val, e2.a, 2);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val.type);
+                        where_helper(e1.a, val, e2.a, 2, a.a);
                     }
                     otherwise {
                       var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -422,8 +422,8 @@ module EfuncMsg
                 var e2 = toSymEntry(g2, bool);
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val, e2.a, 2);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val.type);
+                        where_helper(e1.a, val, e2.a, 2, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -479,8 +479,8 @@ module EfuncMsg
                 var val2 = try! value2:int;
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val1, val2, 3);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val1.type);
+                        where_helper(e1.a, val1, val2, 3, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -496,8 +496,8 @@ module EfuncMsg
                 var val2 = try! value2:real;
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val1, val2, 3);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val1.type);
+                        where_helper(e1.a, val1, val2, 3, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -513,8 +513,8 @@ module EfuncMsg
                 var val2 = try! value2.toLower():bool;
                 select efunc {
                     when "where" {
-                        var a = where_helper(e1.a, val1, val2, 3);
-                        st.addEntry(rname, new shared SymEntry(a));
+                        var a = st.addEntry(rname, e1.size, val1.type);
+                        where_helper(e1.a, val1, val2, 3, a.a);
                     }
                     otherwise {
                         var errorMsg = notImplementedError(pn,efunc,g1.dtype,
@@ -538,8 +538,9 @@ module EfuncMsg
     }
 
     /* The 'where' function takes a boolean array and two other arguments A and B, and 
-       returns an array with A where the boolean is true and B where it is false. A and B
-       can be vectors or scalars. 
+       fills the array C with A where the boolean is true and B where it is false. A and B
+       can be vectors or scalars. C is the array of the result entry, which the server may
+       recycle from an output buffer rather than allocate. 
        Dev Note: I would like to be able to write these functions without
        the param kind and just let the compiler choose, but it complains about an
        ambiguous call. 
@@ -555,13 +556,14 @@ module EfuncMsg
 
        :arg kind:
        :type kind: param
+
+       :arg C:
+       :type C: [D] t
        */
-    proc where_helper(cond:[?D] bool, A:[D] ?t, B:[D] t, param kind):[D] t where (kind == 0) {
-      var C:[D] t;
+    proc where_helper(cond:[?D] bool, A:[D] ?t, B:[D] t, param kind, ref C:[D] t) where (kind == 0) {
       forall (ch, a, b, c) in zip(cond, A, B, C) {
         c = if ch then a else b;
       }
-      return C;
     }
 
     /*
@@ -577,13 +579,14 @@ module EfuncMsg
 
     :arg kind:
     :type kind: param
+
+    :arg C:
+    :type C: [D] t
     */
-    proc where_helper(cond:[?D] bool, A:[D] ?t, b:t, param kind):[D] t where (kind == 1) {
-      var C:[D] t;
+    proc where_helper(cond:[?D] bool, A:[D] ?t, b:t, param kind, ref C:[D] t) where (kind == 1) {
       forall (ch, a, c) in zip(cond, A, C) {
         c = if ch then a else b;
       }
-      return C;
     }
 
     /*
@@ -599,13 +602,14 @@ module EfuncMsg
 
     :arg kind:
     :type kind: param
+
+    :arg C:
+    :type C: [D] t
     */
-    proc where_helper(cond:[?D] bool, a:?t, B:[D] t, param kind):[D] t where (kind == 2) {
-      var C:[D] t;
+    proc where_helper(cond:[?D] bool, a:?t, B:[D] t, param kind, ref C:[D] t) where (kind == 2) {
       forall (ch, b, c) in zip(cond, B, C) {
         c = if ch then a else b;
       }
-      return C;
     }
 
     /*
@@ -621,13 +625,14 @@ module EfuncMsg
 
     :arg kind:
     :type kind: param
+
+    :arg C:
+    :type C: [D] t
     */
-    proc where_helper(cond:[?D] bool, a:?t, b:t, param kind):[D] t where (kind == 3) {
-      var C:[D] t;
+    proc where_helper(cond:[?D] bool, a:?t, b:t, param kind, ref C:[D] t) where (kind == 3) {
       forall (ch, c) in zip(cond, C) {
         c = if ch then a else b;
       }
-      return C;
     }    
 
 }
@@ -0,0 +1,294 @@
+module FusedMsg
+{
+    use ServerConfig;
+
+    use Math;
+    use Map;
+    use Reflection;
+    use Errors;
+    use Logging;
+    use Message;
+
+    use MultiTypeSymbolTable;
+    use MultiTypeSymEntry;
+    use ServerErrorStrings;
+
+    private config const logLevel = ServerConfig.logLevel;
+    const fmLogger = new Logger(logLevel);
+
+    /* maximum number of distinct pdarrays a fused expression may read */
+    param maxFusedOperands = 4;
+
+    /* maximum depth of the evaluation stack of a fused expression */
+    param maxFusedDepth = 16;
+
+    enum FusedOp {Load, Const, Add, Sub, Mul, Div, DivScalar, Abs, Log, Exp, Sin, Cos};
+
+    /* one instruction of the postfix program of a fused expression */
+    record FusedInstr {
+        var op: FusedOp;
+        var slot: int;
+        var ival: int;
+        var rval: real;
+    }
+
+    /*
+    Evaluate a postfix program over every element of its operand arrays in a
+    single pass, writing the result to ra. Unused operand slots are padded
+    with one of the used operands. Each task evaluates its own copy of the
+    program on a fixed-size stack, so no intermediate arrays are created.
+
+    :arg ra: the result array
+    :arg prog: the postfix program
+    :arg a0: operand slot 0
+    :arg a1: operand slot 1
+    :arg a2: operand slot 2
+    :arg a3: operand slot 3
+    */
+    proc evalFused(ref ra: [?D] ?RT, const ref prog: [] FusedInstr,
+                   const ref a0: [D] ?LT, const ref a1: [D] LT,
+                   const ref a2: [D] LT, const ref a3: [D] LT) {
+        forall (r, x0, x1, x2, x3) in zip(ra, a0, a1, a2, a3) with (var p = prog) {
+            var stack: maxFusedDepth*RT;
+            var sp = 0;
+            for ins in p {
+                select ins.op {
+                    when FusedOp.Load {
+                        var v: LT;
+                        select ins.slot {
+                            when 0 do v = x0;
+                            when 1 do v = x1;
+                            when 2 do v = x2;
+                            otherwise do v = x3;
+                        }
+                        stack[sp] = v:RT;
+                        sp += 1;
+                    }
+                    when FusedOp.Const {
+                        if RT == real then stack[sp] = ins.rval;
+                                      else stack[sp] = ins.ival;
+                        sp += 1;
+                    }
+                    when FusedOp.Add {
+                        sp -= 1;
+                        stack[sp-1] = stack[sp-1] + stack[sp];
+                    }
+                    when FusedOp.Sub {
+                        sp -= 1;
+                        stack[sp-1] = stack[sp-1] - stack[sp];
+                    }
+                    when FusedOp.Mul {
+                        sp -= 1;
+                        stack[sp-1] = stack[sp-1] * stack[sp];
+                    }
+                    // vector / vector, which yields 0 where the divisor is 0
+                    when FusedOp.Div {
+                        sp -= 1;
+                        stack[sp-1] = if stack[sp] != 0 then stack[sp-1] / stack[sp] else 0:RT;
+                    }
+                    // vector / scalar and scalar / vector
+                    when FusedOp.DivScalar {
+                        sp -= 1;
+                        stack[sp-1] = stack[sp-1] / stack[sp];
+                    }
+                    when FusedOp.Abs {
+                        stack[sp-1] = Math.abs(stack[sp-1]);
+                    }
+                    when FusedOp.Log {
+                        if RT == real then stack[sp-1] = Math.log(stack[sp-1]);
+                    }
+                    when FusedOp.Exp {
+                        if RT == real then stack[sp-1] = Math.exp(stack[sp-1]);
+                    }
+                    when FusedOp.Sin {
+                        if RT == real then stack[sp-1] = Math.sin(stack[sp-1]);
+                    }
+                    when FusedOp.Cos {
+                        if RT == real then stack[sp-1] = Math.cos(stack[sp-1]);
+                    }
+                }
+            }
+            r = stack[0];
+        }
+    }
+
+    /*
+    Evaluate a fused program into the result entry, resolving the operand
+    slots to entries of element type t
+    */
+    proc evalFusedEntries(res, const ref prog: [] FusedInstr, operands: [] string,
+                          st: borrowed SymTab, type t) throws {
+        const n = operands.size;
+        const e0 = toSymEntry(st.lookup(operands[0]), t);
+        const e1 = if n > 1 then toSymEntry(st.lookup(operands[1]), t) else e0;
+        const e2 = if n > 2 then toSymEntry(st.lookup(operands[2]), t) else e0;
+        const e3 = if n > 3 then toSymEntry(st.lookup(operands[3]), t) else e0;
+        evalFused(res.a, prog, e0.a, e1.a, e2.a, e3.a);
+    }
+
+    /*
+    Parse and respond to fused and fusedStore messages.
+    A fused message evaluates a chain of elementwise binops and efuncs in a
+    single pass over its operands. Its expression is given in postfix: each
+    token is a pdarray name, a "dtype:value" scalar, one of the binary
+    operators +, -, *, / (vector/vector division) and /s (division involving
+    a scalar) or one of the efuncs abs, log, exp, sin and cos.
+    All operands must have the same dtype, int64 or float64; int64 results
+    only support +, - and *.
+
+    :arg reqMsg: request containing (cmd,dtype,tokens...) and, for
+                 fusedStore, the name of the pdarray to store the result to
+    :type reqMsg: string
+
+    :arg st: SymTab to act on
+    :type st: borrowed SymTab
+
+    :returns: (MsgTuple)
+    :throws: `UndefinedSymbolError(name)`
+    */
+    proc fusedMsg(cmd: string, payload: string, st: borrowed SymTab): MsgTuple throws {
+        param pn = Reflection.getRoutineName();
+        var repMsg: string; // response message
+
+        var fields = payload.split();
+        const rtype = str2dtype(fields[0]);
+        var last = fields.domain.high;
+        var store = "";
+        if cmd == "fusedStore" {
+            store = fields[last];
+            last -= 1;
+        }
+
+        var prog: [0..#(last)] FusedInstr;
+        var slots = new map(string, int);
+        var operands: [0..#maxFusedOperands] string;
+        var depth = 0;
+        for (i, tok) in zip(0.., fields[1..last]) {
+            var ins: FusedInstr;
+            var arity = 2;
+            select tok {
+                when "+"   do ins.op = FusedOp.Add;
+                when "-"   do ins.op = FusedOp.Sub;
+                when "*"   do ins.op = FusedOp.Mul;
+                when "/"   do ins.op = FusedOp.Div;
+                when "/s"  do ins.op = FusedOp.DivScalar;
+                when "abs" { ins.op = FusedOp.Abs; arity = 1; }
+                when "log" { ins.op = FusedOp.Log; arity = 1; }
+                when "exp" { ins.op = FusedOp.Exp; arity = 1; }
+                when "sin" { ins.op = FusedOp.Sin; arity = 1; }
+                when "cos" { ins.op = FusedOp.Cos; arity = 1; }
+                otherwise {
+                    arity = 0;
+                    if tok.find(":") > 0 {
+                        var (dtype, value) = tok.splitMsgToTuple(":", 2);
+                        ins.op = FusedOp.Const;
+                        select str2dtype(dtype) {
+                            when DType.Int64 {
+                                ins.ival = value:int;
+                                ins.rval = ins.ival:real;
+                            }
+                            when DType.Float64 {
+                                if rtype != DType.Float64 {
+                                    var errorMsg = notImplementedError(pn, "%s %s".format(cmd, tok));
+                                    fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                                    return new MsgTuple(errorMsg, MsgType.ERROR);
+                                }
+                                ins.rval = value:real;
+                            }
+                            otherwise {
+                                var errorMsg = notImplementedError(pn, "%s %s".format(cmd, tok));
+                                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                                return new MsgTuple(errorMsg, MsgType.ERROR);
+                            }
+                        }
+                    } else {
+                        ins.op = FusedOp.Load;
+                        if !slots.contains(tok) {
+                            if slots.size == maxFusedOperands {
+                                var errorMsg = "Error: %s reads more than %i pdarrays".format(
+                                                                      pn, maxFusedOperands);
+                                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                                return new MsgTuple(errorMsg, MsgType.ERROR);
+                            }
+                            operands[slots.size] = tok;
+                            slots.add(tok, slots.size);
+                        }
+                        ins.slot = slots.getValue(tok);
+                    }
+                }
+            }
+            if rtype == DType.Int64 && arity > 0 && ins.op != FusedOp.Add &&
+                                         ins.op != FusedOp.Sub && ins.op != FusedOp.Mul {
+                var errorMsg = notImplementedError(pn, "%s %s".format(cmd, tok));
+                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+            depth += if arity == 0 then 1 else 1 - arity;
+            if depth < 1 || depth > maxFusedDepth {
+                var errorMsg = "Error: %s malformed expression %s".format(pn, payload);
+                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+            prog[i] = ins;
+        }
+        if depth != 1 || slots.size == 0 {
+            var errorMsg = "Error: %s malformed expression %s".format(pn, payload);
+            fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+
+        const used = operands[0..#slots.size];
+        var first: borrowed GenSymEntry = st.lookup(used[0]);
+        for name in used {
+            var gEnt: borrowed GenSymEntry = st.lookup(name);
+            if gEnt.dtype != first.dtype || gEnt.size != first.size {
+                var errorMsg = "Error: %s operands %s and %s differ in dtype or size".format(
+                                                                      pn, used[0], name);
+                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+        }
+
+        fmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                       "cmd: %s dtype: %s operands: %t program size: %i".format(
+                                   cmd, dtype2str(rtype), used, prog.size));
+
+        var rname = if store == "" then st.nextName() else store;
+        select (rtype, first.dtype) {
+            when (DType.Int64, DType.Int64) {
+                var e = if store == "" then st.addEntry(rname, first.size, int)
+                                       else toSymEntry(st.lookup(store), int);
+                e.hasMin = false;
+                e.hasMax = false;
+                evalFusedEntries(e, prog, used, st, int);
+            }
+            when (DType.Float64, DType.Int64) {
+                var e = if store == "" then st.addEntry(rname, first.size, real)
+                                       else toSymEntry(st.lookup(store), real);
+                e.hasMin = false;
+                e.hasMax = false;
+                evalFusedEntries(e, prog, used, st, int);
+            }
+            when (DType.Float64, DType.Float64) {
+                var e = if store == "" then st.addEntry(rname, first.size, real)
+                                       else toSymEntry(st.lookup(store), real);
+                e.hasMin = false;
+                e.hasMax = false;
+                evalFusedEntries(e, prog, used, st, real);
+            }
+            otherwise {
+                var errorMsg = unrecognizedTypeError(pn,
+                                  "("+dtype2str(rtype)+","+dtype2str(first.dtype)+")");
+                fmLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+                return new MsgTuple(errorMsg, MsgType.ERROR);
+            }
+        }
+
+        if store == "" then
+            repMsg = "created %s".format(st.attrib(rname));
+        else
+            repMsg = "updated %s".format(st.attrib(rname));
+        fmLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
+        return new MsgTuple(repMsg, MsgType.NORMAL);
+    }
+}
@@ -18,6 +18,7 @@ module GenSymIO {
     use Errors;
     use Logging;
     use Message;
+    use Compression;
     use ServerConfig;
     use Search;
     use IndexingMsg;
@@ -34,14 +35,17 @@ module GenSymIO {
 
     /*
      * Creates a pdarray server-side and returns the SymTab name used to
-     * retrieve the pdarray from the SymTab.
+     * retrieve the pdarray from the SymTab. The data is big-endian unless
+     * args is "multipart little", i.e. the client sent its little-endian
+     * data unchanged in a second frame.
      */
-    proc arrayMsg(cmd: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
+    proc arrayMsg(cmd: string, args: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
         // Set up our return items
         var msgType = MsgType.NORMAL;
         var msg:string = "";
         var rname:string = "";
         var (dtypeBytes, sizeBytes, data) = payload.splitMsgToTuple(b" ", 3);
+        var little = isLittleEndian(args);
         var dtype = DType.UNDEF;
         var size:int;
         try {
@@ -73,13 +77,13 @@ module GenSymIO {
 
         try {  // Read data in SymEntry based on type
             if dtype == DType.Int64 {
-                rname = makeEntry(size, int, st, tmpf);
+                rname = makeEntry(size, int, st, tmpf, little);
             } else if dtype == DType.Float64 {
-                rname = makeEntry(size, real, st, tmpf);
+                rname = makeEntry(size, real, st, tmpf, little);
             } else if dtype == DType.Bool {
-                rname = makeEntry(size, bool, st, tmpf);
+                rname = makeEntry(size, bool, st, tmpf, little);
             } else if dtype == DType.UInt8 {
-                rname = makeEntry(size, uint(8), st, tmpf);
+                rname = makeEntry(size, uint(8), st, tmpf, little);
             } else {
                 msg = "Unhandled data type %s".format(dtypeBytes);
                 msgType = MsgType.ERROR;
@@ -102,11 +106,12 @@ module GenSymIO {
     /*
      * Puts a arrays into an already existing one
      */
-    proc arrayStoreMsg(cmd: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
+    proc arrayStoreMsg(cmd: string, args: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
         var msgType = MsgType.NORMAL;
         var msg:string = "";
         var oldName:string = "";
         var (dtypeBytes, oldNameBytes, sizeBytes, data) = payload.splitMsgToTuple(b" ", 4);
+        var little = isLittleEndian(args);
         var dtype = DType.UNDEF;
         var size:int;
         try {
@@ -133,31 +138,23 @@ module GenSymIO {
         if dtype == DType.Int64 {
             var r = toSymEntry(right,int);
             var localA: [r.aD.low..r.aD.high] int;
-            var tmpr = tmpf.reader(kind=iobig, start=0);
-            tmpr.read(localA);
+            readData(tmpf, localA, little);
             r.a = localA;
-            tmpr.close(); 
         } else if dtype == DType.Float64 {
             var r = toSymEntry(right,real);
             var localA: [r.aD.low..r.aD.high] real;
-            var tmpr = tmpf.reader(kind=iobig, start=0);
-            tmpr.read(localA);
+            readData(tmpf, localA, little);
             r.a = localA;
-            tmpr.close(); 
         } else if dtype == DType.Bool {
             var r = toSymEntry(right,bool);
             var localA: [r.aD.low..r.aD.high] bool;
-            var tmpr = tmpf.reader(kind=iobig, start=0);
-            tmpr.read(localA);
+            readData(tmpf, localA, little);
             r.a = localA;
-            tmpr.close(); 
         } else if dtype == DType.UInt8 {
             var r = toSymEntry(right,uint(8));
             var localA: [r.aD.low..r.aD.high] uint(8);
-            var tmpr = tmpf.reader(kind=iobig, start=0);
-            tmpr.read(localA);
+            readData(tmpf, localA, little);
             r.a = localA;
-            tmpr.close(); 
         }
         msg = "updated " + st.attrib(oldName);
         gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),msg);
@@ -169,18 +166,41 @@ module GenSymIO {
      * within a SymEntry, and write to the SymTab cache
      * Here tmpf is a memory buffer which contains the data we want to read.
      */
-    private proc makeEntry(size:int, type t, st: borrowed SymTab, tmpf:file): string throws {
+    private proc makeEntry(size:int, type t, st: borrowed SymTab, tmpf:file, little: bool): string throws {
         var entry = new shared SymEntry(size, t);
-        var tmpr = tmpf.reader(kind=iobig, start=0);
         var localA: [entry.aD.low..entry.aD.high] t;
-        tmpr.read(localA);
+        readData(tmpf, localA, little);
         entry.a = localA;
-        tmpr.close(); 
         var name = st.nextName();
         st.addEntry(name, entry);
         return name;
     }
 
+    /*
+     * Read the data payload from the memory buffer into localA, in the
+     * byte order the client sent it
+     */
+    private proc readData(tmpf:file, ref localA: [] ?t, little: bool) throws {
+        if little {
+            var tmpr = tmpf.reader(kind=iolittle, start=0);
+            tmpr.read(localA);
+            tmpr.close();
+        } else {
+            var tmpr = tmpf.reader(kind=iobig, start=0);
+            tmpr.read(localA);
+            tmpr.close();
+        }
+    }
+
+    /*
+     * Multipart binary requests have args "multipart <byteorder>", the byte
+     * order of the client, followed by the codec and size of the payload if
+     * it was compressed; other binary requests are big-endian
+     */
+    private proc isLittleEndian(args: string): bool {
+        return args.startsWith("multipart little");
+    }
+
     /*
      * Ensure the file is closed, disregard errors
      */
@@ -196,36 +216,55 @@ module GenSymIO {
 
     /*
      * Outputs the pdarray as a Numpy ndarray in the form of a 
-     * Chapel Bytes object
+     * Chapel Bytes object. The payload is either the name of the pdarray,
+     * for all of its values in big-endian order, or "<name> <start> <count>
+     * <byteorder>" for the chunk of a streaming download, optionally followed
+     * by the codec compressing the chunk.
      */
     proc tondarrayMsg(cmd: string, payload: string, st: 
                                           borrowed SymTab): bytes throws {
         var arrayBytes: bytes;
-        var entry = st.lookup(payload);
-        overMemLimit(2*entry.size*entry.itemsize);
+        var fields = payload.split();
+        var entry = st.lookup(fields[0]);
+        var start = 0;
+        var count = entry.size;
+        var little = false;
+        var codec = "";
+        if fields.size >= 4 {
+            try {
+                start = fields[1]:int;
+                count = fields[2]:int;
+            } catch {
+                return b"Error: Unable to parse the chunk to transfer";
+            }
+            little = fields[3] == "little";
+            if fields.size == 5 then codec = fields[4];
+        }
+        if start < 0 || count < 0 || start + count > entry.size {
+            return b"Error: Chunk %i..#%i is out of bounds with size %i".format(start, count, entry.size);
+        }
+        overMemLimit(2*count*entry.itemsize);
         var tmpf: file; defer { ensureClose(tmpf); }
 
         proc localizeArr(A: [?D] ?eltType) {
-            const localA:[D.low..D.high] eltType = A;
+            const localA:[start..#count] eltType = A[start..#count];
             return localA;
         }
         try {
             tmpf = openmem();
-            var tmpw = tmpf.writer(kind=iobig);
             if entry.dtype == DType.Int64 {
-                tmpw.write(localizeArr(toSymEntry(entry, int).a));
+                writeData(tmpf, localizeArr(toSymEntry(entry, int).a), little);
             } else if entry.dtype == DType.Float64 {
-                tmpw.write(localizeArr(toSymEntry(entry, real).a));
+                writeData(tmpf, localizeArr(toSymEntry(entry, real).a), little);
             } else if entry.dtype == DType.Bool {
-                tmpw.write(localizeArr(toSymEntry(entry, bool).a));
+                writeData(tmpf, localizeArr(toSymEntry(entry, bool).a), little);
             } else if entry.dtype == DType.UInt8 {
-                tmpw.write(localizeArr(toSymEntry(entry, uint(8)).a));
+                writeData(tmpf, localizeArr(toSymEntry(entry, uint(8)).a), little);
             } else {
                 var errorMsg = "Error: Unhandled dtype %s".format(entry.dtype);                
                 gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);            
                 return errorMsg.encode(); // return as bytes
             }
-            tmpw.close();
         } catch {
             return b"Error: Unable to write SymEntry to memory buffer";
         }
@@ -245,9 +284,92 @@ module GenSymIO {
 
          But I think the main problem is how to separate the length from the data
          */
+       if !codec.isEmpty() {
+           try {
+               return compressBytes(codec, arrayBytes);
+           } catch {
+               return b"Error: Unable to compress the chunk with %s".format(codec);
+           }
+       }
        return arrayBytes;
     }
 
+    /*
+     * Write localA to the memory buffer in the byte order the client asked for
+     */
+    private proc writeData(tmpf:file, localA: [] ?t, little: bool) throws {
+        if little {
+            var tmpw = tmpf.writer(kind=iolittle);
+            tmpw.write(localA);
+            tmpw.close();
+        } else {
+            var tmpw = tmpf.writer(kind=iobig);
+            tmpw.write(localA);
+            tmpw.close();
+        }
+    }
+
+    /*
+     * Writes a chunk of a streaming upload into an existing pdarray. The
+     * payload is "<name> <start> <count> " followed by count values, in the
+     * byte order given by args (see arrayMsg).
+     */
+    proc arrayChunkMsg(cmd: string, args: string, payload: bytes, st: borrowed SymTab): MsgTuple throws {
+        var (nameBytes, startBytes, countBytes, data) = payload.splitMsgToTuple(b" ", 4);
+        var name: string;
+        var start, count: int;
+        try {
+            name = nameBytes.decode();
+            start = startBytes:int;
+            count = countBytes:int;
+        } catch {
+            var errorMsg = "Error parsing/decoding either name, start or count";
+            gsLogger.error(getModuleName(), getRoutineName(), getLineNumber(), errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var little = isLittleEndian(args);
+        var entry: borrowed GenSymEntry = st.lookup(name);
+        if start < 0 || count < 0 || start + count > entry.size {
+            var errorMsg = "Chunk %i..#%i is out of bounds with size %i".format(start, count, entry.size);
+            gsLogger.error(getModuleName(), getRoutineName(), getLineNumber(), errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        overMemLimit(2*count*entry.itemsize);
+        var tmpf:file; defer { ensureClose(tmpf); }
+        try {
+            tmpf = openmem();
+            var tmpw = tmpf.writer(kind=iobig);
+            tmpw.write(data);
+            tmpw.close();
+        } catch {
+            var errorMsg = "Could not write to memory buffer";
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+
+        proc writeChunk(r) throws {
+            var localA: [start..#count] r.etype;
+            readData(tmpf, localA, little);
+            r.a[start..#count] = localA;
+        }
+        if entry.dtype == DType.Int64 {
+            writeChunk(toSymEntry(entry, int));
+        } else if entry.dtype == DType.Float64 {
+            writeChunk(toSymEntry(entry, real));
+        } else if entry.dtype == DType.Bool {
+            writeChunk(toSymEntry(entry, bool));
+        } else if entry.dtype == DType.UInt8 {
+            writeChunk(toSymEntry(entry, uint(8)));
+        } else {
+            var errorMsg = "Unhandled data type %s".format(entry.dtype);
+            gsLogger.error(getModuleName(),getRoutineName(),getLineNumber(),errorMsg);
+            return new MsgTuple(errorMsg, MsgType.ERROR);
+        }
+        var msg = "updated " + st.attrib(name);
+        gsLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),msg);
+        return new MsgTuple(msg, MsgType.NORMAL);
+    }
+
     /*
      * Converts the JSON array to a pdarray
      */
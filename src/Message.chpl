@@ -2,6 +2,7 @@ module Message {
     use IO;
     use Reflection;
     use Errors;
+    use List;
 
     enum MsgType {NORMAL,WARNING,ERROR}
     enum MsgFormat {STRING,BINARY}
@@ -66,4 +67,170 @@ module Message {
        return "%jt".format(new ReplyMsg(msg=msg,msgType=msgType, 
                                                         msgFormat=msgFormat, user=user));
    }
+
+    /*
+     * Compact requests and replies start with compactMagic, which JSON-formatted
+     * messages never do, followed by fixed-size little-endian fields:
+     *
+     * request: the format (0 STRING, 1 BINARY) as a uint(8), the sizes of user,
+     *          token, cmd and args as uint(32)s, then the fields themselves and,
+     *          for a binary request, the payload
+     * reply:   whether it is the reply to a batch as a uint(8) and the number of
+     *          replies as a uint(32) (one per command of a batch), then for each
+     *          reply its MsgType (0 NORMAL, 1 WARNING, 2 ERROR) as a uint(8), the
+     *          number of arrays it reports as created as a uint(16) and the size
+     *          of msg as a uint(32), followed by msg and by the ArrayMeta of each
+     *          created array: the size of its name as a uint(16), the name, its
+     *          DType code as a uint(8), then size, ndim, shape and itemsize as ints
+     *
+     * The client sends compact requests once the server config reports
+     * compactEnvelope, and the server replies in the form of the request.
+     */
+    const compactMagic = b"AKC1";
+
+    /*
+     * The typed metadata of an array a compact reply reports as created, where
+     * dtype is the position of its DType
+     */
+    record ArrayMeta {
+        var name: string;
+        var dtype: int;
+        var size: int;
+        var ndim: int;
+        var shape: 1*int;
+        var itemsize: int;
+    }
+
+    /*
+     * Returns whether the raw request is compact rather than JSON-formatted
+     */
+    proc isCompact(request: bytes): bool {
+        return request.startsWith(compactMagic);
+    }
+
+    /*
+     * Reads the little-endian unsigned integer of nbytes bytes at offset
+     */
+    private proc readUInt(request: bytes, offset: int, param nbytes: int): int {
+        var x = 0;
+        for param i in 0..nbytes-1 {
+            x |= request.byte(offset + i):int << (8 * i);
+        }
+        return x;
+    }
+
+    /*
+     * Sequenced requests, JSON-formatted or compact, are prefixed with
+     * sequenceMagic, the session of the client as 32 hex digits and the sequence
+     * number of the request within the session as a little-endian uint(64). A
+     * client retrying a request it did not get the reply to resends it with the
+     * same sequence number, and the server resends its reply rather than
+     * executing it again. The client sequences its requests once the server
+     * config reports sequencedRequests.
+     */
+    const sequenceMagic = b"AKS1";
+
+    /*
+     * Returns whether the raw request is sequenced
+     */
+    proc isSequenced(request: bytes): bool {
+        return request.startsWith(sequenceMagic);
+    }
+
+    /*
+     * Splits a sequenced request into its session, its sequence number and the
+     * request itself
+     */
+    proc splitSequenced(request: bytes): (string, int, bytes) throws {
+        const size = sequenceMagic.size + 40;
+        if request.size < size {
+            throw new owned ErrorWithContext("Incomplete sequenced request",
+                                       getLineNumber(),
+                                       getRoutineName(),
+                                       getModuleName(),
+                                       "ValueError");
+        }
+        const session = request[sequenceMagic.size..#32].decode();
+        const seq = readUInt(request, sequenceMagic.size + 32, 8);
+        return (session, seq, request[size..]);
+    }
+
+    /*
+     * Deserializes a compact request to a RequestMsg object, returning the
+     * binary payload that follows the fields, if any
+     */
+    proc deserializeCompact(ref msg: RequestMsg, request: bytes): bytes throws {
+        var offset = compactMagic.size + 17;
+        if request.size < offset {
+            throw new owned ErrorWithContext("Incomplete compact request",
+                                       getLineNumber(),
+                                       getRoutineName(),
+                                       getModuleName(),
+                                       "ValueError");
+        }
+        const format = request.byte(compactMagic.size);
+        var fields: 4*string;
+        for i in 0..3 {
+            const size = readUInt(request, compactMagic.size + 1 + 4*i, 4);
+            if offset + size > request.size {
+                throw new owned ErrorWithContext("Incomplete compact request",
+                                           getLineNumber(),
+                                           getRoutineName(),
+                                           getModuleName(),
+                                           "ValueError");
+            }
+            if size > 0 then fields(i) = request[offset..#size].decode();
+            offset += size;
+        }
+        msg = new RequestMsg(user=fields(0), token=fields(1), cmd=fields(2),
+                             format=if format == 1 then "BINARY" else "STRING",
+                             args=fields(3));
+        return if offset < request.size then request[offset..] else b"";
+    }
+
+    /*
+     * Serializes replies, with the ArrayMeta of the arrays each one reports as
+     * created, into a compact reply
+     */
+    proc serializeCompact(replies: list(MsgTuple), created: list(list(ArrayMeta)),
+                                                       batch: bool): bytes throws {
+        var mem = openmem();
+        var w = mem.writer(kind=iolittle, locking=false);
+        w.write(compactMagic);
+        w.write((if batch then 1 else 0):uint(8));
+        w.write(replies.size:uint(32));
+        for i in 0..#replies.size {
+            const msg = replies[i].msg.encode();
+            w.write(msgTypeCode(replies[i].msgType));
+            w.write(created[i].size:uint(16));
+            w.write(msg.size:uint(32));
+            w.write(msg);
+            for meta in created[i] {
+                const name = meta.name.encode();
+                w.write(name.size:uint(16));
+                w.write(name);
+                w.write(meta.dtype:uint(8));
+                w.write(meta.size);
+                w.write(meta.ndim);
+                for s in meta.shape do w.write(s);
+                w.write(meta.itemsize);
+            }
+        }
+        w.close();
+
+        var reply: bytes;
+        var r = mem.reader(kind=iolittle, locking=false, start=0);
+        r.readbytes(reply);
+        r.close();
+        mem.close();
+        return reply;
+    }
+
+    private proc msgTypeCode(msgType: MsgType): uint(8) {
+        select msgType {
+            when MsgType.NORMAL do return 0:uint(8);
+            when MsgType.WARNING do return 1:uint(8);
+            otherwise do return 2:uint(8);
+        }
+    }
 }
\ No newline at end of file
@@ -36,6 +36,7 @@ module MsgProcessing
     public use CastMsg;
     public use BroadcastMsg;
     public use FlattenMsg;
+    public use FusedMsg;
     use LinearAlgebra.Sparse;
     use DateTime;
     use BlockDist;
@@ -161,6 +162,19 @@ module MsgProcessing
             mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
                                         "created the pdarray %s".format(st.attrib(store)));
         }
+        else if (dtypestr=="bool") then {
+            var s = toSymEntry(res,bool);
+            s.a = false;
+            s.hasMin = false;
+            s.hasMax = false;
+            // if verbose print action
+            mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                "cmd: %s dtype: %s size: %i updated pdarray name: %s".format(
+                                                        cmd,dtype2str(dtype),size,store));
+            // if verbose print result
+            mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                        "created the pdarray %s".format(st.attrib(store)));
+        }
         repMsg = "created " + st.attrib(store);
         mpLogger.debug(getModuleName(),getRoutineName(),getLineNumber(), repMsg);
         return new MsgTuple(repMsg, MsgType.NORMAL);
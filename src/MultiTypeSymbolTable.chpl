@@ -28,6 +28,12 @@ module MultiTypeSymbolTable
         */
         var tab: map(string, shared GenSymEntry);
 
+        /*
+        Name of the array the command being executed may recycle for the
+        array it creates, or "" if none (see useOutputBuffer)
+        */
+        var outputBuffer: string;
+
         /*
         Gives out symbol names.
         */
@@ -95,6 +101,9 @@ module MultiTypeSymbolTable
         :returns: borrow of newly created `SymEntry(t)`
         */
         proc addEntry(name: string, len: int, type t): borrowed SymEntry(t) throws {
+            if !outputBuffer.isEmpty() && recycleOutputBuffer(name, len, t) {
+                return tab.getBorrowed(name).toSymEntry(t);
+            }
             // check and throw if memory limit would be exceeded
             if t == bool {overMemLimit(len);} else {overMemLimit(len*numBytes(t));}
             var entry = new shared SymEntry(len, t);
@@ -110,6 +119,62 @@ module MultiTypeSymbolTable
             return tab.getBorrowed(name).toSymEntry(t);
         }
 
+        /*
+        Sets the array the next array created by addEntry may recycle, so
+        that the command being executed writes its result to a dead
+        temporary of the client instead of allocating. The buffer is
+        consumed by the first addEntry: it is recycled if it is unregistered
+        and has the type and length of the new array, and deleted otherwise
+        (as deleteEntry does, registered arrays are kept). Its contents are not
+        reset, so commands only get an output buffer if they overwrite
+        every element of their result.
+
+        :arg name: name of the array
+        :type name: string
+        */
+        proc useOutputBuffer(name: string) throws {
+            checkTable(name, "useOutputBuffer");
+            outputBuffer = name;
+        }
+
+        /*
+        Deletes the output buffer if the command did not consume it, e.g.
+        because it failed or created no array
+        */
+        proc releaseOutputBuffer() throws {
+            if !outputBuffer.isEmpty() {
+                var buffer = outputBuffer;
+                outputBuffer = "";
+                if tab.contains(buffer) then deleteEntry(buffer);
+            }
+        }
+
+        /*
+        Moves the output buffer to name if it is an unregistered array of
+        type t and length len, deleting it otherwise
+
+        :returns: whether the buffer was recycled
+        */
+        proc recycleOutputBuffer(name: string, len: int, type t): bool throws {
+            var buffer = outputBuffer;
+            outputBuffer = "";
+            if !tab.contains(buffer) || registry.contains(buffer) {
+                return false;
+            }
+            var gse = tab.getBorrowed(buffer);
+            if gse.dtype != whichDtype(t) || gse.size != len {
+                deleteEntry(buffer);
+                return false;
+            }
+            var entry = gse.toSymEntry(t);
+            entry.hasMin = false;
+            entry.hasMax = false;
+            mtLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),
+                                   "recycling symbol %s as %s".format(buffer, name));
+            tab.addOrSet(name, tab.getAndRemove(buffer));
+            return true;
+        }
+
         /*
         Takes an already created GenSymEntry and creates a new SymEntry.
 
@@ -65,4 +65,20 @@ module NumPyDType
         return "UNDEF";
     }
 
+    /* Turns a DType into its code in compact replies, the position of the
+    matching dtype in arkouda.message.COMPACT_DTYPES
+
+    :arg dtype: DType to convert to a code
+    :type dtype: DType
+
+    :returns: (int) 0 through 3, or -1 for DType.UNDEF
+    */
+    proc dtype2code(dtype:DType): int {
+        if dtype == DType.Int64 {return 0;}
+        if dtype == DType.Float64 {return 1;}
+        if dtype == DType.Bool {return 2;}
+        if dtype == DType.UInt8 {return 3;}
+        return -1;
+    }
+
 }
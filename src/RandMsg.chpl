@@ -200,9 +200,8 @@ module RandMsg
         // Result + 2 scratch arrays
         overMemLimit(3*8*len);
         var rname = st.nextName();
-        var entry = new shared SymEntry(len, real);
+        var entry = st.addEntry(rname, len, real);
         fillNormal(entry.a, seed);
-        st.addEntry(rname, entry);
 
         var repMsg = "created " + st.attrib(rname);
         randLogger.debug(getModuleName(),getRoutineName(),getLineNumber(),repMsg);
@@ -4,6 +4,7 @@ module ServerConfig
     use ZMQ only;
     use HDF5.C_HDF5 only H5get_libversion;
     use SymArrayDmap only makeDistDom;
+    use Compression only supportedCodecs;
 
     public use IO;
     private use SysCTypes;
@@ -85,6 +86,11 @@ module ServerConfig
                 [loc in LocaleSpace] new owned LocaleConfig();
             var authenticate: bool;
             var logLevel: LogLevel;
+            var multipartPayloads: bool;
+            var chunkedTransfers: bool;
+            var compactEnvelope: bool;
+            var compressionCodecs: string;
+            var sequencedRequests: bool;
         }
         var (Zmajor, Zminor, Zmicro) = ZMQ.version;
         var H5major: c_uint, H5minor: c_uint, H5micro: c_uint;
@@ -102,6 +108,11 @@ module ServerConfig
         cfg.distributionType = (makeDistDom(10).type):string;
         cfg.authenticate = authenticate; 
         cfg.logLevel = logLevel;
+        cfg.multipartPayloads = true;
+        cfg.chunkedTransfers = true;
+        cfg.compactEnvelope = true;
+        cfg.compressionCodecs = ",".join(supportedCodecs().toArray());
+        cfg.sequencedRequests = true;
 
         for loc in Locales {
             on loc {
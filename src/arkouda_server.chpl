@@ -20,6 +20,9 @@ use Reflection;
 use SymArrayDmap;
 use ServerErrorStrings;
 use Message;
+use Compression;
+use Map;
+use List;
 
 private config const logLevel = ServerConfig.logLevel;
 const asLogger = new Logger(logLevel);
@@ -166,13 +169,28 @@ proc main() {
     t1.clear();
     t1.start();
 
+    /*
+     * The sequence number of the last request of each client session, and its
+     * reply unless it is binary, which is resent if the client retries the
+     * request (see sequenceMagic). replySession is the session of the request
+     * being handled, if it is sequenced.
+     */
+    var lastSequence = new map(string, int);
+    var lastReply = new map(string, bytes);
+    var replySession: string;
+
     /*
     Following processing of incoming message, sends a message back to the client.
 
     :arg repMsg: either a string or bytes to be sent
     */
-    proc sendRepMsg(repMsg: ?t) throws where t==string || t==bytes {
+    proc sendRepMsg(repMsg: ?t, replayable: bool = true) throws where t==string || t==bytes {
         if (isTracing) then repCount += 1;
+        if !replySession.isEmpty() {
+            // binary replies are computed again if the request is retried
+            if replayable then lastReply.addOrSet(replySession, repMsg:bytes);
+                          else lastReply.remove(replySession);
+        }
         if trace {
           if t==bytes {
               asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
@@ -185,6 +203,61 @@ proc main() {
         socket.send(repMsg);
     }
 
+    /*
+    Returns the ArrayMeta of the arrays a reply message reports as created, for
+    compact replies: the names following "created" in each "+"-separated part
+    that are in the symbol table.
+
+    :arg msg: the reply message
+    */
+    proc createdArrays(msg: string): list(ArrayMeta) throws {
+        var arrays: list(ArrayMeta);
+        for part in msg.split("+") {
+            if !part.startsWith("created ") then continue;
+            for name in part.split() {
+                if !st.tab.contains(name) then continue;
+                var entry = st.lookup(name);
+                arrays.append(new ArrayMeta(name=name, dtype=dtype2code(entry.dtype),
+                                            size=entry.size, ndim=entry.ndim,
+                                            shape=entry.shape, itemsize=entry.itemsize));
+            }
+        }
+        return arrays;
+    }
+
+    /*
+    Serializes the replies to a request in the compact form.
+
+    :arg replies: the reply to the request, or to each command of a batch
+    :arg batch: whether the request is a batch
+    */
+    proc compactReply(replies: list(MsgTuple), batch: bool): bytes throws {
+        var created: list(list(ArrayMeta));
+        for reply in replies {
+            created.append(createdArrays(reply.msg));
+        }
+        return serializeCompact(replies, created, batch);
+    }
+
+    /*
+    Sends the string reply to a request, in the compact form if the request was
+    compact and JSON-formatted otherwise.
+
+    :arg repTuple: the reply
+    :arg user: the user who sent the request
+    :arg compact: whether the request was compact
+    */
+    proc sendReply(repTuple: MsgTuple, user: string, compact: bool) throws {
+        if compact {
+            var replies: list(MsgTuple);
+            replies.append(repTuple);
+            sendRepMsg(compactReply(replies, batch=false));
+        } else {
+            sendRepMsg(serialize(msg=repTuple.msg, msgType=repTuple.msgType,
+                                               msgFormat=MsgFormat.STRING, user=user));
+        }
+    }
+
     /*
     Compares the token submitted by the user with the arkouda_server token. If the
     tokens do not match, or the user did not submit a token, an ErrorWithMsg is thrown.    
@@ -229,6 +302,265 @@ proc main() {
                          msgType=MsgType.NORMAL,msgFormat=MsgFormat.STRING, user=user));
     }
     
+    /*
+    Commands which create a single array overwriting all of its elements,
+    and so accept the name of an array to recycle for it as their first arg
+    when sent as <cmd>Store (see SymTab.useOutputBuffer)
+    */
+    const outputBufferCommands = {"efunc", "cast", "efunc3vv", "efunc3vs", "efunc3sv",
+                                  "efunc3ss", "[pdarray]", "randomNormal"};
+
+    /*
+    Executes a single command against the symbol table, returning the MsgTuple
+    generated by the command. Commands that reply with bytes (e.g. tondarray)
+    write their reply to binaryRepMsg and return an empty MsgTuple.
+
+    :arg cmd: the command name
+    :arg args: the delimited string containing the command arguments
+    :arg payload: the binary payload, if any, sent with the request
+    :arg user: the user submitting the request
+    :arg token: the token submitted with the request
+    :arg binaryRepMsg: the bytes reply, if any
+    */
+    proc executeCommand(cmd: string, args: string, payload: bytes, user: string,
+                                  token: string, ref binaryRepMsg: bytes): MsgTuple throws {
+        var repTuple: MsgTuple;
+        select cmd
+        {
+            when "array"             {repTuple = arrayMsg(cmd, args, payload, st);}
+            when "arrayStore"        {repTuple = arrayStoreMsg(cmd, args, payload, st);}
+            when "arrayChunk"        {repTuple = arrayChunkMsg(cmd, args, payload, st);}
+            when "tondarray"         {binaryRepMsg = tondarrayMsg(cmd, args, st);}
+            when "cast"              {repTuple = castMsg(cmd, args, st);}
+            when "mink"              {repTuple = minkMsg(cmd, args, st);}
+            when "maxk"              {repTuple = maxkMsg(cmd, args, st);}
+            when "intersect1d"       {repTuple = intersect1dMsg(cmd, args, st);}
+            when "sortedintersect1d" {repTuple = sortedIntersect1dMsg(cmd,args,st);}
+            when "setdiff1d"         {repTuple = setdiff1dMsg(cmd, args, st);}
+            when "setxor1d"          {repTuple = setxor1dMsg(cmd, args, st);}
+            when "union1d"           {repTuple = union1dMsg(cmd, args, st);}
+            when "segmentLengths"    {repTuple = segmentLengthsMsg(cmd, args, st);}
+            when "segmentedHash"     {repTuple = segmentedHashMsg(cmd, args, st);}
+            when "segmentedEfunc"    {repTuple = segmentedEfuncMsg(cmd, args, st);}
+            when "segmentedPeel"     {repTuple = segmentedPeelMsg(cmd, args, st);}
+            when "segmentedIndex"    {repTuple = segmentedIndexMsg(cmd, args, st);}
+            when "segmentedBinopvv"  {repTuple = segBinopvvMsg(cmd, args, st);}
+            when "segmentedBinopvs"  {repTuple = segBinopvsMsg(cmd, args, st);}
+            when "segmentedGroup"    {repTuple = segGroupMsg(cmd, args, st);}
+            when "segmentedIn1d"     {repTuple = segIn1dMsg(cmd, args, st);}
+            when "segmentedFlatten"  {repTuple = segFlattenMsg(cmd, args, st);}
+            when "lshdf"             {repTuple = lshdfMsg(cmd, args, st);}
+            when "readhdf"           {repTuple = readhdfMsg(cmd, args, st);}
+            when "readAllHdf"        {repTuple = readAllHdfMsg(cmd, args, st);}
+            when "tohdf"             {repTuple = tohdfMsg(cmd, args, st);}
+            when "create"            {repTuple = createMsg(cmd, args, st);}
+            when "delete"            {repTuple = deleteMsg(cmd, args, st);}
+            when "binopvv"           {repTuple = binopvvMsg(cmd, args, st);}
+            when "binopvvStore"      {repTuple = binopvvStoreMsg(cmd, args, st);}
+            when "binopvs"           {repTuple = binopvsMsg(cmd, args, st);}
+            when "binopvsStore"      {repTuple = binopvsStoreMsg(cmd, args, st);}
+            when "binopsv"           {repTuple = binopsvMsg(cmd, args, st);}
+            when "binopsvStore"      {repTuple = binopsvStoreMsg(cmd, args, st);}
+            when "opeqvv"            {repTuple = opeqvvMsg(cmd, args, st);}
+            when "opeqvs"            {repTuple = opeqvsMsg(cmd, args, st);}
+            when "efunc"             {repTuple = efuncMsg(cmd, args, st);}
+            when "fused"             {repTuple = fusedMsg(cmd, args, st);}
+            when "fusedStore"        {repTuple = fusedMsg(cmd, args, st);}
+            when "efunc3vv"          {repTuple = efunc3vvMsg(cmd, args, st);}
+            when "efunc3vs"          {repTuple = efunc3vsMsg(cmd, args, st);}
+            when "efunc3sv"          {repTuple = efunc3svMsg(cmd, args, st);}
+            when "efunc3ss"          {repTuple = efunc3ssMsg(cmd, args, st);}
+            when "reduction"         {repTuple = reductionMsg(cmd, args, st);}
+            when "countReduction"    {repTuple = countReductionMsg(cmd, args, st);}
+            when "findSegments"      {repTuple = findSegmentsMsg(cmd, args, st);}
+            when "segmentedReduction"{repTuple = segmentedReductionMsg(cmd, args, st);}
+            when "broadcast"         {repTuple = broadcastMsg(cmd, args, st);}
+            when "arange"            {repTuple = arangeMsg(cmd, args, st);}
+            when "arangeStore"       {repTuple = arangeStoreMsg(cmd, args, st);}
+            when "linspace"          {repTuple = linspaceMsg(cmd, args, st);}
+            when "randint"           {repTuple = randintMsg(cmd, args, st);}
+            when "randintStore"      {repTuple = randintStoreMsg(cmd, args, st);}
+            when "randomNormal"      {repTuple = randomNormalMsg(cmd, args, st);}
+            when "randomStrings"     {repTuple = randomStringsMsg(cmd, args, st);}
+            when "histogram"         {repTuple = histogramMsg(cmd, args, st);}
+            when "in1d"              {repTuple = in1dMsg(cmd, args, st);}
+            when "unique"            {repTuple = uniqueMsg(cmd, args, st);}
+            when "value_counts"      {repTuple = value_countsMsg(cmd, args, st);}
+            when "set"               {repTuple = setMsg(cmd, args, st);}
+            when "info"              {repTuple = infoMsg(cmd, args, st);}
+            when "str"               {repTuple = strMsg(cmd, args, st);}
+            when "repr"              {repTuple = reprMsg(cmd, args, st);}
+            when "[int]"             {repTuple = intIndexMsg(cmd, args, st);}
+            when "[slice]"           {repTuple = sliceIndexMsg(cmd, args, st);}
+            when "[sliceStore]"      {repTuple = sliceIndexStoreMsg(cmd, args, st);}
+            when "[pdarray]"         {repTuple = pdarrayIndexMsg(cmd, args, st);}
+            when "[int]=val"         {repTuple = setIntIndexToValueMsg(cmd, args, st);}
+            when "[pdarray]=val"     {repTuple = setPdarrayIndexToValueMsg(cmd, args, st);}
+            when "[pdarray]=pdarray" {repTuple = setPdarrayIndexToPdarrayMsg(cmd, args, st);}
+            when "[slice]=val"       {repTuple = setSliceIndexToValueMsg(cmd, args, st);}
+            when "[slice]=pdarray"   {repTuple = setSliceIndexToPdarrayMsg(cmd, args, st);}
+            when "argsort"           {repTuple = argsortMsg(cmd, args, st);}
+            when "coargsort"         {repTuple = coargsortMsg(cmd, args, st);}
+            when "concatenate"       {repTuple = concatenateMsg(cmd, args, st);}
+            when "sort"              {repTuple = sortMsg(cmd, args, st);}
+            when "joinEqWithDT"      {repTuple = joinEqWithDTMsg(cmd, args, st);}
+            when "getconfig"         {repTuple = getconfigMsg(cmd, args, st);}
+            when "getmemused"        {repTuple = getmemusedMsg(cmd, args, st);}
+            when "register"          {repTuple = registerMsg(cmd, args, st);}
+            when "attach"            {repTuple = attachMsg(cmd, args, st);}
+            when "unregister"        {repTuple = unregisterMsg(cmd, args, st);}
+            when "clear"             {repTuple = clearMsg(cmd, args, st);}
+            when "zerosStore"        {repTuple = zerosStoreMsg(cmd, args, st);}
+            when "count_frequencies" {repTuple = countFrequenciesMsg(cmd, args, st);}
+            when "move_records"      {repTuple = moveRecordsMsg(cmd, args, st);}
+            when "cumsum"            {repTuple = cumSumMsg(cmd,args,st);}
+            when "remove_duplicates" {repTuple = removeDuplicatesMsg(cmd,args,st);}
+            when "triangle_count"    {repTuple = triangleCountMsg(cmd, args, st);}
+            when "triangle_count_sparse" {repTuple = sparseTriangleCountMsg(cmd, args, st);}
+            when "vector_times_matrix" {repTuple = vectorTimesMatrixMsg(cmd, args, st);}
+            when "vector_times_matrix_store" {repTuple = vectorTimesMatrixStoreMsg(cmd, args, st);}
+            when "matrix_times_vector" {repTuple = matrixTimesVectorMsg(cmd, args, st);}
+            when "matrix_times_vector_store" {repTuple = matrixTimesVectorStoreMsg(cmd, args, st);}
+            when "inverse_vector"    {repTuple = inverseVectorMsg(cmd, args, st);}
+            when "inverse_vector_store" {repTuple = inverseVectorMsgStore(cmd, args, st);}
+            when "betwenness_centrality" {repTuple = betweennessCentralityMsg(cmd, args, st);}
+            when "half_of_triangle_count" {repTuple = halfOfTriCountMsg(cmd, args, st);}
+            when "startProfile" {repTuple = startCountingMsg(cmd, args, st);}
+            when "endProfile" {repTuple = stopCountingMsg(cmd, args, st);}
+            when "connect" {
+                if authenticate {
+                    repTuple = new MsgTuple("connected to arkouda server tcp://*:%i as user %s with token %s".format(
+                                                      ServerPort,user,token), MsgType.NORMAL);
+                } else {
+                    repTuple = new MsgTuple("connected to arkouda server tcp://*:%i".format(ServerPort), 
+                                                                                    MsgType.NORMAL);
+                }
+            }
+            when "disconnect" {
+                repTuple = new MsgTuple("disconnected from arkouda server tcp://*:%i".format(ServerPort), 
+                                                               MsgType.NORMAL);
+            }
+            when "noop" {
+                repTuple = new MsgTuple("noop", MsgType.NORMAL);
+            }
+            when "ruok" {
+                repTuple = new MsgTuple("imok", MsgType.NORMAL);
+            }
+            otherwise {
+                const base = if cmd.endsWith("Store") then cmd[0..#(cmd.size-5)] else "";
+                if outputBufferCommands.contains(base) {
+                    // <cmd>Store: the first arg names a dead temporary the
+                    // command may recycle for the array it creates
+                    var (buffer, baseArgs) = args.splitMsgToTuple(" ", 2);
+                    st.useOutputBuffer(buffer);
+                    defer { try! st.releaseOutputBuffer(); }
+                    repTuple = executeCommand(base, baseArgs, payload, user, token, binaryRepMsg);
+                } else {
+                    repTuple = new MsgTuple("Unrecognized command: %s".format(cmd), MsgType.ERROR);
+                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repTuple.msg);
+                }
+            }
+        }
+        return repTuple;
+    }
+
+    /*
+    Executes a batch of commands in order, returning the MsgTuple generated by
+    each command. Each line of the batch consists of the comma-delimited
+    client-side ids of the pdarrays the command creates (or "-" if none)
+    followed by the JSON-formatted RequestMsg or, for clients using the compact
+    envelope, by the cmd and its args, or the id of the result of a Store
+    command. Client-side ids of pdarrays created or stored to earlier in the
+    batch, prefixed with "%" in the args, are replaced with the corresponding
+    server-side names before a command is executed. Execution stops at the first command that
+    results in an error.
+
+    :arg args: the newline-delimited batch of requests
+    :arg user: the user submitting the batch
+    :arg token: the token submitted with the batch
+    */
+    proc batchMsg(args: string, user: string, token: string): list(MsgTuple) throws {
+        var aliases = new map(string, string);
+        var replies = new list(MsgTuple);
+
+        for line in args.split("\n") {
+            if line.isEmpty() then continue;
+            var (ids, request) = line.splitMsgToTuple(" ", 2);
+            var msg: RequestMsg;
+            if request.startsWith("{") {
+                msg = extractRequest(request);
+                if authenticate {
+                    authenticateUser(msg.token);
+                }
+            } else {
+                // the batch request itself was authenticated
+                var (subCmd, subArgs) = request.splitMsgToTuple(" ", 2);
+                msg = new RequestMsg(user=user, token=token, cmd=subCmd,
+                                     format="STRING", args=subArgs);
+            }
+
+            // resolve the ids of pdarrays created earlier in this batch, which
+            // the client marks with a "%" since server names may equal them
+            var fields = msg.args.split(" ");
+            for f in fields {
+                if f.size > 1 && f.startsWith("%") {
+                    const id = f[1..];
+                    if aliases.contains(id) then f = aliases.getValue(id);
+                }
+            }
+            var subArgs = " ".join(fields);
+
+            var binaryRepMsg: bytes;
+            var subTuple: MsgTuple;
+            try {
+                subTuple = executeCommand(msg.cmd, subArgs, b"", user, msg.token, binaryRepMsg);
+                if subTuple.msg.isEmpty() {
+                    subTuple = new MsgTuple("Error: %s returns binary data and cannot be batched".format(
+                                                                 msg.cmd), MsgType.ERROR);
+                }
+            } catch (e: ErrorWithMsg) {
+                subTuple = new MsgTuple(e.msg, MsgType.ERROR);
+            } catch (e: Error) {
+                subTuple = new MsgTuple(unknownError(e.message()), MsgType.ERROR);
+            }
+
+            if trace {
+                asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
+                                                     ">>> batched %t".format(msg.cmd));
+            }
+
+            replies.append(subTuple);
+            if subTuple.msgType == MsgType.ERROR then break;
+
+            if ids != "-" {
+                var created = subTuple.msg.split();
+                // a Store command stores to an array created earlier in the batch
+                if created.size > 1 && (created[0] == "created" || created[0] == "updated") {
+                    for (id, i) in zip(ids.split(","), 1..) {
+                        aliases.addOrSet(id, created[i]);
+                    }
+                }
+            }
+        }
+        return replies;
+    }
+
+    /*
+    Serializes the replies to the commands of a batch into the JSON-formatted
+    list of their ReplyMsgs.
+
+    :arg replies: the MsgTuple generated by each command
+    :arg user: the user submitting the batch
+    */
+    proc serializeBatch(replies: list(MsgTuple), user: string): string throws {
+        var serialized: list(string);
+        for reply in replies {
+            serialized.append(serialize(msg=reply.msg, msgType=reply.msgType,
+                                                 msgFormat=MsgFormat.STRING, user=user));
+        }
+        return "[%s]".format(", ".join(serialized.toArray()));
+    }
+
     while !shutdownServer {
         // receive message on the zmq socket
         var reqMsgRaw = socket.recv(bytes);
@@ -236,13 +568,30 @@ proc main() {
         reqCount += 1;
 
         var s0 = t1.elapsed();
-        
+
+        var session: string;
+        var seq: int;
+        replySession = "";
+        if isSequenced(reqMsgRaw) {
+            try {
+                (session, seq, reqMsgRaw) = splitSequenced(reqMsgRaw);
+            } catch e {
+                sendRepMsg(serialize(msg=unknownError(e.message()), msgType=MsgType.ERROR,
+                                                 msgFormat=MsgFormat.STRING, user="Unknown"));
+                continue;
+            }
+        }
+
         /*
          * Separate the first tuple, which is a string binary containing the JSON binary
          * string encapsulating user, token, cmd, message format and args from the 
-         * remaining payload.
+         * remaining payload. Compact requests are decoded below.
          */
-        var (rawRequest, payload) = reqMsgRaw.splitMsgToTuple(b"BINARY_PAYLOAD",2);
+        const compact = isCompact(reqMsgRaw);
+        var rawRequest, payload: bytes;
+        if !compact {
+            (rawRequest, payload) = reqMsgRaw.splitMsgToTuple(b"BINARY_PAYLOAD",2);
+        }
         var user, token, cmd: string;
 
         // parse requests, execute requests, format responses
@@ -252,26 +601,46 @@ proc main() {
              * If there is an error, discontinue processing message and send an error
              * message back to the client.
              */
-            var request : string;
+            var msg: RequestMsg;
 
-            try! {
-                request = rawRequest.decode();
-            } catch e: DecodeError {
-                asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
-                       "illegal byte sequence in command: %t".format(
-                                          rawRequest.decode(decodePolicy.replace)));
-                sendRepMsg(serialize(msg=unknownError(e.message()),msgType=MsgType.ERROR,
-                                                 msgFormat=MsgFormat.STRING, user="Unknown"));
-            }
+            if compact {
+                payload = deserializeCompact(msg, reqMsgRaw);
+            } else {
+                var request : string;
+
+                try! {
+                    request = rawRequest.decode();
+                } catch e: DecodeError {
+                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
+                           "illegal byte sequence in command: %t".format(
+                                              rawRequest.decode(decodePolicy.replace)));
+                    sendRepMsg(serialize(msg=unknownError(e.message()),msgType=MsgType.ERROR,
+                                                     msgFormat=MsgFormat.STRING, user="Unknown"));
+                }
 
-            // deserialize the decoded, JSON-formatted cmdStr into a RequestMsg
-            var msg: RequestMsg  = extractRequest(request);
+                // deserialize the decoded, JSON-formatted cmdStr into a RequestMsg
+                msg = extractRequest(request);
+            }
             user   = msg.user;
             token  = msg.token;
             cmd    = msg.cmd;
             var format = msg.format;
             var args   = msg.args;
 
+            /*
+             * Binary requests with args "multipart <byteorder>" carry their
+             * data in a second frame, which the client sends without copying,
+             * and "multipart <byteorder> <codec> <nbytes>" in a compressed one
+             */
+            if format == "BINARY" && args.startsWith("multipart") {
+                var frame = socket.recv(bytes);
+                var fields = args.split();
+                if fields.size == 4 {
+                    frame = decompressBytes(fields[2], frame, fields[3]:int);
+                }
+                payload += frame;
+            }
+
             /*
              * If authentication is enabled with the --authenticate flag, authenticate
              * the user which for now consists of matching the submitted token
@@ -281,6 +650,29 @@ proc main() {
                 authenticateUser(token);
             }
 
+            /*
+             * A sequenced request the client retries is answered with the reply
+             * it did not get, rather than executed again
+             */
+            if !session.isEmpty() {
+                const last = if lastSequence.contains(session) then lastSequence.getValue(session)
+                                                               else -1;
+                if seq == last && lastReply.contains(session) {
+                    if trace {
+                        asLogger.info(getModuleName(),getRoutineName(),getLineNumber(),
+                                      ">>> %t resent the reply to request %i".format(cmd, seq));
+                    }
+                    sendRepMsg(lastReply.getValue(session));
+                    continue;
+                }
+                if seq < last {
+                    throw new owned ErrorWithMsg("Error: request %i of session %s was answered already".format(
+                                                                                 seq, session));
+                }
+                lastSequence.addOrSet(session, seq);
+                replySession = session;
+            }
+
             if (trace) {
               try {
                 if (cmd != "array" && cmd != "get_from_csv") {
@@ -324,141 +716,28 @@ proc main() {
             var repTuple: MsgTuple;
             //num = num +1;
             if (isTracing) then compWatch.start();
-            select cmd
-            {
-                when "array"             {repTuple = arrayMsg(cmd, payload, st);}
-                when "arrayStore"        {repTuple = arrayStoreMsg(cmd, payload, st);}
-                when "tondarray"         {binaryRepMsg = tondarrayMsg(cmd, args, st);}
-                when "cast"              {repTuple = castMsg(cmd, args, st);}
-                when "mink"              {repTuple = minkMsg(cmd, args, st);}
-                when "maxk"              {repTuple = maxkMsg(cmd, args, st);}
-                when "intersect1d"       {repTuple = intersect1dMsg(cmd, args, st);}
-                when "sortedintersect1d" {repTuple = sortedIntersect1dMsg(cmd,args,st);}
-                when "setdiff1d"         {repTuple = setdiff1dMsg(cmd, args, st);}
-                when "setxor1d"          {repTuple = setxor1dMsg(cmd, args, st);}
-                when "union1d"           {repTuple = union1dMsg(cmd, args, st);}
-                when "segmentLengths"    {repTuple = segmentLengthsMsg(cmd, args, st);}
-                when "segmentedHash"     {repTuple = segmentedHashMsg(cmd, args, st);}
-                when "segmentedEfunc"    {repTuple = segmentedEfuncMsg(cmd, args, st);}
-                when "segmentedPeel"     {repTuple = segmentedPeelMsg(cmd, args, st);}
-                when "segmentedIndex"    {repTuple = segmentedIndexMsg(cmd, args, st);}
-                when "segmentedBinopvv"  {repTuple = segBinopvvMsg(cmd, args, st);}
-                when "segmentedBinopvs"  {repTuple = segBinopvsMsg(cmd, args, st);}
-                when "segmentedGroup"    {repTuple = segGroupMsg(cmd, args, st);}
-                when "segmentedIn1d"     {repTuple = segIn1dMsg(cmd, args, st);}
-                when "segmentedFlatten"  {repTuple = segFlattenMsg(cmd, args, st);}
-                when "lshdf"             {repTuple = lshdfMsg(cmd, args, st);}
-                when "readhdf"           {repTuple = readhdfMsg(cmd, args, st);}
-                when "readAllHdf"        {repTuple = readAllHdfMsg(cmd, args, st);}
-                when "tohdf"             {repTuple = tohdfMsg(cmd, args, st);}
-                when "create"            {repTuple = createMsg(cmd, args, st);}
-                when "delete"            {repTuple = deleteMsg(cmd, args, st);}
-                when "binopvv"           {repTuple = binopvvMsg(cmd, args, st);}
-                when "binopvvStore"      {repTuple = binopvvStoreMsg(cmd, args, st);}
-                when "binopvs"           {repTuple = binopvsMsg(cmd, args, st);}
-                when "binopvsStore"      {repTuple = binopvsStoreMsg(cmd, args, st);}
-                when "binopsv"           {repTuple = binopsvMsg(cmd, args, st);}
-                when "binopsvStore"      {repTuple = binopsvStoreMsg(cmd, args, st);}
-                when "opeqvv"            {repTuple = opeqvvMsg(cmd, args, st);}
-                when "opeqvs"            {repTuple = opeqvsMsg(cmd, args, st);}
-                when "efunc"             {repTuple = efuncMsg(cmd, args, st);}
-                when "efunc3vv"          {repTuple = efunc3vvMsg(cmd, args, st);}
-                when "efunc3vs"          {repTuple = efunc3vsMsg(cmd, args, st);}
-                when "efunc3sv"          {repTuple = efunc3svMsg(cmd, args, st);}
-                when "efunc3ss"          {repTuple = efunc3ssMsg(cmd, args, st);}
-                when "reduction"         {repTuple = reductionMsg(cmd, args, st);}
-                when "countReduction"    {repTuple = countReductionMsg(cmd, args, st);}
-                when "findSegments"      {repTuple = findSegmentsMsg(cmd, args, st);}
-                when "segmentedReduction"{repTuple = segmentedReductionMsg(cmd, args, st);}
-                when "broadcast"         {repTuple = broadcastMsg(cmd, args, st);}
-                when "arange"            {repTuple = arangeMsg(cmd, args, st);}
-                when "arangeStore"       {repTuple = arangeStoreMsg(cmd, args, st);}
-                when "linspace"          {repTuple = linspaceMsg(cmd, args, st);}
-                when "randint"           {repTuple = randintMsg(cmd, args, st);}
-                when "randintStore"      {repTuple = randintStoreMsg(cmd, args, st);}
-                when "randomNormal"      {repTuple = randomNormalMsg(cmd, args, st);}
-                when "randomStrings"     {repTuple = randomStringsMsg(cmd, args, st);}
-                when "histogram"         {repTuple = histogramMsg(cmd, args, st);}
-                when "in1d"              {repTuple = in1dMsg(cmd, args, st);}
-                when "unique"            {repTuple = uniqueMsg(cmd, args, st);}
-                when "value_counts"      {repTuple = value_countsMsg(cmd, args, st);}
-                when "set"               {repTuple = setMsg(cmd, args, st);}
-                when "info"              {repTuple = infoMsg(cmd, args, st);}
-                when "str"               {repTuple = strMsg(cmd, args, st);}
-                when "repr"              {repTuple = reprMsg(cmd, args, st);}
-                when "[int]"             {repTuple = intIndexMsg(cmd, args, st);}
-                when "[slice]"           {repTuple = sliceIndexMsg(cmd, args, st);}
-                when "[sliceStore]"      {repTuple = sliceIndexStoreMsg(cmd, args, st);}
-                when "[pdarray]"         {repTuple = pdarrayIndexMsg(cmd, args, st);}
-                when "[int]=val"         {repTuple = setIntIndexToValueMsg(cmd, args, st);}
-                when "[pdarray]=val"     {repTuple = setPdarrayIndexToValueMsg(cmd, args, st);}
-                when "[pdarray]=pdarray" {repTuple = setPdarrayIndexToPdarrayMsg(cmd, args, st);}
-                when "[slice]=val"       {repTuple = setSliceIndexToValueMsg(cmd, args, st);}
-                when "[slice]=pdarray"   {repTuple = setSliceIndexToPdarrayMsg(cmd, args, st);}
-                when "argsort"           {repTuple = argsortMsg(cmd, args, st);}
-                when "coargsort"         {repTuple = coargsortMsg(cmd, args, st);}
-                when "concatenate"       {repTuple = concatenateMsg(cmd, args, st);}
-                when "sort"              {repTuple = sortMsg(cmd, args, st);}
-                when "joinEqWithDT"      {repTuple = joinEqWithDTMsg(cmd, args, st);}
-                when "getconfig"         {repTuple = getconfigMsg(cmd, args, st);}
-                when "getmemused"        {repTuple = getmemusedMsg(cmd, args, st);}
-                when "register"          {repTuple = registerMsg(cmd, args, st);}
-                when "attach"            {repTuple = attachMsg(cmd, args, st);}
-                when "unregister"        {repTuple = unregisterMsg(cmd, args, st);}
-                when "clear"             {repTuple = clearMsg(cmd, args, st);}
-                when "zerosStore"        {repTuple = zerosStoreMsg(cmd, args, st);}
-                when "count_frequencies" {repTuple = countFrequenciesMsg(cmd, args, st);}
-                when "move_records"      {repTuple = moveRecordsMsg(cmd, args, st);}
-                when "cumsum"            {repTuple = cumSumMsg(cmd,args,st);}
-                when "remove_duplicates" {repTuple = removeDuplicatesMsg(cmd,args,st);}
-                when "triangle_count"    {repTuple = triangleCountMsg(cmd, args, st);}
-                when "triangle_count_sparse" {repTuple = sparseTriangleCountMsg(cmd, args, st);}
-                when "vector_times_matrix" {repTuple = vectorTimesMatrixMsg(cmd, args, st);}
-                when "vector_times_matrix_store" {repTuple = vectorTimesMatrixStoreMsg(cmd, args, st);}
-                when "matrix_times_vector" {repTuple = matrixTimesVectorMsg(cmd, args, st);}
-                when "matrix_times_vector_store" {repTuple = matrixTimesVectorStoreMsg(cmd, args, st);}
-                when "inverse_vector"    {repTuple = inverseVectorMsg(cmd, args, st);}
-                when "inverse_vector_store" {repTuple = inverseVectorMsgStore(cmd, args, st);}
-                when "betwenness_centrality" {repTuple = betweennessCentralityMsg(cmd, args, st);}
-                when "half_of_triangle_count" {repTuple = halfOfTriCountMsg(cmd, args, st);}
-                when "startProfile" {repTuple = startCountingMsg(cmd, args, st);}
-                when "endProfile" {repTuple = stopCountingMsg(cmd, args, st);}
-                when "connect" {
-                    if authenticate {
-                        repTuple = new MsgTuple("connected to arkouda server tcp://*:%i as user %s with token %s".format(
-                                                          ServerPort,user,token), MsgType.NORMAL);
-                    } else {
-                        repTuple = new MsgTuple("connected to arkouda server tcp://*:%i".format(ServerPort), 
-                                                                                        MsgType.NORMAL);
-                    }
-                }
-                when "disconnect" {
-                    repTuple = new MsgTuple("disconnected from arkouda server tcp://*:%i".format(ServerPort), 
-                                                                   MsgType.NORMAL);
-                }
-                when "noop" {
-                    repTuple = new MsgTuple("noop", MsgType.NORMAL);
-                }
-                when "ruok" {
-                    repTuple = new MsgTuple("imok", MsgType.NORMAL);
-                }
-                otherwise {
-                    repTuple = new MsgTuple("Unrecognized command: %s".format(cmd), MsgType.ERROR);
-                    asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),repTuple.msg);
+            var batchReplies: list(MsgTuple);
+            if cmd == "batch" {
+                batchReplies = batchMsg(args, user, token);
+                if !compact {
+                    repTuple = new MsgTuple(serializeBatch(batchReplies, user), MsgType.NORMAL);
                 }
+            } else {
+                repTuple = executeCommand(cmd, args, payload, user, token, binaryRepMsg);
             }
             if (isTracing) then compWatch.stop();
             /*
              * 1. Determine if the reply message is binary or a string via the repTuple.msg attribute
-             * 2. If a string, invoke serialize to generate a JSON-formatted reply string
+             * 2. If a string, invoke sendReply to generate a JSON-formatted or compact reply
              * 3. Invoke the sendRepMsg function
              */          
-            if repTuple.msg.isEmpty() {
+            if cmd == "batch" && compact {
+                sendRepMsg(compactReply(batchReplies, batch=true));
+            } else if repTuple.msg.isEmpty() {
                 // Since the repTuple.msg attribute is empty, this is a binary reply message
-                sendRepMsg(binaryRepMsg);
+                sendRepMsg(binaryRepMsg, replayable=false);
             } else {
-                sendRepMsg(serialize(msg=repTuple.msg,msgType=repTuple.msgType,
-                                                              msgFormat=MsgFormat.STRING, user=user));
+                sendReply(repTuple, user, compact);
             }
 
             /*
@@ -475,16 +754,14 @@ proc main() {
             }
         } catch (e: ErrorWithMsg) {
             // Generate a ReplyMsg of type ERROR and serialize to a JSON-formatted string
-            sendRepMsg(serialize(msg=e.msg,msgType=MsgType.ERROR, msgFormat=MsgFormat.STRING, 
-                                                        user=user));
+            sendReply(new MsgTuple(e.msg, MsgType.ERROR), user, compact);
             if trace {
                 asLogger.error(getModuleName(),getRoutineName(),getLineNumber(),
                     "<<< %s resulted in error %s in  %.17r sec".format(cmd, e.msg, t1.elapsed() - s0));
             }
         } catch (e: Error) {
             // Generate a ReplyMsg of type ERROR and serialize to a JSON-formatted string
-            sendRepMsg(serialize(msg=unknownError(e.message()),msgType=MsgType.ERROR, 
-                                                         msgFormat=MsgFormat.STRING, user=user));
+            sendReply(new MsgTuple(unknownError(e.message()), MsgType.ERROR), user, compact);
             if trace {
                 asLogger.error(getModuleName(), getRoutineName(), getLineNumber(), 
                     "<<< %s resulted in error: %s in %.17r sec".format(cmd, e.message(),
@@ -0,0 +1,77 @@
+import asyncio
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+from arkouda import aio
+
+'''
+Tests the asyncio client, which sends concurrent requests to the server
+'''
+class AioTest(ArkoudaTest):
+
+    def test_concurrent_transfers(self):
+        async def transfer():
+            async with aio.connect() as aclient:
+                arrays = [ak.arange(0, i, 1) + i for i in range(1, 20)]
+                return await asyncio.gather(*(aclient.to_ndarray(a) for a in arrays))
+
+        for i, values in enumerate(asyncio.run(transfer()), 1):
+            self.assertTrue((np.arange(i) + i == values).all())
+
+    def test_compute_branches(self):
+        a = ak.arange(0, 10, 1)
+        e = ak.arange(0, 5, 1)
+
+        async def compute(b, c):
+            async with aio.connect() as aclient:
+                await aclient.compute(b, c)
+                self.assertTrue(ak.client.q.empty())
+                return await aclient.generic_msg('reduction', 'sum {}'.format(b.name),
+                                                 my_pdarray=[b])
+
+        with ak.lazy():
+            b = a * 2 + 1
+            c = e * 3
+            self.assertEqual('int64 100', asyncio.run(compute(b, c)))
+        self.assertTrue((np.arange(5) * 3 == c.to_ndarray()).all())
+
+    def test_wait_for_other_tasks(self):
+        a = ak.arange(0, 10, 1)
+
+        async def compute(b, c):
+            async with aio.connect() as aclient:
+                # the transfers find the commands computing b taken by compute
+                return await asyncio.gather(aclient.compute(b), aclient.to_ndarray(b),
+                                            aclient.to_ndarray(c))
+
+        with ak.lazy():
+            b = a * 2 + 1
+            c = b + 1
+            _, x, y = asyncio.run(compute(b, c))
+        self.assertTrue((np.arange(10) * 2 + 1 == x).all())
+        self.assertTrue((np.arange(10) * 2 + 2 == y).all())
+
+    def test_error(self):
+        async def send():
+            async with aio.connect() as aclient:
+                await aclient.send('nosuchcommand', '')
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(send())
+
+    def test_failed_batch(self):
+        a = ak.arange(0, 5, 1)
+
+        async def compute(d):
+            async with aio.connect() as aclient:
+                await aclient.compute(d)
+
+        with ak.lazy():
+            b = a + 1
+            c = a[b + 10]
+            d = c * 2
+            with self.assertRaises(RuntimeError):
+                asyncio.run(compute(d))
+        self.assertTrue((np.arange(5) + 1 == b.to_ndarray()).all())
+        with self.assertRaisesRegex(RuntimeError, 'was not computed'):
+            d.to_ndarray()
@@ -2,6 +2,7 @@ import unittest, os, sys
 from context import arkouda as ak
 from util.test.util import ServerInfo, get_arkouda_numlocales, start_arkouda_server, stop_arkouda_server, \
      run_client_live, set_server_info
+from util.test.standin_server import StandInServer
 import importlib
 
 '''
@@ -83,3 +84,65 @@ class ArkoudaTest(unittest.TestCase):
                 stop_arkouda_server()
             except Exception:
                 pass
+
+
+'''
+StandInTest starts the NumPy stand-in server (util/test/standin_server.py) in-process at the
+launch of a unittest TestCase, rather than an arkouda_server, so that the test methods can
+inspect its symbols and statistics, and stops it at the completion of the TestCase.
+'''
+class StandInTest(unittest.TestCase):
+
+    timeout = 0
+
+    @classmethod
+    def setUpClass(cls):
+        '''
+        Starts the stand-in server on a free port and sets the StandInTest.server class
+        attribute
+
+        :return: None
+        '''
+        cls.server = StandInServer(port=0)
+        cls.server.start()
+
+    def setUp(self):
+        '''
+        Connects an Arkouda client for each test case, with an empty temp cache, and resets
+        the statistics of the stand-in server
+
+        :return: None
+        '''
+        ak.client.connect(port=self.server.port, timeout=self.timeout)
+        ak.client.clear_temp_cache()
+        self.server.reset_stats()
+
+    def tearDown(self):
+        '''
+        Disconnects the client connection for each test case
+
+        :return: None
+        '''
+        ak.client.disconnect()
+
+    @classmethod
+    def tearDownClass(cls):
+        '''
+        Stops the stand-in server started in the setUpClass method
+
+        :return: None
+        '''
+        cls.server.stop()
+
+    def park(self, arrays):
+        '''
+        Computes the pdarrays and drops them, first to last, so that they are cached in that
+        order
+
+        :param arrays: the pdarrays, which the list is emptied of
+        :type arrays: list
+        :return: None
+        '''
+        ak.compute(*arrays)
+        while arrays:
+            arrays.pop(0)
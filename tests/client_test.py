@@ -1,10 +1,18 @@
 from base_test import ArkoudaTest
+import os
+import subprocess
+import sys
+import threading
+import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from context import arkouda as ak
 
 '''
 Tests basic Arkouda client functionality
 '''
-from util.test.util import start_arkouda_server
+from util.test.util import start_arkouda_server, is_standin_server
 class ClientTest(ArkoudaTest):
     
     def test_client_connected(self):
@@ -80,6 +88,8 @@ class ClientTest(ArkoudaTest):
         self.assertTrue(context)
         self.assertFalse(context.closed)
         
+    @unittest.skipIf(is_standin_server(),
+                     'the stand-in server only counts the bytes of its symbols, of which there may be none')
     def test_get_mem_used(self):
         '''
         Tests the ak.client.get_mem_used method
@@ -128,3 +138,636 @@ class ClientTest(ArkoudaTest):
         self.assertEqual(100, ak.client.pdarrayIterThresh)
         self.assertEqual(1073741824, ak.client.maxTransferBytes)
         self.assertFalse(ak.client.verbose)
+
+    def test_batched_flush(self):
+        '''
+        Tests that a dependency chain flushed from the lazy buffer is sent
+        as a single batch request and yields the same values as numpy
+        '''
+        saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(10)
+        try:
+            a = ak.arange(0, 10, 1)
+            b = a + 1
+            c = b * 2
+            d = c - a
+            npa = np.arange(0, 10, 1)
+            self.assertEqual(((npa + 1) * 2 - npa).sum(), d.sum())
+        finally:
+            ak.client.buff_empty()
+            ak.client.q = saved
+
+    def test_failed_batch(self):
+        '''
+        Tests that the commands flushed after a failing one, and the buffered
+        commands using their results, raise its error rather than naming
+        pdarrays the server does not have, while those before it are computed
+        '''
+        npa = np.arange(0, 5, 1)
+        saved = ak.client.compactEnvelope
+        try:
+            for compact in {saved, False}:
+                ak.client.compactEnvelope = compact
+                a = ak.array(npa)
+                with self.assertRaises(RuntimeError) as cm:
+                    with ak.lazy():
+                        b = a + 1
+                        c = a[b + 10]
+                        d = a * 2
+                self.assertEqual((npa + 1).tolist(), b.to_ndarray().tolist())
+                with self.assertRaisesRegex(RuntimeError, 'was not computed'):
+                    d.to_ndarray()
+                with self.assertRaisesRegex(RuntimeError, str(cm.exception)):
+                    d + 1
+
+                with ak.lazy():
+                    c = a[a + 10]
+                    e = c + 1
+                    f = a - 1
+                    with self.assertRaises(RuntimeError):
+                        c.to_ndarray()
+                with self.assertRaisesRegex(RuntimeError, 'was not computed'):
+                    e.to_ndarray()
+                self.assertEqual((npa - 1).tolist(), f.to_ndarray().tolist())
+        finally:
+            ak.client.compactEnvelope = saved
+
+    def test_fused_flush(self):
+        '''
+        Tests that elementwise chains whose temporaries are dropped before
+        they are flushed are evaluated as fused expressions with the same
+        values as numpy
+        '''
+        saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(20)
+        try:
+            npx = np.linspace(0.5, 3.0, 16)
+            npi = np.arange(0, 16, 1)
+            x = ak.array(npx)
+            i = ak.arange(0, 16, 1)
+            r = (x * x + 1.0) / 2.0 - ak.sin(x) * x
+            k = (i * 3 + 1) * (i - 2) - i
+            self.assertTrue(np.isclose(((npx * npx + 1.0) / 2.0 - np.sin(npx) * npx).sum(),
+                                       r.sum()))
+            self.assertEqual(((npi * 3 + 1) * (npi - 2) - npi).sum(), k.sum())
+        finally:
+            ak.client.buff_empty()
+            ak.client.q = saved
+
+    def test_dead_operation_elimination(self):
+        '''
+        Tests that dropping throwaway intermediates from the lazy buffer
+        leaves the observed values intact
+        '''
+        saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(20)
+        try:
+            a = ak.arange(0, 10, 1)
+            for i in range(5):
+                unused = (a * 3) + i
+            del unused
+            b = a + 1
+            self.assertEqual((np.arange(0, 10, 1) + 1).sum(), b.sum())
+        finally:
+            ak.client.buff_empty()
+            ak.client.q = saved
+
+
+class BufferGraphTest(unittest.TestCase):
+    '''
+    Tests the indexed dependency DAG backing the lazy buffer, which does
+    not require a running arkouda_server
+    '''
+
+    def test_dependencies(self):
+        graph = ak.client.BufferGraph(10)
+        first = ak.client.BufferItem(cmd='arange', args='0 10 1', create_pdarray=True,
+                                     pdarray_id='id_a')
+        second = ak.client.BufferItem(cmd='binopvs', args='+ id_a int64 1',
+                                      create_pdarray=True, pdarray_id='id_b')
+        third = ak.client.BufferItem(cmd='opeqvs', args='+= id_a int64 1')
+        fourth = ak.client.BufferItem(cmd='reduction', args='sum id_a')
+        for item in (first, second, third, fourth):
+            graph.put(item)
+
+        self.assertEqual(['id_a'], second.reads)
+        self.assertEqual(['id_b'], second.writes)
+        self.assertEqual([first], [d() for d in second.dependencies])
+        # the in-place update is ordered after both the writer and the reader
+        self.assertEqual({first, second}, {d() for d in third.dependencies})
+        self.assertEqual([third], [d() for d in fourth.dependencies])
+        self.assertEqual(4, graph.consumers('id_a'))
+
+        items = []
+        graph.remove(second)
+        ak.client.q, saved = graph, ak.client.q
+        try:
+            ak.client.collect_with_dependencies(fourth, items)
+        finally:
+            ak.client.q = saved
+        self.assertEqual([first, third, fourth], items)
+        self.assertTrue(graph.empty())
+        self.assertEqual(0, graph.consumers('id_a'))
+        self.assertFalse(graph.producers)
+        self.assertFalse(graph.readers)
+
+    def test_independent_branches(self):
+        graph = ak.client.BufferGraph(10)
+        first = ak.client.BufferItem(cmd='arange', args='0 10 1', create_pdarray=True,
+                                     pdarray_id='id_ia')
+        other = ak.client.BufferItem(cmd='arange', args='0 5 1', create_pdarray=True,
+                                     pdarray_id='id_ib')
+        second = ak.client.BufferItem(cmd='binopvs', args='+ id_ia int64 1',
+                                      create_pdarray=True, pdarray_id='id_ic')
+        third = ak.client.BufferItem(cmd='binopvs', args='* id_ib int64 2',
+                                     create_pdarray=True, pdarray_id='id_id')
+        for item in (first, other, second, third):
+            graph.put(item)
+        self.assertEqual([[first, second], [other, third]],
+                         ak.client.independent_branches([first, other, second, third]))
+        # a command reading both joins the branches
+        both = ak.client.BufferItem(cmd='binopvv', args='+ id_ic id_id', create_pdarray=True,
+                                    pdarray_id='id_ie')
+        graph.put(both)
+        self.assertEqual([[first, other, second, third, both]],
+                         ak.client.independent_branches([first, other, second, third, both]))
+
+    def test_full(self):
+        graph = ak.client.BufferGraph(2)
+        graph.put(ak.client.BufferItem(cmd='arange', args='0 10 1', pdarray_id='id_a'))
+        self.assertFalse(graph.full())
+        graph.put(ak.client.BufferItem(cmd='arange', args='0 10 1', pdarray_id='id_b'))
+        self.assertTrue(graph.full())
+        self.assertEqual('arange', graph.get().cmd)
+        self.assertEqual(1, graph.qsize())
+
+
+class _Operand:
+    '''
+    Stands in for a pdarray passed to a BufferItem
+    '''
+    def __init__(self, name, dtype, size=10):
+        self.name = name
+        self.dtype = dtype
+        self.size = size
+
+
+def _buffer_item(cmd, args, out, operands):
+    item = ak.client.BufferItem(cmd=cmd, args=args, create_pdarray=True, pdarray_id=out.name,
+                                my_pd_array=operands + [out])
+    ak.client.parse_operands(item)
+    return item
+
+
+class FusionTest(unittest.TestCase):
+    '''
+    Tests fusing buffered elementwise chains, which does not require a
+    running arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(10)
+        self.dead = weakref.ref(_Operand('dead', ak.float64))
+
+    def tearDown(self):
+        ak.client.q = self.saved
+
+    def test_fuse_chain(self):
+        a, b = _Operand('id_fa', ak.float64), _Operand('id_fb', ak.float64)
+        t, u, v = (_Operand(name, ak.float64) for name in ('id_ft', 'id_fu', 'id_fv'))
+        first = _buffer_item('binopvv', '* id_fa id_fa', t, [a])
+        second = _buffer_item('efunc', 'sin id_fb', u, [b])
+        third = _buffer_item('binopvv', '+ id_ft id_fu', v, [t, u])
+        ak.client.names_to_weakref['id_ft'] = self.dead
+        ak.client.names_to_weakref['id_fu'] = self.dead
+
+        items = ak.client.fuse_elementwise([first, second, third])
+        self.assertEqual([third], items)
+        self.assertEqual('fused', third.cmd)
+        self.assertEqual('float64 id_fa id_fa * id_fb sin +', third.args)
+        self.assertEqual(['id_fa', 'id_fb'], third.reads)
+        self.assertTrue(first.executed and second.executed)
+
+    def test_no_fusion(self):
+        a = _Operand('id_ga', ak.float64)
+        t, u = _Operand('id_gt', ak.float64), _Operand('id_gu', ak.float64)
+        first = _buffer_item('binopvs', '* id_ga float64 2.0', t, [a])
+        update = ak.client.BufferItem(cmd='opeqvs', args='+= id_ga float64 1.0')
+        ak.client.parse_operands(update)
+        second = _buffer_item('binopvv', '+ id_gt id_ga', u, [t, a])
+
+        # the producer's result is still referenced
+        ak.client.names_to_weakref['id_gt'] = weakref.ref(t)
+        self.assertEqual(3, len(ak.client.fuse_elementwise([first, update, second])))
+        # the producer's operand is updated in place before the consumer runs
+        ak.client.names_to_weakref['id_gt'] = self.dead
+        self.assertEqual(3, len(ak.client.fuse_elementwise([first, update, second])))
+        self.assertEqual('binopvv', second.cmd)
+        self.assertEqual([second], ak.client.fuse_elementwise([first, second]))
+        self.assertEqual('float64 id_ga float64:2.0 * id_ga +', second.args)
+
+    def test_mixed_dtypes(self):
+        a = _Operand('id_ha', ak.int64)
+        t, u = _Operand('id_ht', ak.int64), _Operand('id_hu', ak.float64)
+        first = _buffer_item('binopvs', '+ id_ha int64 1', t, [a])
+        second = _buffer_item('binopvs', '* id_ht float64 0.5', u, [t])
+        ak.client.names_to_weakref['id_ht'] = self.dead
+        self.assertEqual(2, len(ak.client.fuse_elementwise([first, second])))
+        self.assertEqual('binopvs', second.cmd)
+
+
+class DeadOperationTest(unittest.TestCase):
+    '''
+    Tests dropping buffered commands whose results are never observed,
+    which does not require a running arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(10)
+        self.dead = weakref.ref(_Operand('dead', ak.int64))
+
+    def tearDown(self):
+        ak.client.q = self.saved
+
+    def test_drop_chain(self):
+        a = _Operand('id_da', ak.int64)
+        t, u, v = (_Operand(name, ak.int64) for name in ('id_dt', 'id_du', 'id_dv'))
+        first = _buffer_item('binopvs', '* id_da int64 3', t, [a])
+        second = _buffer_item('binopvs', '+ id_dt int64 1', u, [t])
+        third = _buffer_item('binopvs', '- id_da int64 1', v, [a])
+        for name in ('id_dt', 'id_du'):
+            ak.client.names_to_weakref[name] = self.dead
+        ak.client.names_to_weakref['id_dv'] = weakref.ref(v)
+
+        items, parked = ak.client.eliminate_dead_operations([first, second, third])
+        self.assertEqual([third], items)
+        self.assertTrue(first.executed and second.executed)
+        self.assertEqual([], parked)
+
+    def test_keep_side_effects(self):
+        a = _Operand('id_ea', ak.int64)
+        t = _Operand('id_et', ak.int64)
+        first = _buffer_item('binopvs', '* id_ea int64 3', t, [a])
+        update = ak.client.BufferItem(cmd='opeqvs', args='+= id_et int64 1')
+        ak.client.parse_operands(update)
+        ak.client.names_to_weakref['id_et'] = self.dead
+
+        # the result is still read by a command left in the buffer
+        ak.client.q.put(update)
+        items, _ = ak.client.eliminate_dead_operations([first])
+        self.assertEqual([first], items)
+        ak.client.q.remove(update)
+
+        items, _ = ak.client.eliminate_dead_operations([first, update])
+        self.assertEqual([first, update], items)
+        self.assertFalse(first.executed or update.executed)
+
+    def test_keep_setitem_target(self):
+        a = _Operand('id_fa', ak.int64)
+        t = _Operand('id_ft', ak.int64)
+        first = _buffer_item('binopvs', '* id_fa int64 3', t, [a])
+        # setitems name their target as arr_id, like the pdarrays they create
+        update = ak.client.BufferItem(cmd='[int]=val', args='id_ft 6 int64 85',
+                                      pdarray_id='id_ft')
+        ak.client.parse_operands(update)
+        ak.client.names_to_weakref['id_ft'] = self.dead
+
+        items, _ = ak.client.eliminate_dead_operations([first, update])
+        self.assertEqual([first, update], items)
+        self.assertFalse(first.executed or update.executed)
+
+
+class PlanCacheTest(unittest.TestCase):
+    '''
+    Tests reusing the optimizer's plan for flushed command sequences of the
+    same shape, which does not require a running arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(10)
+        ak.client.clear_plan_cache()
+        self.dead = weakref.ref(_Operand('dead', ak.float64))
+
+    def tearDown(self):
+        ak.client.q = self.saved
+        ak.client.clear_plan_cache()
+
+    def iteration(self, suffix, scalar):
+        a = _Operand('id_pa' + suffix, ak.float64)
+        t, u, v = (_Operand(name + suffix, ak.float64) for name in ('id_pt', 'id_pu', 'id_pv'))
+        items = [_buffer_item('binopvs', '* id_pa{} float64 {}'.format(suffix, scalar), t, [a]),
+                 _buffer_item('efunc', 'cos id_pt' + suffix, u, [t]),
+                 _buffer_item('binopvs', '+ id_pa{} float64 1.0'.format(suffix), v, [a])]
+        for name in ('id_pt', 'id_pv'):
+            ak.client.names_to_weakref[name + suffix] = self.dead
+        ak.client.names_to_weakref['id_pu' + suffix] = weakref.ref(u)
+        return items, (a, t, u, v)
+
+    def test_signature(self):
+        first, _ = self.iteration('0', 2.0)
+        second, operands = self.iteration('1', 3.0)
+        self.assertEqual(ak.client.plan_signature(first), ak.client.plan_signature(second))
+        # the shape includes whether results are still referenced
+        ak.client.names_to_weakref['id_pv1'] = weakref.ref(operands[3])
+        self.assertNotEqual(ak.client.plan_signature(first), ak.client.plan_signature(second))
+
+    def test_replay(self):
+        for suffix, scalar in (('0', 2.0), ('1', 3.0)):
+            items, _ = self.iteration(suffix, scalar)
+            stats = {'eliminated': 0, 'fused': 0}
+            items, _ = ak.client.optimize_batch(items, stats)
+            self.assertEqual({'eliminated': 1, 'fused': 1}, stats)
+            self.assertEqual(1, len(items))
+            self.assertEqual('float64 id_pa{} float64:{} * cos'.format(suffix, scalar),
+                             items[0].args)
+        self.assertEqual({'hits': 1, 'misses': 1, 'plans': 1}, ak.client.get_plan_cache_info())
+
+
+class CommonSubexpressionTest(ArkoudaTest):
+
+    def assertShared(self, first, second):
+        # a common subexpression is a new pdarray sharing the server-side array
+        self.assertIsNot(first, second)
+        self.assertEqual(ak.client.client_to_server_names[first.name],
+                         ak.client.client_to_server_names[second.name])
+
+    def test_repeated_commands(self):
+        a = ak.arange(0, 10, 1)
+        perm = ak.argsort(a)
+        self.assertShared(perm, ak.argsort(a))
+        self.assertShared(ak.coargsort([a, perm]), ak.coargsort([a, perm]))
+        floats = ak.cast(a, ak.float64)
+        self.assertShared(floats, ak.cast(a, ak.float64))
+        self.assertShared(ak.sin(floats), ak.sin(floats))
+        self.assertShared(a[perm], a[perm])
+        self.assertShared(a[2:8], a[2:8])
+        self.assertShared(ak.in1d(a, perm), ak.in1d(a, perm))
+        self.assertFalse(ak.in1d(a, perm, invert=True).any())
+        self.assertEqual(45, a[perm].sum())
+
+    def test_recorded_keys(self):
+        a = ak.arange(0, 10, 1)
+        key = ak.client.expression_key('argsort', 'pdarray {}'.format(a.name))
+        self.assertEqual('argsort:pdarray:{}'.format(a.name), key)
+        perm = ak.argsort(a)
+        self.assertShared(perm, ak.client.find_common_subexpression(key))
+        # the expression is forgotten with its operand, once no buffered
+        # command reads it
+        del a
+        self.assertEqual(45, perm.sum())
+        self.assertIsNone(ak.client.find_common_subexpression(key))
+
+    def test_in_place_update(self):
+        a = ak.arange(0, 10, 1)
+        square = a * a
+        perm = ak.argsort(a)
+        self.assertEqual(45, a.sum())
+        a += 1
+        self.assertEqual(1, a.version)
+        self.assertEqual(55, a.sum())
+        self.assertIsNot(square, a * a)
+        self.assertEqual(385, (a * a).sum())
+        self.assertEqual(285, square.sum())
+        a[0] = 100
+        self.assertEqual(2, a.version)
+        self.assertIsNot(perm, ak.argsort(a))
+
+    def test_update_shared_result(self):
+        # a pdarray updated in place is given its own copy of the shared array
+        a = ak.arange(0, 10, 1)
+        p = ak.argsort(a)
+        q = ak.argsort(a)
+        p[0] = 5
+        self.assertEqual(5, p[0])
+        self.assertEqual(0, q[0])
+        x = a + 1
+        y = a + 1
+        x[0] = 100
+        self.assertEqual(100, x[0])
+        self.assertEqual(1, y[0])
+        s1 = a[1:4]
+        s2 = a[1:4]
+        s1[0] = -1
+        self.assertEqual([-1, 2, 3], s1.to_ndarray().tolist())
+        self.assertEqual([1, 2, 3], s2.to_ndarray().tolist())
+        f1 = ak.cast(a, ak.float64)
+        f2 = ak.cast(a, ak.float64)
+        f2 += 1.5
+        self.assertEqual(45, f1.sum())
+        self.assertEqual(60, f2.sum())
+
+    def test_delete_shared_result(self):
+        # the shared array is only parked once every pdarray sharing it is deleted
+        a = ak.arange(0, 10, 1)
+        p = ak.argsort(a)
+        q = ak.argsort(a)
+        del p
+        self.assertFalse(ak.client.is_shared(q.name))
+        b = ak.zeros(10, dtype=ak.int64)
+        c = a * 2
+        self.assertEqual(list(range(10)), q.to_ndarray().tolist())
+        self.assertEqual(0, b.sum())
+        self.assertEqual(90, c.sum())
+
+
+class VersionedKeyTest(unittest.TestCase):
+    '''
+    Tests the index of recorded common subexpressions, which does not
+    require a running arkouda_server
+    '''
+
+    def test_forget(self):
+        a, b = _Operand('id_va', ak.int64), _Operand('id_vb', ak.int64)
+        result = _Operand('id_vr', ak.int64)
+        ak.client.record_common_subexpression(result, '+:id_va:id_vb', '+:id_vb:id_va')
+        self.assertIs(result, ak.client.args_to_id['+:id_vb@0:id_va@0']())
+        self.assertIn('+:id_va@0:id_vb@0', ak.client.args_to_id)
+
+        ak.client.record_update('id_va')
+        self.assertEqual('+:id_va@1:id_vb@0', ak.client.versioned_key('+:id_va:id_vb'))
+        self.assertIsNone(ak.client.find_common_subexpression('+:id_va:id_vb'))
+        self.assertNotIn('id_vb', ak.client.operand_to_args)
+
+        ak.client.record_common_subexpression(result, 'efunc:abs:id_vb')
+        self.assertTrue(ak.client.delete_from_args_map('id_vr'))
+        self.assertIsNone(ak.client.find_common_subexpression('efunc:abs:id_vb'))
+        self.assertNotIn('id_vb', ak.client.operand_to_args)
+        self.assertTrue(ak.client.delete_from_args_map('id_va'))
+        self.assertNotIn('id_va', ak.client.versions)
+
+
+class ThreadedClientTest(ArkoudaTest):
+    '''
+    Tests using the client from a pool of threads
+    '''
+
+    def test_thread_pool(self):
+        shared = ak.arange(0, 100, 1) * 3
+
+        def report(i):
+            a = ak.arange(0, 100, 1)
+            t = a * i + shared
+            for _ in range(5):
+                t = t + a * 2 - 1
+            return t.to_ndarray()
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(report, range(16)))
+        npa = np.arange(100)
+        for i, values in enumerate(results):
+            self.assertTrue((npa * i + npa * 3 + 5 * (npa * 2 - 1) == values).all())
+
+    def test_buffered_by_other_thread(self):
+        saved = ak.client.flush_policy
+        ak.client.set_flush_policy(ak.CountFlushPolicy(1000))
+        try:
+            a = ak.arange(0, 10, 1) + 5
+            with ThreadPoolExecutor(1) as executor:
+                values = executor.submit(lambda: (a * 2).to_ndarray()).result()
+            self.assertTrue(((np.arange(10) + 5) * 2 == values).all())
+            self.assertTrue((np.arange(10) + 5 == a.to_ndarray()).all())
+        finally:
+            ak.client.set_flush_policy(saved)
+
+    def test_disconnect_flushes_all_threads(self):
+        saved = ak.client.flush_policy
+        ak.client.set_flush_policy(ak.CountFlushPolicy(1000))
+        try:
+            with ThreadPoolExecutor(1) as executor:
+                a = executor.submit(lambda: ak.arange(0, 10, 1) + 5).result()
+            self.assertFalse(all(graph.empty() for graph in ak.client.buffers()))
+            ak.client.disconnect()
+            # the commands of the ended thread were sent before disconnecting
+            self.assertTrue(all(graph.empty() for graph in ak.client.buffers()))
+            ak.client.connect(server=ArkoudaTest.server, port=ArkoudaTest.port,
+                              timeout=ArkoudaTest.timeout)
+            self.assertTrue((np.arange(10) + 5 == a.to_ndarray()).all())
+        finally:
+            ak.client.set_flush_policy(saved)
+
+
+class ThreadLocalTest(unittest.TestCase):
+    '''
+    Tests the per-thread sockets and buffers, which does not require a
+    running arkouda_server
+    '''
+
+    def in_thread(self, function):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(function()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_socket_pool(self):
+        pool = ak.client.SocketPool()
+        pool.connect('tcp://localhost:5599')
+        try:
+            socket = pool.socket()
+            self.assertIs(socket, pool.socket())
+            other = self.in_thread(pool.socket)
+            self.assertIsNot(socket, other)
+            # the socket of the thread that ended is reused
+            self.assertEqual([other], pool.idle)
+            self.assertIs(other, self.in_thread(pool.socket))
+            pool.reset()
+            self.assertTrue(socket.closed)
+            self.assertIsNot(socket, pool.socket())
+        finally:
+            pool.close()
+        self.assertTrue(other.closed)
+
+    def test_buffers(self):
+        buffer = ak.client.ThreadLocalBufferGraph(10)
+        saved = ak.client.q
+        ak.client.q = buffer
+        try:
+            item = ak.client.BufferItem(cmd='arange', args='0 10 1', create_pdarray=True,
+                                        pdarray_id='id_ta')
+            self.in_thread(lambda: buffer.put(item))
+            self.assertTrue(buffer.empty())
+            self.assertEqual(10, buffer.maxsize)
+            self.assertEqual(2, len(ak.client.buffers()))
+            self.assertEqual([item], [user for graph in ak.client.buffers()
+                                      for user in graph.users('id_ta')])
+        finally:
+            ak.client.q = saved
+
+    def test_unlocked(self):
+        def can_lock():
+            if not ak.client.state_lock.acquire(timeout=0.1):
+                return False
+            ak.client.state_lock.release()
+            return True
+
+        with ak.client.state_lock, ak.client.state_lock:
+            with ak.client.unlocked():
+                # another thread can change the client state meanwhile
+                self.assertTrue(self.in_thread(can_lock))
+            self.assertFalse(self.in_thread(can_lock))
+        self.assertTrue(self.in_thread(can_lock))
+
+    def test_wait_for_in_flight(self):
+        producer = ak.client.BufferItem(cmd='arange', args='0 10 1', create_pdarray=True,
+                                        pdarray_id='id_fa')
+        reader = ak.client.BufferItem(cmd='binopvs', args='* id_fa int64 2', create_pdarray=True,
+                                      pdarray_id='id_fb')
+        other = ak.client.BufferItem(cmd='arange', args='0 5 1', create_pdarray=True,
+                                     pdarray_id='id_fc')
+        for item in (producer, reader, other):
+            ak.client.parse_operands(item)
+        events = []
+
+        def complete():
+            with ak.client.state_lock:
+                events.append('completed')
+                del ak.client.in_flight[producer]
+                ak.client.in_flight_done.notify_all()
+
+        ak.client.in_flight[producer] = -1
+        try:
+            # independent items do not wait for the items of other threads
+            ak.client.wait_for_in_flight([other])
+            timer = threading.Timer(0.2, complete)
+            timer.start()
+            ak.client.wait_for_in_flight([reader])
+            events.append('sent')
+            timer.join()
+        finally:
+            ak.client.in_flight.pop(producer, None)
+        self.assertEqual(['completed', 'sent'], events)
+
+
+class ImportTest(unittest.TestCase):
+    '''
+    Tests that importing arkouda defers its heavy dependencies and the
+    splash message, in a fresh interpreter
+    '''
+
+    def run_python(self, code):
+        return subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE,
+                              cwd=os.path.dirname(os.path.dirname(ak.__file__)),
+                              universal_newlines=True, check=True).stdout
+
+    def test_deferred_imports(self):
+        out = self.run_python('import sys, arkouda; '
+                              'print(sorted(m for m in ("pandas", "pyfiglet", "pkg_resources") '
+                              'if m in sys.modules))')
+        self.assertEqual('[]\n', out)
+
+    def test_lazy_names(self):
+        out = self.run_python('import sys, arkouda as ak; ak.Datetime; '
+                              'print("pandas" in sys.modules, ak.date_range is '
+                              'ak.timeclass.date_range, "Timedelta" in dir(ak))')
+        self.assertEqual('True True True\n', out)
+        for module, names in ak._LAZY_SUBMODULES.items():
+            self.assertEqual(sorted(names), sorted(getattr(ak, module).__all__))
+        with self.assertRaises(AttributeError):
+            ak.no_such_name
+        out = self.run_python('from arkouda import *; '
+                              'print(Datetime.__name__, Timedelta.__name__, date_range.__name__, '
+                              'timedelta_range.__name__, timeclass.__name__, callable(argsort))')
+        self.assertEqual('Datetime Timedelta date_range timedelta_range arkouda.timeclass True\n', out)
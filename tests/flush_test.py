@@ -0,0 +1,126 @@
+import unittest
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+
+'''
+Tests the policies deciding when buffered commands are flushed to the server
+'''
+class FlushTest(ArkoudaTest):
+
+    def setUp(self):
+        ArkoudaTest.setUp(self)
+        self.saved = ak.client.flush_policy
+
+    def tearDown(self):
+        ak.client.set_flush_policy(self.saved)
+        ArkoudaTest.tearDown(self)
+
+    def test_adaptive_flush(self):
+        policy = ak.AdaptiveFlushPolicy(2, 64)
+        ak.client.set_flush_policy(policy)
+        before = ak.client.get_flush_counts().get('adaptive', 0)
+        a = ak.arange(0, 100, 1)
+        d = ak.zeros(100, dtype=ak.int64)
+        for i in range(30):
+            d = d + (a * a) * 2
+        self.assertLess(before, ak.client.get_flush_counts()['adaptive'])
+        self.assertLess(2, policy.window)
+        npa = np.arange(0, 100, 1)
+        self.assertEqual((npa * npa * 2 * 30).sum(), d.sum())
+
+    def test_dependency_flush(self):
+        ak.client.set_flush_policy(ak.CountFlushPolicy(1000))
+        before = ak.client.get_flush_counts().get('dependency', 0)
+        a = ak.arange(0, 10, 1)
+        self.assertEqual(285, (a * a).sum())
+        self.assertEqual(before + 1, ak.client.get_flush_counts()['dependency'])
+
+    def test_set_flush_policy(self):
+        with self.assertRaises(TypeError):
+            ak.client.set_flush_policy(10)
+
+
+class _Buffer:
+    '''
+    Stands in for the BufferGraph a flush policy is consulted with
+    '''
+    def __init__(self, size, maxsize=10, pending_bytes=0, age=0.0):
+        self.size = size
+        self.maxsize = maxsize
+        self.pending_bytes = pending_bytes
+        self.seconds = age
+
+    def __len__(self):
+        return self.size
+
+    def empty(self):
+        return self.size == 0
+
+    def age(self):
+        return self.seconds
+
+
+class FlushPolicyTest(unittest.TestCase):
+    '''
+    Tests the flush policies, which does not require a running arkouda_server
+    '''
+
+    def test_abstract_policy(self):
+        class NoCheck(ak.FlushPolicy):
+            pass
+
+        with self.assertRaises(TypeError):
+            ak.FlushPolicy()
+        with self.assertRaises(TypeError):
+            NoCheck()
+
+    def test_count_policy(self):
+        policy = ak.CountFlushPolicy()
+        self.assertIsNone(policy.check(_Buffer(9)))
+        self.assertEqual(('count', 9), policy.check(_Buffer(10)))
+        self.assertEqual(('count', 2), ak.CountFlushPolicy(3).check(_Buffer(3)))
+        self.assertIsNone(policy.check(_Buffer(5, maxsize=0)))
+
+    def test_bytes_policy(self):
+        policy = ak.BytesFlushPolicy(800)
+        self.assertIsNone(policy.check(_Buffer(1, pending_bytes=799)))
+        self.assertEqual(('bytes', 0), policy.check(_Buffer(1, pending_bytes=800)))
+
+    def test_time_policy(self):
+        policy = ak.TimeFlushPolicy(0.5)
+        self.assertIsNone(policy.check(_Buffer(0, age=1.0)))
+        self.assertIsNone(policy.check(_Buffer(1, age=0.1)))
+        self.assertEqual(('time', 0), policy.check(_Buffer(1, age=1.0)))
+
+    def test_adaptive_policy(self):
+        policy = ak.AdaptiveFlushPolicy(2, 8)
+        self.assertIsNone(policy.check(_Buffer(1)))
+        self.assertEqual(('adaptive', 0), policy.check(_Buffer(2)))
+        found = {'trigger': 'adaptive', 'items': 2, 'eliminated': 0, 'fused': 1, 'reused': 0}
+        nothing = dict(found, fused=0)
+        for window in (4, 8, 8):
+            policy.observe(found)
+            self.assertEqual(window, policy.window)
+        policy.observe(dict(nothing, trigger='dependency'))
+        self.assertEqual(8, policy.window)
+        policy.observe(nothing)
+        self.assertEqual(4, policy.window)
+        with self.assertRaises(ValueError):
+            ak.AdaptiveFlushPolicy(4, 2)
+
+    def test_any_policy(self):
+        policy = ak.AnyFlushPolicy(ak.CountFlushPolicy(4), ak.BytesFlushPolicy(100))
+        self.assertIsNone(policy.check(_Buffer(1, pending_bytes=10)))
+        self.assertEqual(('bytes', 0), policy.check(_Buffer(1, pending_bytes=100)))
+        self.assertEqual(('count', 3), policy.check(_Buffer(4, pending_bytes=100)))
+
+    def test_pending_bytes(self):
+        buffer = ak.client.BufferGraph(10)
+        item = ak.client.BufferItem(cmd='create', args='int64 100', create_pdarray=True,
+                                    pdarray_id='id_pb', size=100, type=ak.int64)
+        buffer.put(item)
+        self.assertEqual(800, buffer.pending_bytes)
+        self.assertLessEqual(0, buffer.age())
+        buffer.remove(item)
+        self.assertEqual(0, buffer.pending_bytes)
@@ -0,0 +1,131 @@
+import io, json, unittest
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+from arkouda import instrumentation
+
+'''
+Tests the client-side instrumentation of commands
+'''
+class InstrumentationTest(ArkoudaTest):
+
+    def tearDown(self):
+        ak.disable_instrumentation()
+        ak.reset_instrumentation()
+        ArkoudaTest.tearDown(self)
+
+    def test_disabled_by_default(self):
+        ak.reset_instrumentation()
+        a = ak.arange(0, 10, 1)
+        self.assertEqual(45, a.sum())
+        stats = ak.get_instrumentation()
+        self.assertFalse(stats['enabled'])
+        self.assertEqual({}, stats['commands'])
+        self.assertEqual({}, stats['flushes'])
+
+    def test_phases(self):
+        with ak.instrumented():
+            with ak.lazy():
+                a = ak.arange(0, 1000, 1)
+                b = a * 2 + 1
+                self.assertEqual(1000 * 999 + 1000, b.to_ndarray().sum())
+            ak.array(np.arange(1000)).to_ndarray()
+        stats = ak.get_instrumentation()
+        self.assertTrue(stats['enabled'] is False)
+        commands = stats['commands']
+        # the buffered commands are formatted on their own, fused, and sent as
+        # a batch
+        self.assertEqual(['format'], list(commands['binopvs']['phases']))
+        self.assertEqual(2, commands['binopvs']['phases']['format']['count'])
+        self.assertEqual(['transform_args'], list(commands['fused']['phases']))
+        batch = commands['batch']
+        self.assertLessEqual(1, batch['requests'])
+        self.assertEqual(['serialize', 'wait', 'parse'], list(batch['phases']))
+        self.assertLess(0, batch['bytes_sent'])
+        self.assertLess(0, batch['bytes_received'])
+        self.assertEqual(2, commands['tondarray']['requests'])
+        self.assertLessEqual(16000, commands['tondarray']['bytes_received'])
+        self.assertLessEqual(8000, commands['array']['bytes_sent'])
+        wait = batch['phases']['wait']
+        self.assertEqual(batch['requests'], wait['count'])
+        self.assertLessEqual(wait['min'], wait['p50'])
+        self.assertLessEqual(wait['p99'], wait['max'])
+        self.assertEqual(wait['count'], sum(wait['buckets'].values()))
+        self.assertEqual(1, stats['flushes']['dependency']['flushes'])
+
+    def test_lookups(self):
+        with ak.instrumented():
+            a = ak.arange(0, 100, 1)
+            b = ak.abs(a)
+            c = ak.abs(a)
+            self.assertEqual(ak.client.client_to_server_names[b.name],
+                             ak.client.client_to_server_names[c.name])
+        cse = ak.get_instrumentation()['cse']
+        self.assertEqual(1, cse['hits'])
+        self.assertLessEqual(1, cse['misses'])
+        self.assertLess(0, cse['hit_rate'])
+
+    def test_dataframe(self):
+        with ak.instrumented():
+            ak.arange(0, 10, 1).to_ndarray()
+        df = ak.instrumentation_dataframe()
+        self.assertIn(('tondarray', 'wait'), set(zip(df.cmd, df.phase)))
+        self.assertTrue((df['count'] > 0).all())
+
+
+class RecordingTest(unittest.TestCase):
+    '''
+    Tests the histograms and the output of the instrumentation, without a server
+    '''
+
+    def tearDown(self):
+        ak.disable_instrumentation()
+        ak.reset_instrumentation()
+
+    def test_histogram(self):
+        histogram = instrumentation.Histogram()
+        for seconds in [1e-7, 3e-6, 3e-6, 1e-3, 0.5]:
+            histogram.add(seconds)
+        stats = histogram.asdict()
+        self.assertEqual(5, stats['count'])
+        self.assertAlmostEqual(0.5010061, stats['total'])
+        self.assertEqual(1e-7, stats['min'])
+        self.assertEqual(0.5, stats['max'])
+        # 3e-6 is in the bucket of durations up to 4 microseconds
+        self.assertEqual(4e-6, stats['p50'])
+        self.assertEqual(0.5, stats['p99'])
+        self.assertEqual({'1e-06': 1, '4e-06': 2, '0.001024': 1, '0.524288': 1}, stats['buckets'])
+        self.assertEqual(0.0, instrumentation.Histogram().quantile(0.5))
+
+    def test_record(self):
+        instrumentation.record_lookup('cse', True)
+        instrumentation.record_flush({'trigger': 'count', 'items': 3, 'eliminated': 1,
+                                      'fused': 0, 'reused': 1})
+        self.assertIs(instrumentation.null_timer, instrumentation.timer('array'))
+        stats = ak.get_instrumentation()
+        self.assertEqual(0, stats['cse']['hits'])
+        self.assertEqual({}, stats['flushes'])
+
+        ak.enable_instrumentation()
+        timer = instrumentation.timer('array')
+        timer.lap('serialize')
+        timer.count_sent([b'header', memoryview(np.zeros(10))])
+        timer.count_received(b'created')
+        instrumentation.record_lookup('temp_cache', True)
+        instrumentation.record_lookup('temp_cache', False)
+        instrumentation.record_flush({'trigger': 'count', 'items': 3, 'eliminated': 1,
+                                      'fused': 0, 'reused': 1})
+        stats = ak.get_instrumentation()
+        self.assertEqual({'requests': 1, 'bytes_sent': 86, 'bytes_received': 7},
+                         {key: value for key, value in stats['commands']['array'].items()
+                          if key != 'phases'})
+        self.assertEqual(1, stats['commands']['array']['phases']['serialize']['count'])
+        self.assertEqual({'hits': 1, 'misses': 1, 'hit_rate': 0.5}, stats['temp_cache'])
+        self.assertEqual({'flushes': 1, 'items': 3, 'eliminated': 1, 'fused': 0, 'reused': 1},
+                         stats['flushes']['count'])
+
+        out = io.StringIO()
+        ak.dump_instrumentation(out)
+        self.assertEqual(stats['commands'], json.loads(out.getvalue())['commands'])
+        ak.reset_instrumentation()
+        self.assertEqual({}, ak.get_instrumentation()['commands'])
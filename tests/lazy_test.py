@@ -0,0 +1,129 @@
+import json
+import unittest
+import weakref
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+
+'''
+Tests explicit lazy-evaluation scopes and the optimized plan of buffered commands
+'''
+class LazyTest(ArkoudaTest):
+
+    def test_lazy_scope(self):
+        a = ak.arange(0, 10, 1)
+        with ak.lazy():
+            b = (a * a) + 1
+            c = b * 2
+            self.assertFalse(ak.client.q.empty())
+        self.assertTrue(ak.client.q.empty())
+        npa = np.arange(0, 10, 1)
+        self.assertEqual(((npa * npa + 1) * 2).sum(), c.sum())
+
+    def test_compute(self):
+        with ak.lazy():
+            a = ak.arange(0, 10, 1)
+            b = a + 5
+            c = a * 3
+            ak.compute(b)
+            self.assertEqual(1, len(ak.client.q))
+            self.assertEqual(c.name, next(iter(ak.client.q)).pdarray_id)
+        self.assertEqual((np.arange(0, 10, 1) + 5).sum(), b.sum())
+
+    def test_explain(self):
+        # a size no other test uses, so no cached temporaries are reused
+        with ak.lazy():
+            a = ak.arange(0, 17, 1)
+            b = (a * a) + 1
+            unused = a - 1
+            del unused
+            plan = json.loads(ak.export_plan())
+            statuses = [node['status'] for node in plan['nodes']]
+            self.assertEqual(['pending', 'fused', 'pending', 'eliminated'], statuses)
+            self.assertEqual('fused', plan['nodes'][2]['optimized_cmd'])
+            self.assertTrue(ak.export_plan('dot').startswith('digraph plan {'))
+            ak.explain()
+        self.assertEqual((np.arange(0, 17, 1) ** 2 + 1).sum(), b.sum())
+
+
+class _Operand:
+    '''
+    Stands in for a pdarray passed to a BufferItem
+    '''
+    def __init__(self, name, dtype, size=10):
+        self.name = name
+        self.dtype = dtype
+        self.size = size
+
+
+class PlanTest(unittest.TestCase):
+    '''
+    Tests dry-running the optimizer over the buffer, which does not require
+    a running arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = ak.client.q
+        ak.client.q = ak.client.BufferGraph(0)
+        self.dead = weakref.ref(_Operand('dead', ak.float64))
+
+    def tearDown(self):
+        ak.client.q = self.saved
+
+    def push(self, cmd, args, out, operands):
+        item = ak.client.BufferItem(cmd=cmd, args=args, create_pdarray=True, pdarray_id=out.name,
+                                    my_pd_array=operands + [out])
+        ak.client.q.put(item)
+        return item
+
+    def test_plan(self):
+        a = _Operand('id_pa', ak.float64)
+        t, u, v = (_Operand(name, ak.float64) for name in ('id_pt', 'id_pu', 'id_pv'))
+        first = self.push('binopvs', '* id_pa float64 2.0', t, [a])
+        second = self.push('efunc', 'cos id_pt', u, [t])
+        third = self.push('binopvs', '+ id_pa float64 1.0', v, [a])
+        ak.client.names_to_weakref['id_pa'] = weakref.ref(a)
+        ak.client.names_to_weakref['id_pt'] = self.dead
+        ak.client.names_to_weakref['id_pu'] = weakref.ref(u)
+        ak.client.names_to_weakref['id_pv'] = self.dead
+
+        plan = json.loads(ak.export_plan())
+        self.assertEqual(['fused', 'pending', 'eliminated'],
+                         [node['status'] for node in plan['nodes']])
+        self.assertEqual(1, plan['nodes'][0]['fused_into'])
+        self.assertEqual('float64 id_pa float64:2.0 * cos', plan['nodes'][1]['optimized_args'])
+        self.assertEqual([0], plan['nodes'][1]['dependencies'])
+
+        # nothing is executed or rewritten
+        self.assertEqual(3, len(ak.client.q))
+        self.assertEqual('efunc', second.cmd)
+        self.assertFalse(first.executed or second.executed or third.executed)
+
+        dot = ak.export_plan('dot')
+        self.assertIn('n0 -> n1 [style=dotted, label="fused"];', dot)
+        with self.assertRaises(ValueError):
+            ak.export_plan('yaml')
+
+    def test_plan_buffers(self):
+        a, i = _Operand('id_pa', ak.float64), _Operand('id_pi', ak.int64)
+        t, u, v = (_Operand(name, ak.float64) for name in ('id_pt', 'id_pu', 'id_pv'))
+        self.push('binopvs', '* id_pa float64 2.0', t, [a])
+        gather = self.push('[pdarray]', 'id_pt id_pi', u, [t, i])
+        self.push('binopvs', '+ id_pa float64 1.0', v, [a])
+        for operand in (a, i, u, v):
+            ak.client.names_to_weakref[operand.name] = weakref.ref(operand)
+        # id_pt is dropped, last read by [pdarray]
+        ak.client.names_to_weakref['id_pt'] = self.dead
+        gather.my_pd_array.append(('id_pt', ak.float64, 10))
+        ak.client.names_to_number_of_live_references['id_pt'] = 1
+        self.addCleanup(ak.client.names_to_number_of_live_references.pop, 'id_pt')
+
+        # the temporary created earlier in the flush is reused, as the flush does
+        nodes = json.loads(ak.export_plan())['nodes']
+        self.assertEqual([None, None, 'id_pt'], [node['reuses'] for node in nodes])
+        self.assertEqual('binopvsStore', nodes[2]['optimized_cmd'])
+
+        ak.client.buffer_planning_enabled = False
+        self.addCleanup(setattr, ak.client, 'buffer_planning_enabled', True)
+        nodes = json.loads(ak.export_plan())['nodes']
+        self.assertEqual([None, None, None], [node['reuses'] for node in nodes])
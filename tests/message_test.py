@@ -1,7 +1,7 @@
-import unittest, json
+import unittest, json, struct
 from context import arkouda
 from arkouda.message import RequestMessage, MessageFormat, ReplyMessage, \
-     MessageType
+     MessageType, ArrayMetadata, TypedReply, COMPACT_MAGIC
 
 class MessageTest(unittest.TestCase):
 
@@ -87,4 +87,34 @@ class MessageTest(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             ReplyMessage.fromdict({ 'msg' : 'normal result', 'msgType': 'NORMAL'})
-    
\ No newline at end of file
+
+    def testCompactRequest(self):
+        msg = RequestMessage(user='user1', token='token', cmd='[int]', args='id_1 5')
+        self.assertEqual(COMPACT_MAGIC + struct.pack('<BIIII', 0, 5, 5, 5, 6) +
+                         b'user1token[int]id_1 5', msg.ascompact())
+
+        minMsg = RequestMessage(user='user1', cmd='connect', format=MessageFormat.BINARY)
+        self.assertEqual(COMPACT_MAGIC + struct.pack('<BIIII', 1, 5, 0, 7, 0) +
+                         b'user1connect', minMsg.ascompact())
+
+    def testCompactReply(self):
+        created = 'created id_2 int64 10 1 (10) 8'
+        raw = COMPACT_MAGIC + struct.pack('<BI', 0, 1) + \
+              struct.pack('<BHI', 0, 1, len(created)) + created.encode() + \
+              struct.pack('<H', 4) + b'id_2' + struct.pack('<Bqqqq', 0, 10, 1, 10, 8)
+        reply = ReplyMessage.fromcompact(raw)
+        self.assertEqual(ReplyMessage(msg=created, msgType=MessageType.NORMAL, user=''), reply)
+        self.assertIsInstance(reply.msg, TypedReply)
+        self.assertEqual((ArrayMetadata(name='id_2', dtype='int64', size=10, ndim=1,
+                                        shape=(10,), itemsize=8),), reply.msg.created)
+
+        raw = COMPACT_MAGIC + struct.pack('<BI', 1, 2) + \
+              struct.pack('<BHI', 1, 0, 4) + b'warn' + struct.pack('<BHI', 2, 0, 6) + b'Error:'
+        self.assertEqual([ReplyMessage(msg='warn', msgType=MessageType.WARNING, user=''),
+                          ReplyMessage(msg='Error:', msgType=MessageType.ERROR, user='')],
+                         ReplyMessage.fromcompact(raw))
+
+        with self.assertRaises(ValueError):
+            ReplyMessage.fromcompact(raw[:-2])
+        with self.assertRaises(ValueError):
+            ReplyMessage.fromcompact(b'{"msg": "normal result"}')
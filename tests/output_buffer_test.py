@@ -0,0 +1,159 @@
+import io
+import numpy as np
+from base_test import StandInTest
+from context import arkouda as ak
+
+'''
+Tests the output buffers of the commands creating arrays: sent as <cmd>Store,
+they recycle a dead temporary or cached array of the dtype and size of their
+result instead of allocating. The NumPy stand-in server is started
+in-process, to inspect its symbols and count the recycled buffers.
+'''
+class OutputBufferTest(StandInTest):
+
+    def tearDown(self):
+        super().tearDown()
+        self.assertEqual({}, self.server.symbols)
+
+    def test_cached_buffers(self):
+        npa = np.arange(100)
+        a = ak.array(npa)
+        m = ak.array(npa % 3 == 0)
+        perm = ak.array(npa[::-1].copy())
+        ak.compute(a, m, perm)
+        results = []
+        for make, expected in [(lambda: ak.abs(a), np.abs(npa).astype(np.float64)),
+                               (lambda: ak.cast(a, ak.float64), npa.astype(np.float64)),
+                               (lambda: ak.cast(a, ak.bool), npa.astype(bool)),
+                               (lambda: ak.where(m, a, -1), np.where(npa % 3 == 0, npa, -1)),
+                               (lambda: a[perm], npa[::-1]),
+                               (lambda: ak.numeric.cumsum(a), np.cumsum(npa))]:
+            self.park([ak.zeros(100, dtype=expected.dtype)])
+            symbols = len(self.server.symbols)
+            result = make()
+            self.assertTrue((expected == result.to_ndarray()).all())
+            self.assertEqual(expected.dtype, result.dtype)
+            # the cached array became the result
+            self.assertEqual(symbols, len(self.server.symbols))
+            results.append(result)
+        self.park([ak.zeros(100)])
+        normal = ak.standard_normal(100, seed=1)
+        self.assertEqual(100, normal.to_ndarray().size)
+        recycled = self.server.stats()['recycled']
+        self.assertEqual({'efunc': 2, 'cast': 2, 'efunc3vs': 1, '[pdarray]': 1,
+                          'randomNormal': 1, 'total': 7}, recycled)
+        self.assertEqual(0, ak.client.get_temp_cache_info()['arrays'])
+
+    def test_bool_cache(self):
+        self.park([ak.zeros(50, dtype=ak.bool)])
+        self.assertEqual(1, ak.client.get_temp_cache_info()['arrays'])
+        ones = ak.ones(50, dtype=ak.bool)
+        self.assertTrue(ones.to_ndarray().all())
+        self.assertEqual(1, self.server.stats()['commands']['zerosStore'])
+        self.assertEqual(1, len(self.server.symbols))
+
+    def test_dead_temporary(self):
+        x = ak.arange(0, 100, 1) + 1
+        ak.compute(x)
+        c = ak.numeric.cumsum(x)
+        del x
+        self.assertEqual(np.cumsum(np.arange(1, 101)).tolist(), c.to_ndarray().tolist())
+        # the sum was dead by the time the cumsum was sent, which recycled it
+        self.assertEqual(1, self.server.stats()['recycled']['efunc'])
+        self.assertEqual(1, len(self.server.symbols))
+
+    def test_gather_operands_kept(self):
+        a = ak.arange(0, 10, 1)
+        key = 9 - a
+        ak.compute(key)
+        b = a[key]
+        del key
+        self.assertEqual(list(range(9, -1, -1)), b.to_ndarray().tolist())
+        # the dead index array was cached rather than gathered into
+        self.assertEqual(0, self.server.stats()['recycled']['total'])
+        self.assertEqual(1, ak.client.get_temp_cache_info()['arrays'])
+
+    def test_recycled_name_of_live_array(self):
+        # server names run ahead of client ids, so the name of the recycled
+        # array is the client id of the live one
+        n = next(ak.pdarrayclass.array_ids)
+        self.server.next_id = n + 1
+        t = ak.arange(0, 10, 1)
+        ak.compute(t)
+        live = ak.arange(0, 5, 1)
+        ak.compute(live)
+        recycled = ak.client.client_to_server_names[t.name]
+        self.assertEqual(live.name, recycled)
+        del t
+        r = ak.arange(10, 20, 1)
+        self.assertEqual(list(range(10, 20)), r.to_ndarray().tolist())
+        self.assertEqual(list(range(5)), live.to_ndarray().tolist())
+        self.assertEqual(1, self.server.stats()['commands']['arangeStore'])
+
+    def test_mismatched_buffer(self):
+        name = self.server.add(np.arange(5))
+        buffer = self.server.add(np.zeros(3))
+        reply = self.server.execute('efuncStore', '{} abs {}'.format(buffer, name))
+        self.assertTrue(reply.startswith('created'))
+        # the buffer did not fit, and was deleted
+        self.assertNotIn(buffer, self.server.symbols)
+        self.assertEqual(0, self.server.stats()['recycled']['total'])
+        self.server.symbols.clear()
+
+    def gather_abs_cast(self, x, perm):
+        '''
+        Computes cast(abs(x[perm]), int64) in one batch, dropping the
+        temporaries, and returns it with the number of arrays on the server
+
+        :param x: the int64 pdarray
+        :type x: pdarray
+        :param perm: the permutation
+        :type perm: pdarray
+        '''
+        with ak.lazy():
+            t = x[perm]
+            u = ak.abs(t)
+            del t
+            v = ak.cast(u, ak.int64)
+            del u
+        return v, len(self.server.symbols)
+
+    def test_planned_buffers(self):
+        npa = np.arange(100)
+        x = ak.array(npa)
+        perm = ak.array(npa[::-1].copy())
+        ak.compute(x, perm)
+        v, symbols = self.gather_abs_cast(x, perm)
+        self.assertEqual(npa[::-1].tolist(), v.to_ndarray().tolist())
+        # the gathered array died at the abs, and was recycled by the cast
+        self.assertEqual({'cast': 1, 'total': 1}, self.server.stats()['recycled'])
+        self.assertEqual(4, symbols)
+        self.assertEqual((2400, 1600), ak.client.peak_bytes_history[-1])
+        out = io.StringIO()
+        ak.client.dump_peak_bytes(out)
+        self.assertEqual('2400 1600', out.getvalue().splitlines()[-1])
+        del v
+        ak.client.clear_temp_cache()
+
+        ak.client.buffer_planning_enabled = False
+        try:
+            v, symbols = self.gather_abs_cast(x, perm)
+        finally:
+            ak.client.buffer_planning_enabled = True
+        self.assertEqual(npa[::-1].tolist(), v.to_ndarray().tolist())
+        self.assertEqual(5, symbols)
+        self.assertEqual((2400, 2400), ak.client.peak_bytes_history[-1])
+
+    def test_store_to_batch_temporary(self):
+        npa = np.arange(100)
+        x = ak.array(npa)
+        perm = ak.array(npa[::-1].copy())
+        ak.compute(x, perm)
+        with ak.lazy():
+            t = x[perm]
+            r = (t + 1) * 2
+            del t
+        # the fused command stored to the gathered array, named by the server
+        self.assertEqual(3, len(self.server.symbols))
+        self.assertEqual(1, self.server.stats()['commands']['fusedStore'])
+        self.assertEqual(((npa[::-1] + 1) * 2 + npa).tolist(), (r + x).to_ndarray().tolist())
@@ -1,3 +1,6 @@
+import struct
+import unittest
+import weakref
 import numpy as np
 import pandas as pd
 import datetime as dt
@@ -51,6 +54,15 @@ class PdarrayCreationTest(ArkoudaTest):
         self.assertEqual("'int' object is not iterable", 
                          cm.exception.args[0])       
 
+    def test_array_releases_values(self):
+        # the buffer sent from is not kept alive by the pdarray created
+        values = np.arange(10)
+        ref = weakref.ref(values)
+        pda = ak.array(values)
+        del values
+        self.assertIsNone(ref())
+        self.assertEqual(45, pda.sum())
+
     def test_arange(self):
         self.assertTrue((ak.array([0, 1, 2, 3, 4]) == ak.arange(0, 5, 1)).all())
 
@@ -574,3 +586,36 @@ class PdarrayCreationTest(ArkoudaTest):
         
         ones.fill(np.float64(2))  
         self.assertTrue((np.float64(2) == ones.to_ndarray()).all())  
+
+
+class PayloadTest(unittest.TestCase):
+    '''
+    Tests the payloads array() sends, which does not require a running
+    arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = ak.client.multipartPayloads
+
+    def tearDown(self):
+        ak.client.multipartPayloads = self.saved
+
+    def test_multipart(self):
+        ak.client.multipartPayloads = True
+        a = np.arange(5, dtype='>i8')[::2]
+        header, values = ak.pdarraycreation._payload(a, 'int64 3 ')
+        self.assertEqual(b'int64 3 ', header)
+        self.assertEqual(24, values.nbytes)
+        self.assertTrue((a == np.frombuffer(values, dtype=np.int64)).all())
+
+        a = np.arange(4, dtype=np.float64)
+        header, values = ak.pdarraycreation._payload(a, 'float64 4 ')
+        # sent from the array's own buffer
+        self.assertTrue(np.shares_memory(a, np.frombuffer(values, dtype=np.float64)))
+
+    def test_big_endian(self):
+        ak.client.multipartPayloads = False
+        payload = ak.pdarraycreation._payload(np.array([1, 258]), 'int64 2 ')
+        self.assertEqual(b'int64 2 ' + struct.pack('>2q', 1, 258), payload)
+        payload = ak.pdarraycreation._payload(np.array([True, False]), 'bool 2 ')
+        self.assertEqual(b'bool 2 \x01\x00', payload)
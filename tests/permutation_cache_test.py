@@ -0,0 +1,115 @@
+import numpy as np
+from base_test import StandInTest
+from context import arkouda as ak
+
+'''
+Tests the cache of the permutations computed by argsort and coargsort: once
+dropped, a permutation is kept on the server for the same sort of the same
+versions of its keys, until a key is updated in place or deleted, which
+makes it a temporary reused by later commands, or it is evicted under the
+budget of the temp cache. The NumPy stand-in server is started in-process,
+to count the sorts it runs.
+'''
+class PermutationCacheTest(StandInTest):
+
+    def setUp(self):
+        super().setUp()
+        self.npa = np.array([5, 3, 9, 1, 7, 3, 0, 8])
+        self.a = ak.array(self.npa)
+
+    def tearDown(self):
+        del self.a
+        ak.client.set_temp_cache_budget(2 ** 30)
+        super().tearDown()
+        self.assertEqual({}, self.server.symbols)
+
+    def sort_and_drop(self, sort):
+        '''
+        Computes a permutation and drops it, returning its values
+
+        :param sort: computes the permutation
+        :type sort: callable
+        :return: the values of the permutation
+        :rtype: list
+        '''
+        return sort().to_ndarray().tolist()
+
+    def test_argsort(self):
+        expected = np.argsort(self.npa, kind='stable').tolist()
+        self.assertEqual(expected, self.sort_and_drop(lambda: ak.argsort(self.a)))
+        self.assertEqual(1, ak.client.get_temp_cache_info()['permutations'])
+        self.assertEqual(expected, self.sort_and_drop(lambda: ak.argsort(self.a)))
+        self.assertEqual(1, self.server.stats()['commands']['argsort'])
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual((1, 1), (info['permutation_hits'], info['permutation_misses']))
+        # the cached permutation is not a temporary
+        self.assertEqual(0, ak.client.get_temp_cache_info()['hits'])
+        b = ak.arange(0, self.npa.size, 1)
+        self.assertEqual(list(range(self.npa.size)), b.to_ndarray().tolist())
+        self.assertEqual(0, ak.client.get_temp_cache_info()['hits'])
+
+    def test_coargsort(self):
+        b = ak.array(self.npa % 2)
+        expected = np.lexsort([self.npa, self.npa % 2]).tolist()
+        for _ in range(3):
+            self.assertEqual(expected, self.sort_and_drop(lambda: ak.coargsort([b, self.a])))
+        self.assertEqual(1, self.server.stats()['commands']['coargsort'])
+        # the order of the keys matters
+        self.sort_and_drop(lambda: ak.coargsort([self.a, b]))
+        self.assertEqual(2, self.server.stats()['commands']['coargsort'])
+
+    def test_updated_key(self):
+        self.sort_and_drop(lambda: ak.argsort(self.a))
+        self.a += 1
+        self.assertEqual(np.argsort(self.npa, kind='stable').tolist(),
+                         self.sort_and_drop(lambda: ak.argsort(self.a)))
+        self.assertEqual(2, self.server.stats()['commands']['argsort'])
+        # the stale permutation became a temporary, the new one is cached
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual(1, info['permutations'])
+        self.assertEqual(2, info['arrays'])
+
+    def test_deleted_key(self):
+        self.sort_and_drop(lambda: ak.argsort(self.a))
+        del self.a
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual(0, info['permutations'])
+        # the permutation and the key are temporaries now
+        self.assertEqual(2, info['arrays'])
+        b = ak.arange(0, self.npa.size, 1)
+        self.assertEqual(list(range(self.npa.size)), b.to_ndarray().tolist())
+        self.assertEqual(1, ak.client.get_temp_cache_info()['hits'])
+        self.a = b
+
+    def test_budget(self):
+        ak.client.set_temp_cache_budget(self.npa.nbytes)
+        self.sort_and_drop(lambda: ak.argsort(self.a))
+        c = ak.array(np.arange(self.npa.size))
+        del c
+        # the permutation was evicted to fit the array cached after it
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual((0, 1, 1), (info['permutations'], info['arrays'], info['evicted']))
+        self.sort_and_drop(lambda: ak.argsort(self.a))
+        self.assertEqual(2, self.server.stats()['commands']['argsort'])
+
+    def test_disabled(self):
+        ak.client.permutation_cache_enabled = False
+        try:
+            self.sort_and_drop(lambda: ak.argsort(self.a))
+            self.assertEqual(0, ak.client.get_temp_cache_info()['permutations'])
+            self.sort_and_drop(lambda: ak.argsort(self.a))
+        finally:
+            ak.client.permutation_cache_enabled = True
+        self.assertEqual(2, self.server.stats()['commands']['argsort'])
+
+    def test_unique_after_argsort(self):
+        p = ak.argsort(self.a)
+        values, counts = np.unique(self.npa, return_counts=True)
+        self.assertEqual(values.tolist(), ak.unique(self.a).to_ndarray().tolist())
+        u, c = ak.unique(self.a, return_counts=True)
+        self.assertEqual(values.tolist(), u.to_ndarray().tolist())
+        self.assertEqual(counts.tolist(), c.to_ndarray().tolist())
+        # grouped by the live permutation rather than sorting again
+        self.assertEqual(1, self.server.stats()['commands']['argsort'])
+        self.assertNotIn('unique', self.server.stats()['commands'])
+        del p, u, c
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from base_test import StandInTest
+from context import arkouda as ak
+from arkouda.message import sequence_header, split_sequenced
+
+'''
+Tests that requests whose reply does not arrive are retried, and that flushes
+of the command buffer interrupted by a failed request are completed, without
+the server executing any request twice. The NumPy stand-in server is started
+in-process, so that it can stall its replies past the client timeout.
+'''
+class ReconnectTest(StandInTest):
+
+    timeout = 1
+
+    def setUp(self):
+        self.saved = ak.client.maxRetries, ak.client.retryDelay
+        ak.client.retryDelay = 0.1
+        super().setUp()
+        self.assertTrue(ak.client.sequencedRequests)
+
+    def tearDown(self):
+        ak.client.maxRetries, ak.client.retryDelay = self.saved
+        super().tearDown()
+
+    def test_retry(self):
+        with ak.lazy():
+            a = ak.arange(0, 10, 1)
+            b = a * 2
+            # the reply to the batch arrives after the client timed out
+            self.server.stall(1.5)
+        self.assertEqual(list(range(0, 20, 2)), b.to_ndarray().tolist())
+        stats = self.server.stats()
+        self.assertEqual({'batch': 1, 'total': 1}, stats['replayed'])
+        # each command was executed once
+        self.assertEqual({1}, {n for cmd, n in stats['commands'].items() if cmd != 'total'})
+
+    def test_interrupted_flush(self):
+        ak.client.maxRetries = 0
+        with self.assertRaises(ConnectionError):
+            with ak.lazy():
+                a = ak.arange(0, 10, 1)
+                b = a * 2
+                self.server.stall(1.5)
+        # the next request completes the flush first, and b gets its server name
+        self.assertEqual(list(range(0, 20, 2)), b.to_ndarray().tolist())
+        self.assertEqual(135, (a + b).sum())
+        stats = self.server.stats()
+        self.assertEqual({'batch': 1, 'total': 1}, stats['replayed'])
+        # each command was executed once
+        self.assertEqual({1}, {n for cmd, n in stats['commands'].items() if cmd != 'total'})
+
+    def test_binary_reply_retry(self):
+        a = ak.array(np.arange(100))
+        self.server.stall(1.5)
+        # binary replies are not kept by the server, so tondarray runs again
+        self.assertEqual(list(range(100)), a.to_ndarray().tolist())
+        stats = self.server.stats()
+        self.assertEqual(2, stats['requests']['tondarray'])
+        self.assertEqual(0, stats['replayed']['total'])
+
+    def test_no_retry(self):
+        ak.client.sequencedRequests = False
+        self.server.stall(1.5)
+        with self.assertRaises(ConnectionError):
+            ak.client._send_string_message('noop')
+        ak.client.sequencedRequests = True
+        self.assertEqual(1, ak.client.get_config()['numLocales'])
+
+
+class SequenceTest(unittest.TestCase):
+
+    def test_sequence_header(self):
+        session = 'f' * 32
+        header = sequence_header(session, 7)
+        self.assertEqual(44, len(header))
+        self.assertEqual((session, 7, b'request'), split_sequenced(header + b'request'))
+        with self.assertRaises(ValueError):
+            split_sequenced(b'AKC1' + header[4:])
@@ -0,0 +1,69 @@
+import numpy as np
+from base_test import StandInTest
+from context import arkouda as ak
+
+'''
+Tests the NumPy stand-in server (util/test/standin_server.py) the client
+optimizations are benchmarked against without an arkouda_server, started
+in-process rather than through ArkoudaTest
+'''
+class StandInServerTest(StandInTest):
+
+    def test_commands(self):
+        npa = np.arange(10, dtype=np.int64)
+        a = ak.array(npa)
+        self.assertTrue((npa * 2 + 1 == (a * 2 + 1).to_ndarray()).all())
+        self.assertTrue((npa[2:8:2] == a[2:8:2].to_ndarray()).all())
+        self.assertTrue((npa[npa > 4] == a[a > 4].to_ndarray()).all())
+        self.assertAlmostEqual(np.log(npa + 1).sum(), ak.log(a + 1).sum())
+        self.assertEqual(45, a.sum())
+        self.assertEqual(9, a.max())
+        b = ak.array(np.array([3, 1, 2]))
+        self.assertEqual([1, 2, 0], ak.argsort(b).to_ndarray().tolist())
+        self.assertEqual(8, ak.zeros(8).size)
+        with self.assertRaises(RuntimeError):
+            ak.client.generic_msg(cmd='unimplemented', return_value_needed=True)
+
+    def test_stats(self):
+        with ak.lazy():
+            a = ak.arange(0, 1000, 1)
+            b = ak.abs(a * 2 + a) * 3
+        b.to_ndarray()
+        stats = self.server.stats()
+        # the buffered commands reach the server in a single batch
+        self.assertEqual({'batch': 1, 'tondarray': 1, 'total': 2}, stats['requests'])
+        self.assertLess(stats['requests']['total'], stats['commands']['total'])
+        self.assertEqual(1, stats['commands']['tondarray'])
+        self.assertGreaterEqual(stats['sent']['tondarray'], 8000)
+        self.server.reset_stats()
+        self.assertEqual(0, self.server.stats()['requests']['total'])
+
+    def test_server_name_equal_to_client_id(self):
+        n = next(ak.pdarrayclass.array_ids)
+        # the server names the next array after the client id the one after it gets
+        self.server.next_id = n + 1
+        npa = np.array([50, 90, 70])
+        a = ak.array(npa)
+        ak.compute(a)
+        with ak.lazy():
+            perm = ak.argsort(a)
+            self.assertEqual(perm.name, ak.client.client_to_server_names[a.name])
+            b = a[perm]
+        # the gather reads a, not the permutation created in the same batch
+        self.assertEqual(sorted(npa.tolist()), b.to_ndarray().tolist())
+
+    def test_wire_formats(self):
+        npa = np.arange(5000, dtype=np.float64)
+        for compact in (True, False):
+            ak.client.compactEnvelope = compact
+            self.assertTrue((npa == ak.array(npa).to_ndarray()).all())
+        ak.client.set_compression('zlib', threshold=0)
+        self.server.reset_stats()
+        try:
+            a = ak.array(np.zeros(5000))
+            self.assertTrue((a.to_ndarray() == 0).all())
+            stats = self.server.stats()
+            self.assertLess(stats['received']['total'], 1000)
+            self.assertLess(stats['sent']['tondarray'], 1000)
+        finally:
+            ak.client.set_compression(None)
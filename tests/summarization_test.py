@@ -1,3 +1,4 @@
+import unittest
 import numpy as np
 from context import arkouda as ak
 from base_test import ArkoudaTest
@@ -32,4 +33,94 @@ class SummarizationTest(ArkoudaTest):
         self.assertEqual(self.na.any(), self.pda.any()) 
         
     def testAll(self):
-        self.assertEqual(self.na.all(), self.pda.all()) 
\ No newline at end of file
+        self.assertEqual(self.na.all(), self.pda.all()) 
+
+class PropertyTest(ArkoudaTest):
+    '''
+    Tests the reductions derived from known properties instead of being
+    computed by the server
+    '''
+
+    def assertDerived(self, pda, *ops):
+        derived = {op: pda.properties[op] for op in ops}
+        pda.properties.clear()
+        for op in ops:
+            self.assertEqual(ak.pdarrayclass._reduction(pda, op), derived[op])
+
+    def test_creation(self):
+        a = ak.arange(-9, 9, 3)
+        self.assertDerived(a, 'sum', 'min', 'max', 'argmin', 'argmax', 'is_sorted', 'any', 'all')
+        self.assertDerived(ak.zeros(5, dtype=ak.int64), 'sum', 'min', 'max', 'any', 'all')
+        self.assertDerived(ak.ones(5, dtype=ak.float64), 'sum', 'min', 'max', 'any', 'all')
+
+    def test_transforms(self):
+        a = ak.arange(0, 10, 1)
+        b = (a * -3) + 7
+        self.assertDerived(b, 'sum', 'min', 'max', 'argmin', 'argmax')
+        self.assertFalse('is_sorted' in b.properties)
+        c = ak.cast(a, ak.float64) / np.float64(4)
+        self.assertDerived(c, 'min', 'max', 'is_sorted')
+        self.assertDerived(a[::2], 'is_sorted')
+
+        a[0] = 5
+        self.assertFalse(a.properties)
+        self.assertEqual(0, len((a + 1).properties))
+        self.assertEqual(-1, (a - 2).min())
+
+    def test_var(self):
+        na = np.arange(0, 10, 1)
+        a = ak.arange(0, 10, 1)
+        self.assertAlmostEqual(na.var(), a.var())
+        self.assertIn('squared_deviations', a.properties)
+        self.assertAlmostEqual(na.std(ddof=1), a.std(ddof=1))
+
+
+class _Array:
+    '''
+    Stands in for a pdarray whose properties are derived
+    '''
+    def __init__(self, dtype, size, **properties):
+        self.dtype = dtype
+        self.size = size
+        self.properties = properties
+
+
+class DerivedPropertyTest(unittest.TestCase):
+    '''
+    Tests deriving properties through scalar binops, which does not require
+    a running arkouda_server
+    '''
+
+    def derive(self, source, dtype, op, scalar, reverse=False):
+        result = _Array(dtype, source.size)
+        ak.pdarrayclass._derive_properties(result, source, op, scalar, reverse)
+        return result.properties
+
+    def test_integral(self):
+        a = _Array(ak.int64, 4, min=np.int64(-2), max=np.int64(5), sum=np.int64(6),
+                   argmin=np.int64(3), argmax=np.int64(1), is_sorted=np.bool_(False),
+                   any=np.bool_(True), all=np.bool_(False))
+        self.assertEqual(dict(min=1, max=8, sum=18, argmin=3, argmax=1, is_sorted=False),
+                         self.derive(a, ak.int64, '+', 3))
+        self.assertEqual(dict(min=-4, max=3, sum=-2, argmin=1, argmax=3),
+                         self.derive(a, ak.int64, '-', 1, reverse=True))
+        self.assertEqual(dict(min=-10, max=4, sum=-12, argmin=1, argmax=3, any=True, all=False),
+                         self.derive(a, ak.int64, '*', -2))
+        self.assertEqual(dict(min=-1, max=2), self.derive(a, ak.int64, '//', 2))
+        self.assertEqual(dict(min=0, max=0, sum=0), self.derive(a, ak.int64, '*', 0))
+
+    def test_overflow(self):
+        a = _Array(ak.int64, 2, min=np.int64(0), max=np.int64(2**62), sum=np.int64(2**62),
+                   argmin=np.int64(0), is_sorted=np.bool_(True))
+        # the sum wraps as on the server, nothing else survives the overflow
+        self.assertEqual(dict(sum=np.int64(-2**63)), self.derive(a, ak.int64, '*', 2))
+
+    def test_floating(self):
+        a = _Array(ak.float64, 4, min=np.float64(-1.0), max=np.float64(3.0), sum=np.float64(4.0),
+                   argmin=np.int64(0), is_sorted=np.bool_(True))
+        self.assertEqual(dict(min=-0.5, max=1.5, is_sorted=True), self.derive(a, ak.float64, '/', 2))
+        self.assertEqual(dict(min=-2.5, max=1.5), self.derive(a, ak.float64, '-', 0.5, reverse=True))
+        self.assertEqual(dict(), self.derive(a, ak.float64, '**', 2))
+        self.assertEqual(dict(), self.derive(a, ak.float64, '+', np.inf))
+        self.assertEqual(dict(), self.derive(_Array(ak.int64, 4, min=np.int64(0), max=np.int64(1)),
+                                             ak.int64, '+', 0.5))
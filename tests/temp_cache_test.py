@@ -0,0 +1,127 @@
+import io
+import numpy as np
+from base_test import StandInTest
+from context import arkouda as ak
+
+'''
+Tests the cache of dead temporaries kept on the server for reuse: arrays
+beyond its byte budget are evicted least recently cached first and deleted
+in a single batch request, as are arrays beyond the server memory budget.
+The NumPy stand-in server is started in-process, to inspect its symbols.
+'''
+class TempCacheTest(StandInTest):
+
+    def tearDown(self):
+        ak.client.set_temp_cache_budget(2 ** 30)
+        super().tearDown()
+        # the cached arrays are deleted on disconnect
+        self.assertEqual({}, self.server.symbols)
+
+    def park(self, sizes):
+        '''
+        Creates and drops an int64 array of each size, in order, so that
+        they are cached
+
+        :param sizes: the sizes of the arrays
+        :type sizes: list
+        '''
+        super().park([ak.arange(0, size, 1) for size in sizes])
+
+    def test_budget(self):
+        ak.client.set_temp_cache_budget(3000)
+        self.park([100, 200, 150])
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual(3, info['parked'])
+        # the 800 byte array cached first was evicted to fit 2800 bytes
+        self.assertEqual(1, info['evicted'])
+        self.assertEqual(2, info['arrays'])
+        self.assertEqual(2800, info['bytes'])
+        # and is deleted before the next command
+        self.assertEqual(3, len(self.server.symbols))
+        ak.client.get_config()
+        self.assertEqual(2, len(self.server.symbols))
+        # a cached array is reused rather than created
+        b = ak.arange(0, 200, 1)
+        self.assertEqual(list(range(200)), b.to_ndarray().tolist())
+        self.assertEqual(1, ak.client.get_temp_cache_info()['hits'])
+        self.assertNotIn('create', self.server.stats()['commands'])
+
+    def test_batched_delete(self):
+        self.park([100, 100, 200, 300])
+        self.server.reset_stats()
+        ak.client.set_temp_cache_budget(2400)
+        self.assertEqual(3, ak.client.get_temp_cache_info()['evicted'])
+        ak.client.get_config()
+        stats = self.server.stats()
+        self.assertEqual(1, stats['requests']['batch'])
+        self.assertEqual(3, stats['commands']['delete'])
+        self.assertEqual(1, ak.client.get_temp_cache_info()['deletes'])
+        self.assertEqual(1, len(self.server.symbols))
+
+    def test_server_budget(self):
+        keep = ak.array(np.arange(1000))
+        self.park([500, 500])
+        self.assertEqual(16000, ak.client.get_mem_used())
+        ak.client.set_temp_cache_budget(2 ** 30, server_budget=12000, interval=60)
+        self.assertEqual(12000, ak.client.get_mem_used())
+        self.assertEqual(1, ak.client.get_temp_cache_info()['arrays'])
+        # the memory in use is not checked again within the interval
+        self.park([1000])
+        self.assertEqual(20000, ak.client.get_mem_used())
+        self.assertEqual(999, keep.max())
+
+    def test_clear(self):
+        self.park([10, 20])
+        ak.client.clear_temp_cache()
+        self.assertEqual(0, ak.client.get_temp_cache_info()['bytes'])
+        self.assertEqual({}, self.server.symbols)
+        with self.assertRaises(ValueError):
+            ak.client.set_temp_cache_budget(-1)
+
+    def test_counters(self):
+        self.park([100])
+        # the arange allocated its result, nothing being cached yet
+        self.assertEqual({('int64', 100): {'hits': 0, 'misses': 1}},
+                         ak.client.get_temp_cache_lookups())
+        b = ak.arange(0, 100, 1)
+        x = b + 1
+        ak.compute(x)
+        c = ak.numeric.cumsum(x)
+        del x
+        self.assertEqual(np.cumsum(np.arange(1, 101)).tolist(), c.to_ndarray().tolist())
+        info = ak.client.get_temp_cache_info()
+        self.assertEqual({'parked': 1, 'hits': 1, 'misses': 2, 'reused': 1, 'rewrites': 1,
+                          'bytes_parked': 800, 'bytes_saved': 1600},
+                         {key: info[key] for key in ('parked', 'hits', 'misses', 'reused',
+                                                     'rewrites', 'bytes_parked', 'bytes_saved')})
+        self.assertEqual({('int64', 100): {'hits': 1, 'misses': 2}},
+                         ak.client.get_temp_cache_lookups())
+        ak.client.set_temp_cache_budget(0)
+        del b
+        self.assertEqual(800, ak.client.get_temp_cache_info()['bytes_evicted'])
+        ak.client.clear_temp_cache()
+        self.assertEqual({}, ak.client.get_temp_cache_lookups())
+
+    def test_memory_timeline(self):
+        ak.client.enable_memory_timeline(reset=True)
+        try:
+            with ak.lazy():
+                a = ak.arange(0, 100, 1)
+                b = a * 2
+            self.park([50])
+        finally:
+            ak.client.disable_memory_timeline()
+        timeline = ak.client.get_memory_timeline()
+        self.assertEqual([(1600, 0), (2000, 0)], [sample[1:] for sample in timeline])
+        # sampled within the batch requests of the flushes
+        self.assertEqual({'batch': 2, 'total': 2}, self.server.stats()['requests'])
+        self.assertEqual(400, ak.client.get_temp_cache_info()['bytes'])
+        out = io.StringIO()
+        ak.client.dump_memory_timeline(out)
+        self.assertEqual('1600\n2000\n', out.getvalue())
+        out = io.StringIO()
+        ak.client.dump_memory_timeline(out, timestamps=True)
+        self.assertEqual(['2000', '0'], out.getvalue().splitlines()[-1].split()[1:])
+        # not sampled once disabled
+        self.park([10])
+        self.assertEqual(2, len(ak.client.get_memory_timeline()))
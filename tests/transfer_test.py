@@ -0,0 +1,130 @@
+import os, tempfile, unittest
+import numpy as np
+from base_test import ArkoudaTest
+from context import arkouda as ak
+
+'''
+Tests the chunked streaming transfers of ak.upload and ak.download, and
+the compression of transfers
+'''
+class TransferTest(ArkoudaTest):
+
+    def setUp(self):
+        ArkoudaTest.setUp(self)
+        self.saved = ak.client.maxChunksInFlight
+        ak.client.maxChunksInFlight = 2
+
+    def tearDown(self):
+        ak.client.maxChunksInFlight = self.saved
+        ArkoudaTest.tearDown(self)
+
+    def test_download(self):
+        a = ak.arange(0, 103, 1)
+        self.assertTrue((np.arange(103) == ak.download(a, chunk_bytes=80)).all())
+        self.assertTrue((np.arange(11) / 10 ==
+                         ak.download(ak.arange(0, 11, 1) / 10, chunk_bytes=24)).all())
+        with self.assertRaises(ValueError):
+            ak.download(a, out=np.empty(3))
+
+    def test_download_memmap(self):
+        path = os.path.join(tempfile.mkdtemp(), 'a.dat')
+        out = np.memmap(path, dtype=np.int64, mode='w+', shape=(103,))
+        ak.download(ak.arange(0, 103, 1) * 2, out=out, chunk_bytes=64)
+        out.flush()
+        self.assertTrue((np.arange(103) * 2 ==
+                         np.memmap(path, dtype=np.int64, mode='r')).all())
+
+    def test_upload(self):
+        a = ak.upload(np.arange(50, dtype=np.float64), chunk_bytes=56)
+        self.assertEqual(ak.float64, a.dtype)
+        self.assertTrue((np.arange(50) == a.to_ndarray()).all())
+        a = ak.upload(np.arange(20).tobytes(), dtype=np.int64, chunk_bytes=40)
+        self.assertTrue((np.arange(20) == a.to_ndarray()).all())
+        a = ak.upload(np.arange(6, dtype='>i8'))
+        self.assertTrue((np.arange(6) == a.to_ndarray()).all())
+        a = ak.upload(np.array([True, False, True]))
+        self.assertEqual([True, False, True], a.to_ndarray().tolist())
+
+    def test_upload_iterable(self):
+        chunks = (np.arange(i, i + 5) for i in range(0, 20, 5))
+        a = ak.upload(chunks, size=20, chunk_bytes=16)
+        self.assertEqual(190, a.sum())
+        self.assertTrue((np.arange(20) == a.to_ndarray()).all())
+        with self.assertRaises(ValueError):
+            ak.upload(iter([np.arange(3)]), size=5)
+        with self.assertRaises(ValueError):
+            ak.upload(iter([np.arange(9)]), size=5)
+        with self.assertRaises(ValueError):
+            ak.upload(iter([np.arange(3)]))
+        with self.assertRaises(TypeError):
+            ak.upload(b'abc')
+
+    def test_transfer_limit(self):
+        saved = ak.client.maxTransferBytes
+        a = ak.arange(0, 103, 1)
+        try:
+            ak.client.maxTransferBytes = 100
+            with self.assertRaises(RuntimeError):
+                a.to_ndarray()
+            self.assertTrue((np.arange(103) == ak.download(a)).all())
+        finally:
+            ak.client.maxTransferBytes = saved
+
+    def test_compressed_transfers(self):
+        saved = ak.client.compression, ak.client.compressionThreshold
+        try:
+            ak.set_compression('zlib', threshold=64)
+            a = ak.arange(0, 103, 1)
+            self.assertTrue((np.arange(103) == a.to_ndarray()).all())
+            self.assertTrue((np.arange(103) == ak.download(a, chunk_bytes=80)).all())
+            mask = ak.array(np.arange(200) % 3 == 0)
+            self.assertTrue((np.arange(200) % 3 == 0).tolist() == mask.to_ndarray().tolist())
+            a = ak.upload(np.arange(50, dtype=np.float64), chunk_bytes=80)
+            self.assertTrue((np.arange(50) == a.to_ndarray()).all())
+            strings = ak.array(['id_{}'.format(i) for i in range(40)])
+            self.assertEqual(['id_{}'.format(i) for i in range(40)],
+                             strings.to_ndarray().tolist())
+        finally:
+            ak.set_compression(*saved)
+
+
+class CompressionTest(unittest.TestCase):
+    '''
+    Tests the codecs and when transfers are compressed, which does not
+    require a running arkouda_server
+    '''
+
+    def setUp(self):
+        self.saved = (ak.client.compression, ak.client.compressionThreshold,
+                      ak.client.serverCodecs)
+
+    def tearDown(self):
+        ak.client.compression, ak.client.compressionThreshold, ak.client.serverCodecs = \
+            self.saved
+
+    def test_codecs(self):
+        self.assertIn('zlib', ak.compression.available_codecs())
+        values = memoryview(np.arange(1000) % 5).cast('B')
+        for codec in ak.compression.available_codecs():
+            compressed = ak.compression.compress(codec, values)
+            self.assertLess(len(compressed), len(values))
+            self.assertEqual(values.tobytes(),
+                             ak.compression.decompress(codec, compressed, len(values)))
+            with self.assertRaises(RuntimeError):
+                ak.compression.decompress(codec, compressed, len(values) - 8)
+
+    def test_set_compression(self):
+        with self.assertRaises(ValueError):
+            ak.client.set_compression('brotli')
+        with self.assertRaises(ValueError):
+            ak.client.set_compression('zlib', threshold=-1)
+        ak.client.set_compression('zlib', threshold=100)
+        ak.client.serverCodecs = ['zlib']
+        self.assertIsNone(ak.client._transfer_codec(99))
+        self.assertEqual('zlib', ak.client._transfer_codec(100))
+        ak.client.serverCodecs = []
+        self.assertIsNone(ak.client._transfer_codec(100))
+        ak.client.serverCodecs = ['zlib']
+        ak.client.set_compression(None)
+        self.assertIsNone(ak.client._transfer_codec(100))
+        self.assertEqual(100, ak.client.compressionThreshold)
@@ -0,0 +1,693 @@
+"""
+A stand-in for the arkouda_server, implemented on NumPy, for exercising and
+benchmarking the client (command buffering, common subexpressions, temporary
+reuse via the *Store commands and output buffers, batching and the wire
+formats) on machines without a Chapel build. It speaks the same ZMQ protocol
+as the server: JSON or compact requests and replies, multipart and
+compressed payloads, chunked transfers, batches and sequenced requests, and
+implements the core command set on a single locale. Commands it does not
+implement are answered with an error. Replies can be stalled, to exercise
+the retries of the client.
+
+Each request is recorded by command, with the bytes received and sent for
+it, so message counts and transfer volume can be compared across client
+changes. Run it as a server:
+
+    python3 util/test/standin_server.py --ServerPort=5555
+
+which writes its statistics as JSON to --stats (stdout by default) when
+shut down, or in-process:
+
+    server = StandInServer(port=0)
+    server.start()
+    ak.connect(port=server.port)
+    ...
+    print(server.stats())
+    server.stop()
+
+Setting ARKOUDA_STANDIN_SERVER=True makes start_arkouda_server, and so the
+full stack tests, start it instead of the arkouda_server.
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import zmq
+
+from context import arkouda
+from arkouda.compression import available_codecs, compress, decompress
+from arkouda.message import COMPACT_DTYPES, COMPACT_MAGIC, SEQUENCE_MAGIC, split_sequenced
+
+BINOPS = {
+    '+': np.add, '-': np.subtract, '*': np.multiply, '/': np.true_divide,
+    '//': np.floor_divide, '%': np.mod, '**': np.power,
+    '<': np.less, '>': np.greater, '<=': np.less_equal, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal,
+    '&': np.bitwise_and, '|': np.bitwise_or, '^': np.bitwise_xor,
+    '<<': np.left_shift, '>>': np.right_shift,
+}
+
+EFUNCS = {
+    'abs': np.abs, 'log': np.log, 'exp': np.exp, 'sin': np.sin, 'cos': np.cos,
+    'cumsum': np.cumsum, 'cumprod': np.cumprod,
+}
+
+# commands which can recycle the array named by their first arg for the
+# array they create when sent as <cmd>Store, as SymTab.useOutputBuffer
+OUTPUT_BUFFER_COMMANDS = frozenset(['efunc', 'cast', 'efunc3vv', 'efunc3vs', 'efunc3sv',
+                                    'efunc3ss', '[pdarray]', 'randomNormal'])
+
+REDUCTIONS = {
+    'any': np.any, 'all': np.all, 'sum': np.sum, 'prod': np.prod, 'min': np.min,
+    'max': np.max, 'argmin': np.argmin, 'argmax': np.argmax,
+    'is_sorted': lambda a: np.all(a[:-1] <= a[1:]),
+}
+
+MSG_TYPES = ('NORMAL', 'WARNING', 'ERROR')
+
+_COMPACT_REQUEST = struct.Struct('<BIIII')
+_COMPACT_HEADER = struct.Struct('<BI')
+_COMPACT_RECORD = struct.Struct('<BHI')
+_COMPACT_ARRAY = struct.Struct('<Bqqqq')
+
+
+class StandInServer:
+    """
+    NumPy-backed stand-in for the arkouda_server, bound to a REP socket.
+    Requests are served one at a time, by serve() or by the thread started
+    by start().
+
+    Attributes
+    ----------
+    port : int
+        The port the server is bound to
+    symbols : dict
+        Server name to the np.ndarray of each pdarray
+    requests : Counter
+        Number of requests received for each command, a batch counting once
+        as "batch"
+    commands : Counter
+        Number of times each command was executed, including within batches
+    received, sent : Counter
+        Bytes received and sent for the requests of each command, including
+        their payload frames
+    replayed : Counter
+        Number of retried requests of each command answered with the reply
+        sent before
+    recycled : Counter
+        Number of output buffers of each command recycled for the array it
+        created
+    """
+
+    def __init__(self, port=5555, compact=True, codecs=None):
+        """
+        :param int port: the port to bind to, 0 for any free port
+        :param bool compact: whether to offer the compact envelope
+        :param list codecs: the compression codecs to offer, defaults to all
+                            those available
+        """
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.REP)
+        if port == 0:
+            port = self.socket.bind_to_random_port('tcp://*')
+        else:
+            self.socket.bind('tcp://*:{}'.format(port))
+        self.port = port
+        self.compact = compact
+        self.codecs = available_codecs() if codecs is None else list(codecs)
+        self.symbols = {}
+        self.next_id = 0
+        self.requests = Counter()
+        self.commands = Counter()
+        self.received = Counter()
+        self.sent = Counter()
+        self.replayed = Counter()
+        self.recycled = Counter()
+        # the (name, command) of the output buffer of the command executing
+        self.output_buffer = None
+        # per session, the last sequence number and its reply (see stall)
+        self.last_sequence = {}
+        self.last_reply = {}
+        self.session = None
+        self.stalls = []
+        self.thread = None
+        self.stopping = threading.Event()
+
+    ##############
+    # Statistics #
+    ##############
+
+    def stats(self):
+        """
+        Returns the statistics recorded since the server started or the last
+        reset_stats()
+
+        :return: "requests", "commands", "received", "sent", "replayed" and
+                 "recycled", each mapping commands to counts, and their "total"
+        :rtype: dict
+        """
+        stats = {}
+        for key in ('requests', 'commands', 'received', 'sent', 'replayed', 'recycled'):
+            counts = getattr(self, key)
+            stats[key] = dict(counts)
+            stats[key]['total'] = sum(counts.values())
+        return stats
+
+    def reset_stats(self):
+        """
+        Clears the statistics, e.g. between the phases of a benchmark
+
+        :return: None
+        """
+        for counts in (self.requests, self.commands, self.received, self.sent, self.replayed,
+                       self.recycled):
+            counts.clear()
+
+    def stall(self, seconds, requests=1):
+        """
+        Delays the replies to the next requests by seconds, after executing
+        them, as if the replies were lost when the client times out first
+
+        :param float seconds: the delay
+        :param int requests: the number of requests to delay
+        :return: None
+        """
+        self.stalls.extend([seconds] * requests)
+
+    ################
+    # Symbol table #
+    ################
+
+    def next_name(self):
+        self.next_id += 1
+        return 'id_{}'.format(self.next_id)
+
+    def attrib(self, name):
+        a = self.symbols[name]
+        return '{} {} {} {} ({}) {}'.format(name, a.dtype.name, a.size, a.ndim,
+                                           a.size, a.itemsize)
+
+    def lookup(self, name):
+        try:
+            return self.symbols[name]
+        except KeyError:
+            raise ValueError('undefined symbol: {}'.format(name))
+
+    def add(self, values):
+        name = self.next_name()
+        values = np.asarray(values)
+        if self.output_buffer is not None:
+            # recycle the output buffer if it fits, as SymTab.addEntry
+            buffer, cmd = self.output_buffer
+            self.output_buffer = None
+            recycled = self.symbols.pop(buffer, None)
+            if (recycled is not None and recycled.dtype == values.dtype
+                    and recycled.shape == values.shape):
+                recycled[...] = values
+                self.symbols[name] = recycled
+                self.recycled[cmd] += 1
+                return name
+        # a copy, since the values may be a view of another symbol (a slice)
+        self.symbols[name] = np.array(values, copy=True)
+        return name
+
+    def created(self, *arrays):
+        return '+'.join('created ' + self.attrib(self.add(a)) for a in arrays)
+
+    def updated(self, name, values):
+        self.lookup(name)[...] = values
+        return 'updated ' + self.attrib(name)
+
+    @staticmethod
+    def scalar(dtype, value):
+        if dtype == 'bool':
+            return np.bool_(value == 'True')
+        return np.dtype(dtype).type(value)
+
+    @staticmethod
+    def value(v):
+        v = np.asarray(v)[()]
+        if isinstance(v, np.bool_):
+            return 'bool {}'.format(v)
+        if isinstance(v, np.floating):
+            return 'float64 {!r}'.format(float(v))
+        return 'int64 {}'.format(int(v))
+
+    ############
+    # Commands #
+    ############
+
+    def getconfig(self):
+        return json.dumps({'arkoudaVersion': arkouda.__version__,
+                           'serverHostname': socket.gethostname(),
+                           'ServerPort': self.port, 'numLocales': 1,
+                           'numPUs': os.cpu_count(), 'maxTaskPar': os.cpu_count(),
+                           'physicalMemory': 0, 'distributionType': 'standin',
+                           'LocaleConfigs': [], 'authenticate': False,
+                           'logLevel': 'INFO', 'multipartPayloads': True,
+                           'chunkedTransfers': True, 'compactEnvelope': self.compact,
+                           'compressionCodecs': ','.join(self.codecs),
+                           'sequencedRequests': True})
+
+    def array(self, args, payload, store=False):
+        # "<dtype> [<name>] <size> <bytes>", in the byte order of the args
+        parts = payload.split(b' ', 3 if store else 2)
+        dtype = np.dtype(parts[0].decode())
+        order = '<' if args.startswith('multipart little') else '>'
+        values = np.frombuffer(parts[-1], dtype=dtype.newbyteorder(order)).astype(dtype)
+        if store:
+            return self.updated(parts[1].decode(), values)
+        return self.created(values)
+
+    def array_chunk(self, args, payload):
+        name, start, count, data = payload.split(b' ', 3)
+        a = self.lookup(name.decode())
+        start, count = int(start), int(count)
+        if start < 0 or start + count > a.size:
+            raise ValueError('Chunk {}..#{} is out of bounds with size {}'.format(
+                start, count, a.size))
+        order = '<' if args.startswith('multipart little') else '>'
+        a[start:start + count] = np.frombuffer(data, dtype=a.dtype.newbyteorder(order))
+        return 'updated ' + self.attrib(name.decode())
+
+    def tondarray(self, fields):
+        # "<name>" in big-endian, or "<name> <start> <count> <byteorder> [<codec>]"
+        a = self.lookup(fields[0])
+        order = '>'
+        if len(fields) >= 4:
+            start, count = int(fields[1]), int(fields[2])
+            if start < 0 or start + count > a.size:
+                return 'Error: Chunk {}..#{} is out of bounds with size {}'.format(
+                    start, count, a.size).encode()
+            a = a[start:start + count]
+            order = '<' if fields[3] == 'little' else '>'
+        data = a.astype(a.dtype.newbyteorder(order)).tobytes()
+        if len(fields) == 5:
+            data = compress(fields[4], memoryview(data))
+        return data
+
+    def fused(self, fields, store):
+        # a postfix expression of operands, "<dtype>:<value>" constants and ops
+        tokens = fields[1:-1] if store else fields[1:]
+        stack = []
+        with np.errstate(all='ignore'):
+            for tok in tokens:
+                if tok in ('+', '-', '*'):
+                    b, a = stack.pop(), stack.pop()
+                    stack.append(BINOPS[tok](a, b))
+                elif tok == '/':
+                    # division by a zero operand yields 0, as on the server
+                    b, a = stack.pop(), stack.pop()
+                    stack.append(np.where(b != 0, np.true_divide(a, b), 0.0))
+                elif tok == '/s':
+                    b, a = stack.pop(), stack.pop()
+                    stack.append(np.true_divide(a, b))
+                elif tok in ('abs', 'log', 'exp', 'sin', 'cos'):
+                    stack.append(EFUNCS[tok](np.asarray(stack.pop(), dtype=np.float64)))
+                elif ':' in tok:
+                    stack.append(self.scalar(*tok.split(':', 1)))
+                else:
+                    stack.append(self.lookup(tok))
+        if len(stack) != 1:
+            raise ValueError('malformed fused expression: {}'.format(' '.join(tokens)))
+        values = np.asarray(stack[0]).astype(fields[0])
+        return self.updated(fields[-1], values) if store else self.created(values)
+
+    def execute(self, cmd, args, payload=b''):
+        """
+        Executes a command, returning its string or, for tondarray, bytes reply
+
+        :return: the reply message
+        :rtype: Union[str, bytes]
+        :raise: Exception for errors, which are replied as such
+        """
+        self.commands[cmd] += 1
+        if cmd.endswith('Store') and cmd[:-5] in OUTPUT_BUFFER_COMMANDS:
+            buffer, _, args = args.partition(' ')
+            self.lookup(buffer)
+            self.output_buffer = (buffer, cmd[:-5])
+            try:
+                return self.run(cmd[:-5], args, payload)
+            finally:
+                if self.output_buffer is not None:
+                    self.symbols.pop(buffer, None)
+                    self.output_buffer = None
+        return self.run(cmd, args, payload)
+
+    def run(self, cmd, args, payload):
+        f = args.split()
+        if cmd in ('connect', 'disconnect'):
+            return '{}ed to arkouda server'.format(cmd)
+        if cmd == 'noop':
+            return 'noop'
+        if cmd == 'ruok':
+            return 'imok'
+        if cmd == 'getconfig':
+            return self.getconfig()
+        if cmd == 'getmemused':
+            return str(sum(a.nbytes for a in self.symbols.values()))
+        if cmd in ('array', 'arrayStore'):
+            return self.array(args, payload, store=cmd == 'arrayStore')
+        if cmd == 'arrayChunk':
+            return self.array_chunk(args, payload)
+        if cmd == 'tondarray':
+            return self.tondarray(f)
+        if cmd == 'create':
+            return self.created(np.zeros(int(f[1]), dtype=f[0]))
+        if cmd == 'zerosStore':
+            return self.updated(f[2], 0)
+        if cmd == 'delete':
+            self.symbols.pop(f[0], None)
+            return 'deleted {}'.format(f[0])
+        if cmd == 'clear':
+            self.symbols.clear()
+            return 'success'
+        if cmd == 'set':
+            self.lookup(f[0])[...] = self.scalar(f[1], f[2])
+            return 'set {} to {}'.format(f[0], f[2])
+        if cmd.startswith('binop'):
+            op = BINOPS[f[0]]
+            with np.errstate(all='ignore'):
+                if cmd.startswith('binopvv'):
+                    r = op(self.lookup(f[1]), self.lookup(f[2]))
+                elif cmd.startswith('binopvs'):
+                    r = op(self.lookup(f[1]), self.scalar(f[2], f[3]))
+                else:
+                    r = op(self.scalar(f[1], f[2]), self.lookup(f[3]))
+            return self.updated(f[-1], r) if cmd.endswith('Store') else self.created(r)
+        if cmd in ('opeqvv', 'opeqvs'):
+            a = self.lookup(f[1])
+            b = self.lookup(f[2]) if cmd == 'opeqvv' else self.scalar(f[2], f[3])
+            a[...] = BINOPS[f[0][:-1]](a, b)
+            return 'opeq success'
+        if cmd == 'efunc':
+            a = self.lookup(f[1])
+            if f[0] not in ('cumsum', 'cumprod'):
+                # evaluated to float64, as on the server
+                a = a.astype(np.float64)
+            with np.errstate(all='ignore'):
+                return self.created(EFUNCS[f[0]](a))
+        if cmd.startswith('efunc3') and f[0] == 'where':
+            # "where <condition> <A> <B>", scalars given as "<dtype> <value>";
+            # the result has the dtype of A, or of B if only B is an array
+            operands = []
+            rest = f[2:]
+            for kind in cmd[-2:]:
+                if kind == 'v':
+                    operands.append(self.lookup(rest[0]))
+                    rest = rest[1:]
+                else:
+                    operands.append(self.scalar(rest[0], rest[1]))
+                    rest = rest[2:]
+            dtype = operands[1].dtype if cmd.endswith('sv') else operands[0].dtype
+            return self.created(np.where(self.lookup(f[1]), *operands).astype(dtype))
+        if cmd == 'randomNormal':
+            rng = np.random.default_rng(None if f[1] == 'None' else int(f[1]))
+            return self.created(rng.standard_normal(int(f[0])))
+        if cmd in ('fused', 'fusedStore'):
+            return self.fused(f, store=cmd == 'fusedStore')
+        if cmd == 'reduction':
+            return self.value(REDUCTIONS[f[0]](self.lookup(f[1])))
+        if cmd in ('arange', 'arangeStore'):
+            r = np.arange(int(f[0]), int(f[1]), int(f[2]))
+            return self.updated(f[3], r) if cmd == 'arangeStore' else self.created(r)
+        if cmd in ('[slice]', '[sliceStore]'):
+            r = self.lookup(f[0])[int(f[1]):int(f[2]):int(f[3])]
+            return self.updated(f[4], r) if cmd == '[sliceStore]' else self.created(r)
+        if cmd == '[pdarray]':
+            return self.created(self.lookup(f[0])[self.lookup(f[1])])
+        if cmd == '[int]':
+            return 'item ' + self.value(self.lookup(f[0])[int(f[1])])
+        if cmd == '[int]=val':
+            self.lookup(f[0])[int(f[1])] = self.scalar(f[2], f[3])
+            return 'set {}'.format(f[0])
+        if cmd == 'argsort':
+            return self.created(np.argsort(self.lookup(f[1]), kind='stable'))
+        if cmd == 'coargsort':
+            keys = [self.lookup(name) for name in f[1:1 + int(f[0])]]
+            return self.created(np.lexsort(keys[::-1]))
+        if cmd == 'cast':
+            return self.created(self.lookup(f[0]).astype(f[2]))
+        if cmd == 'in1d':
+            return self.created(np.in1d(self.lookup(f[0]), self.lookup(f[1]),
+                                        invert=f[2] == 'True'))
+        if cmd == 'unique':
+            if f[2] == 'True':
+                return self.created(*np.unique(self.lookup(f[1]), return_counts=True))
+            return self.created(np.unique(self.lookup(f[1])))
+        if cmd == 'findSegments':
+            # "<permutation> <nkeys> <keys...> <objtypes...>": the start of each
+            # run of equal keys in sorted order, and the index of its first key
+            perm = self.lookup(f[0])
+            keys = [self.lookup(name)[perm] for name in f[2:2 + int(f[1])]]
+            starts = np.zeros(perm.size, dtype=bool)
+            starts[:1] = True
+            for k in keys:
+                starts[1:] |= k[1:] != k[:-1]
+            segments = np.flatnonzero(starts)
+            return self.created(segments, perm[segments])
+        if cmd == 'countReduction':
+            segments = self.lookup(f[0])
+            return self.created(np.diff(np.append(segments, int(f[1]))))
+        if cmd == 'transpose':
+            arrays = [self.lookup(name) for name in f[1:1 + int(f[0])]]
+            # the server replies with the names alone
+            return 'created ' + ' '.join(self.add(row) for row in np.stack(arrays, axis=1))
+        if cmd in ('str', 'repr'):
+            return np.array2string(self.lookup(f[0]), separator=' ' if cmd == 'str' else ', ')
+        raise ValueError('unrecognized command: {}'.format(cmd))
+
+    def batch(self, args, user):
+        """
+        Executes the lines of a batch, "<ids> <request>", where the request is
+        a JSON-formatted RequestMessage or "<cmd> <args>", and ids name the
+        pdarrays it creates, for later lines to refer to as "%<id>"
+
+        :return: the reply message and type of each executed line
+        :rtype: list
+        """
+        aliases, replies = {}, []
+        for line in args.split('\n'):
+            if not line:
+                continue
+            ids, request = line.split(' ', 1)
+            if request.startswith('{'):
+                msg = json.loads(request)
+                cmd, sub_args = msg['cmd'], msg['args']
+            else:
+                cmd, _, sub_args = request.partition(' ')
+            # only the ids marked as aliases, since server names may equal them
+            sub_args = ' '.join(aliases.get(t[1:], t) if t.startswith('%') else t
+                                for t in sub_args.split(' '))
+            try:
+                reply = self.execute(cmd, sub_args)
+                if isinstance(reply, bytes):
+                    raise ValueError('{} returns binary data and cannot be batched'.format(cmd))
+                replies.append((reply, 'NORMAL'))
+            except Exception as e:
+                replies.append(('Error: {}'.format(e), 'ERROR'))
+                break
+            created = reply.split()
+            if ids != '-' and len(created) > 1 and created[0] in ('created', 'updated'):
+                for i, alias in enumerate(ids.split(',')):
+                    aliases[alias] = created[i + 1]
+        return replies
+
+    ###########
+    # Replies #
+    ###########
+
+    def compact_reply(self, replies, batch):
+        # see ReplyMessage.fromcompact
+        out = [COMPACT_MAGIC, _COMPACT_HEADER.pack(batch, len(replies))]
+        for msg, msg_type in replies:
+            names = []
+            for part in msg.split('+'):
+                fields = part.split()
+                if fields and fields[0] == 'created':
+                    names += [n for n in fields[1:] if n in self.symbols]
+            raw = msg.encode()
+            out.append(_COMPACT_RECORD.pack(MSG_TYPES.index(msg_type), len(names), len(raw)))
+            out.append(raw)
+            for name in names:
+                a = self.symbols[name]
+                out.append(struct.pack('<H', len(name)) + name.encode())
+                out.append(_COMPACT_ARRAY.pack(COMPACT_DTYPES.index(a.dtype.name),
+                                               a.size, 1, a.size, a.itemsize))
+        return b''.join(out)
+
+    def reply(self, cmd, message, replayable=True):
+        if self.session is not None:
+            # binary replies are computed again if the request is retried
+            if replayable:
+                self.last_reply[self.session] = message
+            else:
+                self.last_reply.pop(self.session, None)
+        if self.stalls:
+            time.sleep(self.stalls.pop(0))
+        self.sent[cmd] += len(message)
+        self.socket.send(message, copy=False)
+
+    def decode(self, raw):
+        """
+        Decodes a JSON-formatted or compact request into its fields and
+        binary payload
+
+        :return: whether the request is compact, its fields and its payload
+        :rtype: tuple
+        """
+        if raw.startswith(COMPACT_MAGIC):
+            fmt, *sizes = _COMPACT_REQUEST.unpack_from(raw, len(COMPACT_MAGIC))
+            offset = len(COMPACT_MAGIC) + _COMPACT_REQUEST.size
+            fields = []
+            for size in sizes:
+                fields.append(raw[offset:offset + size].decode())
+                offset += size
+            user, token, cmd, args = fields
+            return True, {'user': user, 'token': token, 'cmd': cmd, 'args': args,
+                          'format': 'BINARY' if fmt else 'STRING'}, raw[offset:]
+        header, _, payload = raw.partition(b'BINARY_PAYLOAD')
+        return False, json.loads(header.decode()), payload
+
+    def handle(self, raw):
+        """
+        Handles a request, receiving its payload frame if any, and sends the
+        reply
+
+        :return: False if the request was a shutdown, True otherwise
+        :rtype: bool
+        """
+        size = len(raw)
+        session = seq = self.session = None
+        if raw.startswith(SEQUENCE_MAGIC):
+            session, seq, raw = split_sequenced(raw)
+        compact, msg, payload = self.decode(raw)
+        cmd, args, user = msg['cmd'], msg['args'], msg['user']
+        self.requests[cmd] += 1
+        self.received[cmd] += size
+        if msg.get('format') == 'BINARY' and args.startswith('multipart'):
+            frame = self.socket.recv()
+            self.received[cmd] += len(frame)
+            fields = args.split()
+            if len(fields) == 4:
+                frame = decompress(fields[2], frame, int(fields[3]))
+            payload += frame
+        if session is not None:
+            last = self.last_sequence.get(session, -1)
+            if seq == last and session in self.last_reply:
+                self.replayed[cmd] += 1
+                self.reply(cmd, self.last_reply[session])
+                return True
+            if seq < last:
+                error = 'Error: request {} of session {} was answered already'.format(seq, session)
+                self.reply(cmd, json.dumps({'msg': error, 'msgType': 'ERROR',
+                                            'user': user}).encode())
+                return True
+            self.last_sequence[session] = seq
+            self.session = session
+        if cmd == 'shutdown':
+            self.commands[cmd] += 1
+            replies = [('shutdown server', 'NORMAL')]
+        elif cmd == 'batch':
+            replies = self.batch(args, user)
+            if compact:
+                self.reply(cmd, self.compact_reply(replies, 1))
+                return True
+            replies = [(json.dumps([{'msg': m, 'msgType': t, 'user': user}
+                                    for m, t in replies]), 'NORMAL')]
+        else:
+            try:
+                rep = self.execute(cmd, args, payload)
+                if isinstance(rep, bytes):
+                    self.reply(cmd, rep, replayable=False)
+                    return True
+                replies = [(rep, 'NORMAL')]
+            except Exception as e:
+                replies = [('Error: {}'.format(e), 'ERROR')]
+        if compact:
+            message = self.compact_reply(replies, 0)
+        else:
+            rep, msg_type = replies[0]
+            message = json.dumps({'msg': rep, 'msgType': msg_type, 'user': user}).encode()
+        self.reply(cmd, message)
+        return cmd != 'shutdown'
+
+    #############
+    # Lifecycle #
+    #############
+
+    def serve(self):
+        """
+        Serves requests until a shutdown request or stop()
+
+        :return: None
+        """
+        try:
+            while not self.stopping.is_set():
+                if self.socket.poll(100) and not self.handle(self.socket.recv()):
+                    break
+        finally:
+            self.socket.close(linger=0)
+            self.context.term()
+
+    def start(self):
+        """
+        Serves requests on a daemon thread
+
+        :return: the thread
+        :rtype: threading.Thread
+        """
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        """
+        Stops the thread started by start(), if the server was not shut down
+
+        :return: None
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+def main():
+    # accepts the arkouda_server arguments start_arkouda_server passes
+    parser = argparse.ArgumentParser(description='NumPy stand-in for the arkouda_server')
+    parser.add_argument('--ServerPort', type=int, default=5555, help='Port to bind to')
+    parser.add_argument('--serverConnectionInfo', default=None,
+                        help='File to write "hostname port" to once bound')
+    parser.add_argument('--stats', default=None,
+                        help='File to write the statistics to on shutdown, defaults to stdout')
+    parser.add_argument('--no-compact', default=False, action='store_true',
+                        help='Do not offer the compact envelope')
+    parser.add_argument('--codecs', default=None,
+                        help='Comma-separated compression codecs to offer')
+    args, _ = parser.parse_known_args()
+
+    codecs = None if args.codecs is None else [c for c in args.codecs.split(',') if c]
+    server = StandInServer(args.ServerPort, compact=not args.no_compact, codecs=codecs)
+    if args.serverConnectionInfo:
+        with open(args.serverConnectionInfo, 'w') as f:
+            f.write('{} {}\n'.format(socket.gethostname(), server.port))
+    print('stand-in server listening on tcp://*:{}'.format(server.port), file=sys.stderr)
+    server.serve()
+    stats = json.dumps(server.stats(), indent=2, sort_keys=True)
+    if args.stats:
+        with open(args.stats, 'w') as f:
+            f.write(stats + '\n')
+    else:
+        print(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,7 @@ import logging
 import os
 import socket
 import subprocess
+import sys
 import time
 
 from collections import namedtuple
@@ -52,6 +53,16 @@ def get_arkouda_server():
     """
     return os.path.join(get_arkouda_home(), 'arkouda_server')
 
+def is_standin_server():
+    """
+    Checks if ARKOUDA_STANDIN_SERVER is True, in which case the NumPy stand-in
+    server (util/test/standin_server.py) is started instead of arkouda_server.
+    
+    :return: boolean indicating whether to use the stand-in server
+    :rtype: bool
+    """
+    return os.getenv('ARKOUDA_STANDIN_SERVER') == 'True'
+
 def is_multilocale_arkouda():
     """
     Checks if the arkouda server was compiled for multiple locales (runs
@@ -71,6 +82,8 @@ def get_arkouda_numlocales():
     :return: number of locales
     :rtype: int
     """
+    if is_standin_server():
+        return 1
     if is_multilocale_arkouda():
         return int(os.getenv('ARKOUDA_NUMLOCALES', 2))
     else:
@@ -176,7 +189,10 @@ def start_arkouda_server(numlocales, verbose=False, log=False, port=5555, host=N
     with contextlib.suppress(FileNotFoundError):
         os.remove(connection_file)
     
-    cmd = [get_arkouda_server(),
+    server = [get_arkouda_server()]
+    if is_standin_server():
+        server = [sys.executable, os.path.join(util_dir, 'standin_server.py')]
+    cmd = server + [
            '--trace={}'.format('true' if log else 'false'),
            '--serverConnectionInfo={}'.format(connection_file),
            '-nl {}'.format(numlocales), '--ServerPort={}'.format(port)]